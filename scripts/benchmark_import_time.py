@@ -0,0 +1,79 @@
+"""
+Measure the import time of main wacryptolib modules (as paid by CLI runs and short-lived worker processes),
+in fresh interpreters, and check it against a time budget.
+
+Heavy dependencies (jsonschema, requests...) and validation schemas must only be loaded on first use,
+so they are also checked to be absent after import.
+
+Exits with a non-zero status if a budget is exceeded, so that this script can be used as a CI gate.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+IMPORT_TIME_BUDGETS_S = {  # For imports with warm bytecode caches, on a modest machine
+    "wacryptolib.cryptainer": 0.15,
+    "wacryptolib.__main__": 0.35,  # Also includes the "click" CLI framework
+}
+
+LAZILY_IMPORTED_MODULES = ["asyncio", "jsonschema", "jsonrpc_requests", "requests"]
+
+REPEAT = 7
+
+
+def _get_cumulated_import_time_s(module_name):
+    env = os.environ.copy()
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # Bytecode caches must be used, as in production
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module_name],
+        env=env,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    for line in proc.stderr.splitlines():  # Format is "import time: self [us] | cumulative | imported package"
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module_name:
+            return int(fields[1]) / 1_000_000
+    raise RuntimeError("No import time found for %s" % module_name)
+
+
+def _get_unwanted_imported_modules(module_name):
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, %s; print(' '.join(m for m in %r if m in sys.modules))"
+            % (module_name, LAZILY_IMPORTED_MODULES),
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    return proc.stdout.split()
+
+
+def benchmark_import_time():
+    success = True
+    for module_name, budget_s in IMPORT_TIME_BUDGETS_S.items():
+        _get_cumulated_import_time_s(module_name)  # Warm up bytecode and filesystem caches
+        import_time_s = statistics.median(_get_cumulated_import_time_s(module_name) for _ in range(REPEAT))
+        within_budget = import_time_s <= budget_s
+        print(
+            "%-30s %.3f s (budget: %.3f s) %s"
+            % (module_name, import_time_s, budget_s, "OK" if within_budget else "EXCEEDED")
+        )
+        success &= within_budget
+
+    unwanted_modules = _get_unwanted_imported_modules("wacryptolib.cryptainer")
+    if unwanted_modules:
+        print("Modules which should be lazily imported: %s" % ", ".join(unwanted_modules))
+        success = False
+
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if benchmark_import_time() else 1)
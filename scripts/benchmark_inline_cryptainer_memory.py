@@ -0,0 +1,69 @@
+"""
+Measure the peak memory used (as traced by tracemalloc) when dumping to and loading from filesystem
+a json cryptainer with a big inline payload ciphertext, compared to a plain serialization in memory.
+"""
+
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from wacryptolib._crypto_backend import get_random_bytes
+from wacryptolib.cryptainer import (
+    LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+    encrypt_payload_into_cryptainer,
+    dump_cryptainer_to_bytes,
+    load_cryptainer_from_bytes,
+    dump_cryptainer_to_filesystem,
+    load_cryptainer_from_filesystem,
+)
+
+CRYPTOCONF = dict(
+    payload_cipher_layers=[
+        dict(
+            payload_cipher_algo="AES_CBC",
+            key_cipher_layers=[dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)],
+            payload_signatures=[],
+        )
+    ]
+)
+
+
+def _measure_peak_memory(label, func):
+    tracemalloc.start()
+    func()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("%-70s %.1f MB" % (label, peak_memory / 1024 ** 2))
+
+
+def benchmark_inline_cryptainer_memory(payload_size):
+    cryptainer = encrypt_payload_into_cryptainer(
+        get_random_bytes(payload_size), cryptoconf=CRYPTOCONF, cryptainer_metadata=None
+    )
+    cryptainer_filepath = Path(tempfile.mkdtemp()) / "inline_cryptainer.crypt"
+
+    label = "cryptainer with %d MB inline payload" % (payload_size // 1024 ** 2)
+    _measure_peak_memory(
+        "dump_cryptainer_to_bytes() of %s" % label,
+        lambda: cryptainer_filepath.write_bytes(dump_cryptainer_to_bytes(cryptainer)),
+    )
+    _measure_peak_memory(
+        "dump_cryptainer_to_filesystem() of %s" % label,
+        lambda: dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer, offload_payload_ciphertext=False),
+    )
+    _measure_peak_memory(
+        "load_cryptainer_from_bytes() of %s" % label,
+        lambda: load_cryptainer_from_bytes(cryptainer_filepath.read_bytes()),
+    )
+    _measure_peak_memory(
+        "load_cryptainer_from_filesystem() of %s" % label, lambda: load_cryptainer_from_filesystem(cryptainer_filepath)
+    )
+    _measure_peak_memory(
+        "load_cryptainer_from_filesystem(include_payload_ciphertext=False) of %s" % label,
+        lambda: load_cryptainer_from_filesystem(cryptainer_filepath, include_payload_ciphertext=False),
+    )
+    cryptainer_filepath.unlink()
+
+
+if __name__ == "__main__":
+    benchmark_inline_cryptainer_memory(payload_size=50 * 1024 ** 2)
@@ -0,0 +1,96 @@
+"""
+Compare the specialized extended-json codec of wacryptolib (used by dump_to_json_str() and load_from_json_str())
+with the generic converters of bson.json_util, on real cryptainers with inline or offloaded payload ciphertexts.
+
+Outputs of both codecs are checked to be identical before being timed.
+"""
+
+import time
+
+from bson.json_util import dumps, loads
+
+from wacryptolib.cryptainer import (
+    LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+    SHARED_SECRET_ALGO_MARKER,
+    OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER,
+    encrypt_payload_into_cryptainer,
+)
+from wacryptolib.utilities import WACRYPTOLIB_JSON_OPTIONS, dump_to_json_str, load_from_json_str, generate_uuid0
+
+CRYPTOCONF = dict(
+    payload_cipher_layers=[
+        dict(
+            payload_cipher_algo="AES_CBC",
+            key_cipher_layers=[dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)],
+            payload_signatures=[
+                dict(
+                    payload_digest_algo="SHA256",
+                    payload_signature_algo="DSA_DSS",
+                    payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                )
+            ],
+        ),
+        dict(
+            payload_cipher_algo="CHACHA20_POLY1305",
+            key_cipher_layers=[
+                dict(
+                    key_cipher_algo=SHARED_SECRET_ALGO_MARKER,
+                    key_shared_secret_threshold=2,
+                    key_shared_secret_shards=[
+                        dict(
+                            key_cipher_layers=[
+                                dict(
+                                    key_cipher_algo="RSA_OAEP",
+                                    key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                                    keychain_uid=generate_uuid0(),
+                                )
+                            ]
+                        )
+                        for _ in range(3)
+                    ],
+                )
+            ],
+            payload_signatures=[],
+        ),
+    ]
+)
+
+
+def _measure(label, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    print("%-70s %.3f s" % (label, time.perf_counter() - start))
+
+
+def benchmark_json_codec(payload_size, offloaded, repeat):
+    cryptainer = encrypt_payload_into_cryptainer(
+        b"x" * payload_size, cryptoconf=CRYPTOCONF, cryptainer_metadata={"sensor": "camera", "index": 42}
+    )
+    if offloaded:
+        cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+
+    generic_json_str = dumps(cryptainer, sort_keys=True, json_options=WACRYPTOLIB_JSON_OPTIONS)
+    json_str = dump_to_json_str(cryptainer)
+    assert json_str == generic_json_str, "Diverging json outputs"
+    assert load_from_json_str(json_str) == loads(json_str, json_options=WACRYPTOLIB_JSON_OPTIONS)
+
+    label = "%s cryptainer (%d bytes payload) x %d" % ("offloaded" if offloaded else "inline", payload_size, repeat)
+    _measure(
+        "json_util.dumps() of %s" % label,
+        lambda: dumps(cryptainer, sort_keys=True, json_options=WACRYPTOLIB_JSON_OPTIONS),
+        repeat=repeat,
+    )
+    _measure("dump_to_json_str() of %s" % label, lambda: dump_to_json_str(cryptainer), repeat=repeat)
+    _measure(
+        "json_util.loads() of %s" % label,
+        lambda: loads(json_str, json_options=WACRYPTOLIB_JSON_OPTIONS),
+        repeat=repeat,
+    )
+    _measure("load_from_json_str() of %s" % label, lambda: load_from_json_str(json_str), repeat=repeat)
+
+
+if __name__ == "__main__":
+    benchmark_json_codec(payload_size=1024, offloaded=True, repeat=10_000)
+    benchmark_json_codec(payload_size=1024, offloaded=False, repeat=10_000)
+    benchmark_json_codec(payload_size=10 * 1024 ** 2, offloaded=False, repeat=5)
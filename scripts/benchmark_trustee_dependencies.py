@@ -0,0 +1,107 @@
+"""
+Measure the time needed to gather trustee dependencies and decryptable symkeys of big batches of cryptainers,
+e.g. when preparing authorization or revelation requests.
+
+Cryptainers are clones of a single real cryptainer (with new UIDs), so that only the analysis is measured.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from wacryptolib.cryptainer import (
+    LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+    SHARED_SECRET_ALGO_MARKER,
+    CRYPTAINER_SUFFIX,
+    ReadonlyCryptainerStorage,
+    encrypt_payload_into_cryptainer,
+    gather_decryptable_symkeys,
+    gather_trustee_dependencies,
+    dump_cryptainer_to_filesystem,
+)
+from wacryptolib.utilities import generate_uuid0
+
+CRYPTOCONF = dict(
+    payload_cipher_layers=[
+        dict(
+            payload_cipher_algo="AES_EAX",
+            key_cipher_layers=[dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)],
+            payload_signatures=[
+                dict(
+                    payload_digest_algo="SHA256",
+                    payload_signature_algo="DSA_DSS",
+                    payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                )
+            ],
+        ),
+        dict(
+            payload_cipher_algo="CHACHA20_POLY1305",
+            key_cipher_layers=[
+                dict(
+                    key_cipher_algo=SHARED_SECRET_ALGO_MARKER,
+                    key_shared_secret_threshold=2,
+                    key_shared_secret_shards=[
+                        dict(
+                            key_cipher_layers=[
+                                dict(
+                                    key_cipher_algo="RSA_OAEP",
+                                    key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                                    keychain_uid=generate_uuid0(),
+                                )
+                            ]
+                        )
+                        for _ in range(3)
+                    ],
+                )
+            ],
+            payload_signatures=[],
+        ),
+    ]
+)
+
+KEYCHAIN_COUNT = 50  # Cryptainers share their keychains, as with a keychain rotation policy
+
+
+def _build_cryptainers(cryptainer_count):
+    cryptainer_template = encrypt_payload_into_cryptainer(b"abc", cryptoconf=CRYPTOCONF, cryptainer_metadata=None)
+    keychain_uids = [generate_uuid0() for _ in range(KEYCHAIN_COUNT)]
+    return [
+        dict(cryptainer_template, cryptainer_uid=generate_uuid0(), keychain_uid=keychain_uids[idx % KEYCHAIN_COUNT])
+        for idx in range(cryptainer_count)
+    ]
+
+
+def _measure(label, func):
+    start = time.perf_counter()
+    func()
+    print("%-80s %.3f s" % (label, time.perf_counter() - start))
+
+
+def benchmark_gathering(cryptainer_count):
+    cryptainers = _build_cryptainers(cryptainer_count)
+    cryptainers_with_names = [("cryptainer%d%s" % (idx, CRYPTAINER_SUFFIX), c) for (idx, c) in enumerate(cryptainers)]
+
+    _measure(
+        "gather_trustee_dependencies() for %d cryptainers" % cryptainer_count,
+        lambda: gather_trustee_dependencies(cryptainers),
+    )
+    _measure(
+        "gather_decryptable_symkeys() for %d cryptainers" % cryptainer_count,
+        lambda: gather_decryptable_symkeys(cryptainers_with_names),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cryptainer_name, cryptainer in cryptainers_with_names:
+            dump_cryptainer_to_filesystem(Path(tmp_dir, cryptainer_name), cryptainer=cryptainer)
+        storage = ReadonlyCryptainerStorage(Path(tmp_dir))
+        for max_workers in (1, 4):
+            _measure(
+                "storage.gather_cryptainer_dependencies(max_workers=%d) for %d cryptainers"
+                % (max_workers, cryptainer_count),
+                lambda: storage.gather_cryptainer_dependencies(max_workers=max_workers),
+            )
+
+
+if __name__ == "__main__":
+    for cryptainer_count in (10_000, 100_000):
+        benchmark_gathering(cryptainer_count)
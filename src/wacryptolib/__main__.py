@@ -1,3 +1,5 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pprint import pprint
 
@@ -14,6 +16,15 @@ from wacryptolib.cryptainer import (
     check_cryptoconf_sanity,
     check_cryptainer_sanity,
     get_cryptoconf_summary,
+    CryptainerStorage,
+    DecryptionErrorCriticity,
+    DecryptionErrorType,
+    ReadonlyCryptainerStorage,
+    migrate_cryptainers,
+    verify_cryptainer_integrity,
+    convert_cryptainer_format_on_filesystem,
+    dump_cryptainer_to_bytes,
+    load_cryptainer_from_bytes,
 )
 from wacryptolib.keystore import FilesystemKeystorePool
 from wacryptolib.utilities import dump_to_json_bytes, load_from_json_bytes
@@ -26,7 +37,7 @@ def _get_keystore_pool(ctx):
     keystore_pool_dir = ctx.obj["keystore_pool"]
     if not keystore_pool_dir:
         keystore_pool_dir = Path().joinpath(DEFAULT_KEYSTORE_POOL_DIRNAME).resolve()
-        click.echo("No keystore-pool directory provided, defaulting to '%s'" % keystore_pool_dir)
+        click.echo("No keystore-pool directory provided, defaulting to '%s'" % keystore_pool_dir, err=True)
         keystore_pool_dir.mkdir(exist_ok=True)
     return FilesystemKeystorePool(keystore_pool_dir)
 
@@ -102,8 +113,9 @@ def _do_encrypt(payload, cryptoconf_fileobj, keystore_pool):
 @click.option("-i", "--input-medium", type=click.File("rb"), required=True)
 @click.option("-o", "--output-cryptainer", type=click.File("wb"))
 @click.option("-c", "--cryptoconf", default=None, help="Json crypotoconf file", type=click.File("rb"))
+@click.option("--binary/--json", default=False, help="Format of the cryptainer file (default: json)")
 @click.pass_context
-def encrypt(ctx, input_medium, output_cryptainer, cryptoconf):
+def encrypt(ctx, input_medium, output_cryptainer, cryptoconf, binary):
     """Turn a media file into a secure cryptainer."""
     if not output_cryptainer:
         output_cryptainer = LazyFile(input_medium.name + CRYPTAINER_SUFFIX, "wb")
@@ -113,7 +125,10 @@ def encrypt(ctx, input_medium, output_cryptainer, cryptoconf):
     keystore_pool = _get_keystore_pool(ctx)
     cryptainer = _do_encrypt(payload=input_medium.read(), cryptoconf_fileobj=cryptoconf, keystore_pool=keystore_pool)
 
-    cryptainer_bytes = dump_to_json_bytes(cryptainer, indent=4)
+    if binary:
+        cryptainer_bytes = dump_cryptainer_to_bytes(cryptainer, binary_format=True)
+    else:
+        cryptainer_bytes = dump_to_json_bytes(cryptainer, indent=4)
 
     with output_cryptainer as f:
         f.write(cryptainer_bytes)
@@ -142,7 +157,7 @@ def decrypt(ctx, input_cryptainer, output_medium):
 
     # click.echo("In decrypt: %s" % str(locals()))
 
-    cryptainer = load_from_json_bytes(input_cryptainer.read())
+    cryptainer = load_cryptainer_from_bytes(input_cryptainer.read())
 
     keystore_pool = _get_keystore_pool(ctx)
     medium_content, error_report = _do_decrypt(cryptainer=cryptainer, keystore_pool=keystore_pool)
@@ -168,12 +183,155 @@ def summarize(ctx, input_file):
 
     # click.echo("In display_cryptoconf_summary: %s" % str(locals()))
 
-    cryptoconf = load_from_json_bytes(input_file.read())
+    cryptoconf = load_cryptainer_from_bytes(input_file.read())  # Also handles json cryptoconfs
 
     text_summary = get_cryptoconf_summary(cryptoconf)
     print(text_summary)
 
 
+@wacryptolib_cli.command()
+@click.option(
+    "-i",
+    "--input-cryptainer",
+    "input_cryptainers",
+    multiple=True,
+    required=True,
+    help="Cryptainer file to convert (can be repeated)",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, writable=True, readable=True, resolve_path=True),
+)
+@click.option("--binary/--json", default=True, help="Target format of cryptainer files (default: binary)")
+@click.pass_context
+def convert(ctx, input_cryptainers, binary):
+    """Rewrite cryptainer files in compact binary format, or back to json."""
+    converted_count = 0
+    for input_cryptainer in input_cryptainers:
+        converted_count += convert_cryptainer_format_on_filesystem(Path(input_cryptainer), binary_format=binary)
+    click.echo(
+        "Conversion finished for %d cryptainer(s), %d already in %s format"
+        % (converted_count, len(input_cryptainers) - converted_count, "binary" if binary else "json")
+    )
+
+
+@wacryptolib_cli.command()
+@click.option(
+    "-d",
+    "--cryptainer-dir",
+    required=True,
+    help="Folder of the cryptainer storage to migrate",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, writable=True, readable=True, resolve_path=True),
+)
+@click.option(
+    "-c", "--cryptoconf", required=True, help="Json cryptoconf file for migrated cryptainers", type=click.File("rb")
+)
+@click.option(
+    "-w", "--workers", default=1, help="Count of cryptainers migrated in parallel", type=click.IntRange(min=1)
+)
+@click.pass_context
+def migrate(ctx, cryptainer_dir, cryptoconf, workers):
+    """Re-encrypt all the cryptainers of a folder with a new cryptoconf."""
+    cryptoconf = load_from_json_bytes(cryptoconf.read())
+    check_cryptoconf_sanity(cryptoconf)
+
+    keystore_pool = _get_keystore_pool(ctx)
+    cryptainer_storage = CryptainerStorage(Path(cryptainer_dir), keystore_pool=keystore_pool)
+    error_reports = migrate_cryptainers(cryptainer_storage, cryptoconf, workers=workers)
+
+    failed_cryptainer_names = []
+    for cryptainer_name, error_report in error_reports.items():
+        if error_report:
+            print("Migration errors occured for cryptainer '%s':" % cryptainer_name)
+            pprint(error_report)
+        if any(error_entry["error_criticity"] == DecryptionErrorCriticity.ERROR for error_entry in error_report):
+            failed_cryptainer_names.append(cryptainer_name)
+
+    if failed_cryptainer_names:
+        raise RuntimeError("%d cryptainer(s) could not be migrated" % len(failed_cryptainer_names))
+
+    click.echo("Migration finished for %d cryptainer(s)" % len(error_reports))
+
+
+def _audit_cryptainer(cryptainer_filepath, keystore_pool, verify_integrity_tags, decryption_session):
+    audit_entry = dict(cryptainer_name=cryptainer_filepath.name, errors=[], exception=None)
+    try:
+        error_report = verify_cryptainer_integrity(
+            cryptainer_filepath,
+            keystore_pool=keystore_pool,
+            verify_integrity_tags=verify_integrity_tags,
+            decryption_session=decryption_session,
+        )
+    except Exception as exc:  # E.g. missing offloaded payload, or corrupted cryptainer header
+        audit_entry["exception"] = repr(exc)
+        error_report = []
+    audit_entry["errors"] = [
+        dict(
+            error_type=error_entry["error_type"],
+            error_criticity=error_entry["error_criticity"],
+            error_message=error_entry["error_message"],
+        )
+        for error_entry in error_report
+    ]
+    audit_entry["is_intact"] = not audit_entry["exception"] and not any(
+        error_entry["error_criticity"] == DecryptionErrorCriticity.ERROR
+        or error_entry["error_type"] == DecryptionErrorType.SIGNATURE_ERROR
+        for error_entry in error_report
+    )
+    return audit_entry
+
+
+@wacryptolib_cli.command()
+@click.option(
+    "-d",
+    "--cryptainer-dir",
+    required=True,
+    help="Folder of the cryptainer storage to audit",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, readable=True, resolve_path=True),
+)
+@click.option("-o", "--output-report", default="-", help="Json report file (else stdout)", type=click.File("w"))
+@click.option(
+    "--verify-tags/--no-verify-tags",
+    default=False,
+    help="Also decrypt payloads (requiring private keys) to check integrity tags of all layers",
+)
+@click.option("-w", "--workers", default=4, help="Count of cryptainers audited in parallel", type=click.IntRange(min=1))
+@click.pass_context
+def verify(ctx, cryptainer_dir, output_report, verify_tags, workers):
+    """Check the integrity of all the cryptainers of a folder, without keeping plaintexts."""
+    keystore_pool = _get_keystore_pool(ctx)
+    cryptainer_storage = ReadonlyCryptainerStorage(Path(cryptainer_dir), keystore_pool=keystore_pool)
+    cryptainer_filepaths = cryptainer_storage.list_cryptainer_names(as_sorted_list=True, as_absolute_paths=True)
+
+    with cryptainer_storage.create_decryption_session() as decryption_session, ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="cryptainer_audit_worker"
+    ) as executor:
+        audit_entries = list(
+            executor.map(
+                lambda cryptainer_filepath: _audit_cryptainer(
+                    cryptainer_filepath,
+                    keystore_pool=keystore_pool,
+                    verify_integrity_tags=verify_tags,
+                    decryption_session=decryption_session,
+                ),
+                cryptainer_filepaths,
+            )
+        )
+
+    failed_cryptainer_count = sum(1 for audit_entry in audit_entries if not audit_entry["is_intact"])
+    audit_report = dict(
+        cryptainer_dir=str(cryptainer_dir),
+        verify_integrity_tags=verify_tags,
+        cryptainer_count=len(audit_entries),
+        failed_cryptainer_count=failed_cryptainer_count,
+        cryptainers=audit_entries,
+    )
+
+    output_report.write(json.dumps(audit_report, indent=4) + "\n")  # Click closes or flushes it on exit
+
+    if failed_cryptainer_count:
+        raise RuntimeError("%d cryptainer(s) failed integrity verification" % failed_cryptainer_count)
+
+    click.echo("Integrity verification finished for %d cryptainer(s)" % len(audit_entries), err=True)
+
+
 if __name__ == "__main__":
     fake_prog_name = "python -m wacryptolib"  # Else __init__.py is used in help text...
     wacryptolib_cli(prog_name=fake_prog_name)
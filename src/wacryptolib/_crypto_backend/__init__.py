@@ -119,7 +119,7 @@ if use_fallback_backend:
         def patched_decrypt(ciphertext):
             plaintext = b""
             while ciphertext:
-                chunk = ciphertext[: cipher.block_size]
+                chunk = bytes(ciphertext[: cipher.block_size])  # Ciphertext might be a memoryview
                 ciphertext = ciphertext[cipher.block_size :]
                 plaintext += original_cipher_decrypt(chunk)
             return plaintext
@@ -1,5 +1,5 @@
 import logging
-from typing import BinaryIO
+from typing import BinaryIO, Callable
 
 from wacryptolib import _crypto_backend
 from wacryptolib import utilities
@@ -47,8 +47,8 @@ def decrypt_bytestring(
     """Decrypt a bytestring with the selected algorithm for the given encrypted data dict,
     using the provided key (which must be of a compatible type and length).
 
-    :param cipherdict: dict with field "ciphertext" as bytestring and (depending
-        on the cipher_algo) some other fields like "tag" or "nonce"
+    :param cipherdict: dict with field "ciphertext" as bytestring (or bytes-like object, e.g. a memoryview
+        over a memory-mapped file) and (depending on the cipher_algo) some other fields like "tag" or "nonce"
         as bytestrings
     :param cipher_algo: one of the supported encryption algorithms
     :param key_dict: dict with secret key fields
@@ -307,6 +307,68 @@ class EncryptionNodeBase:
     def _get_payload_macs(self) -> dict:
         return {}
 
+    def _build_cipher(self):
+        """Return a new cipher object, initialized with the keys of this node (also usable for decryption)."""
+        raise NotImplementedError("%s._build_cipher()" % self.__class__.__name__)
+
+    def get_pending_payload(self) -> bytes:
+        """Return the data received but not yet encrypted, due to block alignment."""
+        assert not self._is_finished
+        return self._remainder
+
+    def build_chunk_decrypter(self) -> Callable:
+        """Return a function decrypting, chunk by chunk, the ciphertext output by this node (integrity not checked)."""
+        cipher = self._build_cipher()
+        remainder = b""
+
+        def decrypt_chunk(ciphertext):
+            nonlocal remainder
+            if self.BLOCK_SIZE != 1:
+                ciphertext, remainder = utilities.gather_data_as_blocks(
+                    remainder, ciphertext, block_size=self.BLOCK_SIZE
+                )
+            return cipher.decrypt(ciphertext)
+
+        return decrypt_chunk
+
+    def build_payload_decrypter(self, payload_macs: dict, verify_integrity_tags: bool = True) -> tuple:
+        """Return a tuple of functions (decrypt_chunk, finalize_decryption), to decrypt chunk by chunk the WHOLE
+        ciphertext output by a node having the same keys, with unpadding and check of integrity tags at the end.
+
+        Both functions raise DecryptionError (or DecryptionIntegrityError) on problem, so the plaintext
+        already returned must only be trusted once `finalize_decryption()` has succeeded.
+        """
+        cipher = self._build_cipher()
+        remainder = b""
+
+        def decrypt_chunk(ciphertext):
+            nonlocal remainder
+            if self.BLOCK_SIZE != 1:
+                data = remainder + ciphertext  # Last block is always retained, for unpadding
+                aligned_length = max(len(data) - 1, 0) // self.BLOCK_SIZE * self.BLOCK_SIZE
+                ciphertext, remainder = data[:aligned_length], data[aligned_length:]
+            return cipher.decrypt(ciphertext)
+
+        def finalize_decryption():
+            plaintext = b""
+            try:
+                if self.BLOCK_SIZE != 1:
+                    if len(remainder) != self.BLOCK_SIZE:
+                        raise ValueError("Ciphertext length is not a multiple of block size")
+                    plaintext = _crypto_backend.unpad_bytes(cipher.decrypt(remainder), block_size=self.BLOCK_SIZE)
+                if verify_integrity_tags:
+                    self._verify_payload_macs(cipher, payload_macs=payload_macs)
+            except ValueError as exc:
+                if "MAC check failed" in str(exc):  # Hackish check for pycryptodome
+                    raise DecryptionIntegrityError("Failed decryption authentication (%s)" % exc) from exc
+                raise DecryptionError("Failed decryption (%s)" % exc) from exc
+            return plaintext
+
+        return decrypt_chunk, finalize_decryption
+
+    def _verify_payload_macs(self, cipher, payload_macs: dict):
+        pass  # No integrity tags by default
+
 
 class AesCbcEncryptionNode(EncryptionNodeBase):
     """Encrypt a bytestring using AES (CBC mode)."""
@@ -317,7 +379,10 @@ class AesCbcEncryptionNode(EncryptionNodeBase):
         super().__init__(payload_digest_algo=payload_digest_algo)
         self._key = key_dict["key"]
         self._iv = key_dict["iv"]
-        self._cipher = _crypto_backend.build_aes_cbc_cipher(self._key, iv=self._iv)
+        self._cipher = self._build_cipher()
+
+    def _build_cipher(self):
+        return _crypto_backend.build_aes_cbc_cipher(self._key, iv=self._iv)
 
 
 class AesEaxEncryptionNode(EncryptionNodeBase):
@@ -327,11 +392,17 @@ class AesEaxEncryptionNode(EncryptionNodeBase):
         super().__init__(payload_digest_algo=payload_digest_algo)
         self._key = key_dict["key"]
         self._nonce = key_dict["nonce"]
-        self._cipher = _crypto_backend.build_aes_eax_cipher(self._key, nonce=self._nonce)
+        self._cipher = self._build_cipher()
+
+    def _build_cipher(self):
+        return _crypto_backend.build_aes_eax_cipher(self._key, nonce=self._nonce)
 
     def _get_payload_macs(self) -> dict:
         return {"tag": self._cipher.digest()}
 
+    def _verify_payload_macs(self, cipher, payload_macs: dict):
+        cipher.verify(payload_macs["tag"])
+
 
 class Chacha20Poly1305EncryptionNode(EncryptionNodeBase):
     """Encrypt a bytestring using ChaCha20 with Poly1305 authentication."""
@@ -341,11 +412,17 @@ class Chacha20Poly1305EncryptionNode(EncryptionNodeBase):
 
         self._key = key_dict["key"]
         self._nonce = key_dict["nonce"]
-        self._cipher = _crypto_backend.build_chacha20_poly1305_cipher(self._key, nonce=self._nonce)
+        self._cipher = self._build_cipher()
+
+    def _build_cipher(self):
+        return _crypto_backend.build_chacha20_poly1305_cipher(self._key, nonce=self._nonce)
 
     def _get_payload_macs(self) -> dict:
         return {"tag": self._cipher.digest()}
 
+    def _verify_payload_macs(self, cipher, payload_macs: dict):
+        cipher.verify(payload_macs["tag"])
+
 
 class PayloadEncryptionPipeline:
     """PRIVATE API FOR NOW
@@ -395,6 +472,42 @@ class PayloadEncryptionPipeline:
         self._output_stream.flush()
         self._finalized = True
 
+    def get_pending_payloads(self) -> list:
+        """Return, for each encryption node, the data received but not yet encrypted (due to block alignment)."""
+        assert not self._finalized
+        return [cipher.get_pending_payload() for cipher in self._cipher_streams]
+
+    def replay_encryption(self, previous_ciphertext_stream: BinaryIO, pending_payloads: list, chunk_size: int):
+        """Bring this NEW pipeline into the exact state of a previous one using the same keys, which had
+        already written the content of `previous_ciphertext_stream`, and retained `pending_payloads` in its nodes.
+
+        Since encryption is deterministic for given keys, this is done by decrypting the previous ciphertext
+        layer by layer, and encrypting the recovered payload again (without writing it to output stream).
+        """
+        assert not self._finalized
+        assert len(pending_payloads) == len(self._cipher_streams), pending_payloads
+        chunk_decrypters = [cipher.build_chunk_decrypter() for cipher in self._cipher_streams]
+
+        def _reencrypt_chunk(chunk):
+            for cipher in self._cipher_streams:
+                chunk = cipher.encrypt(chunk)
+            return chunk  # Identical to what was written by previous pipeline
+
+        while True:
+            ciphertext = previous_ciphertext_stream.read(chunk_size)
+            if not ciphertext:
+                break
+            for chunk_decrypter in reversed(chunk_decrypters):
+                ciphertext = chunk_decrypter(ciphertext)
+            _reencrypt_chunk(ciphertext)
+
+        # Payload retained by a node is the output of previous node, still to be decrypted by the latter
+        pending_payload = b""
+        for chunk_decrypter, node_pending_payload in reversed(list(zip(chunk_decrypters, pending_payloads))):
+            pending_payload = chunk_decrypter(pending_payload) + node_pending_payload
+        ciphertext = _reencrypt_chunk(pending_payload)
+        assert not ciphertext, len(ciphertext)  # Else previous pipeline state was incoherent
+
     def get_payload_integrity_tags(self) -> list:
         logger.debug(
             "Getting payload integrity tags of payload encryption pipeline with %d encryption nodes",
@@ -406,6 +519,78 @@ class PayloadEncryptionPipeline:
         return integrity_tags_list
 
 
+class PayloadDecryptionPipeline:
+    """PRIVATE API FOR NOW
+
+    Pipeline to decrypt, chunk by chunk, a payload ciphertext through its payload cipher layers
+    (outermost layer first), while computing the digests of the ciphertext handled by each layer.
+
+    `payload_cipher_layer_extracts` is a list (in cryptainer order) of dicts with fields "cipher_algo",
+    "symkey", "payload_macs" and "payload_digest_algos".
+    """
+
+    _finalized = False
+
+    def __init__(self, payload_cipher_layer_extracts: list, verify_integrity_tags: bool = True):
+        self._payload_decrypters = []
+        self._hashers_dicts = []
+
+        for payload_cipher_layer_extract in payload_cipher_layer_extracts:
+            payload_cipher_algo = payload_cipher_layer_extract["cipher_algo"]
+            cipher_algo_conf = _get_cipher_algo_conf(cipher_algo=payload_cipher_algo)
+            encryption_class = cipher_algo_conf["encryption_node_class"]
+
+            if encryption_class is None:
+                raise OperationNotSupported("Node class %s is not implemented" % payload_cipher_algo)
+
+            encryption_node = encryption_class(key_dict=payload_cipher_layer_extract["symkey"])
+            self._payload_decrypters.append(
+                encryption_node.build_payload_decrypter(
+                    payload_macs=payload_cipher_layer_extract["payload_macs"],
+                    verify_integrity_tags=verify_integrity_tags,
+                )
+            )
+            self._hashers_dicts.append(
+                {
+                    hash_algo: _crypto_backend.get_hasher_instance(hash_algo)
+                    for hash_algo in payload_cipher_layer_extract["payload_digest_algos"]
+                }
+            )
+
+    def _decrypt_through_layer(self, layer_index, ciphertext, is_last_chunk=False):
+        decrypt_chunk, finalize_decryption = self._payload_decrypters[layer_index]
+        for hasher_instance in self._hashers_dicts[layer_index].values():
+            hasher_instance.update(ciphertext)
+        plaintext = decrypt_chunk(ciphertext)
+        if is_last_chunk:
+            plaintext += finalize_decryption()
+        return plaintext
+
+    def decrypt_chunk(self, chunk) -> bytes:
+        """Return the plaintext available after decryption of this chunk (possibly empty)."""
+        assert not self._finalized
+        for layer_index in reversed(range(len(self._payload_decrypters))):
+            chunk = self._decrypt_through_layer(layer_index, chunk)
+        return chunk
+
+    def finalize(self) -> bytes:
+        """Return the remaining plaintext, after integrity checks (which raise DecryptionError on failure)."""
+        assert not self._finalized
+        self._finalized = True
+        chunk = b""
+        for layer_index in reversed(range(len(self._payload_decrypters))):
+            chunk = self._decrypt_through_layer(layer_index, chunk, is_last_chunk=True)
+        return chunk
+
+    def get_payload_digests(self) -> list:
+        """Return, for each payload cipher layer, a dict mapping digest algos to digests of the layer's ciphertext."""
+        assert self._finalized
+        return [
+            {hash_algo: hasher_instance.digest() for (hash_algo, hasher_instance) in hashers_dict.items()}
+            for hashers_dict in self._hashers_dicts
+        ]
+
+
 CIPHER_ALGOS_REGISTRY = dict(
     ## SYMMETRIC ENCRYPTION ##
     # ALL encryption/decryption routines must handle a "ciphertext" attribute on their cipherdict
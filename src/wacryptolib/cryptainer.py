@@ -1,25 +1,38 @@
+import binascii
+import codecs
 import copy
+import functools
+import hashlib
+import io
+import json
 import logging
 import math
+import mmap
 import os
+import re
+import struct
+import tempfile
 import threading
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, Union, Sequence, BinaryIO
+from typing import Optional, Union, Sequence, BinaryIO, Callable, Iterable
 from urllib.parse import urlparse
 
-import jsonschema
+import bson
 import schema as pythonschema
-from jsonrpc_requests import JSONRPCError
-from jsonschema import validate as jsonschema_validate
+from bson.errors import BSONError
 from schema import And, Or, Schema, Optional as OptionalKey
 
+from wacryptolib import _crypto_backend
 from wacryptolib.cipher import (
     encrypt_bytestring,
     decrypt_bytestring,
     PayloadEncryptionPipeline,
+    PayloadDecryptionPipeline,
     STREAMABLE_CIPHER_ALGOS,
     SUPPORTED_CIPHER_ALGOS,
 )
@@ -32,7 +45,6 @@ from wacryptolib.exceptions import (
     KeystoreDoesNotExist,
     DecryptionIntegrityError,
 )
-from wacryptolib.jsonrpc_client import JsonRpcProxy, status_slugs_response_error_handler
 from wacryptolib.keygen import (
     generate_symkey,
     load_asymmetric_key_from_pem_bytestring,
@@ -46,8 +58,9 @@ from wacryptolib.trustee import TrusteeApi, ReadonlyTrusteeApi
 from wacryptolib.utilities import (
     dump_to_json_bytes,
     load_from_json_bytes,
-    dump_to_json_file,
-    load_from_json_file,
+    load_from_json_str,
+    dump_to_binary_envelope,
+    load_from_binary_envelope,
     generate_uuid0,
     hash_message,
     synchronized,
@@ -57,17 +70,27 @@ from wacryptolib.utilities import (
     delete_filesystem_node_for_stream,
     SUPPORTED_HASH_ALGOS,
     get_validation_micro_schemas,
+    WACRYPTOLIB_BSON_OPTIONS,
 )
 
 logger = logging.getLogger(__name__)
 
 CRYPTAINER_FORMAT = "cryptainer_1.0"
+# Same structure, but symkeys, shards, key structs and key cipherdicts are serialized as binary envelopes (see
+# dump_to_binary_envelope()) instead of json, which older readers (and revelation gateways) can't decode
+CRYPTAINER_BINARY_ENVELOPES_FORMAT = "cryptainer_1.1"
+SUPPORTED_CRYPTAINER_FORMATS = (CRYPTAINER_FORMAT, CRYPTAINER_BINARY_ENVELOPES_FORMAT)
+CRYPTAINER_BINARY_FORMAT = "cryptainer_2.0"  # File format only, loaded cryptainers keep their CRYPTAINER_FORMAT
+# Prefix of binary cryptainer files, since a json file can't start with a NUL byte
+CRYPTAINER_BINARY_MAGIC = b"\x00" + CRYPTAINER_BINARY_FORMAT.encode("ascii") + b"\x00"
 CRYPTAINER_SUFFIX = ".crypt"
 CRYPTAINER_DATETIME_FORMAT = "%Y%m%d_%H%M%S"  # For use in cryptainer names and their records
 CRYPTAINER_DATETIME_LENGTH = (
     15  # Important to lookup prefix of filename before matching it with CRYPTAINER_DATETIME_FORMAT
 )
 CRYPTAINER_TEMP_SUFFIX = "~"  # To name temporary, unfinalized, cryptainers
+CRYPTAINER_CHECKPOINT_SUFFIX = ".checkpoint"  # Added to CRYPTAINER_SUFFIX, for resumable encryption streams
+CRYPTAINER_MIGRATION_SUFFIX = ".migration"  # Added to CRYPTAINER_SUFFIX, for cryptainers being migrated
 
 
 class PAYLOAD_CIPHERTEXT_LOCATIONS:
@@ -80,6 +103,25 @@ OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER = dict(ciphertext_location=PAYLOAD_CIPHERTEX
 
 OFFLOADED_PAYLOAD_FILENAME_SUFFIX = ".payload"  # Added to CRYPTAINER_SUFFIX
 
+# Single-file cryptainers start with this magic and their CRYPTAINER_SINGLE_FILE_OFFSETS, followed by their
+# serialized header (json or binary), and by their raw offloaded ciphertext (instead of a nearby file)
+CRYPTAINER_SINGLE_FILE_MAGIC = b"\x00cryptainer_single_file\x00"
+CRYPTAINER_SINGLE_FILE_OFFSETS = struct.Struct("<QQQQ")  # header_offset, header_length, payload_offset, payload_length
+CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH = len(CRYPTAINER_SINGLE_FILE_MAGIC) + CRYPTAINER_SINGLE_FILE_OFFSETS.size
+CRYPTAINER_SINGLE_FILE_HEADER_ROOM = 4096  # Spare bytes left after headers of streamed cryptainers, for signatures
+
+# Top-level fields returned by load_cryptainer_header_from_filesystem(), sorted like in json cryptainer files
+CRYPTAINER_HEADER_FIELDS = (
+    "cryptainer_format",
+    "cryptainer_metadata",
+    "cryptainer_state",
+    "cryptainer_uid",
+    "keychain_uid",
+)
+CRYPTAINER_HEADER_READ_SIZE = 4096  # Initial read size when loading cryptainer headers, doubled when needed
+
+INLINE_CIPHERTEXT_BASE64_CHUNK_SIZE = 3 * 256 * 1024  # Raw bytes per base64 chunk of json inline ciphertexts
+
 DEFAULT_DATA_CHUNK_SIZE = 1024 ** 2  # E.g. when streaming a big payload through encryptors
 
 DECRYPTED_FILE_SUFFIX = ".medium"  # To construct decrypted filename when no output filename is provided
@@ -88,6 +130,11 @@ SHARED_SECRET_ALGO_MARKER = "[SHARED_SECRET]"  # Special "key_cipher_algo" value
 
 DUMMY_KEYSTORE_POOL = InMemoryKeystorePool()  # Common fallback storage with in-memory keys
 
+DEFAULT_TRUSTEE_CALLS_MAX_WORKERS = 8  # Threads used to contact several (possibly remote) trustees concurrently
+
+DEFAULT_STORAGE_SCAN_MAX_WORKERS = 4  # Threads used to load cryptainer headers when scanning a whole storage
+STORAGE_SCAN_BATCH_SIZE = 256  # Count of cryptainer headers loaded at once by each scanning thread
+
 
 class CRYPTAINER_TRUSTEE_TYPES:
     LOCAL_KEYFACTORY_TRUSTEE = "local_keyfactory"
@@ -98,6 +145,19 @@ class CRYPTAINER_TRUSTEE_TYPES:
 # Shortcut helper, should NOT be modified
 LOCAL_KEYFACTORY_TRUSTEE_MARKER = dict(trustee_type=CRYPTAINER_TRUSTEE_TYPES.LOCAL_KEYFACTORY_TRUSTEE)
 
+# Opt-in cryptoconf for checkpoints of encryption streams, which contain the secret payload keys and pending plaintext:
+# such checkpoints can be resumed by the device alone, but BEWARE, they thus also let anyone controlling the local
+# keyfactory decrypt the beginning of the stream, without the agreement of trustees
+LOCAL_CHECKPOINT_CRYPTOCONF = dict(
+    payload_cipher_layers=[
+        dict(
+            payload_cipher_algo="AES_EAX",
+            key_cipher_layers=[dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)],
+            payload_signatures=[],
+        )
+    ]
+)
+
 
 class CRYPTAINER_STATES:
     STARTED = "STARTED"
@@ -121,45 +181,53 @@ def get_trustee_id(trustee_conf: dict) -> str:
     return trustee_id
 
 
-def gather_trustee_dependencies(cryptainers: Sequence) -> dict:
-    """Analyse a cryptainer and return the trustees (and their keypairs) used by it.
+class _TrusteeDependenciesGatherer:
+    """
+    THIS CLASS IS PRIVATE API
 
-    :return: dict with lists of keypair identifiers in fields "encryption" and "signature".
+    Accumulates the trustees (and their keypairs) used by cryptainers, in linear time.
     """
 
-    signature_dependencies = {}
-    cipher_dependencies = {}
+    def __init__(self):
+        self._signature_dependencies = {}
+        self._cipher_dependencies = {}
+        self._known_keypair_markers = set()  # Hashed, else deduplication gets quadratic
 
-    def _add_keypair_identifiers_for_trustee(mapper, trustee_conf, keychain_uid, key_algo):
+    def _add_keypair_identifiers_for_trustee(self, mapper, trustee_conf, keychain_uid, key_algo):
         trustee_id = get_trustee_id(trustee_conf=trustee_conf)
-        keypair_identifiers = dict(keychain_uid=keychain_uid, key_algo=key_algo)
-        mapper.setdefault(trustee_id, (trustee_conf, []))
-        keypair_identifiers_list = mapper[trustee_id][1]
-        if keypair_identifiers not in keypair_identifiers_list:
-            keypair_identifiers_list.append(keypair_identifiers)
+        keypair_marker = (mapper is self._signature_dependencies, trustee_id, keychain_uid, key_algo)
+        if keypair_marker in self._known_keypair_markers:
+            return
+        self._known_keypair_markers.add(keypair_marker)
+        _trustee_conf, keypair_identifiers_list = mapper.setdefault(trustee_id, (trustee_conf, []))
+        keypair_identifiers_list.append(dict(keychain_uid=keychain_uid, key_algo=key_algo))
 
-    def _grab_key_cipher_layers_dependencies(key_cipher_layers):
+    def _grab_key_cipher_layers_dependencies(self, key_cipher_layers, keychain_uid):
         for key_cipher_layer in key_cipher_layers:
             key_cipher_algo = key_cipher_layer["key_cipher_algo"]
 
             if key_cipher_algo == SHARED_SECRET_ALGO_MARKER:
                 shard_confs = key_cipher_layer["key_shared_secret_shards"]
                 for shard_conf in shard_confs:
-                    _grab_key_cipher_layers_dependencies(shard_conf["key_cipher_layers"])  # Recursive call
+                    self._grab_key_cipher_layers_dependencies(
+                        shard_conf["key_cipher_layers"], keychain_uid=keychain_uid
+                    )  # Recursive call
             elif key_cipher_algo in SUPPORTED_SYMMETRIC_KEY_ALGOS:
-                _grab_key_cipher_layers_dependencies(key_cipher_layer["key_cipher_layers"])  # Recursive call
+                self._grab_key_cipher_layers_dependencies(
+                    key_cipher_layer["key_cipher_layers"], keychain_uid=keychain_uid
+                )  # Recursive call
             else:
                 assert key_cipher_algo in SUPPORTED_ASYMMETRIC_KEY_ALGOS, key_cipher_algo
                 keychain_uid_for_encryption = key_cipher_layer.get("keychain_uid") or keychain_uid
                 trustee_conf = key_cipher_layer["key_cipher_trustee"]
-                _add_keypair_identifiers_for_trustee(
-                    mapper=cipher_dependencies,
+                self._add_keypair_identifiers_for_trustee(
+                    mapper=self._cipher_dependencies,
                     trustee_conf=trustee_conf,
                     keychain_uid=keychain_uid_for_encryption,
                     key_algo=key_cipher_algo,
                 )
 
-    for cryptainer in cryptainers:
+    def add_cryptainer(self, cryptainer: dict):
         keychain_uid = cryptainer["keychain_uid"]
         for payload_cipher_layer in cryptainer["payload_cipher_layers"]:
             for signature_conf in payload_cipher_layer["payload_signatures"]:
@@ -167,27 +235,31 @@ def gather_trustee_dependencies(cryptainers: Sequence) -> dict:
                 keychain_uid_for_signature = signature_conf.get("keychain_uid") or keychain_uid
                 trustee_conf = signature_conf["payload_signature_trustee"]
 
-                _add_keypair_identifiers_for_trustee(
-                    mapper=signature_dependencies,
+                self._add_keypair_identifiers_for_trustee(
+                    mapper=self._signature_dependencies,
                     trustee_conf=trustee_conf,
                     keychain_uid=keychain_uid_for_signature,
                     key_algo=key_algo_signature,
                 )
 
-            _grab_key_cipher_layers_dependencies(payload_cipher_layer["key_cipher_layers"])
+            self._grab_key_cipher_layers_dependencies(payload_cipher_layer["key_cipher_layers"], keychain_uid)
 
-    trustee_dependencies = {"signature": signature_dependencies, "encryption": cipher_dependencies}
-    return trustee_dependencies
+    def get_trustee_dependencies(self) -> dict:
+        return {"signature": self._signature_dependencies, "encryption": self._cipher_dependencies}
 
 
-def gather_decryptable_symkeys(cryptainers_with_names: Sequence) -> dict:  # TODO Update this name
-    """Analyse a cryptainer and returns the symkeys/shards (and their corresponding trustee) needed for decryption.
+class _DecryptableSymkeysGatherer:
+    """
+    THIS CLASS IS PRIVATE API
 
-    :return: dict with a tuple of the cipher key and the symkey/shard by trustee id.
+    Accumulates the symkeys/shards (and their corresponding trustee) needed to decrypt cryptainers, in linear time.
     """
-    decryptable_symkeys_per_trustee = {}
+
+    def __init__(self):
+        self._decryptable_symkeys_per_trustee = {}
 
     def _add_decryptable_symkeys_for_trustee(
+        self,
         cryptainer_name,
         cryptainer_uid,
         cryptainer_metadata,
@@ -207,13 +279,19 @@ def gather_decryptable_symkeys(cryptainers_with_names: Sequence) -> dict:  # TOD
             "keychain_uid": keychain_uid_for_encryption,
             "key_algo": key_algo_for_encryption,
         }
-        _trustee_data, _decryptable_symkeys = decryptable_symkeys_per_trustee.setdefault(
+        _trustee_data, _decryptable_symkeys = self._decryptable_symkeys_per_trustee.setdefault(
             trustee_id, (key_cipher_trustee, [])
         )
         _decryptable_symkeys.append(symkey_decryption_request)
 
     def _gather_decryptable_symkeys(
-        cryptainer_name, cryptainer_uid, cryptainer_metadata, key_cipher_layers: list, key_ciphertext
+        self,
+        cryptainer_name,
+        cryptainer_uid,
+        cryptainer_metadata,
+        default_keychain_uid,
+        key_cipher_layers: list,
+        key_ciphertext,
     ):
         assert isinstance(key_ciphertext, bytes), key_ciphertext
 
@@ -223,24 +301,26 @@ def gather_decryptable_symkeys(cryptainers_with_names: Sequence) -> dict:  # TOD
 
         if last_key_cipher_algo == SHARED_SECRET_ALGO_MARKER:
             key_shared_secret_shards = last_key_cipher_layer["key_shared_secret_shards"]
-            key_cipherdict = load_from_json_bytes(key_ciphertext)
+            key_cipherdict = load_from_binary_envelope(key_ciphertext)  # Only parsed once per shared-secret layer
             shard_ciphertexts = key_cipherdict["shard_ciphertexts"]
 
             for shard_ciphertext, shard_conf in zip(shard_ciphertexts, key_shared_secret_shards):
-                _gather_decryptable_symkeys(
+                self._gather_decryptable_symkeys(
                     cryptainer_name,
                     cryptainer_uid,
                     cryptainer_metadata,
+                    default_keychain_uid,
                     shard_conf["key_cipher_layers"],
                     shard_ciphertext,
                 )
 
         elif last_key_cipher_algo in SUPPORTED_SYMMETRIC_KEY_ALGOS:
             subkey_ciphertext = last_key_cipher_layer["key_ciphertext"]
-            _gather_decryptable_symkeys(
+            self._gather_decryptable_symkeys(
                 cryptainer_name,
                 cryptainer_uid,
                 cryptainer_metadata,
+                default_keychain_uid,
                 last_key_cipher_layer["key_cipher_layers"],
                 subkey_ciphertext,
             )
@@ -252,7 +332,7 @@ def gather_decryptable_symkeys(cryptainers_with_names: Sequence) -> dict:  # TOD
             key_algo_for_encryption = last_key_cipher_layer["key_cipher_algo"]
             key_cipher_trustee = last_key_cipher_layer["key_cipher_trustee"]
 
-            _add_decryptable_symkeys_for_trustee(
+            self._add_decryptable_symkeys_for_trustee(
                 cryptainer_name=cryptainer_name,
                 cryptainer_uid=cryptainer_uid,
                 cryptainer_metadata=cryptainer_metadata,
@@ -262,7 +342,7 @@ def gather_decryptable_symkeys(cryptainers_with_names: Sequence) -> dict:  # TOD
                 key_algo_for_encryption=key_algo_for_encryption,
             )
 
-    for (cryptainer_name, cryptainer) in cryptainers_with_names:
+    def add_cryptainer(self, cryptainer_name, cryptainer: dict):
         default_keychain_uid = cryptainer["keychain_uid"]
         cryptainer_uid = cryptainer["cryptainer_uid"]
         cryptainer_metadata = cryptainer["cryptainer_metadata"]
@@ -270,15 +350,45 @@ def gather_decryptable_symkeys(cryptainers_with_names: Sequence) -> dict:  # TOD
         for payload_cipher_layer in cryptainer["payload_cipher_layers"]:
             key_ciphertext = payload_cipher_layer.get("key_ciphertext")
 
-            _gather_decryptable_symkeys(
+            self._gather_decryptable_symkeys(
                 cryptainer_name=cryptainer_name,
                 cryptainer_uid=cryptainer_uid,
                 cryptainer_metadata=cryptainer_metadata,
+                default_keychain_uid=default_keychain_uid,
                 key_cipher_layers=payload_cipher_layer["key_cipher_layers"],
                 key_ciphertext=key_ciphertext,
             )
 
-    return decryptable_symkeys_per_trustee
+    def get_decryptable_symkeys_per_trustee(self) -> dict:
+        return self._decryptable_symkeys_per_trustee
+
+
+def gather_trustee_dependencies(cryptainers: Iterable) -> dict:
+    """Analyse cryptainers and return the trustees (and their keypairs) used by them.
+
+    Cryptainers can be provided by any iterable (e.g. a generator), and may be header-only (i.e. loaded
+    without their payload ciphertext).
+
+    :return: dict with lists of keypair identifiers in fields "encryption" and "signature".
+    """
+    trustee_dependencies_gatherer = _TrusteeDependenciesGatherer()
+    for cryptainer in cryptainers:
+        trustee_dependencies_gatherer.add_cryptainer(cryptainer)
+    return trustee_dependencies_gatherer.get_trustee_dependencies()
+
+
+def gather_decryptable_symkeys(cryptainers_with_names: Iterable) -> dict:  # TODO Update this name
+    """Analyse cryptainers and return the symkeys/shards (and their corresponding trustee) needed for decryption.
+
+    Tuples (cryptainer_name, cryptainer) can be provided by any iterable (e.g. a generator), and cryptainers
+    may be header-only (i.e. loaded without their payload ciphertext).
+
+    :return: dict with a tuple of the cipher key and the symkey/shard by trustee id.
+    """
+    decryptable_symkeys_gatherer = _DecryptableSymkeysGatherer()
+    for cryptainer_name, cryptainer in cryptainers_with_names:
+        decryptable_symkeys_gatherer.add_cryptainer(cryptainer_name, cryptainer)
+    return decryptable_symkeys_gatherer.get_decryptable_symkeys_per_trustee()
 
 
 def request_decryption_authorizations(
@@ -302,26 +412,176 @@ def request_decryption_authorizations(
     return request_authorization_result
 
 
-def get_trustee_proxy(trustee: dict, keystore_pool: KeystorePoolBase):
+def get_trustee_proxy(trustee: dict, keystore_pool: KeystorePoolBase, private_key_cache: Optional[dict] = None):
     """
     Return an TrusteeApi subclass instance (or proxy) depending on the content of `trustee` dict.
+
+    `private_key_cache` is only used by local trustees (see TrusteeApi).
     """
     assert isinstance(trustee, dict), trustee
 
     trustee_type = trustee.get("trustee_type")  # Might be None
 
     if trustee_type == CRYPTAINER_TRUSTEE_TYPES.LOCAL_KEYFACTORY_TRUSTEE:
-        return TrusteeApi(keystore_pool.get_local_keyfactory())
+        return TrusteeApi(keystore_pool.get_local_keyfactory(), private_key_cache=private_key_cache)
     elif trustee_type == CRYPTAINER_TRUSTEE_TYPES.AUTHENTICATOR_TRUSTEE:
         keystore_uid = trustee["keystore_uid"]  # ID of authenticator is identical to that of its keystore
         readonly_keystore = keystore_pool.get_foreign_keystore(keystore_uid)
         assert not isinstance(readonly_keystore, FilesystemKeystore), readonly_keystore  # NOT writable for safety
-        return ReadonlyTrusteeApi(readonly_keystore)
+        return ReadonlyTrusteeApi(readonly_keystore, private_key_cache=private_key_cache)
     elif trustee_type == CRYPTAINER_TRUSTEE_TYPES.JSONRPC_API_TRUSTEE:
+        from wacryptolib.jsonrpc_client import JsonRpcProxy, status_slugs_response_error_handler  # Heavy, lazy import
+
         return JsonRpcProxy(url=trustee["jsonrpc_url"], response_error_handler=status_slugs_response_error_handler)
     raise ValueError("Unrecognized trustee identifiers: %s" % str(trustee))
 
 
+class AsyncTrusteeProxy:
+    """
+    Asyncio flavour of the trustee API, implemented by wrapping a blocking trustee proxy.
+
+    Blocking calls are offloaded to `executor` (or to the default executor of the event loop).
+    Natively asynchronous trustee clients just have to expose the same coroutine methods.
+    """
+
+    def __init__(self, trustee_proxy, executor: Optional[Executor] = None):
+        self._trustee_proxy = trustee_proxy
+        self._executor = executor
+
+    async def _call_in_executor(self, method_name: str, **kwargs):
+        import asyncio  # Lazy import, already loaded anyway by the running event loop
+
+        loop = asyncio.get_running_loop()
+        method = getattr(self._trustee_proxy, method_name)
+        return await loop.run_in_executor(self._executor, functools.partial(method, **kwargs))
+
+    async def fetch_public_key(self, **kwargs) -> bytes:
+        return await self._call_in_executor("fetch_public_key", **kwargs)
+
+    async def get_message_signature(self, **kwargs) -> dict:
+        return await self._call_in_executor("get_message_signature", **kwargs)
+
+    async def request_decryption_authorization(self, **kwargs) -> dict:
+        return await self._call_in_executor("request_decryption_authorization", **kwargs)
+
+    async def decrypt_with_private_key(self, **kwargs) -> bytes:
+        return await self._call_in_executor("decrypt_with_private_key", **kwargs)
+
+
+def get_async_trustee_proxy(
+    trustee: dict, keystore_pool: KeystorePoolBase, executor: Optional[Executor] = None
+) -> AsyncTrusteeProxy:
+    """
+    Return an AsyncTrusteeProxy instance, wrapping the proxy that `get_trustee_proxy()` would return.
+    """
+    trustee_proxy = get_trustee_proxy(trustee=trustee, keystore_pool=keystore_pool)
+    return AsyncTrusteeProxy(trustee_proxy, executor=executor)
+
+
+def _copy_data_tree(data_tree):
+    """Copy the dicts and lists of a tree whose leaves are immutable (str, bytes, int, UUID...).
+
+    Much faster than copy.deepcopy() for cryptoconf templates.
+    """
+    if isinstance(data_tree, dict):
+        return {key: _copy_data_tree(value) for key, value in data_tree.items()}
+    if isinstance(data_tree, list):
+        return [_copy_data_tree(value) for value in data_tree]
+    return data_tree
+
+
+_CRYPTAINER_RUNTIME_FIELDS = ("key_ciphertext", "payload_macs", "payload_digest_value", "payload_signature_struct")
+
+
+def _get_cryptoconf_skeleton(data_tree):
+    """Return a copy of a cryptainer (sub)tree stripped of the fields generated at encryption time,
+    so that it can be compared with the cryptoconf it was built from."""
+    if isinstance(data_tree, dict):
+        return {
+            key: _get_cryptoconf_skeleton(value)
+            for key, value in data_tree.items()
+            if key not in _CRYPTAINER_RUNTIME_FIELDS
+        }
+    if isinstance(data_tree, list):
+        return [_get_cryptoconf_skeleton(value) for value in data_tree]
+    return data_tree
+
+
+def _iterate_asymmetric_key_cipher_layers(key_cipher_layers: list):
+    """Yield every asymmetric key cipher layer (i.e. involving a trustee) found in a recursive structure."""
+    for key_cipher_layer in key_cipher_layers:
+        key_cipher_algo = key_cipher_layer["key_cipher_algo"]
+        if key_cipher_algo == SHARED_SECRET_ALGO_MARKER:
+            for shard_conf in key_cipher_layer["key_shared_secret_shards"]:
+                yield from _iterate_asymmetric_key_cipher_layers(shard_conf["key_cipher_layers"])  # Recursive call
+        elif key_cipher_algo in SUPPORTED_SYMMETRIC_KEY_ALGOS:
+            yield from _iterate_asymmetric_key_cipher_layers(key_cipher_layer["key_cipher_layers"])  # Recursive call
+        else:
+            yield key_cipher_layer
+
+
+def _iterate_cryptoconf_trustees(cryptoconf: dict):
+    """Yield every trustee conf (possibly several times) referenced by a cryptoconf or cryptainer."""
+    for payload_cipher_layer in cryptoconf["payload_cipher_layers"]:
+        for key_cipher_layer in _iterate_asymmetric_key_cipher_layers(payload_cipher_layer["key_cipher_layers"]):
+            yield key_cipher_layer["key_cipher_trustee"]
+        for signature_conf in payload_cipher_layer["payload_signatures"]:
+            yield signature_conf["payload_signature_trustee"]
+
+
+class CryptoconfPlan:
+    """
+    Precompiled form of a cryptoconf, meant to be reused for the encryption of lots of cryptainers.
+
+    Instances must be built with `compile_cryptoconf()`, and must not be modified afterwards.
+    """
+
+    def __init__(self, cryptoconf: dict, keystore_pool: Optional[KeystorePoolBase] = None):
+        assert isinstance(cryptoconf, dict), cryptoconf
+        self.cryptoconf = cryptoconf  # Must NOT be modified, we only make copies of it
+        self.keystore_pool = keystore_pool or DUMMY_KEYSTORE_POOL
+
+        payload_cipher_layers = cryptoconf["payload_cipher_layers"]
+        self.payload_digest_algos_per_layer = [
+            [signature["payload_digest_algo"] for signature in payload_cipher_layer["payload_signatures"]]
+            for payload_cipher_layer in payload_cipher_layers
+        ]
+        self.is_streamable = all(
+            payload_cipher_layer["payload_cipher_algo"] in STREAMABLE_CIPHER_ALGOS
+            for payload_cipher_layer in payload_cipher_layers
+        )
+        self.trustee_proxies = {}  # Maps trustee IDs to their proxies
+
+    def resolve_trustee_proxies(self):
+        """Instantiate once and for all the proxies of all trustees involved in the cryptoconf."""
+        for trustee_conf in _iterate_cryptoconf_trustees(self.cryptoconf):
+            trustee_id = get_trustee_id(trustee_conf)
+            if trustee_id not in self.trustee_proxies:
+                self.trustee_proxies[trustee_id] = get_trustee_proxy(trustee_conf, keystore_pool=self.keystore_pool)
+
+    def build_cryptainer_template(self) -> dict:
+        """Return a new, modifiable, copy of the cryptoconf tree, to be completed into a cryptainer."""
+        return _copy_data_tree(self.cryptoconf)
+
+
+def compile_cryptoconf(cryptoconf: dict, keystore_pool: Optional[KeystorePoolBase] = None) -> CryptoconfPlan:
+    """Validate a cryptoconf and precompute all that can be reused between cryptainers using it.
+
+    The resulting plan can be provided instead of a cryptoconf to encryption utilities and to
+    `CryptainerStorage`, which then skip per-cryptainer validation, copying and trustee resolution.
+
+    :param cryptoconf: configuration tree
+    :param keystore_pool: optional key storage pool, used to resolve the trustees of the cryptoconf
+    :return: CryptoconfPlan instance
+    """
+    check_cryptoconf_sanity(cryptoconf)
+    if not cryptoconf["payload_cipher_layers"]:
+        raise SchemaValidationError("Empty payload_cipher_layers list is forbidden in cryptoconf")
+    cryptoconf_plan = CryptoconfPlan(copy.deepcopy(cryptoconf), keystore_pool=keystore_pool)
+    cryptoconf_plan.resolve_trustee_proxies()
+    return cryptoconf_plan
+
+
 class CryptainerBase:
     """
     THIS CLASS IS PRIVATE API
@@ -330,9 +590,18 @@ class CryptainerBase:
 
     `passphrase_mapper` maps trustees IDs to potential passphrases; a None key can be used to provide additional
     passphrases for all trustees.
+
+    Independent trustee operations are run concurrently on a thread pool of `trustee_calls_max_workers` threads,
+    created on the first concurrent call; use `close()` (or the instance as a context manager) to release it.
     """
 
-    def __init__(self, keystore_pool: KeystorePoolBase = None, passphrase_mapper: Optional[dict] = None):
+    def __init__(
+        self,
+        keystore_pool: KeystorePoolBase = None,
+        passphrase_mapper: Optional[dict] = None,
+        trustee_calls_max_workers: int = DEFAULT_TRUSTEE_CALLS_MAX_WORKERS,
+    ):
+        assert trustee_calls_max_workers >= 1, trustee_calls_max_workers
         if not keystore_pool:
             logger.warning(
                 "No key storage pool provided for %s instance, falling back to common InMemoryKeystorePool()",
@@ -342,6 +611,81 @@ class CryptainerBase:
         assert isinstance(keystore_pool, KeystorePoolBase), keystore_pool
         self._keystore_pool = keystore_pool
         self._passphrase_mapper = passphrase_mapper or {}
+        self._trustee_calls_max_workers = trustee_calls_max_workers
+        self._thread_pool_executor = None  # Lazily created, most operations don't need it
+        self._thread_pool_lock = threading.Lock()
+        self._thread_local = threading.local()  # Marks our own worker threads
+
+    def _get_thread_pool_executor(self) -> ThreadPoolExecutor:
+        with self._thread_pool_lock:
+            if self._thread_pool_executor is None:
+                self._thread_pool_executor = ThreadPoolExecutor(
+                    max_workers=self._trustee_calls_max_workers, thread_name_prefix="trustee_call_worker"
+                )
+            return self._thread_pool_executor
+
+    def close(self):
+        """Release the thread pool of this instance, if any (calls still running are left to finish in background).
+
+        The instance remains usable, a new thread pool gets created if needed.
+        """
+        with self._thread_pool_lock:
+            thread_pool_executor, self._thread_pool_executor = self._thread_pool_executor, None
+        if thread_pool_executor is not None:
+            thread_pool_executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run_worker_task(self, func, *args):
+        self._thread_local.is_worker_thread = True
+        return func(*args)
+
+    def _must_run_sequentially(self, argument_tuples: list) -> bool:
+        """Calls issued from one of our worker threads (i.e. nested shards) are run sequentially,
+        so that a saturated thread pool can't deadlock on itself."""
+        return len(argument_tuples) < 2 or getattr(self._thread_local, "is_worker_thread", False)
+
+    def _map_concurrently(self, func, *iterables) -> list:
+        """Apply `func` to items of `iterables` on the thread pool, and return results IN ORDER."""
+        argument_tuples = list(zip(*iterables))
+        if self._must_run_sequentially(argument_tuples):
+            return [func(*arguments) for arguments in argument_tuples]
+        thread_pool_executor = self._get_thread_pool_executor()
+        futures = [
+            thread_pool_executor.submit(self._run_worker_task, func, *arguments) for arguments in argument_tuples
+        ]
+        return [future.result() for future in futures]  # Exceptions are propagated here
+
+    def _iterate_concurrently(self, func, *iterables):
+        """Apply `func` to items of `iterables` on the thread pool, and yield (index, result) tuples as soon as
+        results are available (results which become available simultaneously are yielded in index order).
+
+        Closing the generator early cancels calls which haven't started yet; running calls are left to finish
+        in background, and their results are discarded.
+        """
+        argument_tuples = list(zip(*iterables))
+        if self._must_run_sequentially(argument_tuples):
+            for index, arguments in enumerate(argument_tuples):
+                yield index, func(*arguments)
+            return
+        thread_pool_executor = self._get_thread_pool_executor()
+        future_indices = {
+            thread_pool_executor.submit(self._run_worker_task, func, *arguments): index
+            for (index, arguments) in enumerate(argument_tuples)
+        }
+        pending_futures = set(future_indices)
+        try:
+            while pending_futures:
+                done_futures, pending_futures = wait_futures(pending_futures, return_when=FIRST_COMPLETED)
+                for future in sorted(done_futures, key=future_indices.get):
+                    yield future_indices[future], future.result()  # Exceptions are propagated here
+        finally:
+            for future in pending_futures:
+                future.cancel()
 
 
 class CryptainerEncryptor(CryptainerBase):
@@ -349,10 +693,51 @@ class CryptainerEncryptor(CryptainerBase):
     THIS CLASS IS PRIVATE API
 
     Contains every method used to write and encrypt a cryptainer, IN MEMORY.
+
+    Independent trustee operations (encryption of shared-secret shards, payload signatures) are run
+    concurrently, with deterministic output.
+
+    Nested key data are serialized as json, unless `binary_key_envelopes` is set, in which case they are
+    more compact binary envelopes, and cryptainers get the CRYPTAINER_BINARY_ENVELOPES_FORMAT.
     """
 
+    def __init__(
+        self,
+        keystore_pool: KeystorePoolBase = None,
+        passphrase_mapper: Optional[dict] = None,
+        trustee_calls_max_workers: int = DEFAULT_TRUSTEE_CALLS_MAX_WORKERS,
+        binary_key_envelopes: bool = False,
+    ):
+        super().__init__(
+            keystore_pool=keystore_pool,
+            passphrase_mapper=passphrase_mapper,
+            trustee_calls_max_workers=trustee_calls_max_workers,
+        )
+        self._trustee_proxies = {}  # Cache mapping trustee IDs to proxies
+        self._binary_key_envelopes = binary_key_envelopes
+
+    def _dump_key_data(self, data) -> bytes:
+        """Serialize a symkey, shard, key struct or key cipherdict, according to the format of new cryptainers."""
+        if self._binary_key_envelopes:
+            return dump_to_binary_envelope(data)
+        return dump_to_json_bytes(data)
+
+    def _get_trustee_proxy(self, trustee: dict):
+        trustee_id = get_trustee_id(trustee)
+        trustee_proxy = self._trustee_proxies.get(trustee_id)
+        if trustee_proxy is None:
+            trustee_proxy = get_trustee_proxy(trustee=trustee, keystore_pool=self._keystore_pool)
+            self._trustee_proxies[trustee_id] = trustee_proxy  # Concurrent overwrites are harmless
+        return trustee_proxy
+
     def build_cryptainer_and_encryption_pipeline(
-        self, *, cryptoconf: dict, output_stream: BinaryIO, keychain_uid=None, cryptainer_metadata=None
+        self,
+        *,
+        cryptoconf: Union[dict, CryptoconfPlan],
+        output_stream: BinaryIO,
+        keychain_uid=None,
+        cryptainer_metadata=None,
+        cryptainer_base_and_secrets: Optional[tuple] = None,
     ) -> tuple:
         """
         Build a base cryptainer to store encrypted keys, as well as a stream encryptor
@@ -361,17 +746,21 @@ class CryptainerEncryptor(CryptainerBase):
         Signatures, and final ciphertext (if not offloaded), will have to be added
         later to the cryptainer.
 
-        :param cryptoconf: configuration tree
+        :param cryptoconf: configuration tree, or its compiled plan
         :param output_stream: open file where the stream encryptor should write to
         :param keychain_uid: default uuid for the set of encryption keys used
         :param cryptainer_metadata: additional informations to store unencrypted in cryptainer
+        :param cryptainer_base_and_secrets: optional result of a previous `_generate_cryptainer_base_and_secrets()`
+            call with the same parameters, to be used instead of generating new keys
 
         :return: cryptainer with all the information needed to attempt payload decryption
         """
 
-        cryptainer, payload_cipher_layer_extracts = self._generate_cryptainer_base_and_secrets(
-            cryptoconf=cryptoconf, default_keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
-        )
+        if cryptainer_base_and_secrets is None:
+            cryptainer_base_and_secrets = self._generate_cryptainer_base_and_secrets(
+                cryptoconf=cryptoconf, default_keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
+            )
+        cryptainer, payload_cipher_layer_extracts = cryptainer_base_and_secrets
 
         encryption_pipeline = PayloadEncryptionPipeline(
             output_stream=output_stream, payload_cipher_layer_extracts=payload_cipher_layer_extracts
@@ -380,39 +769,114 @@ class CryptainerEncryptor(CryptainerBase):
         return cryptainer, encryption_pipeline
 
     def encrypt_data(
-        self, payload: Union[bytes, BinaryIO], *, cryptoconf: dict, keychain_uid=None, cryptainer_metadata=None
+        self,
+        payload: Union[bytes, BinaryIO],
+        *,
+        cryptoconf: Union[dict, CryptoconfPlan],
+        keychain_uid=None,
+        cryptainer_metadata=None,
+        payload_ciphertext_sink: Optional[BinaryIO] = None,
+        cryptainer_base_and_secrets: Optional[tuple] = None,
     ) -> dict:
         """
         Shortcut when data is already available.
 
         This method browses through configuration tree to apply the right succession of encryption+signature algorithms to data.
 
+        File-like payloads are streamed chunk by chunk through encryption nodes (when the cryptoconf allows it),
+        so that the plaintext is never fully loaded in memory.
+
         :param payload: initial plaintext, or file pointer (file immediately deleted then)
-        :param cryptoconf: configuration tree
+        :param cryptoconf: configuration tree, or its compiled plan
         :param keychain_uid: default uuid for the set of encryption keys used
         :param cryptainer_metadata: additional data to store unencrypted in cryptainer
+        :param payload_ciphertext_sink: if provided, binary stream which receives the payload ciphertext,
+            in which case the cryptainer is marked as having an offloaded ciphertext
+        :param cryptainer_base_and_secrets: optional result of a previous `_generate_cryptainer_base_and_secrets()`
+            call with the same parameters, to be used instead of generating new keys
 
         :return: cryptainer with all the information needed to attempt data decryption
         """
 
-        payload = self._load_payload_bytes_and_cleanup(payload)  # Ensure we get the whole payload buffer
-
-        cryptainer, payload_cipher_layer_extracts = self._generate_cryptainer_base_and_secrets(
-            cryptoconf=cryptoconf, default_keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
-        )
-
-        payload_ciphertext, payload_integrity_tags = self._encrypt_and_hash_payload(
-            payload, payload_cipher_layer_extracts
-        )
-
-        cryptainer["payload_ciphertext_struct"] = dict(
-            ciphertext_location=PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE, ciphertext_value=payload_ciphertext
+        cryptainer, payload_integrity_tags = self._encrypt_data_into_unsigned_cryptainer(
+            payload,
+            cryptoconf=cryptoconf,
+            keychain_uid=keychain_uid,
+            cryptainer_metadata=cryptainer_metadata,
+            payload_ciphertext_sink=payload_ciphertext_sink,
+            cryptainer_base_and_secrets=cryptainer_base_and_secrets,
         )
 
         self.add_authentication_data_to_cryptainer(cryptainer, payload_integrity_tags)
 
         return cryptainer
 
+    def _encrypt_data_into_unsigned_cryptainer(
+        self,
+        payload: Union[bytes, BinaryIO],
+        *,
+        cryptoconf: Union[dict, CryptoconfPlan],
+        keychain_uid=None,
+        cryptainer_metadata=None,
+        payload_ciphertext_sink: Optional[BinaryIO] = None,
+        cryptainer_base_and_secrets: Optional[tuple] = None,
+    ) -> tuple:
+        """Return a (cryptainer, payload_integrity_tags) tuple, with authentication data still missing."""
+
+        may_stream = hasattr(payload, "read") or payload_ciphertext_sink is not None
+        use_streaming = may_stream and is_cryptainer_cryptoconf_streamable(cryptoconf)
+
+        if use_streaming:
+            output_stream = payload_ciphertext_sink
+            if output_stream is None:
+                # Temporary file ensures that we don't keep more than one copy of the (potentially huge) ciphertext in RAM
+                output_stream = tempfile.TemporaryFile()
+
+            cryptainer, encryption_pipeline = self.build_cryptainer_and_encryption_pipeline(
+                cryptoconf=cryptoconf,
+                output_stream=output_stream,
+                keychain_uid=keychain_uid,
+                cryptainer_metadata=cryptainer_metadata,
+                cryptainer_base_and_secrets=cryptainer_base_and_secrets,
+            )
+            for chunk in consume_bytes_as_chunks(payload, chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+                encryption_pipeline.encrypt_chunk(chunk)
+            encryption_pipeline.finalize()
+            payload_integrity_tags = encryption_pipeline.get_payload_integrity_tags()
+
+            if payload_ciphertext_sink is not None:
+                payload_ciphertext = None
+            else:
+                with output_stream:
+                    output_stream.seek(0)
+                    payload_ciphertext = output_stream.read()
+
+        else:
+            payload = self._load_payload_bytes_and_cleanup(payload)  # Ensure we get the whole payload buffer
+
+            if cryptainer_base_and_secrets is None:
+                cryptainer_base_and_secrets = self._generate_cryptainer_base_and_secrets(
+                    cryptoconf=cryptoconf, default_keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
+                )
+            cryptainer, payload_cipher_layer_extracts = cryptainer_base_and_secrets
+
+            payload_ciphertext, payload_integrity_tags = self._encrypt_and_hash_payload(
+                payload, payload_cipher_layer_extracts
+            )
+
+            if payload_ciphertext_sink is not None:
+                payload_ciphertext_sink.write(payload_ciphertext)
+                payload_ciphertext = None
+
+        if payload_ciphertext is None:
+            cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+        else:
+            cryptainer["payload_ciphertext_struct"] = dict(
+                ciphertext_location=PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE, ciphertext_value=payload_ciphertext
+            )
+
+        return cryptainer, payload_integrity_tags
+
     @staticmethod
     def _load_payload_bytes_and_cleanup(payload: Union[bytes, BinaryIO]):
         """Automatically deletes filesystem entry if it exists!"""
@@ -464,40 +928,54 @@ class CryptainerEncryptor(CryptainerBase):
         return payload_current, payload_integrity_tags
 
     def _generate_cryptainer_base_and_secrets(
-        self, cryptoconf: dict, default_keychain_uid=None, cryptainer_metadata=None
+        self,
+        cryptoconf: Union[dict, CryptoconfPlan],
+        default_keychain_uid=None,
+        cryptainer_metadata=None,
+        cryptainer_uid=None,
     ) -> tuple:
         """
         Build a payload-less and signature-less cryptainer, preconfigured with a set of symmetric keys
         under their final form (encrypted by trustees). A separate extract, with symmetric keys as well as algo names, is returned so that actual payload encryption and signature can be performed separately.
 
-        :param cryptoconf: configuration tree
+        :param cryptoconf: configuration tree, or its compiled plan
         :param default_keychain_uid: default uuid for the set of encryption keys used
         :param cryptainer_metadata: additional payload to store unencrypted in cryptainer, and also inside encrypted keys/shards
+        :param cryptainer_uid: uuid of the cryptainer, only to be provided when re-encrypting an existing cryptainer
 
         :return: a (cryptainer: dict, secrets: list) tuple, where each secret has keys cipher_algo, symmetric_key and payload_digest_algos.
         """
 
         assert cryptainer_metadata is None or isinstance(cryptainer_metadata, dict), cryptainer_metadata
-        cryptainer_format = CRYPTAINER_FORMAT
-        cryptainer_uid = generate_uuid0()  # ALWAYS UNIQUE!
+        cryptainer_format = CRYPTAINER_BINARY_ENVELOPES_FORMAT if self._binary_key_envelopes else CRYPTAINER_FORMAT
+        cryptainer_uid = cryptainer_uid or generate_uuid0()  # ALWAYS UNIQUE, except for migrated cryptainers!
         default_keychain_uid = default_keychain_uid or generate_uuid0()  # Might be shared by lots of cryptainers
 
-        assert isinstance(cryptoconf, dict), cryptoconf
-        cryptainer = copy.deepcopy(cryptoconf)  # So that we can manipulate it as new cryptainer
+        if isinstance(cryptoconf, CryptoconfPlan):
+            cryptoconf_plan = cryptoconf  # Already validated
+            if cryptoconf_plan.keystore_pool is self._keystore_pool:  # Else proxies target the wrong keystores
+                self._trustee_proxies.update(cryptoconf_plan.trustee_proxies)
+        else:
+            assert isinstance(cryptoconf, dict), cryptoconf
+            if not cryptoconf["payload_cipher_layers"]:
+                raise SchemaValidationError("Empty payload_cipher_layers list is forbidden in cryptoconf")
+            cryptoconf_plan = CryptoconfPlan(cryptoconf, keystore_pool=self._keystore_pool)
         del cryptoconf
-        if not cryptainer["payload_cipher_layers"]:
-            raise SchemaValidationError("Empty payload_cipher_layers list is forbidden in cryptoconf")
+
+        cryptainer = cryptoconf_plan.build_cryptainer_template()  # So that we can manipulate it as new cryptainer
 
         payload_cipher_layer_extracts = []  # Sensitive info with secret keys!
 
-        for payload_cipher_layer in cryptainer["payload_cipher_layers"]:
+        for payload_cipher_layer, payload_digest_algos in zip(
+            cryptainer["payload_cipher_layers"], cryptoconf_plan.payload_digest_algos_per_layer
+        ):
             payload_cipher_algo = payload_cipher_layer["payload_cipher_algo"]
 
             payload_cipher_layer["payload_macs"] = None  # Will be filled later with MAC tags etc.
 
             logger.debug("Generating symmetric key of type %r for payload encryption", payload_cipher_algo)
             symkey = generate_symkey(cipher_algo=payload_cipher_algo)
-            key_bytes = dump_to_json_bytes(symkey)
+            key_bytes = self._dump_key_data(symkey)
             key_cipher_layers = payload_cipher_layer["key_cipher_layers"]
 
             key_ciphertext = self._encrypt_key_through_multiple_layers(
@@ -512,9 +990,7 @@ class CryptainerEncryptor(CryptainerBase):
             payload_cipher_layer_extract = dict(
                 cipher_algo=payload_cipher_algo,
                 symkey=symkey,
-                payload_digest_algos=[
-                    signature["payload_digest_algo"] for signature in payload_cipher_layer["payload_signatures"]
-                ],
+                payload_digest_algos=list(payload_digest_algos),  # Copied, since extracts may be modified
             )
             payload_cipher_layer_extracts.append(payload_cipher_layer_extract)
 
@@ -548,7 +1024,7 @@ class CryptainerEncryptor(CryptainerBase):
                 key_cipher_layer=key_cipher_layer,
                 cryptainer_metadata=cryptainer_metadata,
             )
-            key_bytes = dump_to_json_bytes(key_cipherdict)  # Thus its remains as bytes all along
+            key_bytes = self._dump_key_data(key_cipherdict)  # Thus its remains as bytes all along
 
         assert key_bytes != key_bytes_initial  # safety
         key_ciphertext = key_bytes
@@ -593,12 +1069,8 @@ class CryptainerEncryptor(CryptainerBase):
 
             assert len(shards) == shard_count
 
-            shard_ciphertexts = []
-
-            for shard, key_shared_secret_shard_conf in zip(shards, key_shared_secret_shards):
-                shard_bytes = dump_to_json_bytes(
-                    shard
-                )  # The tuple (idx, payload) of each shard thus becomes encryptable
+            def _encrypt_shard(shard, key_shared_secret_shard_conf):
+                shard_bytes = self._dump_key_data(shard)  # The tuple (idx, payload) of each shard becomes encryptable
                 shard_ciphertext = self._encrypt_key_through_multiple_layers(
                     default_keychain_uid=default_keychain_uid,
                     key_bytes=shard_bytes,
@@ -606,7 +1078,10 @@ class CryptainerEncryptor(CryptainerBase):
                     cryptainer_metadata=cryptainer_metadata,
                 )  # Recursive structure
                 assert isinstance(shard_ciphertext, bytes), shard_ciphertext
-                shard_ciphertexts.append(shard_ciphertext)
+                return shard_ciphertext
+
+            # Each shard may involve a different (remote) trustee, so we contact them all at once
+            shard_ciphertexts = self._map_concurrently(_encrypt_shard, shards, key_shared_secret_shards)
 
             key_cipherdict = {"shard_ciphertexts": shard_ciphertexts}  # A dict is more future-proof than list
 
@@ -615,7 +1090,7 @@ class CryptainerEncryptor(CryptainerBase):
 
             logger.debug("Generating symmetric subkey of type %r for key encryption", key_cipher_algo)
             sub_symkey = generate_symkey(cipher_algo=key_cipher_algo)
-            sub_symkey_bytes = dump_to_json_bytes(sub_symkey)
+            sub_symkey_bytes = self._dump_key_data(sub_symkey)
 
             sub_symkey_ciphertext = self._encrypt_key_through_multiple_layers(
                 default_keychain_uid=default_keychain_uid,
@@ -648,7 +1123,7 @@ class CryptainerEncryptor(CryptainerBase):
 
     def _fetch_asymmetric_key_pem_from_trustee(self, trustee, key_algo, keychain_uid):
         """Method meant to be easily replaced by a mockup in tests"""
-        trustee_proxy = get_trustee_proxy(trustee=trustee, keystore_pool=self._keystore_pool)
+        trustee_proxy = self._get_trustee_proxy(trustee)
         logger.debug("Fetching asymmetric key %s %r", key_algo, keychain_uid)
         public_key_pem = trustee_proxy.fetch_public_key(keychain_uid=keychain_uid, key_algo=key_algo)
         return public_key_pem
@@ -680,7 +1155,7 @@ class CryptainerEncryptor(CryptainerBase):
 
         # FIXME provide utilities to wrap/unwrap this struct?
         key_struct = dict(key_bytes=key_bytes, cryptainer_metadata=cryptainer_metadata)  # SPECIAL FORMAT FOR CHECKUPS
-        key_struct_bytes = dump_to_json_bytes(key_struct)
+        key_struct_bytes = self._dump_key_data(key_struct)
         key_cipherdict = encrypt_bytestring(
             plaintext=key_struct_bytes, cipher_algo=cipher_algo, key_dict=dict(key=public_key)
         )
@@ -689,9 +1164,25 @@ class CryptainerEncryptor(CryptainerBase):
     def add_authentication_data_to_cryptainer(self, cryptainer: dict, payload_integrity_tags: list):
         default_keychain_uid = cryptainer["keychain_uid"]
 
+        signature_confs = self._attach_payload_integrity_tags(cryptainer, payload_integrity_tags)
+
+        def _sign_payload_digest(signature_conf):
+            return self._generate_message_signature(
+                default_keychain_uid=default_keychain_uid, cryptoconf=signature_conf
+            )
+
+        payload_signature_structs = self._map_concurrently(_sign_payload_digest, signature_confs)
+
+        self._attach_payload_signatures(cryptainer, signature_confs, payload_signature_structs)
+
+    @staticmethod
+    def _attach_payload_integrity_tags(cryptainer: dict, payload_integrity_tags: list) -> list:
+        """Store MACs and digests in cryptainer, and return the signature confs (of all layers) awaiting a signature."""
         payload_cipher_layers = cryptainer["payload_cipher_layers"]
         assert len(payload_cipher_layers) == len(payload_integrity_tags)  # Sanity check
 
+        signature_confs = []  # Gathered for ALL layers, to request signatures concurrently
+
         for payload_cipher_layer, payload_integrity_tags_dict in zip(
             cryptainer["payload_cipher_layers"], payload_integrity_tags
         ):
@@ -709,14 +1200,19 @@ class CryptainerEncryptor(CryptainerBase):
                     payload_digest_algo
                 ]  # MUST exist, else incoherence
 
-                payload_signature_struct = self._generate_message_signature(
-                    default_keychain_uid=default_keychain_uid, cryptoconf=signature_conf
-                )
-                signature_conf["payload_signature_struct"] = payload_signature_struct
+                signature_confs.append(signature_conf)
 
                 _encountered_payload_digest_algos.add(payload_digest_algo)
             assert _encountered_payload_digest_algos == set(payload_digests)  # No abnormal extra digest
 
+        return signature_confs
+
+    @staticmethod
+    def _attach_payload_signatures(cryptainer: dict, signature_confs: list, payload_signature_structs: list):
+        assert len(signature_confs) == len(payload_signature_structs)  # Sanity check
+        for signature_conf, payload_signature_struct in zip(signature_confs, payload_signature_structs):
+            signature_conf["payload_signature_struct"] = payload_signature_struct
+
         cryptainer["cryptainer_state"] = CRYPTAINER_STATES.FINISHED
 
     def _generate_message_signature(self, default_keychain_uid: uuid.UUID, cryptoconf: dict) -> dict:
@@ -733,9 +1229,7 @@ class CryptainerEncryptor(CryptainerBase):
         ]  # Must have been set before, using payload_digest_algo field
         assert payload_digest, payload_digest
 
-        trustee_proxy = get_trustee_proxy(
-            trustee=cryptoconf["payload_signature_trustee"], keystore_pool=self._keystore_pool
-        )
+        trustee_proxy = self._get_trustee_proxy(cryptoconf["payload_signature_trustee"])
 
         keychain_uid_for_signature = cryptoconf.get("keychain_uid") or default_keychain_uid
 
@@ -746,6 +1240,111 @@ class CryptainerEncryptor(CryptainerBase):
         return payload_signature_struct
 
 
+class AsyncCryptainerEncryptor(CryptainerEncryptor):
+    """
+    THIS CLASS IS PRIVATE API
+
+    Asyncio variant of the in-memory encryptor.
+
+    Public keys are all fetched concurrently from trustees before encryption, and payload signatures
+    are requested concurrently afterwards, so that no thread is blocked by trustee calls. CPU-bound
+    cipher work is run on `executor` (or on the default executor of the event loop).
+    """
+
+    def __init__(self, keystore_pool: KeystorePoolBase = None, executor: Optional[Executor] = None, **kwargs):
+        super().__init__(keystore_pool=keystore_pool, **kwargs)
+        self._executor = executor
+        self._async_trustee_proxies = {}  # Cache mapping trustee IDs to async proxies
+        self._prefetched_public_key_pems = {}  # Maps (trustee_id, key_algo, keychain_uid) to public keys
+
+    def _get_async_trustee_proxy(self, trustee: dict):
+        """Method meant to be overridden to plug natively asynchronous trustee clients"""
+        trustee_id = get_trustee_id(trustee)
+        async_trustee_proxy = self._async_trustee_proxies.get(trustee_id)
+        if async_trustee_proxy is None:
+            async_trustee_proxy = AsyncTrusteeProxy(self._get_trustee_proxy(trustee), executor=self._executor)
+            self._async_trustee_proxies[trustee_id] = async_trustee_proxy
+        return async_trustee_proxy
+
+    def _fetch_asymmetric_key_pem_from_trustee(self, trustee, key_algo, keychain_uid):
+        public_key_pem = self._prefetched_public_key_pems.get((get_trustee_id(trustee), key_algo, keychain_uid))
+        if public_key_pem is None:  # Shouldn't happen, but blocking fallback is safe
+            public_key_pem = super()._fetch_asymmetric_key_pem_from_trustee(
+                trustee=trustee, key_algo=key_algo, keychain_uid=keychain_uid
+            )
+        return public_key_pem
+
+    async def _prefetch_public_key_pems(self, cryptoconf: dict, default_keychain_uid: uuid.UUID):
+        import asyncio
+
+        key_requests = {}
+        for payload_cipher_layer in cryptoconf["payload_cipher_layers"]:
+            for key_cipher_layer in _iterate_asymmetric_key_cipher_layers(payload_cipher_layer["key_cipher_layers"]):
+                trustee = key_cipher_layer["key_cipher_trustee"]
+                key_algo = key_cipher_layer["key_cipher_algo"]
+                keychain_uid = key_cipher_layer.get("keychain_uid") or default_keychain_uid
+                key_requests[(get_trustee_id(trustee), key_algo, keychain_uid)] = (trustee, key_algo, keychain_uid)
+
+        async def _fetch_public_key(trustee, key_algo, keychain_uid):
+            logger.debug("Fetching asymmetric key %s %r", key_algo, keychain_uid)
+            async_trustee_proxy = self._get_async_trustee_proxy(trustee)
+            return await async_trustee_proxy.fetch_public_key(keychain_uid=keychain_uid, key_algo=key_algo)
+
+        public_key_pems = await asyncio.gather(
+            *(_fetch_public_key(*key_request) for key_request in key_requests.values())
+        )
+        self._prefetched_public_key_pems.update(zip(key_requests.keys(), public_key_pems))
+
+    async def _agenerate_message_signature(self, default_keychain_uid: uuid.UUID, cryptoconf: dict) -> dict:
+        payload_digest = cryptoconf["payload_digest_value"]
+        assert payload_digest, payload_digest
+        async_trustee_proxy = self._get_async_trustee_proxy(cryptoconf["payload_signature_trustee"])
+        return await async_trustee_proxy.get_message_signature(
+            keychain_uid=cryptoconf.get("keychain_uid") or default_keychain_uid,
+            message=payload_digest,
+            signature_algo=cryptoconf["payload_signature_algo"],
+        )
+
+    async def aencrypt_data(
+        self,
+        payload: Union[bytes, BinaryIO],
+        *,
+        cryptoconf: Union[dict, CryptoconfPlan],
+        keychain_uid=None,
+        cryptainer_metadata=None,
+    ) -> dict:
+        """Asyncio equivalent of `encrypt_data()`."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        keychain_uid = keychain_uid or generate_uuid0()  # Must be known BEFORE prefetching public keys
+        cryptoconf_tree = cryptoconf.cryptoconf if isinstance(cryptoconf, CryptoconfPlan) else cryptoconf
+        await self._prefetch_public_key_pems(cryptoconf_tree, default_keychain_uid=keychain_uid)
+
+        cryptainer, payload_integrity_tags = await loop.run_in_executor(
+            self._executor,
+            functools.partial(
+                self._encrypt_data_into_unsigned_cryptainer,
+                payload,
+                cryptoconf=cryptoconf,
+                keychain_uid=keychain_uid,
+                cryptainer_metadata=cryptainer_metadata,
+            ),
+        )
+
+        signature_confs = self._attach_payload_integrity_tags(cryptainer, payload_integrity_tags)
+        payload_signature_structs = await asyncio.gather(
+            *(
+                self._agenerate_message_signature(default_keychain_uid=keychain_uid, cryptoconf=signature_conf)
+                for signature_conf in signature_confs
+            )
+        )
+        self._attach_payload_signatures(cryptainer, signature_confs, list(payload_signature_structs))
+
+        return cryptainer
+
+
 def _get_cryptainer_inline_ciphertext_value(cryptainer):
     assert "payload_ciphertext_struct" in cryptainer, list(cryptainer.keys())
     payload_ciphertext_struct = cryptainer["payload_ciphertext_struct"]
@@ -753,7 +1352,7 @@ def _get_cryptainer_inline_ciphertext_value(cryptainer):
         payload_ciphertext_struct["ciphertext_location"] == PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE
     ), payload_ciphertext_struct["ciphertext_location"]
     ciphertext_value = payload_ciphertext_struct["ciphertext_value"]
-    assert isinstance(ciphertext_value, bytes), repr(ciphertext_value)  # Always (no more "special markers")
+    assert isinstance(ciphertext_value, (bytes, memoryview)), repr(ciphertext_value)  # No more "special markers"
     return ciphertext_value
 
 
@@ -769,27 +1368,213 @@ class DecryptionErrorCriticity:
     ERROR = "ERROR"
 
 
-class CryptainerDecryptor(CryptainerBase):
+DECRYPTION_ERROR_ENTRY_SCHEMA = Schema(
+    {
+        "error_type": Or(
+            DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+            DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+            DecryptionErrorType.SIGNATURE_ERROR,
+        ),
+        "error_criticity": Or(DecryptionErrorCriticity.ERROR, DecryptionErrorCriticity.WARNING),
+        "error_message": And(str, len),
+        "error_exception": Or(Exception, None),
+    }
+)
+
+
+class DecryptionSession:
     """
-    THIS CLASS IS PRIVATE API
+    Set of caches shared by the decryption of several cryptainers (e.g. a day of sensor records), so that
+    trustee proxies are built once, private keys are loaded (and their passphrases tried) once, identical
+    key ciphertexts are unwrapped once, revelation requests are fetched once from each gateway (unreachable
+    gateways are retried), and known failures (missing keystores or keys, wrong passphrases...) are not retried.
 
-    Contains every method used to read and decrypt a cryptainer, IN MEMORY.
+    Cached secrets are wiped by `close()` (automatically called when used as a context manager), after which
+    the session can't be used anymore. Since Python objects can't be reliably zeroized, unwrapped keys are
+    kept in overwritable buffers, and private key objects are merely dereferenced.
+
+    :param keystore_pool: optional key storage pool, used to build trustee proxies
     """
 
-    def extract_cryptainer_metadata(self, cryptainer: dict) -> Optional[dict]:
-        assert isinstance(cryptainer, dict), cryptainer
-        return cryptainer["cryptainer_metadata"]
+    def __init__(self, keystore_pool: Optional[KeystorePoolBase] = None):
+        self._keystore_pool = keystore_pool or DUMMY_KEYSTORE_POOL
+        self._lock = threading.Lock()
+        self._trustee_proxies = {}  # Maps trustee IDs to proxies
+        self._private_key_caches = {}  # Maps trustee IDs to dicts of loaded private keys
+        self._unwrapped_keys = {}  # Maps (trustee ID, keychain_uid, cipher_algo, ciphertext digest) to bytearrays
+        self._trustee_errors = {}  # Maps trustee IDs to exceptions
+        self._unwrapping_errors = {}  # Maps keypair or ciphertext identifiers to exceptions
+        self._memoized_results = {}  # Maps (cache name, key) tuples to results of _memoize()
+        self._is_closed = False
+
+    @property
+    def keystore_pool(self):
+        return self._keystore_pool
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    def _check_not_closed(self):
+        if self._is_closed:
+            raise RuntimeError("Decryption session was already closed")
 
-    def _decrypt_with_local_private_key(self, cipherdict: dict, keychain_uid: uuid.UUID, cipher_algo: str):
-        # TODO USE TrusteeApi() with local keystore then decrypt_with_private_key() function, instead ???
-        error_report = []
-        keystore = self._keystore_pool.get_local_keyfactory()
-        key_struct_bytes = None  # Returns "None" when unable to decrypt with the answer key
+    @synchronized
+    def get_trustee_proxy(self, trustee: dict):
+        """Return the cached proxy for this trustee, or re-raise the error which prevented its creation."""
+        self._check_not_closed()
+        trustee_id = get_trustee_id(trustee)
+        if trustee_id in self._trustee_errors:
+            raise self._trustee_errors[trustee_id]
+        trustee_proxy = self._trustee_proxies.get(trustee_id)
+        if trustee_proxy is None:
+            private_key_cache = self._private_key_caches.setdefault(trustee_id, {})
+            try:
+                trustee_proxy = get_trustee_proxy(
+                    trustee=trustee, keystore_pool=self._keystore_pool, private_key_cache=private_key_cache
+                )
+            except KeystoreDoesNotExist as exc:
+                self._trustee_errors[trustee_id] = exc
+                raise
+            self._trustee_proxies[trustee_id] = trustee_proxy
+        return trustee_proxy
+
+    def _memoize(self, cache_name: str, key, compute: Callable, is_cacheable: Optional[Callable] = None):
+        """Return the cached result of a previous `compute()` call for this cache name and key, else compute it
+        (without holding the session lock, so concurrent computations are possible but harmless) and cache it,
+        unless `is_cacheable(result)` is false (e.g. for transient failures, which must be retried later)."""
+        cache_key = (cache_name, key)
+        with self._lock:
+            self._check_not_closed()
+            if cache_key in self._memoized_results:
+                return self._memoized_results[cache_key]
+        result = compute()
+        with self._lock:
+            self._check_not_closed()
+            if is_cacheable is not None and not is_cacheable(result):
+                return result
+            return self._memoized_results.setdefault(cache_key, result)
+
+    def decrypt_with_private_key(
+        self,
+        trustee: dict,
+        *,
+        keychain_uid: uuid.UUID,
+        cipher_algo: str,
+        cipherdict: dict,
+        key_ciphertext: bytes,
+        passphrases: list,
+        cryptainer_metadata: Optional[dict],
+    ) -> bytes:
+        """Same as the `decrypt_with_private_key()` trustee method, but with a cache of results and errors."""
+        trustee_id = get_trustee_id(trustee)
+        keypair_identifier = (trustee_id, keychain_uid, cipher_algo, tuple(passphrases))
+        unwrapped_key_identifier = (trustee_id, keychain_uid, cipher_algo, hash_message(key_ciphertext, "SHA256"))
+
+        with self._lock:
+            self._check_not_closed()
+            unwrapped_key = self._unwrapped_keys.get(unwrapped_key_identifier)
+            if unwrapped_key is not None:
+                return bytes(unwrapped_key)
+            exc = self._unwrapping_errors.get(keypair_identifier) or self._unwrapping_errors.get(
+                unwrapped_key_identifier
+            )
+            if exc:
+                raise exc
 
+        trustee_proxy = self.get_trustee_proxy(trustee)
         try:
-            private_key_pem = keystore.get_private_key(keychain_uid=keychain_uid, key_algo=cipher_algo)
-        except KeyDoesNotExist as exc:
-            error_entry = self._build_error_report_entry(
+            key_struct_bytes = trustee_proxy.decrypt_with_private_key(
+                keychain_uid=keychain_uid,
+                cipher_algo=cipher_algo,
+                cipherdict=cipherdict,
+                passphrases=passphrases,
+                cryptainer_metadata=cryptainer_metadata,
+            )
+        except (KeyDoesNotExist, KeyLoadingError) as exc:  # Concerns all ciphertexts of this keypair
+            with self._lock:
+                self._unwrapping_errors[keypair_identifier] = exc
+            raise
+        except DecryptionError as exc:
+            with self._lock:
+                self._unwrapping_errors[unwrapped_key_identifier] = exc
+            raise
+
+        with self._lock:
+            self._check_not_closed()
+            self._unwrapped_keys[unwrapped_key_identifier] = bytearray(key_struct_bytes)
+        return key_struct_bytes
+
+    @synchronized
+    def close(self):
+        """Wipe all cached secrets and errors, and forbid further use of this session."""
+        for unwrapped_key in self._unwrapped_keys.values():
+            unwrapped_key[:] = bytes(len(unwrapped_key))  # Zeroize buffer in place
+        self._unwrapped_keys.clear()
+        for private_key_cache in self._private_key_caches.values():
+            private_key_cache.clear()
+        self._private_key_caches.clear()
+        self._trustee_proxies.clear()
+        self._trustee_errors.clear()
+        self._unwrapping_errors.clear()
+        self._memoized_results.clear()
+        self._is_closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CryptainerDecryptor(CryptainerBase):
+    """
+    THIS CLASS IS PRIVATE API
+
+    Contains every method used to read and decrypt a cryptainer, IN MEMORY.
+
+    Shared-secret shards are decrypted concurrently, and the symmetric key is recombined as soon as enough shards
+    are available; the remaining shards are then abandoned, and only outcomes known at that time are reported.
+
+    If a `decryption_session` is provided, its caches are used for trustee operations.
+    """
+
+    def __init__(
+        self,
+        keystore_pool: KeystorePoolBase = None,
+        passphrase_mapper: Optional[dict] = None,
+        decryption_session: Optional[DecryptionSession] = None,
+        trustee_calls_max_workers: int = DEFAULT_TRUSTEE_CALLS_MAX_WORKERS,
+    ):
+        if decryption_session and not keystore_pool:
+            keystore_pool = decryption_session.keystore_pool
+        super().__init__(
+            keystore_pool=keystore_pool,
+            passphrase_mapper=passphrase_mapper,
+            trustee_calls_max_workers=trustee_calls_max_workers,
+        )
+        assert not decryption_session or decryption_session.keystore_pool is self._keystore_pool
+        self._decryption_session = decryption_session
+
+    def _get_trustee_proxy(self, trustee: dict):
+        if self._decryption_session:
+            return self._decryption_session.get_trustee_proxy(trustee)
+        return get_trustee_proxy(trustee=trustee, keystore_pool=self._keystore_pool)
+
+    def extract_cryptainer_metadata(self, cryptainer: dict) -> Optional[dict]:
+        assert isinstance(cryptainer, dict), cryptainer
+        return cryptainer["cryptainer_metadata"]
+
+    def _decrypt_with_local_private_key(self, cipherdict: dict, keychain_uid: uuid.UUID, cipher_algo: str):
+        # TODO USE TrusteeApi() with local keystore then decrypt_with_private_key() function, instead ???
+        error_report = []
+        keystore = self._keystore_pool.get_local_keyfactory()
+        key_struct_bytes = None  # Returns "None" when unable to decrypt with the answer key
+
+        try:
+            private_key_pem = keystore.get_private_key(keychain_uid=keychain_uid, key_algo=cipher_algo)
+        except KeyDoesNotExist as exc:
+            error_entry = self._build_error_report_entry(
                 error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
                 error_message="Private key of revelation response not found (%s/%s)" % (cipher_algo, keychain_uid),
                 error_criticity=DecryptionErrorCriticity.ERROR,
@@ -838,7 +1623,7 @@ class CryptainerDecryptor(CryptainerBase):
 
             request_data = symkey_decryption["symkey_decryption_request_data"]
 
-            cipherdict = load_from_json_bytes(symkey_decryption["symkey_decryption_response_data"])
+            cipherdict = load_from_binary_envelope(symkey_decryption["symkey_decryption_response_data"])
 
             # FIXME immediately deserialize "key_struct_bytes" here and handle error_report ? Or somewhere else ?
             (key_struct_bytes, local_decryption_errors) = self._decrypt_with_local_private_key(
@@ -851,12 +1636,35 @@ class CryptainerDecryptor(CryptainerBase):
 
         return predecrypted_symkey_mapper, error_report
 
+    def _memoize_in_session(self, cache_name: str, key, compute: Callable, is_cacheable: Optional[Callable] = None):
+        if self._decryption_session:
+            return self._decryption_session._memoize(cache_name, key, compute, is_cacheable=is_cacheable)
+        return compute()
+
+    @staticmethod
+    def _is_error_free_result(result: tuple) -> bool:
+        """Tell if a (value, error_report) tuple may be cached, i.e. if no (possibly transient) error occurred."""
+        return not result[1]
+
     def _get_single_gateway_revelation_request_list(self, gateway_url: str, revelation_requestor_uid: uuid.UUID):
+        """Return a tuple (revelation_request_list, error_report), which is cached in the decryption session if any,
+        unless the gateway couldn't be reached (so that it's queried again for next cryptainers)."""
+        return self._memoize_in_session(
+            "gateway_revelation_request_list",
+            (gateway_url, revelation_requestor_uid),
+            lambda: self._fetch_single_gateway_revelation_request_list(gateway_url, revelation_requestor_uid),
+            is_cacheable=self._is_error_free_result,
+        )
+
+    def _fetch_single_gateway_revelation_request_list(self, gateway_url: str, revelation_requestor_uid: uuid.UUID):
         assert gateway_url and revelation_requestor_uid  # By construction
 
         gateway_revelation_request_list = []
         error_report = []
 
+        from jsonrpc_requests import JSONRPCError  # Heavy imports (requests...), done lazily
+        from wacryptolib.jsonrpc_client import JsonRpcProxy, status_slugs_response_error_handler
+
         gateway_proxy = JsonRpcProxy(url=gateway_url, response_error_handler=status_slugs_response_error_handler)
         try:
             gateway_revelation_request_list = gateway_proxy.list_requestor_revelation_requests(
@@ -876,73 +1684,79 @@ class CryptainerDecryptor(CryptainerBase):
         assert gateway_urls and revelation_requestor_uid  # By construction
         error_report = []
         multiple_gateway_revelation_request_list = []
-        for gateway_url in gateway_urls:
-            gateway_revelation_request_list, error_entry = self._get_single_gateway_revelation_request_list(
-                gateway_url, revelation_requestor_uid
-            )
+        gateway_results = self._map_concurrently(
+            self._get_single_gateway_revelation_request_list,
+            gateway_urls,
+            [revelation_requestor_uid] * len(gateway_urls),
+        )
+        for gateway_revelation_request_list, error_entry in gateway_results:  # Same order as gateway_urls
             multiple_gateway_revelation_request_list.extend(gateway_revelation_request_list)
             error_report.extend(error_entry)
 
         return multiple_gateway_revelation_request_list, error_report
 
-    def _get_successful_symkey_decryptions(
-        self, cryptainer: dict, gateway_urls: list, revelation_requestor_uid: uuid.UUID
-    ) -> tuple:
+    @staticmethod
+    def _build_symkey_decryptions_index(revelation_request_list: list) -> dict:
+        """Return a dict mapping cryptainer UIDs to the list of their successful symkey decryptions."""
 
         ACCEPTED = "ACCEPTED"
         REJECTED = "REJECTED"  # USE LATER
 
-        error_report = []
-        multiple_gateway_revelation_request_list, gateway_errors = self._get_multiple_gateway_revelation_request_list(
-            gateway_urls, revelation_requestor_uid
-        )
-        error_report.extend(gateway_errors)
+        symkey_decryptions_index = {}
 
-        successful_symkey_decryptions = []
+        for revelation_request in revelation_request_list:
 
-        if multiple_gateway_revelation_request_list:
+            revelation_request_per_symkey = {
+                key: value for key, value in revelation_request.items() if key != "symkey_decryption_requests"
+            }
 
-            for revelation_request in multiple_gateway_revelation_request_list:
+            # Allow not to verify all decryption requests
+            if revelation_request["revelation_request_status"] == ACCEPTED:
+                for symkey_decryption in revelation_request["symkey_decryption_requests"]:
+                    if symkey_decryption["symkey_decryption_status"] == "DECRYPTED":
+                        symkey_decryption_accepted_for_cryptainer = dict(symkey_decryption.items())
+                        symkey_decryption_accepted_for_cryptainer["revelation_request"] = revelation_request_per_symkey
+                        symkey_decryptions_index.setdefault(symkey_decryption["cryptainer_uid"], []).append(
+                            symkey_decryption_accepted_for_cryptainer
+                        )
 
-                revelation_request_per_symkey = {
-                    key: value for key, value in revelation_request.items() if key != "symkey_decryption_requests"
-                }
+        # FIXME add info/warning for rejected requests???
 
-                # Allow not to verify all decryption requests
-                if revelation_request["revelation_request_status"] == ACCEPTED:
-                    for symkey_decryption in revelation_request["symkey_decryption_requests"]:
-                        if (
-                            symkey_decryption["cryptainer_uid"] == cryptainer["cryptainer_uid"]
-                            and symkey_decryption["symkey_decryption_status"] == "DECRYPTED"
-                        ):
-                            symkey_decryption_accepted_for_cryptainer = dict(symkey_decryption.items())
-                            symkey_decryption_accepted_for_cryptainer[
-                                "revelation_request"
-                            ] = revelation_request_per_symkey
-                            successful_symkey_decryptions.append(symkey_decryption_accepted_for_cryptainer)
+        return symkey_decryptions_index
 
-        # FIXME add info/warning for rejected requests???
+    def _get_symkey_decryptions_index(self, gateway_urls: list, revelation_requestor_uid: uuid.UUID) -> tuple:
+        """Return a tuple (symkey_decryptions_index, error_report), cached in the decryption session if any
+        and if all gateways could be reached."""
 
-        return successful_symkey_decryptions, error_report
+        def _compute():
+            revelation_request_list, gateway_errors = self._get_multiple_gateway_revelation_request_list(
+                gateway_urls, revelation_requestor_uid
+            )
+            return self._build_symkey_decryptions_index(revelation_request_list), gateway_errors
 
-    def decrypt_payload(  # FIXME test the cases with gateway_urls or revelation_requestor_uid empty
-        self,
-        cryptainer: dict,
-        verify_integrity_tags: bool = True,
-        gateway_urls: Optional[list] = None,
-        revelation_requestor_uid: Optional[uuid.UUID] = None,
-    ) -> tuple:
-        """
-        Loop through cryptainer layers, to decipher payload with the right algorithms.
+        return self._memoize_in_session(
+            "symkey_decryptions_index",
+            (tuple(gateway_urls), revelation_requestor_uid),
+            _compute,
+            is_cacheable=self._is_error_free_result,
+        )
 
-        :param cryptainer: dictionary previously built with CryptainerEncryptor method
-        :param verify_integrity_tags: whether to check MAC tags of the ciphertext
+    def _get_successful_symkey_decryptions(
+        self, cryptainer: dict, gateway_urls: list, revelation_requestor_uid: uuid.UUID
+    ) -> tuple:
+        symkey_decryptions_index, gateway_errors = self._get_symkey_decryptions_index(
+            gateway_urls, revelation_requestor_uid
+        )
+        successful_symkey_decryptions = list(symkey_decryptions_index.get(cryptainer["cryptainer_uid"], []))
+        error_report = list(gateway_errors)
+        return successful_symkey_decryptions, error_report
 
-        :return: deciphered plaintext
-        """
+    def _get_predecrypted_symkey_mapper(
+        self, cryptainer: dict, gateway_urls: Optional[list], revelation_requestor_uid: Optional[uuid.UUID]
+    ) -> tuple:
+        """Return a tuple (predecrypted_symkey_mapper or None, error_report), using remote revelation requests."""
         predecrypted_symkey_mapper = None
         error_report = []
-        payload = None
 
         if revelation_requestor_uid and gateway_urls:
             successful_symkey_decryptions, remote_decryption_errors = self._get_successful_symkey_decryptions(
@@ -956,47 +1770,132 @@ class CryptainerDecryptor(CryptainerBase):
 
             error_report.extend(local_decryption_errors)
 
+        return predecrypted_symkey_mapper, error_report
+
+    def _unwrap_payload_cipher_layer_keys(self, cryptainer: dict, predecrypted_symkey_mapper: Optional[dict]) -> list:
+        """Return, for each payload cipher layer (in cryptainer order), a tuple (key_bytes or None, error_report).
+
+        Only the header of the cryptainer is needed for this.
+        """
         assert isinstance(cryptainer, dict), cryptainer
 
         cryptainer_format = cryptainer["cryptainer_format"]
-        if cryptainer_format != CRYPTAINER_FORMAT:
+        if cryptainer_format not in SUPPORTED_CRYPTAINER_FORMATS:
             raise ValueError("Unknown cryptainer format %s" % cryptainer_format)
 
+        default_keychain_uid = cryptainer["keychain_uid"]
+        cryptainer_metadata = cryptainer["cryptainer_metadata"]
+
+        payload_cipher_layer_keys = []
+        for payload_cipher_layer in cryptainer["payload_cipher_layers"]:
+            key_ciphertext = payload_cipher_layer["key_ciphertext"]  # We start fully encrypted, and unravel it
+            key_bytes, multiple_layer_decryption_errors = self._decrypt_key_through_multiple_layers(
+                default_keychain_uid=default_keychain_uid,
+                key_ciphertext=key_ciphertext,
+                key_cipher_layers=payload_cipher_layer["key_cipher_layers"],
+                cryptainer_metadata=cryptainer_metadata,
+                predecrypted_symkey_mapper=predecrypted_symkey_mapper,
+            )
+            payload_cipher_layer_keys.append((key_bytes, multiple_layer_decryption_errors))
+        return payload_cipher_layer_keys
+
+    def can_decrypt_payload(
+        self,
+        cryptainer: dict,
+        gateway_urls: Optional[list] = None,
+        revelation_requestor_uid: Optional[uuid.UUID] = None,
+    ) -> bool:
+        """Return True iff the keys of all payload cipher layers can be unwrapped (payload itself is not needed)."""
+        predecrypted_symkey_mapper, _ = self._get_predecrypted_symkey_mapper(
+            cryptainer, gateway_urls=gateway_urls, revelation_requestor_uid=revelation_requestor_uid
+        )
+        payload_cipher_layer_keys = self._unwrap_payload_cipher_layer_keys(cryptainer, predecrypted_symkey_mapper)
+        return all(key_bytes is not None for (key_bytes, _) in payload_cipher_layer_keys)
+
+    def decrypt_payload(  # FIXME test the cases with gateway_urls or revelation_requestor_uid empty
+        self,
+        cryptainer: dict,
+        verify_integrity_tags: bool = True,
+        gateway_urls: Optional[list] = None,
+        revelation_requestor_uid: Optional[uuid.UUID] = None,
+        payload_ciphertext_struct_loader: Optional[Callable] = None,
+    ) -> tuple:
+        """
+        Loop through cryptainer layers, to decipher payload with the right algorithms.
+
+        The keys of all layers are unwrapped first, so that the payload ciphertext of a header-only cryptainer
+        (i.e. without "payload_ciphertext_struct") is only loaded, via `payload_ciphertext_struct_loader`,
+        if it can actually be decrypted.
+
+        :param cryptainer: dictionary previously built with CryptainerEncryptor method
+        :param verify_integrity_tags: whether to check MAC tags of the ciphertext
+        :param payload_ciphertext_struct_loader: callable returning the INLINE "payload_ciphertext_struct"
+            of a header-only cryptainer
+
+        :return: deciphered plaintext
+        """
+        predecrypted_symkey_mapper, error_report = self._get_predecrypted_symkey_mapper(
+            cryptainer, gateway_urls=gateway_urls, revelation_requestor_uid=revelation_requestor_uid
+        )
+
+        payload_cipher_layer_keys = self._unwrap_payload_cipher_layer_keys(cryptainer, predecrypted_symkey_mapper)
+
+        return self._decrypt_payload_with_unwrapped_keys(
+            cryptainer,
+            payload_cipher_layer_keys=payload_cipher_layer_keys,
+            error_report=error_report,
+            verify_integrity_tags=verify_integrity_tags,
+            payload_ciphertext_struct_loader=payload_ciphertext_struct_loader,
+        )
+
+    def _decrypt_payload_with_unwrapped_keys(
+        self,
+        cryptainer: dict,
+        payload_cipher_layer_keys: list,
+        error_report: list,
+        verify_integrity_tags: bool,
+        payload_ciphertext_struct_loader: Optional[Callable],
+    ) -> tuple:
+        """Decrypt the payload of a cryptainer with the results of `_unwrap_payload_cipher_layer_keys()`,
+        checking signatures too, and return the tuple (payload or None, extended error_report)."""
+        payload = None
+
         cryptainer_uid = cryptainer["cryptainer_uid"]
-        del cryptainer_uid  # Might be used for logging etc, later...
 
         default_keychain_uid = cryptainer["keychain_uid"]
 
-        cryptainer_metadata = cryptainer["cryptainer_metadata"]
-
-        payload_current = _get_cryptainer_inline_ciphertext_value(cryptainer)
+        if "payload_ciphertext_struct" in cryptainer:
+            payload_current = _get_cryptainer_inline_ciphertext_value(cryptainer)
+        elif all(key_bytes is not None for (key_bytes, _) in payload_cipher_layer_keys):
+            assert payload_ciphertext_struct_loader, "Header-only cryptainer requires a payload ciphertext loader"
+            cryptainer = dict(cryptainer, payload_ciphertext_struct=payload_ciphertext_struct_loader())
+            payload_current = _get_cryptainer_inline_ciphertext_value(cryptainer)
+        else:
+            logger.info("Skipping loading of payload ciphertext of cryptainer %s, due to missing keys", cryptainer_uid)
+            payload_current = None
 
-        for payload_cipher_layer in reversed(
-            cryptainer["payload_cipher_layers"]
+        for payload_cipher_layer, (key_bytes, multiple_layer_decryption_errors) in reversed(
+            list(zip(cryptainer["payload_cipher_layers"], payload_cipher_layer_keys))
         ):  # Non-emptiness of this will be checked by validator
 
             payload_cipher_algo = payload_cipher_layer["payload_cipher_algo"]
 
             if payload_current is not None:
+                payload_digests = {}  # Signatures of a same layer may share digest algos
                 for signature_conf in payload_cipher_layer["payload_signatures"]:
                     signature_errors = self._verify_payload_signature(
-                        default_keychain_uid=default_keychain_uid, payload=payload_current, cryptoconf=signature_conf
+                        default_keychain_uid=default_keychain_uid,
+                        payload=payload_current,
+                        cryptoconf=signature_conf,
+                        payload_digests=payload_digests,
                     )
                     error_report.extend(signature_errors)
 
-            key_ciphertext = payload_cipher_layer["key_ciphertext"]  # We start fully encrypted, and unravel it
-            key_bytes, multiple_layer_decryption_errors = self._decrypt_key_through_multiple_layers(
-                default_keychain_uid=default_keychain_uid,
-                key_ciphertext=key_ciphertext,
-                key_cipher_layers=payload_cipher_layer["key_cipher_layers"],
-                cryptainer_metadata=cryptainer_metadata,
-                predecrypted_symkey_mapper=predecrypted_symkey_mapper,
-            )
             error_report.extend(multiple_layer_decryption_errors)
 
             if key_bytes is not None and payload_current is not None:
                 assert isinstance(key_bytes, bytes), key_bytes
-                symkey = load_from_json_bytes(key_bytes)
+                symkey = load_from_binary_envelope(key_bytes)
 
                 payload_macs = payload_cipher_layer[
                     "payload_macs"
@@ -1044,6 +1943,149 @@ class CryptainerDecryptor(CryptainerBase):
             payload = payload_current
         return payload, error_report
 
+    def decrypt_payload_stream(
+        self,
+        cryptainer: dict,
+        ciphertext_stream: BinaryIO,
+        plaintext_chunk_handler: Callable,
+        verify_integrity_tags: bool = True,
+        chunk_size: int = DEFAULT_DATA_CHUNK_SIZE,
+    ) -> tuple:
+        """
+        Decrypt, chunk by chunk, the payload ciphertext read from `ciphertext_stream`, and pass resulting
+        plaintext chunks to `plaintext_chunk_handler`. Payload keys are unwrapped first, from the cryptainer header.
+
+        Since integrity tags and signatures can only be checked at the end, plaintext chunks already handled
+        must be discarded if decryption fails.
+
+        :return: tuple (is_success, error_report)
+        """
+        payload_cipher_layers = cryptainer["payload_cipher_layers"]
+        payload_cipher_layer_keys = self._unwrap_payload_cipher_layer_keys(cryptainer, predecrypted_symkey_mapper=None)
+
+        error_report = []
+        for _, multiple_layer_decryption_errors in reversed(payload_cipher_layer_keys):
+            error_report.extend(multiple_layer_decryption_errors)
+        if any(key_bytes is None for (key_bytes, _) in payload_cipher_layer_keys):
+            error_entry = self._build_error_report_entry(
+                error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+                error_criticity=DecryptionErrorCriticity.ERROR,
+                error_message="Aborted decryption of payload stream (missing payload keys)",
+                error_exception=None,
+            )
+            error_report.append(error_entry)
+            return False, error_report
+
+        payload_cipher_layer_extracts = [
+            dict(
+                cipher_algo=payload_cipher_layer["payload_cipher_algo"],
+                symkey=load_from_binary_envelope(key_bytes),
+                payload_macs=payload_cipher_layer["payload_macs"],
+                payload_digest_algos=[
+                    signature_conf["payload_digest_algo"]
+                    for signature_conf in payload_cipher_layer["payload_signatures"]
+                ],
+            )
+            for (payload_cipher_layer, (key_bytes, _)) in zip(payload_cipher_layers, payload_cipher_layer_keys)
+        ]
+        decryption_pipeline = PayloadDecryptionPipeline(
+            payload_cipher_layer_extracts, verify_integrity_tags=verify_integrity_tags
+        )
+
+        try:
+            while True:
+                chunk = ciphertext_stream.read(chunk_size)
+                if not chunk:
+                    break
+                plaintext_chunk_handler(decryption_pipeline.decrypt_chunk(chunk))
+            plaintext_chunk_handler(decryption_pipeline.finalize())
+        except DecryptionIntegrityError as exc:
+            error_entry = self._build_error_report_entry(
+                error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+                error_criticity=DecryptionErrorCriticity.ERROR,
+                error_message="Failed decryption authentication of payload stream (MAC check failed)",
+                error_exception=exc,
+            )
+            error_report.append(error_entry)
+            return False, error_report
+        except DecryptionError as exc:
+            error_entry = self._build_error_report_entry(
+                error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+                error_criticity=DecryptionErrorCriticity.ERROR,
+                error_message="Failed symmetric decryption of payload stream",
+                error_exception=exc,
+            )
+            error_report.append(error_entry)
+            return False, error_report
+
+        for payload_cipher_layer, payload_digests in reversed(
+            list(zip(payload_cipher_layers, decryption_pipeline.get_payload_digests()))
+        ):
+            for signature_conf in payload_cipher_layer["payload_signatures"]:
+                signature_errors = self._verify_payload_signature(
+                    default_keychain_uid=cryptainer["keychain_uid"],
+                    payload=None,
+                    cryptoconf=signature_conf,
+                    payload_digests=payload_digests,
+                )
+                error_report.extend(signature_errors)
+
+        return True, error_report
+
+    def verify_payload_stream(
+        self,
+        cryptainer: dict,
+        ciphertext_stream: BinaryIO,
+        verify_integrity_tags: bool = False,
+        chunk_size: int = DEFAULT_DATA_CHUNK_SIZE,
+    ) -> list:
+        """
+        Check the integrity of the payload ciphertext read from `ciphertext_stream`, without keeping any plaintext.
+
+        By default, only the digests and signatures of the outermost payload cipher layer are checked, which requires
+        no private key. If `verify_integrity_tags`, the whole payload is also decrypted (with keys unwrapped from the
+        cryptainer header), so that integrity tags and signatures of all layers are checked, and plaintext chunks are
+        discarded at once.
+
+        :return: error_report list
+        """
+        if verify_integrity_tags:
+            is_success, error_report = self.decrypt_payload_stream(
+                cryptainer,
+                ciphertext_stream=ciphertext_stream,
+                plaintext_chunk_handler=lambda plaintext_chunk: None,
+                verify_integrity_tags=True,
+                chunk_size=chunk_size,
+            )
+            return error_report
+
+        signature_confs = cryptainer["payload_cipher_layers"][-1]["payload_signatures"]
+        hashers_dict = {
+            signature_conf["payload_digest_algo"]: _crypto_backend.get_hasher_instance(
+                signature_conf["payload_digest_algo"]
+            )
+            for signature_conf in signature_confs
+        }
+        if hashers_dict:  # Else, no need to read ciphertext at all
+            while True:
+                chunk = ciphertext_stream.read(chunk_size)
+                if not chunk:
+                    break
+                for hasher_instance in hashers_dict.values():
+                    hasher_instance.update(chunk)
+        payload_digests = {hash_algo: hasher_instance.digest() for (hash_algo, hasher_instance) in hashers_dict.items()}
+
+        error_report = []
+        for signature_conf in signature_confs:
+            signature_errors = self._verify_payload_signature(
+                default_keychain_uid=cryptainer["keychain_uid"],
+                payload=None,
+                cryptoconf=signature_conf,
+                payload_digests=payload_digests,
+            )
+            error_report.extend(signature_errors)
+        return error_report
+
     def _decrypt_key_through_multiple_layers(
         self,
         default_keychain_uid: uuid.UUID,
@@ -1096,7 +2138,7 @@ class CryptainerDecryptor(CryptainerBase):
 
         assert isinstance(key_ciphertext, bytes), key_ciphertext
 
-        key_cipherdict = load_from_json_bytes(key_ciphertext)
+        key_cipherdict = load_from_binary_envelope(key_ciphertext)
         assert isinstance(key_cipherdict, dict), key_cipherdict
 
         key_cipher_algo = key_cipher_layer["key_cipher_algo"]
@@ -1111,46 +2153,38 @@ class CryptainerDecryptor(CryptainerBase):
 
             logger.debug("Deciphering the %d shards of shared secret", len(shard_ciphertexts))
 
-            # If some shards are missing, we won't detect it here because zip() stops at shortest list
-            for shard_ciphertext, key_shared_secret_shard_conf in zip(shard_ciphertexts, key_shared_secret_shards):
-
-                shard_bytes, multiple_layer_decryption_errors = self._decrypt_key_through_multiple_layers(
+            def _decrypt_shard(shard_ciphertext, key_shared_secret_shard_conf):
+                return self._decrypt_key_through_multiple_layers(
                     default_keychain_uid=default_keychain_uid,
                     key_ciphertext=shard_ciphertext,
                     key_cipher_layers=key_shared_secret_shard_conf["key_cipher_layers"],
                     cryptainer_metadata=cryptainer_metadata,
                     predecrypted_symkey_mapper=predecrypted_symkey_mapper,
                 )  # Recursive structure
-                error_report.extend(multiple_layer_decryption_errors)
-                if shard_bytes is not None:
-                    shard = load_from_json_bytes(
-                        shard_bytes
-                    )  # The tuple (idx, payload) of each shard thus becomes encryptable
-                    decrypted_shards.append(shard)
-                else:
 
-                    error_entry = self._build_error_report_entry(
-                        error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
-                        error_message="A previous error prevented decrypting shard %s"
-                        % str(key_shared_secret_shard_conf),
-                        error_exception=None,
-                    )
-                    error_report.append(error_entry)
+            # If some shards are missing, we won't detect it here because zip() stops at shortest list
+            shard_decryption_results = self._iterate_concurrently(
+                _decrypt_shard, shard_ciphertexts, key_shared_secret_shards
+            )
 
+            abandoned_shard_indices = set(range(min(len(shard_ciphertexts), len(key_shared_secret_shards))))
+            for shard_index, (shard_bytes, multiple_layer_decryption_errors) in shard_decryption_results:
+                abandoned_shard_indices.remove(shard_index)
+                self._collect_decrypted_shard(
+                    shard_bytes,
+                    multiple_layer_decryption_errors,
+                    key_shared_secret_shard_conf=key_shared_secret_shards[shard_index],
+                    decrypted_shards=decrypted_shards,
+                    error_report=error_report,
+                )
                 if len(decrypted_shards) == key_shared_secret_threshold:
+                    shard_decryption_results.close()  # Abandon slower shards
                     break
+            self._report_abandoned_shards(abandoned_shard_indices, key_shared_secret_shards, error_report=error_report)
 
-            if len(decrypted_shards) < key_shared_secret_threshold:
-                error_entry = self._build_error_report_entry(
-                    error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
-                    error_message="%s valid shard(s) missing for reconstitution "
-                    "of symmetric key" % (key_shared_secret_threshold - len(decrypted_shards)),
-                    error_exception=None,
-                )
-                error_report.append(error_entry)
-            else:
-                logger.debug("A sufficient number of shared-secret shards has been decrypted")
-                key_bytes = recombine_secret_from_shards(shards=decrypted_shards)
+            key_bytes = self._recombine_decrypted_shards(
+                decrypted_shards, key_shared_secret_threshold=key_shared_secret_threshold, error_report=error_report
+            )
 
         elif key_cipher_algo in SUPPORTED_SYMMETRIC_KEY_ALGOS:
             assert key_cipher_algo in SUPPORTED_CIPHER_ALGOS, key_cipher_algo  # Not a SIGNATURE algo
@@ -1166,20 +2200,12 @@ class CryptainerDecryptor(CryptainerBase):
             )  # Recursive structure
             error_report.extend(multiple_layer_decryption_errors)
 
-            if sub_symkey_bytes:
-                sub_symkey_dict = load_from_json_bytes(sub_symkey_bytes)
-                try:
-                    key_bytes = decrypt_bytestring(
-                        key_cipherdict, cipher_algo=key_cipher_algo, key_dict=sub_symkey_dict
-                    )
-                except DecryptionError as exc:
-                    error_entry = self._build_error_report_entry(
-                        error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
-                        error_message="Error decrypting key with symmetric algorithm %s algorithm" % key_cipher_algo,
-                        error_criticity=DecryptionErrorCriticity.ERROR,
-                        error_exception=exc,
-                    )
-                    error_report.append(error_entry)
+            key_bytes = self._decrypt_key_with_symmetric_cipher(
+                key_cipherdict,
+                key_cipher_algo=key_cipher_algo,
+                sub_symkey_bytes=sub_symkey_bytes,
+                error_report=error_report,
+            )
 
         else:  # Using asymmetric algorithm
 
@@ -1199,6 +2225,7 @@ class CryptainerDecryptor(CryptainerBase):
                     cipher_algo=key_cipher_algo,
                     keychain_uid=keychain_uid,
                     cipherdict=key_cipherdict,
+                    key_ciphertext=key_ciphertext,
                     trustee=trustee,
                     cryptainer_metadata=cryptainer_metadata,
                 )
@@ -1206,17 +2233,84 @@ class CryptainerDecryptor(CryptainerBase):
 
         return key_bytes, error_report
 
-    @staticmethod
-    def _get_predecrypted_symkey_or_none(key_ciphertext, predecrypted_symkey_mapper: Optional[dict]) -> Optional[bytes]:
-        predecrypted_symkey = None
+    def _collect_decrypted_shard(
+        self,
+        shard_bytes: Optional[bytes],
+        multiple_layer_decryption_errors: list,
+        key_shared_secret_shard_conf: dict,
+        decrypted_shards: list,
+        error_report: list,
+    ):
+        error_report.extend(multiple_layer_decryption_errors)
+        if shard_bytes is not None:
+            shard = load_from_binary_envelope(shard_bytes)  # The tuple (idx, payload) of each shard
+            decrypted_shards.append(shard)
+        else:
+            error_entry = self._build_error_report_entry(
+                error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+                error_message="A previous error prevented decrypting shard %s" % str(key_shared_secret_shard_conf),
+                error_exception=None,
+            )
+            error_report.append(error_entry)
 
-        if predecrypted_symkey_mapper and (key_ciphertext in predecrypted_symkey_mapper):
-            predecrypted_symkey_struct = load_from_json_bytes(predecrypted_symkey_mapper[key_ciphertext])
-            predecrypted_symkey = predecrypted_symkey_struct["key_bytes"]
+    def _report_abandoned_shards(
+        self, abandoned_shard_indices: set, key_shared_secret_shards: list, error_report: list
+    ):
+        """Shards skipped or cancelled once the threshold was reached are not errors, but must remain traceable."""
+        for shard_index in sorted(abandoned_shard_indices):
+            error_entry = self._build_error_report_entry(
+                error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+                error_message="Decryption of shard %s was skipped or cancelled, since enough shards were decrypted"
+                % str(key_shared_secret_shards[shard_index]),
+                error_criticity=DecryptionErrorCriticity.WARNING,
+                error_exception=None,
+            )
+            error_report.append(error_entry)
 
-        return predecrypted_symkey
+    def _recombine_decrypted_shards(
+        self, decrypted_shards: list, key_shared_secret_threshold: int, error_report: list
+    ) -> Optional[bytes]:
+        if len(decrypted_shards) < key_shared_secret_threshold:
+            error_entry = self._build_error_report_entry(
+                error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+                error_message="%s valid shard(s) missing for reconstitution "
+                "of symmetric key" % (key_shared_secret_threshold - len(decrypted_shards)),
+                error_exception=None,
+            )
+            error_report.append(error_entry)
+            return None
+        logger.debug("A sufficient number of shared-secret shards has been decrypted")
+        return recombine_secret_from_shards(shards=decrypted_shards)
 
-    @staticmethod
+    def _decrypt_key_with_symmetric_cipher(
+        self, key_cipherdict: dict, key_cipher_algo: str, sub_symkey_bytes: Optional[bytes], error_report: list
+    ) -> Optional[bytes]:
+        key_bytes = None
+        if sub_symkey_bytes:
+            sub_symkey_dict = load_from_binary_envelope(sub_symkey_bytes)
+            try:
+                key_bytes = decrypt_bytestring(key_cipherdict, cipher_algo=key_cipher_algo, key_dict=sub_symkey_dict)
+            except DecryptionError as exc:
+                error_entry = self._build_error_report_entry(
+                    error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+                    error_message="Error decrypting key with symmetric algorithm %s algorithm" % key_cipher_algo,
+                    error_criticity=DecryptionErrorCriticity.ERROR,
+                    error_exception=exc,
+                )
+                error_report.append(error_entry)
+        return key_bytes
+
+    @staticmethod
+    def _get_predecrypted_symkey_or_none(key_ciphertext, predecrypted_symkey_mapper: Optional[dict]) -> Optional[bytes]:
+        predecrypted_symkey = None
+
+        if predecrypted_symkey_mapper and (key_ciphertext in predecrypted_symkey_mapper):
+            predecrypted_symkey_struct = load_from_binary_envelope(predecrypted_symkey_mapper[key_ciphertext])
+            predecrypted_symkey = predecrypted_symkey_struct["key_bytes"]
+
+        return predecrypted_symkey
+
+    @staticmethod
     def _build_error_report_entry(
         error_type: str, error_message: str, error_criticity=DecryptionErrorCriticity.WARNING, error_exception=None
     ) -> dict:
@@ -1235,20 +2329,7 @@ class CryptainerDecryptor(CryptainerBase):
             "error_exception": error_exception,
         }
 
-        SCHEMA_ERROR = Schema(
-            {
-                "error_type": Or(
-                    DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
-                    DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
-                    DecryptionErrorType.SIGNATURE_ERROR,
-                ),
-                "error_criticity": Or(DecryptionErrorCriticity.ERROR, DecryptionErrorCriticity.WARNING),
-                "error_message": And(str, len),
-                "error_exception": Or(Exception, None),
-            }
-        )
-
-        _validate_data_tree(data_tree=error_entry, valid_schema=SCHEMA_ERROR)
+        _validate_data_tree(data_tree=error_entry, valid_schema=DECRYPTION_ERROR_ENTRY_SCHEMA)
 
         return error_entry
 
@@ -1259,6 +2340,7 @@ class CryptainerDecryptor(CryptainerBase):
         cipherdict: dict,
         trustee: dict,
         cryptainer_metadata: Optional[dict],
+        key_ciphertext: Optional[bytes] = None,
     ) -> tuple:
         """
         Decrypt given cipherdict with an asymmetric algorithm.
@@ -1267,116 +2349,173 @@ class CryptainerDecryptor(CryptainerBase):
         :param keychain_uid: final uuid for the set of encryption keys used
         :param cipherdict: dictionary with payload components needed to decrypt the ciphered payload
         :param trustee: trustee used for encryption (findable in configuration tree)
+        :param key_ciphertext: serialized form of `cipherdict`, used as cache key by decryption sessions
 
         :return: decypted payload as bytes
         """
         error_report = []
         key_bytes = None
 
-        trustee_id = get_trustee_id(trustee)
-        passphrases = self._passphrase_mapper.get(trustee_id) or []
-        assert isinstance(passphrases, list), repr(passphrases)  # No SINGLE passphrase here
-
-        passphrases += self._passphrase_mapper.get(None) or []  # Add COMMON passphrases
+        passphrases = self._get_trustee_passphrases(trustee)
 
         try:
-            trustee_proxy = get_trustee_proxy(trustee=trustee, keystore_pool=self._keystore_pool)
+            trustee_proxy = self._get_trustee_proxy(trustee)
         except KeystoreDoesNotExist as exc:
-            error_entry = self._build_error_report_entry(
-                error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
-                error_message="Trustee key storage not found (%s)" % trustee["keystore_uid"],
-                error_exception=exc,
-            )
-            error_report.append(error_entry)
+            error_report.append(self._build_trustee_not_found_error_entry(trustee, exc))
 
         else:
             try:
                 # We expect decryption authorization requests to have already been done properly
-                key_struct_bytes = trustee_proxy.decrypt_with_private_key(
-                    keychain_uid=keychain_uid,
-                    cipher_algo=cipher_algo,
-                    cipherdict=cipherdict,
-                    passphrases=passphrases,
-                    cryptainer_metadata=cryptainer_metadata,
+                if self._decryption_session and key_ciphertext is not None:
+                    key_struct_bytes = self._decryption_session.decrypt_with_private_key(
+                        trustee,
+                        keychain_uid=keychain_uid,
+                        cipher_algo=cipher_algo,
+                        cipherdict=cipherdict,
+                        key_ciphertext=key_ciphertext,
+                        passphrases=passphrases,
+                        cryptainer_metadata=cryptainer_metadata,
+                    )
+                else:
+                    key_struct_bytes = trustee_proxy.decrypt_with_private_key(
+                        keychain_uid=keychain_uid,
+                        cipher_algo=cipher_algo,
+                        cipherdict=cipherdict,
+                        passphrases=passphrases,
+                        cryptainer_metadata=cryptainer_metadata,
+                    )
+                key_bytes = self._extract_key_bytes_from_key_struct(key_struct_bytes)
+
+            except (KeyDoesNotExist, KeyLoadingError, DecryptionError) as exc:
+                error_report.append(
+                    self._build_asymmetric_decryption_error_entry(
+                        exc, cipher_algo=cipher_algo, keychain_uid=keychain_uid
+                    )
                 )
-                key_struct = load_from_json_bytes(key_struct_bytes)
-                key_bytes = key_struct["key_bytes"]
-                assert isinstance(key_bytes, bytes), key_bytes
 
-                actual_cryptainer_metadata = key_struct[
-                    "cryptainer_metadata"
-                ]  # Metadata stored along the encrypted key!
-                del actual_cryptainer_metadata  # No use for now
+        return key_bytes, error_report
 
-            except KeyDoesNotExist as exc:
-                error_entry = self._build_error_report_entry(
-                    error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
-                    error_message="Private key not found (%s/%s)" % (cipher_algo, keychain_uid),
-                    error_exception=exc,
-                )
-                error_report.append(error_entry)
+    def _get_trustee_passphrases(self, trustee: dict) -> list:
+        trustee_id = get_trustee_id(trustee)
+        passphrases = self._passphrase_mapper.get(trustee_id) or []
+        assert isinstance(passphrases, list), repr(passphrases)  # No SINGLE passphrase here
 
-            except KeyLoadingError as exc:
-                error_entry = self._build_error_report_entry(
-                    error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
-                    error_message="Could not load private key (%s/%s)" % (cipher_algo, keychain_uid),
-                    error_exception=exc,
-                )
-                error_report.append(error_entry)
+        passphrases = passphrases + (self._passphrase_mapper.get(None) or [])  # Add COMMON passphrases (no mutation)
+        return passphrases
 
-            except DecryptionError as exc:
-                error_entry = self._build_error_report_entry(
-                    error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
-                    error_message="Failed decrypting key with asymmetric algorithm %s (%s)" % (cipher_algo, exc),
-                    error_criticity=DecryptionErrorCriticity.ERROR,
-                    error_exception=exc,
-                )
-                error_report.append(error_entry)
+    @staticmethod
+    def _extract_key_bytes_from_key_struct(key_struct_bytes: bytes) -> bytes:
+        key_struct = load_from_binary_envelope(key_struct_bytes)
+        key_bytes = key_struct["key_bytes"]
+        assert isinstance(key_bytes, bytes), key_bytes
 
-        return key_bytes, error_report
+        actual_cryptainer_metadata = key_struct["cryptainer_metadata"]  # Metadata stored along the encrypted key!
+        del actual_cryptainer_metadata  # No use for now
+        return key_bytes
 
-    def _verify_payload_signature(self, default_keychain_uid: uuid.UUID, payload: bytes, cryptoconf: dict):
+    def _build_trustee_not_found_error_entry(self, trustee: dict, exc: KeystoreDoesNotExist) -> dict:
+        return self._build_error_report_entry(
+            error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+            error_message="Trustee key storage not found (%s)" % trustee["keystore_uid"],
+            error_exception=exc,
+        )
+
+    def _build_asymmetric_decryption_error_entry(
+        self, exc: Exception, cipher_algo: str, keychain_uid: uuid.UUID
+    ) -> dict:
+        if isinstance(exc, KeyDoesNotExist):
+            return self._build_error_report_entry(
+                error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+                error_message="Private key not found (%s/%s)" % (cipher_algo, keychain_uid),
+                error_exception=exc,
+            )
+        if isinstance(exc, KeyLoadingError):
+            return self._build_error_report_entry(
+                error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+                error_message="Could not load private key (%s/%s)" % (cipher_algo, keychain_uid),
+                error_exception=exc,
+            )
+        assert isinstance(exc, DecryptionError), exc
+        return self._build_error_report_entry(
+            error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+            error_message="Failed decrypting key with asymmetric algorithm %s (%s)" % (cipher_algo, exc),
+            error_criticity=DecryptionErrorCriticity.ERROR,
+            error_exception=exc,
+        )
+
+    def _verify_payload_signature(
+        self,
+        default_keychain_uid: uuid.UUID,
+        payload: Optional[bytes],
+        cryptoconf: dict,
+        payload_digests: Optional[dict] = None,
+    ):
         """
         Verify a signature for a specific message. An error is raised if signature isn't correct.
 
         :param default_keychain_uid: default uuid for the set of encryption keys used
-        :param payload: payload on which to verify signature (after digest)
+        :param payload: payload on which to verify signature (after digest), or None if its digest is precomputed
         :param cryptoconf: configuration tree inside payload_signatures
+        :param payload_digests: optional cache dict, mapping digest algos to digests of this same payload
         """
-        error_report = []
-        payload_digest_algo = cryptoconf["payload_digest_algo"]
         payload_signature_algo = cryptoconf["payload_signature_algo"]
         keychain_uid = cryptoconf.get("keychain_uid") or default_keychain_uid
-        trustee_proxy = get_trustee_proxy(
-            trustee=cryptoconf["payload_signature_trustee"], keystore_pool=self._keystore_pool
+
+        public_key, error_report = self._load_signature_public_key(
+            trustee=cryptoconf["payload_signature_trustee"],
+            keychain_uid=keychain_uid,
+            signature_algo=payload_signature_algo,
+        )
+        if public_key is None:
+            return error_report
+
+        return self._check_payload_signature(
+            payload=payload, cryptoconf=cryptoconf, public_key=public_key, payload_digests=payload_digests
         )
+
+    def _load_signature_public_key(self, trustee: dict, keychain_uid: uuid.UUID, signature_algo: str) -> tuple:
+        """Return a tuple (public_key or None, error_report)."""
+        error_report = []
+        trustee_proxy = self._get_trustee_proxy(trustee)
         try:
             public_key_pem = trustee_proxy.fetch_public_key(
-                keychain_uid=keychain_uid, key_algo=payload_signature_algo, must_exist=True
+                keychain_uid=keychain_uid, key_algo=signature_algo, must_exist=True
             )
         except KeyDoesNotExist as exc:
             error_entry = self._build_error_report_entry(
                 error_type=DecryptionErrorType.SIGNATURE_ERROR,
-                error_message="Private key %s/%s not found" % (payload_signature_algo, keychain_uid),
+                error_message="Private key %s/%s not found" % (signature_algo, keychain_uid),
                 error_exception=exc,
             )
             error_report.append(error_entry)
-            return error_report
+            return None, error_report
 
         try:
-            public_key = load_asymmetric_key_from_pem_bytestring(
-                key_pem=public_key_pem, key_algo=payload_signature_algo
-            )
+            public_key = load_asymmetric_key_from_pem_bytestring(key_pem=public_key_pem, key_algo=signature_algo)
         except KeyLoadingError as exc:
             error_entry = self._build_error_report_entry(
                 error_type=DecryptionErrorType.SIGNATURE_ERROR,
-                error_message="Failed loading signature key from pem bytestring (%s)" % payload_signature_algo,
+                error_message="Failed loading signature key from pem bytestring (%s)" % signature_algo,
                 error_exception=exc,
             )
             error_report.append(error_entry)
-            return error_report
+            return None, error_report
+
+        return public_key, error_report
+
+    def _check_payload_signature(
+        self, payload: Optional[bytes], cryptoconf: dict, public_key: object, payload_digests: Optional[dict] = None
+    ) -> list:
+        error_report = []
+        payload_digest_algo = cryptoconf["payload_digest_algo"]
+        payload_signature_algo = cryptoconf["payload_signature_algo"]
 
-        payload_digest = hash_message(payload, hash_algo=payload_digest_algo)
+        if payload_digests is None:
+            payload_digests = {}
+        payload_digest = payload_digests.get(payload_digest_algo)
+        if payload_digest is None:
+            assert payload is not None, payload_digest_algo
+            payload_digest = payload_digests[payload_digest_algo] = hash_message(payload, hash_algo=payload_digest_algo)
 
         expected_payload_digest = cryptoconf.get("payload_digest_value")  # Might be missing
         if expected_payload_digest and expected_payload_digest != payload_digest:
@@ -1414,72 +2553,755 @@ class CryptainerDecryptor(CryptainerBase):
 
         return error_report
 
+    def verify_payload_signatures(self, cryptainers: Sequence) -> list:
+        """
+        Verify the signatures of the outermost payload cipher layer of each cryptainer, i.e. those computed
+        on the stored payload ciphertext (signatures of inner layers can only be checked during decryption).
+
+        Public keys are fetched and loaded once per (trustee, keychain_uid, signature algo), and each digest
+        of a payload is computed once; cryptainers are then processed on the thread pool.
+
+        :return: list of error reports, one per cryptainer, in the same order
+        """
+        signature_key_groups = {}  # Maps (trustee_id, keychain_uid, signature_algo) to trustee dict
+        cryptainer_signature_tasks = []
+
+        for cryptainer in cryptainers:
+            signature_tasks = []
+            default_keychain_uid = cryptainer["keychain_uid"]
+            for signature_conf in cryptainer["payload_cipher_layers"][-1]["payload_signatures"]:
+                trustee = signature_conf["payload_signature_trustee"]
+                keychain_uid = signature_conf.get("keychain_uid") or default_keychain_uid
+                key_group = (get_trustee_id(trustee), keychain_uid, signature_conf["payload_signature_algo"])
+                signature_key_groups.setdefault(key_group, trustee)
+                signature_tasks.append((key_group, signature_conf))
+            cryptainer_signature_tasks.append(signature_tasks)
+
+        def _load_public_key(key_group, trustee):
+            _trustee_id, keychain_uid, signature_algo = key_group
+            return self._load_signature_public_key(
+                trustee=trustee, keychain_uid=keychain_uid, signature_algo=signature_algo
+            )
+
+        # Each key group may involve a different (remote) trustee, so we contact them all at once
+        loaded_public_keys = dict(
+            zip(
+                signature_key_groups,
+                self._map_concurrently(_load_public_key, signature_key_groups.keys(), signature_key_groups.values()),
+            )
+        )
+
+        def _verify_cryptainer_signatures(cryptainer, signature_tasks):
+            error_report = []
+            payload = None
+            payload_digests = {}
+            for key_group, signature_conf in signature_tasks:
+                public_key, key_error_report = loaded_public_keys[key_group]
+                if public_key is None:
+                    error_report.extend(key_error_report)
+                    continue
+                if payload is None:
+                    payload = _get_cryptainer_inline_ciphertext_value(cryptainer)
+                error_report.extend(
+                    self._check_payload_signature(
+                        payload=payload,
+                        cryptoconf=signature_conf,
+                        public_key=public_key,
+                        payload_digests=payload_digests,
+                    )
+                )
+            return error_report
+
+        return self._map_concurrently(_verify_cryptainer_signatures, cryptainers, cryptainer_signature_tasks)
+
+
+class AsyncCryptainerDecryptor(CryptainerDecryptor):
+    """
+    THIS CLASS IS PRIVATE API
+
+    Asyncio variant of the in-memory decryptor.
+
+    Payload keys are unwrapped on the event loop: private-key decryptions are awaited through async trustee proxies,
+    and the shards of shared secrets are decrypted concurrently (slower shards being cancelled once the threshold
+    is reached), so that no thread is blocked by trustee calls. Blocking work (revelation gateways, decryption
+    session caches, payload decryption and signature checks) is run on `executor` (or on the default executor of
+    the event loop).
+    """
+
+    def __init__(self, keystore_pool: KeystorePoolBase = None, executor: Optional[Executor] = None, **kwargs):
+        super().__init__(keystore_pool=keystore_pool, **kwargs)
+        self._executor = executor
+        self._async_trustee_proxies = {}  # Cache mapping trustee IDs to async proxies
+
+    def _get_async_trustee_proxy(self, trustee: dict):
+        """Method meant to be overridden to plug natively asynchronous trustee clients"""
+        trustee_id = get_trustee_id(trustee)
+        async_trustee_proxy = self._async_trustee_proxies.get(trustee_id)
+        if async_trustee_proxy is None:
+            async_trustee_proxy = AsyncTrusteeProxy(self._get_trustee_proxy(trustee), executor=self._executor)
+            self._async_trustee_proxies[trustee_id] = async_trustee_proxy
+        return async_trustee_proxy
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _adecrypt_with_asymmetric_cipher(
+        self,
+        cipher_algo: str,
+        keychain_uid: uuid.UUID,
+        cipherdict: dict,
+        trustee: dict,
+        cryptainer_metadata: Optional[dict],
+        key_ciphertext: bytes,
+    ) -> tuple:
+        error_report = []
+        key_bytes = None
+
+        passphrases = self._get_trustee_passphrases(trustee)
+
+        try:
+            if self._decryption_session:  # Blocking, since it shares its caches with other threads
+                key_struct_bytes = await self._run_in_executor(
+                    self._decryption_session.decrypt_with_private_key,
+                    trustee,
+                    keychain_uid=keychain_uid,
+                    cipher_algo=cipher_algo,
+                    cipherdict=cipherdict,
+                    key_ciphertext=key_ciphertext,
+                    passphrases=passphrases,
+                    cryptainer_metadata=cryptainer_metadata,
+                )
+            else:
+                async_trustee_proxy = self._get_async_trustee_proxy(trustee)
+                key_struct_bytes = await async_trustee_proxy.decrypt_with_private_key(
+                    keychain_uid=keychain_uid,
+                    cipher_algo=cipher_algo,
+                    cipherdict=cipherdict,
+                    passphrases=passphrases,
+                    cryptainer_metadata=cryptainer_metadata,
+                )
+            key_bytes = self._extract_key_bytes_from_key_struct(key_struct_bytes)
+
+        except KeystoreDoesNotExist as exc:
+            error_report.append(self._build_trustee_not_found_error_entry(trustee, exc))
+
+        except (KeyDoesNotExist, KeyLoadingError, DecryptionError) as exc:
+            error_report.append(
+                self._build_asymmetric_decryption_error_entry(exc, cipher_algo=cipher_algo, keychain_uid=keychain_uid)
+            )
+
+        return key_bytes, error_report
+
+    async def _adecrypt_key_through_multiple_layers(
+        self,
+        default_keychain_uid: uuid.UUID,
+        key_ciphertext: bytes,
+        key_cipher_layers: list,
+        cryptainer_metadata: Optional[dict],
+        predecrypted_symkey_mapper: Optional[dict] = None,
+    ) -> tuple:
+        assert len(key_cipher_layers), key_cipher_layers  # Extra safety
+
+        key_bytes = None
+        error_report = []
+
+        for key_cipher_layer in reversed(key_cipher_layers):
+            key_ciphertext, single_layer_decryption_errors = await self._adecrypt_key_through_single_layer(
+                default_keychain_uid=default_keychain_uid,
+                key_ciphertext=key_ciphertext,
+                key_cipher_layer=key_cipher_layer,
+                cryptainer_metadata=cryptainer_metadata,
+                predecrypted_symkey_mapper=predecrypted_symkey_mapper,
+            )
+            error_report.extend(single_layer_decryption_errors)
+            if not key_ciphertext:
+                break
+        else:
+            key_bytes = key_ciphertext  # Fully decrypted version
+
+        return key_bytes, error_report
+
+    async def _adecrypt_key_through_single_layer(
+        self,
+        default_keychain_uid: uuid.UUID,
+        key_ciphertext: bytes,
+        key_cipher_layer: dict,
+        cryptainer_metadata: Optional[dict],
+        predecrypted_symkey_mapper: Optional[dict] = None,
+    ) -> tuple:
+        """Asyncio equivalent of `_decrypt_key_through_single_layer()`."""
+        import asyncio
+
+        error_report = []
+        key_bytes = None
+
+        assert isinstance(key_ciphertext, bytes), key_ciphertext
+
+        key_cipherdict = load_from_binary_envelope(key_ciphertext)
+        assert isinstance(key_cipherdict, dict), key_cipherdict
+
+        key_cipher_algo = key_cipher_layer["key_cipher_algo"]
+
+        if key_cipher_algo == SHARED_SECRET_ALGO_MARKER:
+
+            decrypted_shards = []
+            key_shared_secret_shards = key_cipher_layer["key_shared_secret_shards"]
+            key_shared_secret_threshold = key_cipher_layer["key_shared_secret_threshold"]
+
+            shard_ciphertexts = key_cipherdict["shard_ciphertexts"]
+
+            logger.debug("Deciphering the %d shards of shared secret", len(shard_ciphertexts))
+
+            task_indices = {
+                asyncio.ensure_future(
+                    self._adecrypt_key_through_multiple_layers(
+                        default_keychain_uid=default_keychain_uid,
+                        key_ciphertext=shard_ciphertext,
+                        key_cipher_layers=key_shared_secret_shard_conf["key_cipher_layers"],
+                        cryptainer_metadata=cryptainer_metadata,
+                        predecrypted_symkey_mapper=predecrypted_symkey_mapper,
+                    )
+                ): shard_index
+                for (shard_index, (shard_ciphertext, key_shared_secret_shard_conf)) in enumerate(
+                    zip(shard_ciphertexts, key_shared_secret_shards)
+                )
+            }
+
+            abandoned_shard_indices = set(task_indices.values())
+            pending_tasks = set(task_indices)
+            try:
+                while pending_tasks and len(decrypted_shards) < key_shared_secret_threshold:
+                    done_tasks, pending_tasks = await asyncio.wait(pending_tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in sorted(done_tasks, key=task_indices.get):
+                        abandoned_shard_indices.remove(task_indices[task])
+                        shard_bytes, multiple_layer_decryption_errors = task.result()  # Exceptions are propagated
+                        self._collect_decrypted_shard(
+                            shard_bytes,
+                            multiple_layer_decryption_errors,
+                            key_shared_secret_shard_conf=key_shared_secret_shards[task_indices[task]],
+                            decrypted_shards=decrypted_shards,
+                            error_report=error_report,
+                        )
+                        if len(decrypted_shards) == key_shared_secret_threshold:
+                            break  # Abandon slower shards
+            finally:
+                for task in pending_tasks:
+                    task.cancel()
+            self._report_abandoned_shards(abandoned_shard_indices, key_shared_secret_shards, error_report=error_report)
+
+            key_bytes = self._recombine_decrypted_shards(
+                decrypted_shards, key_shared_secret_threshold=key_shared_secret_threshold, error_report=error_report
+            )
+
+        elif key_cipher_algo in SUPPORTED_SYMMETRIC_KEY_ALGOS:
+            assert key_cipher_algo in SUPPORTED_CIPHER_ALGOS, key_cipher_algo  # Not a SIGNATURE algo
+
+            sub_symkey_bytes, multiple_layer_decryption_errors = await self._adecrypt_key_through_multiple_layers(
+                default_keychain_uid=default_keychain_uid,
+                key_ciphertext=key_cipher_layer["key_ciphertext"],
+                key_cipher_layers=key_cipher_layer["key_cipher_layers"],
+                cryptainer_metadata=cryptainer_metadata,
+                predecrypted_symkey_mapper=predecrypted_symkey_mapper,
+            )  # Recursive structure
+            error_report.extend(multiple_layer_decryption_errors)
+
+            key_bytes = self._decrypt_key_with_symmetric_cipher(  # Tiny key, no need for executor
+                key_cipherdict,
+                key_cipher_algo=key_cipher_algo,
+                sub_symkey_bytes=sub_symkey_bytes,
+                error_report=error_report,
+            )
+
+        else:  # Using asymmetric algorithm
+
+            assert key_cipher_algo in SUPPORTED_ASYMMETRIC_KEY_ALGOS
+            assert key_cipher_algo in SUPPORTED_CIPHER_ALGOS, key_cipher_algo  # Not a SIGNATURE algo
+
+            predecrypted_symmetric_key = self._get_predecrypted_symkey_or_none(
+                key_ciphertext, predecrypted_symkey_mapper=predecrypted_symkey_mapper
+            )
+            if predecrypted_symmetric_key:
+                key_bytes = predecrypted_symmetric_key
+            else:
+                key_bytes, asymetric_decryption_errors = await self._adecrypt_with_asymmetric_cipher(
+                    cipher_algo=key_cipher_algo,
+                    keychain_uid=key_cipher_layer.get("keychain_uid") or default_keychain_uid,
+                    cipherdict=key_cipherdict,
+                    key_ciphertext=key_ciphertext,
+                    trustee=key_cipher_layer["key_cipher_trustee"],
+                    cryptainer_metadata=cryptainer_metadata,
+                )
+                error_report.extend(asymetric_decryption_errors)
+
+        return key_bytes, error_report
+
+    async def _aunwrap_payload_cipher_layer_keys(
+        self, cryptainer: dict, predecrypted_symkey_mapper: Optional[dict]
+    ) -> list:
+        """Asyncio equivalent of `_unwrap_payload_cipher_layer_keys()`, payload cipher layers being concurrent."""
+        import asyncio
+
+        assert isinstance(cryptainer, dict), cryptainer
+
+        cryptainer_format = cryptainer["cryptainer_format"]
+        if cryptainer_format not in SUPPORTED_CRYPTAINER_FORMATS:
+            raise ValueError("Unknown cryptainer format %s" % cryptainer_format)
+
+        payload_cipher_layer_keys = await asyncio.gather(
+            *(
+                self._adecrypt_key_through_multiple_layers(
+                    default_keychain_uid=cryptainer["keychain_uid"],
+                    key_ciphertext=payload_cipher_layer["key_ciphertext"],
+                    key_cipher_layers=payload_cipher_layer["key_cipher_layers"],
+                    cryptainer_metadata=cryptainer["cryptainer_metadata"],
+                    predecrypted_symkey_mapper=predecrypted_symkey_mapper,
+                )
+                for payload_cipher_layer in cryptainer["payload_cipher_layers"]
+            )
+        )
+        return list(payload_cipher_layer_keys)
+
+    async def adecrypt_payload(
+        self,
+        cryptainer: dict,
+        verify_integrity_tags: bool = True,
+        gateway_urls: Optional[list] = None,
+        revelation_requestor_uid: Optional[uuid.UUID] = None,
+        payload_ciphertext_struct_loader: Optional[Callable] = None,
+    ) -> tuple:
+        """Asyncio equivalent of `decrypt_payload()`."""
+        predecrypted_symkey_mapper, error_report = await self._run_in_executor(
+            self._get_predecrypted_symkey_mapper,
+            cryptainer,
+            gateway_urls=gateway_urls,
+            revelation_requestor_uid=revelation_requestor_uid,
+        )
+
+        payload_cipher_layer_keys = await self._aunwrap_payload_cipher_layer_keys(
+            cryptainer, predecrypted_symkey_mapper
+        )
+
+        return await self._run_in_executor(
+            self._decrypt_payload_with_unwrapped_keys,
+            cryptainer,
+            payload_cipher_layer_keys=payload_cipher_layer_keys,
+            error_report=error_report,
+            verify_integrity_tags=verify_integrity_tags,
+            payload_ciphertext_struct_loader=payload_ciphertext_struct_loader,
+        )
+
+
+class CryptainerHeaderFactory:
+    """
+    THIS CLASS IS PRIVATE API
+
+    Background generator of ready-made cryptainer headers, i.e. (cryptainer base, payload_cipher_layer_extracts)
+    pairs, so that new encryption streams don't have to wait for symmetric key generation and trustee key wrapping.
+
+    A pool of up to `pool_size` headers is kept for each recently used combination of cryptoconf, keychain_uid
+    and cryptainer metadata (the latter being embedded in encrypted keys), and refilled after each retrieval.
+
+    BEWARE, pregenerated headers contain secret symmetric keys, kept in RAM until used.
+    """
+
+    max_header_key_count = 4  # Limits the count of separate pools
+
+    def __init__(self, keystore_pool: Optional[KeystorePoolBase], pool_size: int, binary_key_envelopes: bool = False):
+        assert pool_size >= 1, pool_size
+        self._pool_size = pool_size
+        self._cryptainer_encryptor = CryptainerEncryptor(
+            keystore_pool=keystore_pool, binary_key_envelopes=binary_key_envelopes
+        )
+        self._thread_pool_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cryptainer_header_worker")
+        self._header_pools = OrderedDict()  # Maps header keys to deques of ready-made headers, most recent last
+        self._pending_refill_keys = set()
+        self._pending_executor_futures = []
+        self._lock = threading.Lock()
+
+    def __del__(self):
+        self._thread_pool_executor.shutdown(wait=False)
+
+    @staticmethod
+    def _get_header_key(cryptoconf, keychain_uid, cryptainer_metadata) -> tuple:
+        cryptoconf_tree = cryptoconf.cryptoconf if isinstance(cryptoconf, CryptoconfPlan) else cryptoconf
+        return (dump_to_json_bytes(cryptoconf_tree), keychain_uid, dump_to_json_bytes(cryptainer_metadata))
+
+    def _get_header_pool(self, header_key) -> deque:
+        header_pool = self._header_pools.get(header_key)
+        if header_pool is None:
+            header_pool = self._header_pools[header_key] = deque()
+            while len(self._header_pools) > self.max_header_key_count:
+                self._header_pools.popitem(last=False)  # Forget least recently used pool
+        self._header_pools.move_to_end(header_key)
+        return header_pool
+
+    @synchronized
+    def schedule_refill(self, cryptoconf, keychain_uid=None, cryptainer_metadata=None):
+        """Ensure that headers for these parameters get (re)generated in background."""
+        header_key = self._get_header_key(cryptoconf, keychain_uid, cryptainer_metadata)
+        if header_key in self._pending_refill_keys:
+            return
+        self._pending_refill_keys.add(header_key)
+        if not isinstance(cryptoconf, CryptoconfPlan):
+            cryptoconf = copy.deepcopy(cryptoconf)  # Caller might modify it later
+        future = self._thread_pool_executor.submit(
+            self._offloaded_refill_header_pool,
+            header_key=header_key,
+            cryptoconf=cryptoconf,
+            keychain_uid=keychain_uid,
+            cryptainer_metadata=copy.deepcopy(cryptainer_metadata),
+        )
+        self._pending_executor_futures = [f for f in self._pending_executor_futures if not f.done()] + [future]
+
+    @catch_and_log_exception("CryptainerHeaderFactory._offloaded_refill_header_pool")
+    def _offloaded_refill_header_pool(self, header_key, cryptoconf, keychain_uid, cryptainer_metadata):
+        try:
+            while True:
+                with self._lock:
+                    if len(self._get_header_pool(header_key)) >= self._pool_size:
+                        break
+                cryptainer_base_and_secrets = self._cryptainer_encryptor._generate_cryptainer_base_and_secrets(
+                    cryptoconf=cryptoconf,
+                    default_keychain_uid=keychain_uid,
+                    cryptainer_metadata=copy.deepcopy(cryptainer_metadata),
+                )
+                with self._lock:
+                    self._get_header_pool(header_key).append(cryptainer_base_and_secrets)
+        finally:
+            with self._lock:
+                self._pending_refill_keys.discard(header_key)
+
+    def pop_cryptainer_base_and_secrets(
+        self, cryptoconf, keychain_uid=None, cryptainer_metadata=None
+    ) -> Optional[tuple]:
+        """Return a ready-made header for these parameters (or None if none is available), and schedule a refill.
+
+        Parameters seen for the first time (e.g. record-specific metadata) don't trigger any refill, so that
+        headers are only pregenerated for recurring parameters.
+        """
+        header_key = self._get_header_key(cryptoconf, keychain_uid, cryptainer_metadata)
+        with self._lock:
+            is_known_header_key = header_key in self._header_pools
+            header_pool = self._get_header_pool(header_key)
+            cryptainer_base_and_secrets = header_pool.popleft() if header_pool else None
+        logger.debug("Ready-made cryptainer header %s", "found" if cryptainer_base_and_secrets else "not available")
+        if is_known_header_key:
+            self.schedule_refill(cryptoconf, keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata)
+        return cryptainer_base_and_secrets
+
+    def wait_for_idle_state(self):
+        """Wait for pending header generations to be completed."""
+        with self._lock:
+            pending_executor_futures = list(self._pending_executor_futures)
+        for future in pending_executor_futures:
+            future.result()  # Should NEVER raise, thanks to @catch_and_log_exception
+
 
 class CryptainerEncryptionPipeline:  # Fixme normalize to CryptainerEncryptionStream and expose File write/close API?
     """
     Helper which prebuilds a cryptainer without signatures nor payload,
     fills its OFFLOADED ciphertext file chunk by chunk, and then
     dumps the final cryptainer (with signatures) to disk.
+
+    If `checkpoint_interval` is set, the secret state of the pipeline is saved each time this count of payload bytes
+    has been processed, so that an interrupted stream can be continued with `resume_from_checkpoint()`.
+    By default, checkpoints are encrypted with the key cipher layers of the cryptainer itself, so resuming requires
+    the same trustees as decrypting; a `checkpoint_cryptoconf` (e.g. LOCAL_CHECKPOINT_CRYPTOCONF) can be provided
+    instead, if the security tradeoff is acceptable.
+
+    If `single_file` is set, the ciphertext is instead appended to the temporary cryptainer file, after its header
+    and some spare room; this header is rewritten in place at finalization, before the file gets its final name.
+
+    A `cryptainer_uid` may be provided when an existing cryptainer is re-encrypted, so that it keeps its identity.
     """
 
-    def __init__(
-        self,
+    _output_data_stream = None
+
+    def __init__(
+        self,
+        cryptainer_filepath: Path,
+        *,
+        cryptoconf: Union[dict, CryptoconfPlan],
+        cryptainer_metadata: Optional[dict],
+        keychain_uid: Optional[uuid.UUID] = None,
+        keystore_pool: Optional[KeystorePoolBase] = None,
+        dump_initial_cryptainer=True,
+        cryptainer_header_factory: Optional[CryptainerHeaderFactory] = None,
+        checkpoint_interval: Optional[int] = None,
+        checkpoint_cryptoconf: Optional[dict] = None,
+        binary_format: bool = False,
+        single_file: bool = False,
+        binary_key_envelopes: bool = False,
+        cryptainer_uid: Optional[uuid.UUID] = None,
+    ):
+        assert not checkpoint_interval or dump_initial_cryptainer  # Else nothing to resume
+        self._setup_common_attributes(
+            cryptainer_filepath,
+            keystore_pool=keystore_pool,
+            checkpoint_interval=checkpoint_interval,
+            binary_key_envelopes=binary_key_envelopes,
+        )
+        self._checkpoint_cryptoconf = checkpoint_cryptoconf or _build_escrowed_checkpoint_cryptoconf(cryptoconf)
+        self._binary_format = binary_format
+        self._single_file = single_file
+
+        if single_file:
+            self._output_data_stream = open(self._cryptainer_filepath_temp, mode="w+b")
+        else:
+            offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
+            self._output_data_stream = open(offloaded_file_path, mode="wb")
+
+        cryptainer_base_and_secrets = None
+        if cryptainer_header_factory and not cryptainer_uid:  # Pregenerated headers have their own uids
+            cryptainer_base_and_secrets = cryptainer_header_factory.pop_cryptainer_base_and_secrets(
+                cryptoconf, keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
+            )
+        if cryptainer_base_and_secrets is None:
+            cryptainer_base_and_secrets = self._cryptainer_encryptor._generate_cryptainer_base_and_secrets(
+                cryptoconf=cryptoconf,
+                default_keychain_uid=keychain_uid,
+                cryptainer_metadata=cryptainer_metadata,
+                cryptainer_uid=cryptainer_uid,
+            )
+        self._payload_cipher_layer_extracts = cryptainer_base_and_secrets[1]  # Needed for checkpoints
+
+        self._wip_cryptainer, self._encryption_pipeline = self._cryptainer_encryptor.build_cryptainer_and_encryption_pipeline(
+            output_stream=self._output_data_stream,
+            cryptoconf=cryptoconf,
+            keychain_uid=keychain_uid,
+            cryptainer_metadata=cryptainer_metadata,
+            cryptainer_base_and_secrets=cryptainer_base_and_secrets,
+        )
+        self._wip_cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER  # Important
+
+        if single_file:  # Header must always be written first, to reserve its room before ciphertext
+            header_bytes = dump_cryptainer_to_bytes(self._wip_cryptainer, binary_format=binary_format)
+            self._payload_offset = (
+                CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH + len(header_bytes) + CRYPTAINER_SINGLE_FILE_HEADER_ROOM
+            )
+            _write_single_file_offsets(
+                self._output_data_stream,
+                (CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH, len(header_bytes), self._payload_offset, 0),
+            )
+            self._output_data_stream.write(header_bytes)
+            self._output_data_stream.seek(self._payload_offset)
+        elif dump_initial_cryptainer:  # Savegame in case the stream is broken before finalization
+            self._dump_current_cryptainer_to_filesystem(is_temporary=True)
+
+    def _setup_common_attributes(
+        self, cryptainer_filepath, keystore_pool, checkpoint_interval, binary_key_envelopes=False
+    ):
+        assert checkpoint_interval is None or checkpoint_interval > 0, checkpoint_interval
+        self._cryptainer_filepath = cryptainer_filepath
+        self._cryptainer_filepath_temp = cryptainer_filepath.with_suffix(
+            cryptainer_filepath.suffix + CRYPTAINER_TEMP_SUFFIX
+        )
+        self._checkpoint_filepath = _get_checkpoint_file_path(cryptainer_filepath)
+        self._checkpoint_interval = checkpoint_interval
+        self._payload_offset = 0  # Position of ciphertext in output stream
+        self._payload_length = 0
+        self._payload_length_since_checkpoint = 0
+        self._checkpoint_cryptoconf_plan = None  # Compiled on first checkpoint
+        self._keystore_pool = keystore_pool
+        self._cryptainer_encryptor = CryptainerEncryptor(
+            keystore_pool=keystore_pool, binary_key_envelopes=binary_key_envelopes
+        )
+
+    @classmethod
+    def resume_from_checkpoint(
+        cls,
         cryptainer_filepath: Path,
         *,
-        cryptoconf: dict,
-        cryptainer_metadata: Optional[dict],
-        keychain_uid: Optional[uuid.UUID] = None,
         keystore_pool: Optional[KeystorePoolBase] = None,
-        dump_initial_cryptainer=True,
+        checkpoint_interval: Optional[int] = None,
+        passphrase_mapper: Optional[dict] = None,
     ):
+        """Reopen an interrupted encryption stream, in the state of its last checkpoint.
 
-        self._cryptainer_filepath = cryptainer_filepath
-        self._cryptainer_filepath_temp = cryptainer_filepath.with_suffix(
-            cryptainer_filepath.suffix + CRYPTAINER_TEMP_SUFFIX
+        Offloaded ciphertext written after that checkpoint is discarded, so the caller must push again
+        the corresponding payload, if it still has it.
+
+        :param cryptainer_filepath: path of the FINAL cryptainer, as given to the original pipeline
+        :param keystore_pool: key storage pool giving access to the trustees of the checkpoint
+        :param checkpoint_interval: same as for the constructor
+        :param passphrase_mapper: optional dict mapping trustee IDs to their lists of passphrases
+
+        :return: new pipeline instance, ready for more chunks to encrypt (starting at its `payload_length` offset)
+        """
+        self = cls.__new__(cls)
+        self._setup_common_attributes(
+            cryptainer_filepath, keystore_pool=keystore_pool, checkpoint_interval=checkpoint_interval
         )
 
-        offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
-        self._output_data_stream = open(offloaded_file_path, mode="wb")
+        checkpoint_cryptainer = load_cryptainer_from_filesystem(self._checkpoint_filepath)
+        checkpoint_bytes, error_report = decrypt_payload_from_cryptainer(
+            checkpoint_cryptainer, keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper
+        )
+        if checkpoint_bytes is None:
+            raise DecryptionError(
+                "Couldn't decrypt checkpoint of cryptainer %s: %s" % (cryptainer_filepath, error_report)
+            )
+        checkpoint = load_from_json_bytes(checkpoint_bytes)
+
+        self._wip_cryptainer, self._binary_format = _load_cryptainer_file(self._cryptainer_filepath_temp)
+        self._wip_cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+        self._payload_cipher_layer_extracts = checkpoint["payload_cipher_layer_extracts"]
+        self._payload_length = checkpoint["payload_length"]
+        self._checkpoint_cryptoconf = checkpoint["checkpoint_cryptoconf"]
+
+        with open(self._cryptainer_filepath_temp, "rb") as f:
+            single_file_offsets = _read_single_file_offsets(f)
+        self._single_file = bool(single_file_offsets)
+        if self._single_file:
+            self._payload_offset = single_file_offsets[2]
+            ciphertext_filepath = self._cryptainer_filepath_temp
+        else:
+            ciphertext_filepath = _get_offloaded_file_path(cryptainer_filepath)
 
-        self._cryptainer_encryptor = CryptainerEncryptor(keystore_pool=keystore_pool)
+        payload_ciphertext_length = checkpoint["payload_ciphertext_length"]
+        if ciphertext_filepath.stat().st_size < self._payload_offset + payload_ciphertext_length:
+            raise DecryptionError(
+                "Offloaded ciphertext of cryptainer %s is shorter than its checkpoint" % cryptainer_filepath
+            )
 
-        self._wip_cryptainer, self._encryption_pipeline = self._cryptainer_encryptor.build_cryptainer_and_encryption_pipeline(
-            output_stream=self._output_data_stream,
-            cryptoconf=cryptoconf,
-            keychain_uid=keychain_uid,
-            cryptainer_metadata=cryptainer_metadata,
+        logger.info(
+            "Resuming encryption stream of %s from checkpoint at offset %d",
+            cryptainer_filepath,
+            payload_ciphertext_length,
         )
-        self._wip_cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER  # Important
+        self._output_data_stream = open(ciphertext_filepath, mode="r+b")
+        self._output_data_stream.truncate(self._payload_offset + payload_ciphertext_length)
+        self._output_data_stream.seek(self._payload_offset)
 
-        if dump_initial_cryptainer:  # Savegame in case the stream is broken before finalization
-            self._dump_current_cryptainer_to_filesystem(is_temporary=True)
+        self._encryption_pipeline = PayloadEncryptionPipeline(
+            output_stream=self._output_data_stream, payload_cipher_layer_extracts=self._payload_cipher_layer_extracts
+        )
+        self._encryption_pipeline.replay_encryption(
+            self._output_data_stream,
+            pending_payloads=checkpoint["pending_payloads"],
+            chunk_size=DEFAULT_DATA_CHUNK_SIZE,
+        )
+        self._output_data_stream.seek(0, os.SEEK_END)  # New ciphertext gets appended
+        return self
+
+    def checkpoint(self):
+        """Save the current state of the pipeline, encrypted with its checkpoint cryptoconf, nearby the cryptainer."""
+        self._output_data_stream.flush()
+        os.fsync(self._output_data_stream.fileno())  # Checkpoint must never be ahead of ciphertext on disk
+
+        if self._checkpoint_cryptoconf_plan is None:
+            self._checkpoint_cryptoconf_plan = compile_cryptoconf(
+                self._checkpoint_cryptoconf, keystore_pool=self._keystore_pool
+            )
+
+        checkpoint = dict(
+            payload_length=self._payload_length,
+            payload_ciphertext_length=self._output_data_stream.tell() - self._payload_offset,
+            payload_cipher_layer_extracts=self._payload_cipher_layer_extracts,
+            pending_payloads=self._encryption_pipeline.get_pending_payloads(),
+            checkpoint_cryptoconf=self._checkpoint_cryptoconf,  # Needed by resumed pipelines
+        )
+        checkpoint_cryptainer = encrypt_payload_into_cryptainer(
+            dump_to_json_bytes(checkpoint),
+            cryptoconf=self._checkpoint_cryptoconf_plan,
+            cryptainer_metadata=None,
+            keychain_uid=self._wip_cryptainer["keychain_uid"],
+            keystore_pool=self._keystore_pool,
+        )
+        checkpoint_filepath_temp = self._checkpoint_filepath.with_name(
+            self._checkpoint_filepath.name + CRYPTAINER_TEMP_SUFFIX
+        )
+        dump_cryptainer_to_filesystem(
+            checkpoint_filepath_temp,
+            cryptainer=checkpoint_cryptainer,
+            offload_payload_ciphertext=False,
+            binary_format=self._binary_format,
+        )
+        os.replace(checkpoint_filepath_temp, self._checkpoint_filepath)  # Atomic
+        self._payload_length_since_checkpoint = 0
 
     def _dump_current_cryptainer_to_filesystem(self, is_temporary):
         filepath = self._cryptainer_filepath_temp if is_temporary else self._cryptainer_filepath
         dump_cryptainer_to_filesystem(
-            filepath, cryptainer=self._wip_cryptainer, offload_payload_ciphertext=False
-        )  # Payload is ALREADY offloaded separately
+            filepath,
+            cryptainer=self._wip_cryptainer,
+            offload_payload_ciphertext=False,  # Payload is ALREADY offloaded separately
+            binary_format=self._binary_format,
+        )
         if not is_temporary:  # Cleanup temporary cryptainer
             try:
                 self._cryptainer_filepath_temp.unlink()  # TODO use missing_ok=True later with python3.8
             except FileNotFoundError:
                 pass
 
+    @property
+    def payload_length(self) -> int:
+        """Count of payload bytes already pushed to this pipeline (including those before a resumed checkpoint)."""
+        return self._payload_length
+
     def encrypt_chunk(self, chunk: bytes):
         self._encryption_pipeline.encrypt_chunk(chunk)
+        self._payload_length += len(chunk)
+        if self._checkpoint_interval:
+            self._payload_length_since_checkpoint += len(chunk)
+            if self._payload_length_since_checkpoint >= self._checkpoint_interval:
+                self.checkpoint()
+
+    def _finalize_single_file_cryptainer(self):
+        payload_length = self._output_data_stream.tell() - self._payload_offset
+        header_bytes = dump_cryptainer_to_bytes(self._wip_cryptainer, binary_format=self._binary_format)
+        if CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH + len(header_bytes) <= self._payload_offset:
+            header_offset = CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH  # Initial header gets overwritten in place
+        else:
+            logger.warning("Appending final header of %s after its payload", self._cryptainer_filepath)
+            header_offset = self._payload_offset + payload_length
+        self._output_data_stream.seek(header_offset)
+        self._output_data_stream.write(header_bytes)
+        _write_single_file_offsets(
+            self._output_data_stream, (header_offset, len(header_bytes), self._payload_offset, payload_length)
+        )
+        self._output_data_stream.close()
+        os.replace(self._cryptainer_filepath_temp, self._cryptainer_filepath)  # Atomic
 
     def finalize(self):
         self._encryption_pipeline.finalize()  # Would raise if statemachine incoherence
-        self._output_data_stream.close()  # Important
+        if not self._single_file:
+            self._output_data_stream.close()  # Important
 
         payload_integrity_tags = self._encryption_pipeline.get_payload_integrity_tags()
 
         self._cryptainer_encryptor.add_authentication_data_to_cryptainer(self._wip_cryptainer, payload_integrity_tags)
-        self._dump_current_cryptainer_to_filesystem(is_temporary=False)
+        if self._single_file:
+            self._finalize_single_file_cryptainer()
+        else:
+            self._dump_current_cryptainer_to_filesystem(is_temporary=False)
+
+        try:
+            self._checkpoint_filepath.unlink()  # Secret keys must not remain on disk
+        except FileNotFoundError:
+            pass
+        self._cryptainer_encryptor.close()
+
+    def abort(self):
+        """Close the stream and remove all the files created by this pipeline, including its offloaded ciphertext."""
+        self._output_data_stream.close()
+        self._cryptainer_encryptor.close()
+        for filepath in (
+            self._cryptainer_filepath_temp,
+            _get_offloaded_file_path(self._cryptainer_filepath),
+            self._checkpoint_filepath,
+        ):
+            try:
+                filepath.unlink()  # TODO use missing_ok=True later with python3.8
+            except FileNotFoundError:
+                pass
 
     def __del__(self):
         # Emergency closing of open file on deletion
-        if not self._output_data_stream.closed:
+        if self._output_data_stream and not self._output_data_stream.closed:
             logger.error(
                 "Encountered abnormal open file in __del__ of CryptainerEncryptionPipeline: %s"
                 % self._output_data_stream
@@ -1488,6 +3310,8 @@ class CryptainerEncryptionPipeline:  # Fixme normalize to CryptainerEncryptionSt
 
 
 def is_cryptainer_cryptoconf_streamable(cryptoconf):  # FIXME rename and add to docs?
+    if isinstance(cryptoconf, CryptoconfPlan):
+        return cryptoconf.is_streamable
     for payload_cipher_layer in cryptoconf["payload_cipher_layers"]:
         if payload_cipher_layer["payload_cipher_algo"] not in STREAMABLE_CIPHER_ALGOS:
             return False
@@ -1498,16 +3322,28 @@ def encrypt_payload_and_stream_cryptainer_to_filesystem(
     payload: Union[bytes, BinaryIO],
     *,
     cryptainer_filepath,
-    cryptoconf: dict,
+    cryptoconf: Union[dict, CryptoconfPlan],
     cryptainer_metadata: Optional[dict],
     keychain_uid: Optional[uuid.UUID] = None,
     keystore_pool: Optional[KeystorePoolBase] = None,
+    binary_format: bool = False,
+    single_file: bool = False,
+    cryptainer_header_factory: Optional[CryptainerHeaderFactory] = None,
+    binary_key_envelopes: bool = False,
 ) -> None:
     """
     Optimized version which directly streams encrypted payload to **offloaded** file,
     instead of creating a whole cryptainer and then dumping it to disk.
 
     The cryptoconf used must be streamable with an EncryptionPipeline!
+
+    If `binary_format`, the cryptainer file uses the compact CRYPTAINER_BINARY_FORMAT instead of json.
+
+    If `single_file`, the offloaded ciphertext is appended to the cryptainer file itself.
+
+    If `cryptainer_header_factory` is provided, a pregenerated cryptainer header is used when available.
+
+    If `binary_key_envelopes`, see `encrypt_payload_into_cryptainer()`.
     """
     # No need to dump initial (signature-less) cryptainer here, this is all a quick operation...
     encryptor = CryptainerEncryptionPipeline(
@@ -1517,6 +3353,10 @@ def encrypt_payload_and_stream_cryptainer_to_filesystem(
         cryptainer_metadata=cryptainer_metadata,
         keystore_pool=keystore_pool,
         dump_initial_cryptainer=False,
+        binary_format=binary_format,
+        single_file=single_file,
+        cryptainer_header_factory=cryptainer_header_factory,
+        binary_key_envelopes=binary_key_envelopes,
     )
 
     for chunk in consume_bytes_as_chunks(payload, chunk_size=DEFAULT_DATA_CHUNK_SIZE):
@@ -1528,25 +3368,45 @@ def encrypt_payload_and_stream_cryptainer_to_filesystem(
 def encrypt_payload_into_cryptainer(
     payload: Union[bytes, BinaryIO],
     *,
-    cryptoconf: dict,
+    cryptoconf: Union[dict, CryptoconfPlan],
     cryptainer_metadata: Optional[dict],
     keychain_uid: Optional[uuid.UUID] = None,
     keystore_pool: Optional[KeystorePoolBase] = None,
+    payload_ciphertext_sink: Optional[BinaryIO] = None,
+    cryptainer_header_factory: Optional[CryptainerHeaderFactory] = None,
+    binary_key_envelopes: bool = False,
 ) -> dict:
     """Turn a raw payload into a secure cryptainer, which can only be decrypted with
     the agreement of the owner and third-party trustees.
 
     :param payload: bytestring of media (image, video, sound...) or readable file object (file immediately deleted then)
-    :param cryptoconf: tree of specific encryption settings
+    :param cryptoconf: tree of specific encryption settings, or its compiled plan (see `compile_cryptoconf()`)
     :param cryptainer_metadata: dict of metadata describing the payload (remains unencrypted in cryptainer)
     :param keychain_uid: optional default ID of a keychain
     :param keystore_pool: optional key storage pool, might be required by cryptoconf
+    :param payload_ciphertext_sink: optional binary stream receiving the payload ciphertext, instead of the cryptainer
+    :param cryptainer_header_factory: optional source of pregenerated cryptainer headers
+    :param binary_key_envelopes: whether nested keys and shards are serialized as compact binary envelopes
+        instead of json, in which case the cryptainer gets the CRYPTAINER_BINARY_ENVELOPES_FORMAT (which
+        older readers and revelation gateways don't support)
     :return: dict of cryptainer
     """
-    cryptainer_encryptor = CryptainerEncryptor(keystore_pool=keystore_pool)
-    cryptainer = cryptainer_encryptor.encrypt_data(
-        payload, cryptoconf=cryptoconf, keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
-    )
+    cryptainer_base_and_secrets = None
+    if cryptainer_header_factory:
+        cryptainer_base_and_secrets = cryptainer_header_factory.pop_cryptainer_base_and_secrets(
+            cryptoconf, keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
+        )
+    with CryptainerEncryptor(
+        keystore_pool=keystore_pool, binary_key_envelopes=binary_key_envelopes
+    ) as cryptainer_encryptor:
+        cryptainer = cryptainer_encryptor.encrypt_data(
+            payload,
+            cryptoconf=cryptoconf,
+            keychain_uid=keychain_uid,
+            cryptainer_metadata=cryptainer_metadata,
+            payload_ciphertext_sink=payload_ciphertext_sink,
+            cryptainer_base_and_secrets=cryptainer_base_and_secrets,
+        )
     return cryptainer
 
 
@@ -1558,6 +3418,8 @@ def decrypt_payload_from_cryptainer(
     verify_integrity_tags: bool = True,
     gateway_urls: Optional[list] = None,
     revelation_requestor_uid: Optional[uuid.UUID] = None,
+    decryption_session: Optional[DecryptionSession] = None,
+    payload_ciphertext_struct_loader: Optional[Callable] = None,
 ) -> tuple:
     """Decrypt a cryptainer with the help of third-parties.
 
@@ -1565,19 +3427,201 @@ def decrypt_payload_from_cryptainer(
     :param keystore_pool: optional key storage pool
     :param passphrase_mapper: optional dict mapping trustee IDs to their lists of passphrases
     :param verify_integrity_tags: whether to check MAC tags of the ciphertext
+    :param decryption_session: optional DecryptionSession, to share key caches between several decryptions
+    :param payload_ciphertext_struct_loader: if cryptainer was loaded without its payload ciphertext, callable
+        returning its "payload_ciphertext_struct", only called once all payload keys have been unwrapped
 
     :return: tuple (data, error_report)
     """
-    cryptainer_decryptor = CryptainerDecryptor(keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper)
-    data, error_report = cryptainer_decryptor.decrypt_payload(
-        cryptainer=cryptainer,
-        verify_integrity_tags=verify_integrity_tags,
-        gateway_urls=gateway_urls,
-        revelation_requestor_uid=revelation_requestor_uid,
-    )
+    with CryptainerDecryptor(
+        keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper, decryption_session=decryption_session
+    ) as cryptainer_decryptor:
+        data, error_report = cryptainer_decryptor.decrypt_payload(
+            cryptainer=cryptainer,
+            verify_integrity_tags=verify_integrity_tags,
+            gateway_urls=gateway_urls,
+            revelation_requestor_uid=revelation_requestor_uid,
+            payload_ciphertext_struct_loader=payload_ciphertext_struct_loader,
+        )
     return data, error_report
 
 
+def can_decrypt_cryptainer(
+    cryptainer: dict,
+    *,
+    keystore_pool: Optional[KeystorePoolBase] = None,
+    passphrase_mapper: Optional[dict] = None,
+    gateway_urls: Optional[list] = None,
+    revelation_requestor_uid: Optional[uuid.UUID] = None,
+    decryption_session: Optional[DecryptionSession] = None,
+) -> bool:
+    """Check whether the keys of all payload cipher layers of a cryptainer can currently be unwrapped.
+
+    The cryptainer may be loaded without its payload ciphertext, since only its header is used;
+    signatures and integrity tags are NOT checked. Pass the same `decryption_session` to a later decryption,
+    to avoid unwrapping keys twice.
+
+    :param cryptainer: the cryptainer tree, possibly without "payload_ciphertext_struct"
+
+    :return: boolean
+    """
+    with CryptainerDecryptor(
+        keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper, decryption_session=decryption_session
+    ) as cryptainer_decryptor:
+        return cryptainer_decryptor.can_decrypt_payload(
+            cryptainer=cryptainer, gateway_urls=gateway_urls, revelation_requestor_uid=revelation_requestor_uid
+        )
+
+
+def verify_cryptainers_signatures(
+    cryptainers: Sequence[dict],
+    *,
+    keystore_pool: Optional[KeystorePoolBase] = None,
+    trustee_calls_max_workers: int = DEFAULT_TRUSTEE_CALLS_MAX_WORKERS,
+) -> list:
+    """Verify in bulk the payload signatures of cryptainers, without decrypting them.
+
+    Only signatures of the outermost payload cipher layer (i.e. those of the stored payload ciphertext) can be
+    checked this way. Public keys are fetched once per (trustee, keychain_uid, signature algo), payload digests
+    are computed once per digest algo, and cryptainers are verified concurrently.
+
+    :param cryptainers: list of cryptainer trees, including their payload ciphertext
+    :param keystore_pool: optional key storage pool
+    :param trustee_calls_max_workers: size of the thread pool used for trustee calls and verifications
+
+    :return: list of error reports (empty if all signatures are valid), one per cryptainer, in the same order
+    """
+    with CryptainerDecryptor(
+        keystore_pool=keystore_pool, trustee_calls_max_workers=trustee_calls_max_workers
+    ) as cryptainer_decryptor:
+        return cryptainer_decryptor.verify_payload_signatures(cryptainers)
+
+
+def rewrap_cryptainer_keys(
+    cryptainer: dict,
+    new_key_cipher_layers: list,
+    *,
+    keystore_pool: Optional[KeystorePoolBase] = None,
+    passphrase_mapper: Optional[dict] = None,
+    decryption_session: Optional[DecryptionSession] = None,
+) -> tuple:
+    """Re-encrypt the keys of all payload cipher layers of a cryptainer, e.g. for new trustees.
+
+    Each payload key is unwrapped with its current key cipher layers, then wrapped again with (a copy of)
+    `new_key_cipher_layers`. Payload ciphertext and signatures are left untouched, and the cryptainer may
+    be a header-only or an offloaded one.
+
+    :param cryptainer: the cryptainer tree, which is not modified
+    :param new_key_cipher_layers: list of key cipher layers, with the same format as in cryptoconfs
+    :param keystore_pool: optional key storage pool
+    :param passphrase_mapper: optional dict mapping trustee IDs to their lists of passphrases
+    :param decryption_session: optional DecryptionSession, to share key caches between several operations
+
+    :return: tuple (new cryptainer or None if some keys couldn't be unwrapped, error_report)
+    """
+    payload_cipher_layers = cryptainer["payload_cipher_layers"]
+    check_cryptoconf_sanity(
+        dict(
+            payload_cipher_layers=[
+                dict(
+                    payload_cipher_algo=payload_cipher_layer["payload_cipher_algo"],
+                    key_cipher_layers=new_key_cipher_layers,
+                    payload_signatures=[],
+                )
+                for payload_cipher_layer in payload_cipher_layers
+            ]
+        )
+    )
+
+    with CryptainerDecryptor(
+        keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper, decryption_session=decryption_session
+    ) as cryptainer_decryptor:
+        payload_cipher_layer_keys = cryptainer_decryptor._unwrap_payload_cipher_layer_keys(
+            cryptainer, predecrypted_symkey_mapper=None
+        )
+
+    error_report = []
+    for key_bytes, multiple_layer_decryption_errors in payload_cipher_layer_keys:
+        error_report.extend(multiple_layer_decryption_errors)
+    if any(key_bytes is None for (key_bytes, _) in payload_cipher_layer_keys):
+        return None, error_report
+
+    new_payload_cipher_layers = []
+    binary_key_envelopes = cryptainer["cryptainer_format"] == CRYPTAINER_BINARY_ENVELOPES_FORMAT  # Format is kept
+    with CryptainerEncryptor(
+        keystore_pool=keystore_pool, binary_key_envelopes=binary_key_envelopes
+    ) as cryptainer_encryptor:
+        for payload_cipher_layer, (key_bytes, _) in zip(payload_cipher_layers, payload_cipher_layer_keys):
+            key_cipher_layers = _copy_data_tree(new_key_cipher_layers)  # Symmetric layers get completed in-place
+            key_ciphertext = cryptainer_encryptor._encrypt_key_through_multiple_layers(
+                default_keychain_uid=cryptainer["keychain_uid"],
+                key_bytes=key_bytes,
+                key_cipher_layers=key_cipher_layers,
+                cryptainer_metadata=cryptainer["cryptainer_metadata"],
+            )
+            new_payload_cipher_layers.append(
+                dict(payload_cipher_layer, key_cipher_layers=key_cipher_layers, key_ciphertext=key_ciphertext)
+            )
+
+    new_cryptainer = dict(cryptainer, payload_cipher_layers=new_payload_cipher_layers)
+    return new_cryptainer, error_report
+
+
+async def aencrypt_payload_into_cryptainer(
+    payload: Union[bytes, BinaryIO],
+    *,
+    cryptoconf: Union[dict, CryptoconfPlan],
+    cryptainer_metadata: Optional[dict],
+    keychain_uid: Optional[uuid.UUID] = None,
+    keystore_pool: Optional[KeystorePoolBase] = None,
+    executor: Optional[Executor] = None,
+    binary_key_envelopes: bool = False,
+) -> dict:
+    """Asyncio equivalent of `encrypt_payload_into_cryptainer()`.
+
+    Trustee calls are performed concurrently on the event loop, and cipher operations are offloaded to an executor.
+
+    :param executor: optional executor for blocking work (else the default executor of the event loop is used)
+    :return: dict of cryptainer
+    """
+    cryptainer_encryptor = AsyncCryptainerEncryptor(
+        keystore_pool=keystore_pool, executor=executor, binary_key_envelopes=binary_key_envelopes
+    )
+    cryptainer = await cryptainer_encryptor.aencrypt_data(
+        payload, cryptoconf=cryptoconf, keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
+    )
+    return cryptainer
+
+
+async def adecrypt_payload_from_cryptainer(
+    cryptainer: dict,
+    *,
+    keystore_pool: Optional[KeystorePoolBase] = None,
+    passphrase_mapper: Optional[dict] = None,
+    verify_integrity_tags: bool = True,
+    gateway_urls: Optional[list] = None,
+    revelation_requestor_uid: Optional[uuid.UUID] = None,
+    executor: Optional[Executor] = None,
+) -> tuple:
+    """Asyncio equivalent of `decrypt_payload_from_cryptainer()`.
+
+    Trustee calls are performed concurrently on the event loop (e.g. for shared-secret shards), and blocking work
+    (gateway requests, payload decryption, signature checks) is offloaded to an executor.
+
+    :param executor: optional executor for blocking work (else the default executor of the event loop is used)
+    :return: tuple (data, error_report)
+    """
+    with AsyncCryptainerDecryptor(
+        keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper, executor=executor
+    ) as cryptainer_decryptor:
+        return await cryptainer_decryptor.adecrypt_payload(
+            cryptainer,
+            verify_integrity_tags=verify_integrity_tags,
+            gateway_urls=gateway_urls,
+            revelation_requestor_uid=revelation_requestor_uid,
+        )
+
+
 def extract_metadata_from_cryptainer(cryptainer: dict) -> Optional[dict]:
     """Read the metadata tree (possibly None) from a cryptainer.
 
@@ -1664,53 +3708,556 @@ def _get_offloaded_file_path(cryptainer_filepath: Path):
     )
 
 
-def dump_cryptainer_to_filesystem(cryptainer_filepath: Path, cryptainer: dict, offload_payload_ciphertext=True) -> None:
-    """Dump a cryptainer to a file path, overwritting it if existing.
+def _build_escrowed_checkpoint_cryptoconf(cryptoconf: Union[dict, CryptoconfPlan]) -> dict:
+    """Return a cryptoconf protecting checkpoints of an encryption stream like the cryptainer itself, i.e. with
+    the key cipher layers of each of its payload cipher layers."""
+    cryptoconf_tree = cryptoconf.cryptoconf if isinstance(cryptoconf, CryptoconfPlan) else cryptoconf
+    return dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_EAX",
+                key_cipher_layers=_copy_data_tree(payload_cipher_layer["key_cipher_layers"]),
+                payload_signatures=[],
+            )
+            for payload_cipher_layer in cryptoconf_tree["payload_cipher_layers"]
+        ]
+    )
+
+
+def _get_checkpoint_file_path(cryptainer_filepath: Path):
+    return cryptainer_filepath.parent.joinpath(
+        cryptainer_filepath.name.rstrip(CRYPTAINER_TEMP_SUFFIX) + CRYPTAINER_CHECKPOINT_SUFFIX
+    )
+
+
+def dump_cryptainer_to_bytes(cryptainer: dict, binary_format=False) -> bytes:
+    """Serialize a cryptainer to bytes, as json (CRYPTAINER_FORMAT) or as BSON (CRYPTAINER_BINARY_FORMAT).
+
+    The binary format stores binary fields (key ciphertexts, digests, signatures, inline payload...) as-is,
+    instead of base64-encoding them. Cryptainers which can't be represented in BSON (e.g. due to too big
+    integers in their metadata) are dumped as json instead.
+    """
+    if binary_format:
+        # Header fields are put first, so that load_cryptainer_header_from_filesystem() can stop early
+        cryptainer = dict(
+            {key: cryptainer[key] for key in CRYPTAINER_HEADER_FIELDS if key in cryptainer},
+            **{key: value for (key, value) in cryptainer.items() if key not in CRYPTAINER_HEADER_FIELDS},
+        )
+        try:
+            return CRYPTAINER_BINARY_MAGIC + bson.encode(cryptainer, codec_options=WACRYPTOLIB_BSON_OPTIONS)
+        except (BSONError, OverflowError) as exc:
+            logger.warning("Falling back to json format for cryptainer not representable in BSON: %r", exc)
+    return dump_to_json_bytes(cryptainer)
+
+
+def load_cryptainer_from_bytes(cryptainer_bytes: bytes) -> dict:
+    """Deserialize a cryptainer from bytes, whatever its format (json or binary).
+
+    Raises exceptions.ValidationError on loading error.
+    """
+    if not cryptainer_bytes.startswith(CRYPTAINER_BINARY_MAGIC):
+        return load_from_json_bytes(cryptainer_bytes)
+    try:
+        return bson.decode(cryptainer_bytes[len(CRYPTAINER_BINARY_MAGIC) :], codec_options=WACRYPTOLIB_BSON_OPTIONS)
+    except BSONError as exc:
+        raise SchemaValidationError("Invalid binary cryptainer: %r" % exc) from exc
+
+
+def _read_single_file_offsets(cryptainer_file: BinaryIO) -> Optional[tuple]:
+    """Return (header_offset, header_length, payload_offset, payload_length) if the file is a single-file cryptainer."""
+    cryptainer_file.seek(0)
+    prefix = cryptainer_file.read(CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH)
+    if not prefix.startswith(CRYPTAINER_SINGLE_FILE_MAGIC):
+        return None
+    if len(prefix) < CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH:
+        raise SchemaValidationError("Truncated single-file cryptainer")
+    return CRYPTAINER_SINGLE_FILE_OFFSETS.unpack_from(prefix, len(CRYPTAINER_SINGLE_FILE_MAGIC))
+
+
+def _write_single_file_offsets(cryptainer_file: BinaryIO, single_file_offsets: tuple):
+    cryptainer_file.seek(0)
+    cryptainer_file.write(CRYPTAINER_SINGLE_FILE_MAGIC + CRYPTAINER_SINGLE_FILE_OFFSETS.pack(*single_file_offsets))
+
+
+# With sorted json keys, an inline payload ciphertext is the last field of a json cryptainer, thus framed by these
+_PAYLOAD_CIPHERTEXT_STRUCT_JSON_KEY = b'"payload_ciphertext_struct"'
+_INLINE_CIPHERTEXT_JSON_PREFIX = (
+    '"payload_ciphertext_struct": {"ciphertext_location": "%s", "ciphertext_value": {"$binary": {"base64": "'
+    % PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE
+).encode("ascii")
+_INLINE_CIPHERTEXT_JSON_SUFFIX = b'", "subType": "00"}}}}'
+
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+
+def _dump_json_cryptainer_to_file(cryptainer_file: BinaryIO, cryptainer: dict):
+    """Write a cryptainer as json, like `dump_cryptainer_to_bytes()` does, but streaming its inline payload
+    ciphertext (if any) as chunked base64, instead of building its whole serialization in memory."""
+    payload_ciphertext_struct = cryptainer.get("payload_ciphertext_struct")
+    cryptainer_header = {key: value for (key, value) in cryptainer.items() if key != "payload_ciphertext_struct"}
+    is_streamable = (
+        isinstance(payload_ciphertext_struct, dict)
+        and payload_ciphertext_struct.keys() == {"ciphertext_location", "ciphertext_value"}
+        and payload_ciphertext_struct["ciphertext_location"] == PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE
+        and type(payload_ciphertext_struct["ciphertext_value"]) in (bytes, memoryview)  # E.g. memory-mapped
+        and cryptainer_header
+        and max(cryptainer_header) < "payload_ciphertext_struct"  # So that ciphertext is the last json field
+    )
+    if not is_streamable:
+        cryptainer_file.write(dump_to_json_bytes(cryptainer))
+        return
+
+    header_bytes = dump_to_json_bytes(cryptainer_header)
+    assert header_bytes.endswith(b"}"), header_bytes
+    cryptainer_file.write(header_bytes[:-1] + b", " + _INLINE_CIPHERTEXT_JSON_PREFIX)
+    ciphertext_view = memoryview(payload_ciphertext_struct["ciphertext_value"])
+    for idx in range(0, len(ciphertext_view), INLINE_CIPHERTEXT_BASE64_CHUNK_SIZE):
+        chunk = ciphertext_view[idx : idx + INLINE_CIPHERTEXT_BASE64_CHUNK_SIZE]
+        cryptainer_file.write(binascii.b2a_base64(chunk, newline=False))  # Chunks don't need padding
+    cryptainer_file.write(_INLINE_CIPHERTEXT_JSON_SUFFIX)
+
+
+def _locate_json_inline_ciphertext(
+    cryptainer_file: BinaryIO, header_buffer: Optional[bytearray] = None
+) -> Optional[tuple]:
+    """Return (cryptainer_header, base64_offset, base64_length) if the file is a json cryptainer whose inline
+    ciphertext can be streamed (i.e. is its last field), reading only the data BEFORE this ciphertext.
+
+    The search stops at the first "payload_ciphertext_struct" key, so other cryptainers (e.g. with offloaded
+    ciphertext, or indented json) are not read further. If provided, `header_buffer` receives the bytes read
+    from the start of the file, so that the caller doesn't have to read them again.
+
+    The returned cryptainer header has no "payload_ciphertext_struct" field.
+    """
+    cryptainer_file.seek(0)
+    header_bytes = bytearray() if header_buffer is None else header_buffer  # Grown in place, not quadratically
+    read_size = CRYPTAINER_HEADER_READ_SIZE
+    prefix_offset = -1
+    while prefix_offset < 0 or len(header_bytes) < prefix_offset + len(_INLINE_CIPHERTEXT_JSON_PREFIX):
+        chunk = cryptainer_file.read(read_size)
+        if not chunk:
+            return None  # E.g. offloaded ciphertext
+        read_size = min(read_size * 2, INLINE_CIPHERTEXT_BASE64_CHUNK_SIZE)
+        search_start = max(0, len(header_bytes) - len(_PAYLOAD_CIPHERTEXT_STRUCT_JSON_KEY) + 1)
+        header_bytes += chunk
+        if header_bytes.startswith(CRYPTAINER_BINARY_MAGIC):
+            return None
+        if prefix_offset < 0:
+            prefix_offset = header_bytes.find(_PAYLOAD_CIPHERTEXT_STRUCT_JSON_KEY, search_start)
+    if not header_bytes.startswith(_INLINE_CIPHERTEXT_JSON_PREFIX, prefix_offset):
+        return None  # E.g. indented json, or unusual inline ciphertext struct
+
+    # Since quotes of json strings are escaped, this prefix can't be found inside strings, but only
+    # at the top level of the cryptainer (else the remaining json object would have unbalanced braces)
+    try:
+        cryptainer_header = load_from_json_bytes(
+            bytes(header_bytes[:prefix_offset]) + b'"payload_ciphertext_struct": null}'
+        )
+    except ValueError:
+        return None
+    if not isinstance(cryptainer_header, dict) or cryptainer_header.pop("payload_ciphertext_struct", 0) is not None:
+        return None
+
+    base64_offset = prefix_offset + len(_INLINE_CIPHERTEXT_JSON_PREFIX)
+    file_size = os.fstat(cryptainer_file.fileno()).st_size
+    tail_offset = max(base64_offset, file_size - len(_INLINE_CIPHERTEXT_JSON_SUFFIX) - 64)
+    cryptainer_file.seek(tail_offset)
+    tail = cryptainer_file.read().rstrip(b" \t\n\r")  # Trailing json whitespace is allowed
+    if not tail.endswith(_INLINE_CIPHERTEXT_JSON_SUFFIX):
+        return None
+    base64_length = tail_offset + len(tail) - len(_INLINE_CIPHERTEXT_JSON_SUFFIX) - base64_offset
+    return cryptainer_header, base64_offset, base64_length
+
+
+def _iter_json_inline_ciphertext_chunks(cryptainer_file: BinaryIO, base64_offset: int, base64_length: int):
+    """Yield the decoded chunks of an inline ciphertext located by `_locate_json_inline_ciphertext()`."""
+    if base64_length % 4:
+        raise SchemaValidationError("Invalid length of base64 inline ciphertext in json cryptainer")
+    cryptainer_file.seek(base64_offset)
+    remaining_length = base64_length
+    while remaining_length:
+        base64_chunk = cryptainer_file.read(min(remaining_length, INLINE_CIPHERTEXT_BASE64_CHUNK_SIZE // 3 * 4))
+        if not base64_chunk:
+            raise SchemaValidationError("Truncated base64 inline ciphertext in json cryptainer")
+        remaining_length -= len(base64_chunk)
+        if base64_chunk.translate(None, _BASE64_ALPHABET):  # Would be silently ignored by a2b_base64()
+            raise SchemaValidationError("Unexpected characters in base64 inline ciphertext of json cryptainer")
+        try:
+            yield binascii.a2b_base64(base64_chunk)
+        except binascii.Error as exc:
+            raise SchemaValidationError("Invalid base64 inline ciphertext in json cryptainer: %r" % exc) from exc
+
+
+class _JsonInlineCiphertextReader(io.RawIOBase):
+    """
+    THIS CLASS IS PRIVATE API
+
+    Read-only stream decoding, chunk by chunk, the base64 inline ciphertext of a json cryptainer file.
+    """
+
+    def __init__(self, cryptainer_file: BinaryIO, base64_offset: int, base64_length: int):
+        self._cryptainer_file = cryptainer_file
+        self._chunks = _iter_json_inline_ciphertext_chunks(
+            cryptainer_file, base64_offset=base64_offset, base64_length=base64_length
+        )
+        self._pending_chunk = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        filled_length = 0
+        while filled_length < len(buffer):  # Buffer is filled as much as possible, like for files
+            if not self._pending_chunk:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._pending_chunk = memoryview(chunk)
+            length = min(len(buffer) - filled_length, len(self._pending_chunk))
+            buffer[filled_length : filled_length + length] = self._pending_chunk[:length]
+            self._pending_chunk = self._pending_chunk[length:]
+            filled_length += length
+        return filled_length
+
+    def close(self):
+        self._cryptainer_file.close()
+        super().close()
+
+
+def _load_cryptainer_file(cryptainer_filepath: Path, include_inline_ciphertext=True) -> tuple:
+    """Return (cryptainer, binary_format) from a cryptainer file, WITHOUT loading its offloaded ciphertext.
+
+    If not `include_inline_ciphertext`, the "payload_ciphertext_struct" of a cryptainer with inline ciphertext
+    is removed (and, when possible, not even read from the file).
+    """
+    with open(cryptainer_filepath, "rb") as f:
+        single_file_offsets = _read_single_file_offsets(f)
+        if single_file_offsets:
+            header_offset, header_length, _payload_offset, _payload_length = single_file_offsets
+            f.seek(header_offset)
+            cryptainer_bytes = f.read(header_length)
+        else:
+            header_buffer = bytearray()
+            inline_ciphertext_location = _locate_json_inline_ciphertext(f, header_buffer=header_buffer)
+            if inline_ciphertext_location:
+                cryptainer, base64_offset, base64_length = inline_ciphertext_location
+                if not include_inline_ciphertext:
+                    return cryptainer, False
+                try:
+                    ciphertext_buffer = io.BytesIO()  # Its getvalue() doesn't copy data
+                    for chunk in _iter_json_inline_ciphertext_chunks(f, base64_offset, base64_length):
+                        ciphertext_buffer.write(chunk)
+                    cryptainer["payload_ciphertext_struct"] = dict(
+                        ciphertext_location=PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE,
+                        ciphertext_value=ciphertext_buffer.getvalue(),
+                    )
+                    return cryptainer, False
+                except SchemaValidationError as exc:  # Let the full json parser deal with weird json strings
+                    logger.debug("Falling back to full loading of cryptainer %s: %r", cryptainer_filepath, exc)
+            if len(header_buffer) == os.fstat(f.fileno()).st_size:  # E.g. json cryptainer with offloaded ciphertext
+                cryptainer_bytes = bytes(header_buffer)
+            else:  # Only a bounded header part was read, better not copy a potentially huge file around it
+                f.seek(0)
+                cryptainer_bytes = f.read()
+    binary_format = cryptainer_bytes.startswith(CRYPTAINER_BINARY_MAGIC)
+    cryptainer = load_cryptainer_from_bytes(cryptainer_bytes)
+    if (
+        not include_inline_ciphertext
+        and cryptainer.get("payload_ciphertext_struct") != OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+    ):
+        cryptainer.pop("payload_ciphertext_struct", None)
+    return cryptainer, binary_format
+
+
+def _update_single_file_cryptainer_header(cryptainer_filepath: Path, cryptainer: dict, binary_format: bool):
+    """Replace the header of a single-file cryptainer, without moving its payload ciphertext.
+
+    The new header is first written to an unused area (the room before the payload, or the end of the file),
+    and only then are the fixed-size offsets overwritten, so that an interruption leaves the old header in use.
+    """
+    header_bytes = dump_cryptainer_to_bytes(cryptainer, binary_format=binary_format)
+    with open(cryptainer_filepath, "r+b") as f:
+        header_offset, header_length, payload_offset, payload_length = _read_single_file_offsets(f)
+        payload_end = payload_offset + payload_length
+        if header_offset >= payload_end and CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH + len(header_bytes) <= payload_offset:
+            new_header_offset = CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH  # Current header is after payload, room is free
+        else:
+            new_header_offset = max(payload_end, header_offset + header_length)
+        f.seek(new_header_offset)
+        f.write(header_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+        _write_single_file_offsets(f, (new_header_offset, len(header_bytes), payload_offset, payload_length))
+        f.flush()
+        os.fsync(f.fileno())
+        if new_header_offset < payload_offset:
+            f.truncate(payload_end)  # Previous header, appended after payload, is now obsolete
+
+
+def _replace_cryptainer_header_on_filesystem(cryptainer_filepath: Path, cryptainer: dict, binary_format: bool):
+    """Overwrite, in a crash-safe way, a cryptainer file with a new header; offloaded ciphertext is left untouched."""
+    with open(cryptainer_filepath, "rb") as f:
+        is_single_file = bool(_read_single_file_offsets(f))
+    if is_single_file:
+        _update_single_file_cryptainer_header(cryptainer_filepath, cryptainer=cryptainer, binary_format=binary_format)
+    else:
+        cryptainer_filepath_temp = cryptainer_filepath.with_name(cryptainer_filepath.name + CRYPTAINER_TEMP_SUFFIX)
+        dump_cryptainer_to_filesystem(
+            cryptainer_filepath_temp,
+            cryptainer=cryptainer,
+            offload_payload_ciphertext=False,  # Already offloaded, or inline on purpose
+            binary_format=binary_format,
+        )
+        os.replace(cryptainer_filepath_temp, cryptainer_filepath)  # Atomic
+
+
+def dump_cryptainer_to_filesystem(
+    cryptainer_filepath: Path, cryptainer: dict, offload_payload_ciphertext=True, binary_format=False, single_file=False
+) -> None:
+    """Dump a cryptainer to a file path, overwritting it if existing.
+
+    If `offload_payload_ciphertext`, actual encrypted payload is dumped to a separate bytes file nearby the json-formatted cryptainer.
+
+    If `binary_format`, the cryptainer file uses the compact CRYPTAINER_BINARY_FORMAT instead of json.
+
+    If `single_file` (and `offload_payload_ciphertext`), the offloaded payload is appended, as raw bytes, to the
+    cryptainer file itself, after a fixed-size prefix giving the offsets of header and payload.
+
+    Inline payload ciphertexts of json cryptainers are streamed to file as chunked base64 (see
+    INLINE_CIPHERTEXT_BASE64_CHUNK_SIZE), and loaded back the same way, to limit memory usage.
+    """
+    if offload_payload_ciphertext and single_file:
+        payload_ciphertext = _get_cryptainer_inline_ciphertext_value(cryptainer)
+        cryptainer = cryptainer.copy()  # Shallow copy, since we DO NOT touch original dict here!
+        cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+        header_bytes = dump_cryptainer_to_bytes(cryptainer, binary_format=binary_format)
+        payload_offset = CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH + len(header_bytes)
+        with open(cryptainer_filepath, "wb") as f:
+            _write_single_file_offsets(
+                f, (CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH, len(header_bytes), payload_offset, len(payload_ciphertext))
+            )
+            f.write(header_bytes)
+            f.write(payload_ciphertext)
+        try:
+            _get_offloaded_file_path(cryptainer_filepath).unlink()  # Obsolete if we overwrote a two-files cryptainer
+        except FileNotFoundError:
+            pass
+        return
+
+    if offload_payload_ciphertext:
+        offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
+        payload_ciphertext = _get_cryptainer_inline_ciphertext_value(cryptainer)
+        offloaded_file_path.write_bytes(payload_ciphertext)
+        cryptainer = cryptainer.copy()  # Shallow copy, since we DO NOT touch original dict here!
+        cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+    if binary_format:
+        cryptainer_filepath.write_bytes(dump_cryptainer_to_bytes(cryptainer, binary_format=binary_format))
+    else:
+        with open(cryptainer_filepath, "wb") as f:
+            _dump_json_cryptainer_to_file(f, cryptainer)  # Inline ciphertext is streamed as chunked base64
+
+
+def load_cryptainer_from_filesystem(
+    cryptainer_filepath: Path, include_payload_ciphertext=True, mmap_payload_ciphertext=False
+) -> dict:
+    """Load a cryptainer from a file path, potentially loading its offloaded ciphertext from a separate nearby bytes file.
+
+    Both json and binary cryptainer files are supported, as well as single-file cryptainers.
+
+    Field `payload_ciphertext` is only present in result dict if `include_payload_ciphertext` is True.
+
+    If `mmap_payload_ciphertext`, an offloaded ciphertext is not read, but exposed as a read-only memoryview over
+    a memory-mapping of its file, so that the page cache is used directly, and untouched pages are never read.
+    Decryption utilities accept such cryptainers; the mapping is released once the memoryview is garbage-collected,
+    and its file must not be truncated meanwhile.
+    """
+
+    cryptainer, _binary_format = _load_cryptainer_file(
+        cryptainer_filepath, include_inline_ciphertext=include_payload_ciphertext
+    )
+
+    if include_payload_ciphertext:
+        if cryptainer["payload_ciphertext_struct"] == OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER:
+            cryptainer["payload_ciphertext_struct"] = _load_cryptainer_payload_ciphertext_struct(
+                cryptainer_filepath, cryptainer, mmap_payload_ciphertext=mmap_payload_ciphertext
+            )
+    else:
+        cryptainer.pop("payload_ciphertext_struct", None)  # Ensure that a nasty error pops if we try to access it
+
+    return cryptainer
+
+
+_JSON_WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+
+_JSON_RAW_DECODER = json.JSONDecoder()
+
+_BSON_FIXED_VALUE_SIZES = {  # For BSON element types having a value of constant size
+    0x01: 8,  # Double
+    0x07: 12,  # ObjectId
+    0x08: 1,  # Boolean
+    0x09: 8,  # UTC datetime
+    0x0A: 0,  # Null
+    0x10: 4,  # Int32
+    0x11: 8,  # Timestamp
+    0x12: 8,  # Int64
+    0x13: 16,  # Decimal128
+}
+
+_BSON_SIZED_VALUE_EXTRA_LENGTHS = {  # For BSON element types whose value starts with an int32 length
+    0x02: 4,  # String (length doesn't include the length prefix)
+    0x03: 0,  # Embedded document
+    0x04: 0,  # Array
+    0x05: 5,  # Binary (length doesn't include the length prefix and the subtype byte)
+}
+
+
+class _UnsupportedCryptainerHeaderLayout(Exception):
+    """THIS CLASS IS PRIVATE API"""
+
+
+def _read_json_cryptainer_header_fields(cryptainer_file: BinaryIO, header_end: Optional[int]) -> dict:
+    """Parse the header fields of a json cryptainer, reading only the start of the file if its keys are sorted."""
+    decoder = codecs.getincrementaldecoder("utf8")()
+    text = ""
+    read_size = CRYPTAINER_HEADER_READ_SIZE
+    raw_fields = {}
+    idx = None  # Position of the next key in json object, once its opening brace is parsed
+
+    while True:
+        if header_end is not None:
+            read_size = min(read_size, header_end - cryptainer_file.tell())
+        chunk = cryptainer_file.read(read_size)
+        is_eof = not chunk or (header_end is not None and cryptainer_file.tell() >= header_end)
+        text += decoder.decode(chunk, final=is_eof)
+        read_size *= 2
+
+        try:
+            if idx is None:
+                idx = _JSON_WHITESPACE_REGEX.match(text).end()
+                if text[idx] != "{":
+                    raise _UnsupportedCryptainerHeaderLayout("Not a json object")
+                idx = _JSON_WHITESPACE_REGEX.match(text, idx + 1).end()
+            while text[idx] != "}" and len(raw_fields) < len(CRYPTAINER_HEADER_FIELDS):
+                if text[idx] != '"':
+                    raise _UnsupportedCryptainerHeaderLayout("Unexpected character in json object")
+                key, value_start = json.decoder.scanstring(text, idx + 1)
+                value_start = _JSON_WHITESPACE_REGEX.match(text, value_start).end()
+                if text[value_start] != ":":
+                    raise _UnsupportedCryptainerHeaderLayout("Unexpected character after json key")
+                value_start = _JSON_WHITESPACE_REGEX.match(text, value_start + 1).end()
+                if key > CRYPTAINER_HEADER_FIELDS[-1]:
+                    break  # If keys are sorted, no header field remains, so we don't parse the payload ciphertext
+                _value, value_end = _JSON_RAW_DECODER.raw_decode(text, value_start)
+                if key in CRYPTAINER_HEADER_FIELDS:
+                    raw_fields[key] = text[value_start:value_end]
+                next_idx = _JSON_WHITESPACE_REGEX.match(text, value_end).end()
+                if text[next_idx] == ",":
+                    next_idx = _JSON_WHITESPACE_REGEX.match(text, next_idx + 1).end()
+                idx = next_idx  # Only now is this key-value pair fully parsed
+            break
+        except (IndexError, ValueError):  # Includes JSONDecodeError
+            if is_eof:
+                raise _UnsupportedCryptainerHeaderLayout("Invalid json cryptainer") from None
+            # Else, the current key-value pair spans beyond the text we have read
+
+    if len(raw_fields) < len(CRYPTAINER_HEADER_FIELDS):
+        raise _UnsupportedCryptainerHeaderLayout("Missing header fields, or unsorted json keys")
+
+    raw_header = "{%s}" % ", ".join("%s: %s" % (json.dumps(key), value) for (key, value) in raw_fields.items())
+    return load_from_json_str(raw_header)
+
+
+def _read_bson_cryptainer_header_fields(cryptainer_file: BinaryIO) -> dict:
+    """Parse the top-level fields of a BSON document, skipping (without reading them) non-header values."""
+    header_fields = {}
+    element_offset = cryptainer_file.tell() + 4  # Skip document length
+    while len(header_fields) < len(CRYPTAINER_HEADER_FIELDS):
+        cryptainer_file.seek(element_offset)
+        element_head = cryptainer_file.read(64)  # Element type, key, and value length if any
+        if not element_head:
+            raise _UnsupportedCryptainerHeaderLayout("Truncated BSON document")
+        element_type = element_head[0]
+        if element_type == 0x00:
+            break  # End of document
+        key_end = element_head.find(b"\x00", 1)
+        if key_end < 0:
+            raise _UnsupportedCryptainerHeaderLayout("Too long key in BSON document")
+        key = element_head[1:key_end].decode("utf8")
+        value_offset = key_end + 1
+        if element_type in _BSON_FIXED_VALUE_SIZES:
+            value_size = _BSON_FIXED_VALUE_SIZES[element_type]
+        elif element_type in _BSON_SIZED_VALUE_EXTRA_LENGTHS:
+            (value_size,) = struct.unpack_from("<i", element_head, value_offset)
+            value_size += _BSON_SIZED_VALUE_EXTRA_LENGTHS[element_type]
+        else:
+            raise _UnsupportedCryptainerHeaderLayout("Unsupported BSON element type %s" % element_type)
+        element_size = value_offset + value_size
+        if key in CRYPTAINER_HEADER_FIELDS:
+            cryptainer_file.seek(element_offset)
+            element = cryptainer_file.read(element_size)
+            document = struct.pack("<i", 4 + len(element) + 1) + element + b"\x00"
+            header_fields.update(bson.decode(document, codec_options=WACRYPTOLIB_BSON_OPTIONS))
+        element_offset += element_size
+    return header_fields
+
 
-    If `offload_payload_ciphertext`, actual encrypted payload is dumped to a separate bytes file nearby the json-formatted cryptainer.
-    """
-    if offload_payload_ciphertext:
-        offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
-        payload_ciphertext = _get_cryptainer_inline_ciphertext_value(cryptainer)
-        offloaded_file_path.write_bytes(payload_ciphertext)
-        cryptainer = cryptainer.copy()  # Shallow copy, since we DO NOT touch original dict here!
-        cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
-    dump_to_json_file(cryptainer_filepath, cryptainer)
+def load_cryptainer_header_from_filesystem(cryptainer_filepath: Path) -> dict:
+    """Load only the top-level identification fields of a cryptainer (see CRYPTAINER_HEADER_FIELDS), e.g. to list
+    the metadata of lots of cryptainers.
 
+    Key cipher layers and payload ciphertext are skipped as much as possible: json cryptainers (whose keys are
+    sorted) are only read until their "keychain_uid" field, and binary ones until their last header field.
 
-def load_cryptainer_from_filesystem(cryptainer_filepath: Path, include_payload_ciphertext=True) -> dict:
-    """Load a json-formatted cryptainer from a file path, potentially loading its offloaded ciphertext from a separate nearby bytes file.
+    The resulting dict is accepted by `extract_metadata_from_cryptainer()`.
 
-    Field `payload_ciphertext` is only present in result dict if `include_payload_ciphertext` is True.
+    Raises exceptions.ValidationError on loading error.
     """
+    with open(cryptainer_filepath, "rb") as f:
+        single_file_offsets = _read_single_file_offsets(f)
+        header_offset, header_end = 0, None
+        if single_file_offsets:
+            header_offset, header_length, _payload_offset, _payload_length = single_file_offsets
+            header_end = header_offset + header_length
+        f.seek(header_offset)
+        is_binary_format = f.read(len(CRYPTAINER_BINARY_MAGIC)) == CRYPTAINER_BINARY_MAGIC
+        if not is_binary_format:
+            f.seek(header_offset)
+        try:
+            if is_binary_format:
+                return _read_bson_cryptainer_header_fields(f)
+            return _read_json_cryptainer_header_fields(f, header_end=header_end)
+        except (_UnsupportedCryptainerHeaderLayout, BSONError, struct.error, UnicodeDecodeError) as exc:
+            logger.debug("Falling back to full loading of cryptainer %s: %r", cryptainer_filepath, exc)
 
-    cryptainer = load_from_json_file(cryptainer_filepath)
+    cryptainer, _binary_format = _load_cryptainer_file(cryptainer_filepath, include_inline_ciphertext=False)
+    return {key: cryptainer[key] for key in CRYPTAINER_HEADER_FIELDS if key in cryptainer}
 
-    if include_payload_ciphertext:
-        if cryptainer["payload_ciphertext_struct"] == OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER:
-            offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
-            ciphertext_value = offloaded_file_path.read_bytes()
-            cryptainer["payload_ciphertext_struct"] = dict(
-                ciphertext_location=PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE, ciphertext_value=ciphertext_value
-            )
-    else:
-        del cryptainer["payload_ciphertext_struct"]  # Ensure that a nasty error pops if we try to access it
 
-    return cryptainer
+def _is_single_file_cryptainer(cryptainer_file: BinaryIO) -> bool:
+    """Check the magic of a cryptainer file, without parsing its offsets."""
+    return cryptainer_file.read(len(CRYPTAINER_SINGLE_FILE_MAGIC)) == CRYPTAINER_SINGLE_FILE_MAGIC
 
 
 def delete_cryptainer_from_filesystem(cryptainer_filepath):
     """Delete a cryptainer file and its potential offloaded payload file."""
+    with open(cryptainer_filepath, "rb") as f:
+        is_single_file = _is_single_file_cryptainer(f)
     os.remove(cryptainer_filepath)  # TODO - additional retries if file access error_report?
     offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
-    if offloaded_file_path.exists():
+    if not is_single_file and offloaded_file_path.exists():
         # We don't care about OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER here, we go the quick way
         os.remove(offloaded_file_path)
+    checkpoint_file_path = _get_checkpoint_file_path(cryptainer_filepath)
+    if checkpoint_file_path.exists():
+        os.remove(checkpoint_file_path)
 
 
 def get_cryptainer_size_on_filesystem(cryptainer_filepath):
     """Return the total size in bytes occupied by a cryptainer and its potential offloaded payload file."""
-    size = cryptainer_filepath.stat().st_size  # FIXME - Might fail if file got deleted concurrently
+    with open(cryptainer_filepath, "rb") as f:  # FIXME - Might fail if file got deleted concurrently
+        size = os.fstat(f.fileno()).st_size
+        if _is_single_file_cryptainer(f):
+            return size
     offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
     if offloaded_file_path.exists():
         # We don't care about OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER here, we go the quick way
@@ -1718,6 +4265,206 @@ def get_cryptainer_size_on_filesystem(cryptainer_filepath):
     return size
 
 
+class _MappedCiphertextReader(io.RawIOBase):
+    """
+    THIS CLASS IS PRIVATE API
+
+    Read-only stream over the ciphertext of a single-file cryptainer, memory-mapped up to the end of this ciphertext
+    (so that a header appended after it is never read).
+    """
+
+    def __init__(self, cryptainer_file: BinaryIO, payload_offset: int, payload_length: int):
+        self._mapping = mmap.mmap(
+            cryptainer_file.fileno(), length=payload_offset + payload_length, access=mmap.ACCESS_READ
+        )
+        self._mapping.seek(payload_offset)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._mapping.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    def close(self):
+        self._mapping.close()
+        super().close()
+
+
+def _open_cryptainer_ciphertext_stream(cryptainer_filepath: Path, cryptainer: dict) -> BinaryIO:
+    """Return a readable stream of the payload ciphertext of a cryptainer header loaded from `cryptainer_filepath`.
+
+    Inline ciphertexts removed from this header (see `_load_cryptainer_file()`) are streamed from the file too.
+    """
+    if "payload_ciphertext_struct" not in cryptainer:
+        cryptainer_file = open(cryptainer_filepath, "rb")
+        inline_ciphertext_location = _locate_json_inline_ciphertext(cryptainer_file)
+        if inline_ciphertext_location:
+            _cryptainer_header, base64_offset, base64_length = inline_ciphertext_location
+            return _JsonInlineCiphertextReader(
+                cryptainer_file, base64_offset=base64_offset, base64_length=base64_length
+            )
+        cryptainer_file.close()
+        cryptainer, _binary_format = _load_cryptainer_file(cryptainer_filepath)  # E.g. binary format
+    if cryptainer["payload_ciphertext_struct"] != OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER:
+        return io.BytesIO(_get_cryptainer_inline_ciphertext_value(cryptainer))
+    with open(cryptainer_filepath, "rb") as f:
+        single_file_offsets = _read_single_file_offsets(f)
+        if single_file_offsets:
+            _header_offset, _header_length, payload_offset, payload_length = single_file_offsets
+            return _MappedCiphertextReader(f, payload_offset=payload_offset, payload_length=payload_length)
+    return open(_get_offloaded_file_path(cryptainer_filepath), mode="rb")
+
+
+def _load_cryptainer_payload_ciphertext_struct(
+    cryptainer_filepath: Path, cryptainer: dict, mmap_payload_ciphertext=False
+) -> dict:
+    """Return the INLINE "payload_ciphertext_struct" of a cryptainer header loaded from `cryptainer_filepath`
+    (see `_load_cryptainer_file()`), reading only its payload ciphertext if this one is offloaded."""
+    if mmap_payload_ciphertext and cryptainer.get("payload_ciphertext_struct") == OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER:
+        ciphertext_value = _mmap_offloaded_ciphertext(cryptainer_filepath)
+    else:
+        with _open_cryptainer_ciphertext_stream(cryptainer_filepath, cryptainer) as ciphertext_stream:
+            ciphertext_value = ciphertext_stream.read()
+    return dict(ciphertext_location=PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE, ciphertext_value=ciphertext_value)
+
+
+def _map_ciphertext_file(ciphertext_filepath: Path, payload_offset: int, payload_length: int) -> mmap.mmap:
+    """Memory-map a (non-empty) ciphertext file up to the end of its payload, hinting the kernel that this payload
+    will be read sequentially, and that its start will soon be needed."""
+    with open(ciphertext_filepath, "rb") as f:
+        if hasattr(os, "posix_fadvise"):  # Not on Windows and MacOS
+            os.posix_fadvise(f.fileno(), payload_offset, payload_length, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(
+                f.fileno(), payload_offset, min(payload_length, DEFAULT_DATA_CHUNK_SIZE), os.POSIX_FADV_WILLNEED
+            )
+        mapping = mmap.mmap(f.fileno(), length=payload_offset + payload_length, access=mmap.ACCESS_READ)
+    if hasattr(mmap, "MADV_SEQUENTIAL"):  # Python >= 3.8, on some platforms
+        mapping.madvise(mmap.MADV_SEQUENTIAL)  # More aggressive readahead on page faults
+    return mapping  # Remains valid after its file is closed
+
+
+def _mmap_offloaded_ciphertext(cryptainer_filepath: Path) -> Union[bytes, memoryview]:
+    """Return the offloaded ciphertext of a cryptainer as a read-only memoryview over a memory-mapping, which is
+    unmapped once this memoryview (and all its slices) are garbage-collected."""
+    with open(cryptainer_filepath, "rb") as f:
+        single_file_offsets = _read_single_file_offsets(f)
+    if single_file_offsets:
+        _header_offset, _header_length, payload_offset, payload_length = single_file_offsets
+        ciphertext_filepath = cryptainer_filepath
+    else:
+        ciphertext_filepath = _get_offloaded_file_path(cryptainer_filepath)
+        payload_offset, payload_length = 0, ciphertext_filepath.stat().st_size
+    if not payload_length:  # Empty files can't be mapped
+        return b""
+    mapping = _map_ciphertext_file(ciphertext_filepath, payload_offset=payload_offset, payload_length=payload_length)
+    return memoryview(mapping)[payload_offset:]
+
+
+@contextmanager
+def mmap_cryptainer_payload_ciphertext(cryptainer_filepath: Path):
+    """Context manager giving the payload ciphertext of a cryptainer file as a read-only, memory-mapped, memoryview.
+
+    This works for single-file cryptainers as well as for offloaded payloads (inline ciphertexts are just wrapped
+    in a memoryview). The memoryview, and slices of it, must not be used after the end of the `with` block.
+    """
+    with open(cryptainer_filepath, "rb") as f:
+        single_file_offsets = _read_single_file_offsets(f)
+    if single_file_offsets:
+        _header_offset, _header_length, payload_offset, payload_length = single_file_offsets
+        ciphertext_filepath = cryptainer_filepath
+    else:
+        cryptainer, _binary_format = _load_cryptainer_file(cryptainer_filepath)
+        if cryptainer["payload_ciphertext_struct"] != OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER:
+            yield memoryview(_get_cryptainer_inline_ciphertext_value(cryptainer))
+            return
+        ciphertext_filepath = _get_offloaded_file_path(cryptainer_filepath)
+        payload_offset, payload_length = 0, ciphertext_filepath.stat().st_size
+
+    if not payload_length:  # Empty files can't be mapped
+        yield memoryview(b"")
+        return
+
+    mapping = _map_ciphertext_file(ciphertext_filepath, payload_offset=payload_offset, payload_length=payload_length)
+    with mapping:
+        ciphertext_view = memoryview(mapping)[payload_offset:]
+        try:
+            yield ciphertext_view
+        finally:
+            ciphertext_view.release()  # Else the mapping can't be closed
+
+
+def verify_cryptainer_integrity(
+    cryptainer_filepath: Path,
+    *,
+    keystore_pool: Optional[KeystorePoolBase] = None,
+    verify_integrity_tags: bool = False,
+    passphrase_mapper: Optional[dict] = None,
+    decryption_session: Optional[DecryptionSession] = None,
+) -> list:
+    """Audit a cryptainer stored on filesystem, by streaming its (possibly offloaded) payload ciphertext.
+
+    Payload digests and signatures of the outermost payload cipher layer are checked on the ciphertext,
+    which only requires public keys. If `verify_integrity_tags`, the payload is also decrypted chunk by chunk
+    (and plaintext discarded), to check integrity tags and signatures of all layers.
+
+    :param cryptainer_filepath: path of the cryptainer (its offloaded ciphertext, if any, is found nearby)
+    :param keystore_pool: optional key storage pool
+    :param verify_integrity_tags: whether payload keys must be unwrapped to check all layers
+    :param passphrase_mapper: optional dict mapping trustee IDs to their lists of passphrases
+    :param decryption_session: optional DecryptionSession, to share key caches between several audits
+
+    :return: error_report list (empty if the cryptainer is intact)
+    """
+    cryptainer, _binary_format = _load_cryptainer_file(
+        cryptainer_filepath, include_inline_ciphertext=False
+    )  # Payload ciphertext is streamed instead
+    cryptainer_decryptor = CryptainerDecryptor(
+        keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper, decryption_session=decryption_session
+    )
+    with _open_cryptainer_ciphertext_stream(cryptainer_filepath, cryptainer) as ciphertext_stream:
+        return cryptainer_decryptor.verify_payload_stream(
+            cryptainer, ciphertext_stream=ciphertext_stream, verify_integrity_tags=verify_integrity_tags
+        )
+
+
+def convert_cryptainer_format_on_filesystem(cryptainer_filepath: Path, binary_format: bool) -> bool:
+    """Rewrite a cryptainer file in json or binary format, atomically; its offloaded ciphertext (if any) is untouched.
+
+    :param cryptainer_filepath: path of the cryptainer file to convert
+    :param binary_format: True to convert to CRYPTAINER_BINARY_FORMAT, False to convert to json
+
+    :return: whether the cryptainer file was rewritten (False if it was already in the requested format)
+    """
+    cryptainer, current_binary_format = _load_cryptainer_file(cryptainer_filepath)
+    if current_binary_format == binary_format:
+        return False
+    _replace_cryptainer_header_on_filesystem(cryptainer_filepath, cryptainer=cryptainer, binary_format=binary_format)
+    return True
+
+
+def _gather_cryptainer_error_reports(
+    cryptainer_names: list, futures: list, error_type: str, error_message: str
+) -> dict:
+    """Return a dict mapping cryptainer names to the error reports returned by their (completed) futures,
+    an unexpected exception being turned into an ERROR entry built from `error_message` % (name, exception)."""
+    error_reports = {}
+    for cryptainer_name, future in zip(cryptainer_names, futures):
+        exception = future.exception()
+        if exception is None:
+            error_reports[cryptainer_name] = future.result()
+            continue
+        error_entry = CryptainerDecryptor._build_error_report_entry(
+            error_type=error_type,
+            error_criticity=DecryptionErrorCriticity.ERROR,
+            error_message=error_message % (cryptainer_name, exception),
+            error_exception=exception,
+        )
+        error_reports[cryptainer_name] = [error_entry]
+    return error_reports
+
+
 class ReadonlyCryptainerStorage:
     """
     This class provides read access to a directory filled with cryptainers..
@@ -1790,11 +4537,7 @@ class ReadonlyCryptainerStorage:
         assert not Path(cryptainer_name).is_absolute()
         return self._cryptainer_dir.joinpath(cryptainer_name)
 
-    def load_cryptainer_from_storage(self, cryptainer_name_or_idx, include_payload_ciphertext=True) -> dict:
-        """
-        Return the encrypted cryptainer dict for `cryptainer_name_or_idx` (which must be in `list_cryptainer_names()`,
-        or an index suitable for this sorted list).
-        """
+    def _get_cryptainer_name(self, cryptainer_name_or_idx) -> Path:
         if isinstance(cryptainer_name_or_idx, int):
             cryptainer_names = self.list_cryptainer_names(as_sorted_list=True, as_absolute_paths=False)
             cryptainer_name = cryptainer_names[cryptainer_name_or_idx]  # Will break if idx is out of bounds
@@ -1802,14 +4545,35 @@ class ReadonlyCryptainerStorage:
             assert isinstance(cryptainer_name_or_idx, (Path, str)), repr(cryptainer_name_or_idx)
             cryptainer_name = Path(cryptainer_name_or_idx)
         assert not cryptainer_name.is_absolute(), cryptainer_name
+        return cryptainer_name
+
+    def load_cryptainer_from_storage(
+        self, cryptainer_name_or_idx, include_payload_ciphertext=True, mmap_payload_ciphertext=False
+    ) -> dict:
+        """
+        Return the encrypted cryptainer dict for `cryptainer_name_or_idx` (which must be in `list_cryptainer_names()`,
+        or an index suitable for this sorted list).
+
+        See `load_cryptainer_from_filesystem()` about `mmap_payload_ciphertext`.
+        """
+        cryptainer_name = self._get_cryptainer_name(cryptainer_name_or_idx)
 
         logger.info("Loading cryptainer %s from storage (include_payload_ciphertext=%s)", cryptainer_name, include_payload_ciphertext)
         cryptainer_filepath = self._make_absolute(cryptainer_name)
         cryptainer = load_cryptainer_from_filesystem(
-            cryptainer_filepath, include_payload_ciphertext=include_payload_ciphertext
+            cryptainer_filepath,
+            include_payload_ciphertext=include_payload_ciphertext,
+            mmap_payload_ciphertext=mmap_payload_ciphertext,
         )
         return cryptainer
 
+    def create_decryption_session(self) -> DecryptionSession:
+        """
+        Return a new DecryptionSession bound to the keystore pool of this storage, to be passed to successive
+        `decrypt_cryptainer_from_storage()` calls, and closed afterwards (e.g. by using it as a context manager).
+        """
+        return DecryptionSession(keystore_pool=self._keystore_pool)
+
     def decrypt_cryptainer_from_storage(
         self,
         cryptainer_name_or_idx,
@@ -1817,40 +4581,141 @@ class ReadonlyCryptainerStorage:
         verify_integrity_tags: bool = True,
         gateway_urls: Optional[list] = None,
         revelation_requestor_uid: Optional[uuid.UUID] = None,
+        decryption_session: Optional[DecryptionSession] = None,
     ) -> tuple:
         """
         Return the decrypted content of the cryptainer `cryptainer_name_or_idx` (which must be in `list_cryptainer_names()`,
         or an index suitable for this sorted list).
+
+        A `decryption_session` (see `create_decryption_session()`) can be provided to speed up bulk decryptions.
+
+        Keys are unwrapped from the cryptainer header first, and the payload ciphertext is only loaded
+        if all of them are available (else result is None, and the error report tells why).
         """
         logger.info("Decrypting cryptainer %r from storage", cryptainer_name_or_idx)
 
-        cryptainer = self.load_cryptainer_from_storage(cryptainer_name_or_idx, include_payload_ciphertext=True)
+        cryptainer_filepath = self._make_absolute(self._get_cryptainer_name(cryptainer_name_or_idx))
+        cryptainer_header, _binary_format = _load_cryptainer_file(cryptainer_filepath, include_inline_ciphertext=False)
+        cryptainer = dict(cryptainer_header)
+        cryptainer.pop("payload_ciphertext_struct", None)  # Header-only cryptainer
+
+        def payload_ciphertext_struct_loader():  # Header is not parsed again for offloaded ciphertexts
+            return _load_cryptainer_payload_ciphertext_struct(cryptainer_filepath, cryptainer_header)
 
         result, error_report = self._decrypt_payload_from_cryptainer(
             cryptainer,
+            payload_ciphertext_struct_loader=payload_ciphertext_struct_loader,
             passphrase_mapper=passphrase_mapper,
             verify_integrity_tags=verify_integrity_tags,
             gateway_urls=gateway_urls,
             revelation_requestor_uid=revelation_requestor_uid,
+            decryption_session=decryption_session,
         )
-        logger.info("Cryptainer %s successfully decrypted", cryptainer_name_or_idx)
+        logger.info("Cryptainer %s decryption finished", cryptainer_name_or_idx)
         return result, error_report
 
+    def can_decrypt_cryptainer(
+        self,
+        cryptainer_name_or_idx,
+        passphrase_mapper: Optional[dict] = None,
+        gateway_urls: Optional[list] = None,
+        revelation_requestor_uid: Optional[uuid.UUID] = None,
+        decryption_session: Optional[DecryptionSession] = None,
+    ) -> bool:
+        """
+        Return True iff all payload keys of the cryptainer `cryptainer_name_or_idx` can be unwrapped,
+        without loading its payload ciphertext.
+        """
+        cryptainer = self.load_cryptainer_from_storage(cryptainer_name_or_idx, include_payload_ciphertext=False)
+        return can_decrypt_cryptainer(
+            cryptainer,
+            keystore_pool=self._keystore_pool,
+            passphrase_mapper=passphrase_mapper,
+            gateway_urls=gateway_urls,
+            revelation_requestor_uid=revelation_requestor_uid,
+            decryption_session=decryption_session,
+        )
+
+    def iter_cryptainer_headers(self, cryptainer_names: Optional[list] = None):
+        """
+        Iterate on the identification fields of cryptainers (see `load_cryptainer_header_from_filesystem()`),
+        without parsing their key cipher layers nor their payload ciphertext.
+
+        :param cryptainer_names: names of cryptainers to load (defaults to all cryptainers of storage, sorted)
+
+        :return: iterator of (cryptainer_name, cryptainer_header) tuples
+        """
+        if cryptainer_names is None:
+            cryptainer_names = self.list_cryptainer_names(as_sorted_list=True, as_absolute_paths=False)
+        for cryptainer_name in cryptainer_names:
+            cryptainer_name = self._get_cryptainer_name(cryptainer_name)
+            yield cryptainer_name, load_cryptainer_header_from_filesystem(self._make_absolute(cryptainer_name))
+
+    def _load_cryptainer_headers_with_names(self, cryptainer_names: list) -> list:
+        return [
+            (
+                cryptainer_name,
+                load_cryptainer_from_filesystem(self._make_absolute(cryptainer_name), include_payload_ciphertext=False),
+            )
+            for cryptainer_name in cryptainer_names
+        ]
+
+    def gather_cryptainer_dependencies(
+        self, cryptainer_names: Optional[list] = None, max_workers: int = DEFAULT_STORAGE_SCAN_MAX_WORKERS
+    ) -> tuple:
+        """
+        Scan the headers of cryptainers (by batches, in a thread pool), and return both their trustee
+        dependencies and the symkeys/shards needed for their decryption, in a single pass.
+
+        :param cryptainer_names: names of cryptainers to scan (defaults to all cryptainers of storage)
+        :param max_workers: count of threads loading cryptainer headers
+
+        :return: tuple (trustee_dependencies, decryptable_symkeys_per_trustee), with the same formats as
+            the results of `gather_trustee_dependencies()` and `gather_decryptable_symkeys()`
+        """
+        if cryptainer_names is None:
+            cryptainer_names = self.list_cryptainer_names(as_sorted_list=True, as_absolute_paths=False)
+
+        trustee_dependencies_gatherer = _TrusteeDependenciesGatherer()
+        decryptable_symkeys_gatherer = _DecryptableSymkeysGatherer()
+
+        cryptainer_name_batches = [
+            cryptainer_names[idx : idx + STORAGE_SCAN_BATCH_SIZE]
+            for idx in range(0, len(cryptainer_names), STORAGE_SCAN_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cryptainer_scan_worker") as executor:
+            # Results are handled in order, so that the output doesn't depend on thread scheduling
+            for cryptainers_with_names in executor.map(
+                self._load_cryptainer_headers_with_names, cryptainer_name_batches
+            ):
+                for cryptainer_name, cryptainer in cryptainers_with_names:
+                    trustee_dependencies_gatherer.add_cryptainer(cryptainer)
+                    decryptable_symkeys_gatherer.add_cryptainer(cryptainer_name, cryptainer)
+
+        return (
+            trustee_dependencies_gatherer.get_trustee_dependencies(),
+            decryptable_symkeys_gatherer.get_decryptable_symkeys_per_trustee(),
+        )
+
     def _decrypt_payload_from_cryptainer(
         self,
         cryptainer: dict,
+        payload_ciphertext_struct_loader: Callable,
         passphrase_mapper: Optional[dict],
         verify_integrity_tags: bool,
         gateway_urls: Optional[list] = None,
         revelation_requestor_uid: Optional[uuid.UUID] = None,
+        decryption_session: Optional[DecryptionSession] = None,
     ) -> tuple:
         return decrypt_payload_from_cryptainer(
             cryptainer,
+            payload_ciphertext_struct_loader=payload_ciphertext_struct_loader,
             keystore_pool=self._keystore_pool,
             passphrase_mapper=passphrase_mapper,
             verify_integrity_tags=verify_integrity_tags,
             gateway_urls=gateway_urls,
             revelation_requestor_uid=revelation_requestor_uid,
+            decryption_session=decryption_session,
         )  # Will fail if authorizations are not OK
 
     def check_cryptainer_sanity(self, cryptainer_name_or_idx):
@@ -1869,26 +4734,54 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
 
     :param cryptainers_dir: the folder where cryptainer files are stored
     :param keystore_pool: optional KeystorePool, which might be required by current cryptoconf
-    :param default_cryptoconf: cryptoconf to use when none is provided when enqueuing payload
+    :param default_cryptoconf: cryptoconf (or compiled plan) to use when none is provided when enqueuing payload
     :param max_cryptainer_quota: if set, cryptainers are deleted if they exceed this size in bytes
     :param max_cryptainer_count: if set, oldest exceeding cryptainers (time taken from their name, else their file-stats) are automatically erased
     :param max_cryptainer_age: if set, cryptainers exceeding this age (taken from their name, else their file-stats) in days are automatically erased
     :param max_workers: count of worker threads to use in parallel
     :param offload_payload_ciphertext: whether actual encrypted payload must be kept separated from structured cryptainer file
+    :param header_pool_size: if set, count of cryptainer headers (with already encrypted keys) to pregenerate in background
+        for each recent combination of encryption parameters, so that new streams and enqueued files don't wait for
+        trustees; since cryptainer metadata are embedded in encrypted keys, only recurring metadata benefit from it
+    :param keychain_rotation_period: if set, the same default keychain_uid is reused, within a keychain group, for all
+        new cryptainers during this period (instead of creating a new keychain for each cryptainer)
+    :param keychain_rotation_cryptainer_count: if set, the same default keychain_uid is reused, within a keychain group,
+        for this count of new cryptainers (can be combined with `keychain_rotation_period`)
+    :param stream_checkpoint_interval: if set, encryption streams save a checkpoint each time this count of payload
+        bytes has been encrypted, so that they can be continued with `resume_cryptainer_encryption_stream()`
+    :param stream_checkpoint_cryptoconf: if set, cryptoconf protecting these checkpoints, instead of the key cipher
+        layers of the cryptainers themselves (see LOCAL_CHECKPOINT_CRYPTOCONF and its security tradeoff)
+    :param binary_format: whether new cryptainer files use the compact CRYPTAINER_BINARY_FORMAT instead of json
+    :param single_file: whether offloaded payload ciphertexts are appended to cryptainer files themselves,
+        instead of being stored in separate files
+    :param binary_key_envelopes: whether new cryptainers serialize their nested keys as compact binary envelopes
+        (see `encrypt_payload_into_cryptainer()`)
     """
 
     def __init__(
         self,
         cryptainer_dir: Path,
         keystore_pool: Optional[KeystorePoolBase] = None,
-        default_cryptoconf: Optional[dict] = None,
+        default_cryptoconf: Optional[Union[dict, CryptoconfPlan]] = None,
         max_cryptainer_quota: Optional[int] = None,
         max_cryptainer_count: Optional[int] = None,
         max_cryptainer_age: Optional[timedelta] = None,
         max_workers: int = 1,
         offload_payload_ciphertext=True,
+        header_pool_size: int = 0,
+        keychain_rotation_period: Optional[timedelta] = None,
+        keychain_rotation_cryptainer_count: Optional[int] = None,
+        stream_checkpoint_interval: Optional[int] = None,
+        stream_checkpoint_cryptoconf: Optional[dict] = None,
+        binary_format: bool = False,
+        single_file: bool = False,
+        binary_key_envelopes: bool = False,
     ):
         super().__init__(cryptainer_dir=cryptainer_dir, keystore_pool=keystore_pool)
+        assert header_pool_size >= 0, header_pool_size
+        assert stream_checkpoint_interval is None or stream_checkpoint_interval > 0, stream_checkpoint_interval
+        assert keychain_rotation_period is None or keychain_rotation_period > timedelta(0), keychain_rotation_period
+        assert not keychain_rotation_cryptainer_count or keychain_rotation_cryptainer_count >= 1
         assert max_cryptainer_quota is None or max_cryptainer_quota >= 0, max_cryptainer_quota
         assert max_cryptainer_count is None or max_cryptainer_count >= 0, max_cryptainer_count
         assert max_cryptainer_age is None or max_cryptainer_age >= timedelta(seconds=0), max_cryptainer_age
@@ -1900,6 +4793,25 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
         self._pending_executor_futures = []
         self._lock = threading.Lock()
         self._offload_payload_ciphertext = offload_payload_ciphertext
+        self._stream_checkpoint_interval = stream_checkpoint_interval
+        self._stream_checkpoint_cryptoconf = stream_checkpoint_cryptoconf
+        self._binary_format = binary_format
+        self._single_file = single_file
+        self._binary_key_envelopes = binary_key_envelopes
+        self._keychain_rotation_period = keychain_rotation_period
+        self._keychain_rotation_cryptainer_count = keychain_rotation_cryptainer_count
+        self._is_keychain_rotation_enabled = bool(keychain_rotation_period or keychain_rotation_cryptainer_count)
+        self._current_keychains = {}  # Maps keychain groups to dicts with keychain_uid and usage info
+        self._upcoming_keychain_uids = {}  # Maps keychain groups to the keychain_uid of their next rotation
+        self._cryptainer_header_factory = None
+        if header_pool_size:
+            self._cryptainer_header_factory = CryptainerHeaderFactory(
+                keystore_pool=keystore_pool, pool_size=header_pool_size, binary_key_envelopes=binary_key_envelopes
+            )
+            if default_cryptoconf:  # Most common case for recorders
+                self._schedule_cryptainer_header_refill(
+                    default_cryptoconf, cryptainer_metadata=None, keychain_group=None
+                )
 
     def __del__(self):
         self._thread_pool_executor.shutdown(wait=False)
@@ -1912,9 +4824,45 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
         logger.info("Deleting cryptainer %s" % cryptainer_name)
         self._delete_cryptainer(cryptainer_name=cryptainer_name)
 
+    def _purge_stale_checkpoints(self):
+        """Delete checkpoints of already finalized cryptainers (left by crashes), as well as all the files of
+        abandoned encryption streams, once they haven't been modified for `max_cryptainer_age`."""
+        now = get_utc_now_date()
+        checkpoint_suffix = CRYPTAINER_SUFFIX + CRYPTAINER_CHECKPOINT_SUFFIX
+        for checkpoint_filepath in self._cryptainer_dir.glob("*" + checkpoint_suffix):
+            cryptainer_filepath = checkpoint_filepath.with_name(
+                checkpoint_filepath.name[: -len(CRYPTAINER_CHECKPOINT_SUFFIX)]
+            )
+            if cryptainer_filepath.exists():
+                logger.info("Deleting stale checkpoint of finalized cryptainer %s", cryptainer_filepath.name)
+                stale_filepaths = [checkpoint_filepath]
+            elif self._max_cryptainer_age is not None:
+                stream_filepaths = [
+                    checkpoint_filepath,
+                    cryptainer_filepath.with_name(cryptainer_filepath.name + CRYPTAINER_TEMP_SUFFIX),
+                    _get_offloaded_file_path(cryptainer_filepath),
+                ]
+                try:
+                    last_mtime = max(filepath.stat().st_mtime for filepath in stream_filepaths if filepath.exists())
+                except (ValueError, FileNotFoundError):  # Concurrently deleted
+                    continue
+                if now - datetime.fromtimestamp(last_mtime, tz=timezone.utc) <= self._max_cryptainer_age:
+                    continue
+                logger.info("Deleting abandoned encryption stream of cryptainer %s", cryptainer_filepath.name)
+                stale_filepaths = stream_filepaths
+            else:
+                continue
+            for stale_filepath in stale_filepaths:
+                try:
+                    stale_filepath.unlink()  # TODO use missing_ok=True later with python3.8
+                except FileNotFoundError:
+                    pass
+
     def _purge_exceeding_cryptainers(self):
         """Purge cryptainers first by date, then total quota, then count, depending on instance settings"""
 
+        self._purge_stale_checkpoints()  # Secret keys must not linger on disk
+
         if self._max_cryptainer_age is not None:  # FIRST these, since their deletion is unconditional
             cryptainer_dicts = self.list_cryptainer_properties(with_age=True)
             for cryptainer_dict in cryptainer_dicts:
@@ -1960,6 +4908,10 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
             cryptainer_metadata=cryptainer_metadata,
             keychain_uid=default_keychain_uid,
             keystore_pool=self._keystore_pool,
+            binary_format=self._binary_format,
+            single_file=self._single_file,
+            cryptainer_header_factory=self._cryptainer_header_factory,
+            binary_key_envelopes=self._binary_key_envelopes,
         )
 
     def _encrypt_payload_into_cryptainer(self, payload, cryptainer_metadata, default_keychain_uid, cryptoconf):
@@ -1970,6 +4922,8 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
             cryptainer_metadata=cryptainer_metadata,
             keychain_uid=default_keychain_uid,
             keystore_pool=self._keystore_pool,
+            cryptainer_header_factory=self._cryptainer_header_factory,
+            binary_key_envelopes=self._binary_key_envelopes,
         )
 
     @catch_and_log_exception("CryptainerStorage._offloaded_encrypt_payload_and_dump_cryptainer")
@@ -2016,7 +4970,11 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
             )
             logger.debug("Writing self-sufficient cryptainer payload to storage file %s", cryptainer_filepath)
             dump_cryptainer_to_filesystem(
-                cryptainer_filepath, cryptainer=cryptainer, offload_payload_ciphertext=self._offload_payload_ciphertext
+                cryptainer_filepath,
+                cryptainer=cryptainer,
+                offload_payload_ciphertext=self._offload_payload_ciphertext,
+                binary_format=self._binary_format,
+                single_file=self._single_file,
             )
 
         logger.info("Data file %r successfully encrypted into storage cryptainer", filename_base)
@@ -2025,6 +4983,60 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
     def _use_streaming_encryption_for_cryptoconf(self, cryptoconf):
         return self._offload_payload_ciphertext and is_cryptainer_cryptoconf_streamable(cryptoconf)
 
+    def _schedule_cryptainer_header_refill(self, cryptoconf, cryptainer_metadata, keychain_group):
+        """Pregenerate headers for the next cryptainers of this keychain group, if a header pool is enabled.
+
+        With a keychain rotation policy, headers are generated for the keychain_uid of the NEXT rotation of the group
+        (those of the current keychain get refilled after each use anyway).
+        """
+        if not self._cryptainer_header_factory:
+            return
+        keychain_uid = None
+        if self._is_keychain_rotation_enabled:
+            keychain_uid = self._upcoming_keychain_uids.setdefault(keychain_group, generate_uuid0())
+        self._cryptainer_header_factory.schedule_refill(
+            cryptoconf, keychain_uid=keychain_uid, cryptainer_metadata=cryptainer_metadata
+        )
+
+    def _get_default_keychain_uid(
+        self, keychain_group: Optional[str], cryptoconf=None, cryptainer_metadata=None
+    ) -> Optional[uuid.UUID]:
+        """Return the keychain_uid to use for a new cryptainer of this group, according to the rotation policy.
+
+        None is returned if no rotation policy is set, so that each cryptainer gets its own keychain.
+
+        On each rotation, headers are pregenerated (if enabled) for the next keychain of this group, with
+        `cryptoconf` and `cryptainer_metadata`.
+        """
+        if not self._is_keychain_rotation_enabled:
+            return None
+
+        now = get_utc_now_date()
+        current_keychain = self._current_keychains.get(keychain_group)
+
+        if (
+            current_keychain is None
+            or (
+                self._keychain_rotation_period is not None
+                and now - current_keychain["creation_datetime"] >= self._keychain_rotation_period
+            )
+            or (
+                self._keychain_rotation_cryptainer_count is not None
+                and current_keychain["cryptainer_count"] >= self._keychain_rotation_cryptainer_count
+            )
+        ):
+            keychain_uid = self._upcoming_keychain_uids.pop(keychain_group, None) or generate_uuid0()
+            current_keychain = dict(keychain_uid=keychain_uid, creation_datetime=now, cryptainer_count=0)
+            logger.info("Rotating to new keychain %s for keychain group %r", keychain_uid, keychain_group)
+            self._current_keychains[keychain_group] = current_keychain
+            if cryptoconf:
+                self._schedule_cryptainer_header_refill(
+                    cryptoconf, cryptainer_metadata=cryptainer_metadata, keychain_group=keychain_group
+                )
+
+        current_keychain["cryptainer_count"] += 1
+        return current_keychain["keychain_uid"]
+
     def _prepare_for_new_record_encryption(self, cryptoconf):
         """
         Validate arguments for new encryption, and purge obsolete things in storage.
@@ -2047,13 +5059,41 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
         dump_initial_cryptainer=True,
         cryptainer_encryption_stream_class=None,
         cryptainer_encryption_stream_extra_kwargs=None,
+        keychain_group=None,
     ):
         cryptainer_encryption_stream_class = cryptainer_encryption_stream_class or CryptainerEncryptionPipeline
         cryptainer_encryption_stream_extra_kwargs = cryptainer_encryption_stream_extra_kwargs or {}
+        if self._cryptainer_header_factory:
+            cryptainer_encryption_stream_extra_kwargs = dict(
+                cryptainer_header_factory=self._cryptainer_header_factory, **cryptainer_encryption_stream_extra_kwargs
+            )
+        if self._stream_checkpoint_interval:
+            cryptainer_encryption_stream_extra_kwargs = dict(
+                checkpoint_interval=self._stream_checkpoint_interval, **cryptainer_encryption_stream_extra_kwargs
+            )
+        if self._stream_checkpoint_cryptoconf:
+            cryptainer_encryption_stream_extra_kwargs = dict(
+                checkpoint_cryptoconf=self._stream_checkpoint_cryptoconf, **cryptainer_encryption_stream_extra_kwargs
+            )
+        if self._binary_format:  # Custom stream classes might not support this parameter
+            cryptainer_encryption_stream_extra_kwargs = dict(
+                binary_format=self._binary_format, **cryptainer_encryption_stream_extra_kwargs
+            )
+        if self._single_file:  # Same remark as above
+            cryptainer_encryption_stream_extra_kwargs = dict(
+                single_file=self._single_file, **cryptainer_encryption_stream_extra_kwargs
+            )
+        if self._binary_key_envelopes:  # Same remark as above
+            cryptainer_encryption_stream_extra_kwargs = dict(
+                binary_key_envelopes=self._binary_key_envelopes, **cryptainer_encryption_stream_extra_kwargs
+            )
 
         logger.debug("Building cryptainer stream %r", filename_base)
         cryptainer_filepath = self._make_absolute(filename_base + CRYPTAINER_SUFFIX)
         cryptoconf = self._prepare_for_new_record_encryption(cryptoconf)
+        keychain_uid = keychain_uid or self._get_default_keychain_uid(
+            keychain_group, cryptoconf=cryptoconf, cryptainer_metadata=cryptainer_metadata
+        )
 
         cryptainer_encryption_stream = cryptainer_encryption_stream_class(
             cryptainer_filepath,
@@ -2066,9 +5106,31 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
         )
         return cryptainer_encryption_stream
 
+    @synchronized
+    def resume_cryptainer_encryption_stream(
+        self, filename_base, cryptainer_encryption_stream_class=None, passphrase_mapper=None
+    ):
+        """Reopen an encryption stream interrupted (e.g. by a restart) before finalization, from its last checkpoint.
+
+        Unless a `stream_checkpoint_cryptoconf` was provided, the trustees of the cryptainer must be able to decrypt
+        the checkpoint, e.g. with the help of `passphrase_mapper`.
+
+        Raises FileNotFoundError if no checkpoint exists for this cryptainer, and DecryptionError if it can't
+        be decrypted.
+        """
+        cryptainer_encryption_stream_class = cryptainer_encryption_stream_class or CryptainerEncryptionPipeline
+        logger.debug("Resuming cryptainer stream %r", filename_base)
+        cryptainer_filepath = self._make_absolute(filename_base + CRYPTAINER_SUFFIX)
+        return cryptainer_encryption_stream_class.resume_from_checkpoint(
+            cryptainer_filepath,
+            keystore_pool=self._keystore_pool,
+            checkpoint_interval=self._stream_checkpoint_interval,
+            passphrase_mapper=passphrase_mapper,
+        )
+
     @synchronized
     def enqueue_file_for_encryption(
-        self, filename_base, payload, cryptainer_metadata, keychain_uid=None, cryptoconf=None
+        self, filename_base, payload, cryptainer_metadata, keychain_uid=None, cryptoconf=None, keychain_group=None
     ):
         """Enqueue a payload for asynchronous encryption and storage.
 
@@ -2079,10 +5141,15 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
         :param cryptainer_metadata: Dict of metadata added (unencrypted) to cryptainer.
         :param keychain_uid: If provided, replaces autogenerated default keychain_uid for this cryptainer.
         :param cryptoconf: If provided, replaces default cryptoconf for this cryptainer.
+        :param keychain_group: If provided, name (e.g. of sensor) of the group of cryptainers sharing their
+            default keychain_uid, when a keychain rotation policy is active.
         """
         logger.info("Enqueuing file %r for encryption and storage", filename_base)
 
         cryptoconf = self._prepare_for_new_record_encryption(cryptoconf)
+        keychain_uid = keychain_uid or self._get_default_keychain_uid(
+            keychain_group, cryptoconf=cryptoconf, cryptainer_metadata=cryptainer_metadata
+        )
 
         future = self._thread_pool_executor.submit(
             self._offloaded_encrypt_payload_and_dump_cryptainer,
@@ -2094,6 +5161,76 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
         )
         self._pending_executor_futures.append(future)
 
+    def _rewrap_cryptainer_keys_on_filesystem(
+        self, cryptainer_name, new_key_cipher_layers, passphrase_mapper, decryption_session
+    ) -> list:
+        cryptainer_filepath = self._make_absolute(cryptainer_name)
+        cryptainer, binary_format = _load_cryptainer_file(cryptainer_filepath)  # Offloaded ciphertext is NOT loaded
+
+        rewrapped_cryptainer, error_report = rewrap_cryptainer_keys(
+            cryptainer,
+            new_key_cipher_layers,
+            keystore_pool=self._keystore_pool,
+            passphrase_mapper=passphrase_mapper,
+            decryption_session=decryption_session,
+        )
+        if rewrapped_cryptainer is not None:
+            _replace_cryptainer_header_on_filesystem(
+                cryptainer_filepath, cryptainer=rewrapped_cryptainer, binary_format=binary_format
+            )
+            logger.info("Keys of cryptainer %s successfully rewrapped", cryptainer_name)
+        else:
+            logger.warning("Could not rewrap keys of cryptainer %s", cryptainer_name)
+        return error_report
+
+    def rewrap_cryptainers_keys(
+        self,
+        new_key_cipher_layers: list,
+        cryptainer_names: Optional[list] = None,
+        passphrase_mapper=None,
+        workers: int = 1,
+    ) -> dict:
+        """Re-encrypt the payload keys of stored cryptainers with new key cipher layers, on a dedicated thread pool
+        (so that background encryptions aren't delayed).
+
+        Only cryptainer headers are rewritten (atomically), offloaded payload ciphertexts are left untouched;
+        a cryptainer is left unchanged if some of its keys can't be unwrapped, or if an unexpected exception occurs
+        (this exception is then recorded in its error report, and other cryptainers are still processed).
+
+        :param new_key_cipher_layers: list of key cipher layers, with the same format as in cryptoconfs
+        :param cryptainer_names: names of cryptainers to process (defaults to all cryptainers of storage)
+        :param passphrase_mapper: optional dict mapping trustee IDs to their lists of passphrases
+        :param workers: count of cryptainers processed in parallel
+
+        :return: dict mapping cryptainer names to their error reports (empty if no problem occurred)
+        """
+        assert workers >= 1, workers
+        if cryptainer_names is None:
+            cryptainer_names = self.list_cryptainer_names(as_sorted_list=True, as_absolute_paths=False)
+
+        # Private keys are loaded once for all, and the session is only closed once all workers are done
+        with self.create_decryption_session() as decryption_session, ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="cryptainer_rewrap_worker"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._rewrap_cryptainer_keys_on_filesystem,
+                    cryptainer_name=cryptainer_name,
+                    new_key_cipher_layers=new_key_cipher_layers,
+                    passphrase_mapper=passphrase_mapper,
+                    decryption_session=decryption_session,
+                )
+                for cryptainer_name in cryptainer_names
+            ]
+            wait_futures(futures)
+
+        return _gather_cryptainer_error_reports(
+            cryptainer_names,
+            futures,
+            error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+            error_message="Could not rewrap keys of cryptainer %s: %r",
+        )
+
     def _purge_executor_results(self):
         """Remove futures which are actually over. We don't care about their result/exception here"""
         still_pending_results = [future for future in self._pending_executor_futures if not future.done()]
@@ -2105,9 +5242,183 @@ class CryptainerStorage(ReadonlyCryptainerStorage):
         self._purge_executor_results()
         for future in self._pending_executor_futures:
             future.result()  # Should NEVER raise, thanks to the @catch_and_log_exception above, and absence of cancellations
+        if self._cryptainer_header_factory:
+            self._cryptainer_header_factory.wait_for_idle_state()
         self._purge_exceeding_cryptainers()  # Good to have now
 
 
+def _fsync_file(filepath: Path):
+    with open(filepath, "r+b") as f:
+        os.fsync(f.fileno())
+
+
+def _commit_cryptainer_migration(cryptainer_filepath: Path, staging_filepath: Path):
+    """Replace a cryptainer by its fully written migrated version; can be safely called again if interrupted."""
+    staging_offloaded_file_path = _get_offloaded_file_path(staging_filepath)
+    if staging_offloaded_file_path.exists():
+        os.replace(staging_offloaded_file_path, _get_offloaded_file_path(cryptainer_filepath))  # Atomic
+    os.replace(staging_filepath, cryptainer_filepath)  # Atomic
+
+
+def _inline_offloaded_ciphertext_on_filesystem(cryptainer_filepath: Path, binary_format: bool):
+    """Move the offloaded ciphertext of a two-files cryptainer into its cryptainer file."""
+    offloaded_file_path = _get_offloaded_file_path(cryptainer_filepath)
+    cryptainer = load_cryptainer_from_filesystem(cryptainer_filepath, mmap_payload_ciphertext=True)
+    dump_cryptainer_to_filesystem(
+        cryptainer_filepath, cryptainer=cryptainer, offload_payload_ciphertext=False, binary_format=binary_format
+    )
+    del cryptainer  # Releases the mapping of offloaded file
+    os.remove(offloaded_file_path)
+
+
+def _migrate_cryptainer_on_filesystem(
+    cryptainer_filepath: Path,
+    cryptoconf_plan: CryptoconfPlan,
+    keystore_pool: KeystorePoolBase,
+    passphrase_mapper: Optional[dict],
+    decryption_session: DecryptionSession,
+) -> list:
+    staging_filepath = cryptainer_filepath.with_name(cryptainer_filepath.name + CRYPTAINER_MIGRATION_SUFFIX)
+    prestaging_filepath = staging_filepath.with_name(staging_filepath.name + CRYPTAINER_TEMP_SUFFIX)
+
+    if staging_filepath.exists():  # Previous migration was interrupted after its point of no return
+        logger.info("Completing interrupted migration of cryptainer %s", cryptainer_filepath)
+        _commit_cryptainer_migration(cryptainer_filepath, staging_filepath)
+        return []
+
+    for filepath in (prestaging_filepath, _get_offloaded_file_path(staging_filepath)):  # Leftovers of a failed run
+        try:
+            filepath.unlink()  # TODO use missing_ok=True later with python3.8
+        except FileNotFoundError:
+            pass
+
+    cryptainer, binary_format = _load_cryptainer_file(
+        cryptainer_filepath, include_inline_ciphertext=False
+    )  # Payload ciphertext is streamed instead
+    if _get_cryptoconf_skeleton(cryptainer["payload_cipher_layers"]) == _get_cryptoconf_skeleton(
+        cryptoconf_plan.cryptoconf["payload_cipher_layers"]
+    ):
+        logger.info("Cryptainer %s is already migrated, skipping it", cryptainer_filepath)
+        return []
+
+    with open(cryptainer_filepath, "rb") as f:
+        is_single_file = bool(_read_single_file_offsets(f))  # Layout of cryptainer files is preserved too
+    is_inline = "payload_ciphertext_struct" not in cryptainer  # Inline ciphertext was removed from header
+    ciphertext_stream = _open_cryptainer_ciphertext_stream(cryptainer_filepath, cryptainer)
+
+    cryptainer_decryptor = CryptainerDecryptor(
+        keystore_pool=keystore_pool, passphrase_mapper=passphrase_mapper, decryption_session=decryption_session
+    )
+    encryption_pipeline = CryptainerEncryptionPipeline(
+        prestaging_filepath,
+        cryptoconf=cryptoconf_plan,
+        cryptainer_metadata=cryptainer["cryptainer_metadata"],
+        keychain_uid=cryptainer["keychain_uid"],
+        keystore_pool=keystore_pool,
+        dump_initial_cryptainer=False,
+        binary_format=binary_format,
+        single_file=is_single_file,
+        binary_key_envelopes=cryptainer["cryptainer_format"] == CRYPTAINER_BINARY_ENVELOPES_FORMAT,
+        cryptainer_uid=cryptainer["cryptainer_uid"],  # Migrated cryptainer keeps its identity
+    )
+    try:
+        with ciphertext_stream:
+            is_success, error_report = cryptainer_decryptor.decrypt_payload_stream(
+                cryptainer,
+                ciphertext_stream=ciphertext_stream,
+                plaintext_chunk_handler=encryption_pipeline.encrypt_chunk,
+            )
+        if is_success and any(
+            error_entry["error_type"] == DecryptionErrorType.SIGNATURE_ERROR for error_entry in error_report
+        ):  # An unverifiable payload must not get new, valid, signatures
+            is_success = False
+            error_entry = cryptainer_decryptor._build_error_report_entry(
+                error_type=DecryptionErrorType.SIGNATURE_ERROR,
+                error_criticity=DecryptionErrorCriticity.ERROR,
+                error_message="Aborted migration of cryptainer with unverified payload signatures",
+                error_exception=None,
+            )
+            error_report.append(error_entry)
+        if not is_success:
+            encryption_pipeline.abort()
+            logger.warning("Could not migrate cryptainer %s", cryptainer_filepath)
+            return error_report
+        encryption_pipeline.finalize()
+    except Exception:
+        encryption_pipeline.abort()
+        raise
+
+    if is_inline:  # Pipeline always offloads its ciphertext, so we put it back into the cryptainer file
+        _inline_offloaded_ciphertext_on_filesystem(prestaging_filepath, binary_format=binary_format)
+    elif not is_single_file:
+        _fsync_file(_get_offloaded_file_path(staging_filepath))
+    _fsync_file(prestaging_filepath)
+    os.replace(prestaging_filepath, staging_filepath)  # Point of no return, the migration is now committed
+    _commit_cryptainer_migration(cryptainer_filepath, staging_filepath)
+    logger.info("Cryptainer %s successfully migrated", cryptainer_filepath)
+    return error_report
+
+
+def migrate_cryptainers(
+    storage: CryptainerStorage,
+    new_cryptoconf: Union[dict, CryptoconfPlan],
+    *,
+    workers: int = 1,
+    cryptainer_names: Optional[list] = None,
+    passphrase_mapper: Optional[dict] = None,
+) -> dict:
+    """Re-encrypt stored cryptainers with a new cryptoconf, e.g. to replace deprecated cipher algorithms.
+
+    Each payload is streamed from decryption straight into a new cryptainer, which then atomically replaces
+    the original one; the layout of cryptainer files (json or binary format, inline, offloaded or single-file
+    ciphertext) and cryptainer uids are preserved. The operation can be resumed after an interruption:
+    cryptainers already built from `new_cryptoconf` are skipped, and interrupted replacements are completed.
+    A cryptainer is left unchanged if its payload can't be decrypted, if its signatures can't be verified,
+    or if an unexpected exception occurs (this exception is then recorded in its error report, and other
+    cryptainers are still processed).
+
+    :param storage: the CryptainerStorage whose cryptainers are migrated (with its keystore pool)
+    :param new_cryptoconf: streamable cryptoconf, or CryptoconfPlan, for the migrated cryptainers
+    :param workers: count of cryptainers processed in parallel
+    :param cryptainer_names: names of cryptainers to process (defaults to all cryptainers of storage)
+    :param passphrase_mapper: optional dict mapping trustee IDs to their lists of passphrases
+
+    :return: dict mapping cryptainer names to their error reports (empty if no problem occurred)
+    """
+    assert workers >= 1, workers
+    cryptoconf_plan = new_cryptoconf
+    if not isinstance(cryptoconf_plan, CryptoconfPlan):
+        cryptoconf_plan = compile_cryptoconf(new_cryptoconf, keystore_pool=storage._keystore_pool)
+    if not cryptoconf_plan.is_streamable:
+        raise ValueError("Cryptoconf used for migration must only contain streamable cipher algorithms")
+
+    if cryptainer_names is None:
+        cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True, as_absolute_paths=False)
+
+    with storage.create_decryption_session() as decryption_session, ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="cryptainer_migration_worker"
+    ) as executor:
+        futures = [
+            executor.submit(
+                _migrate_cryptainer_on_filesystem,
+                cryptainer_filepath=storage._make_absolute(cryptainer_name),
+                cryptoconf_plan=cryptoconf_plan,
+                keystore_pool=storage._keystore_pool,
+                passphrase_mapper=passphrase_mapper,
+                decryption_session=decryption_session,
+            )
+            for cryptainer_name in cryptainer_names
+        ]
+        wait_futures(futures)
+
+    return _gather_cryptainer_error_reports(
+        cryptainer_names,
+        futures,
+        error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+        error_message="Could not migrate cryptainer %s: %r",
+    )
+
+
 def _create_cryptainer_and_cryptoconf_schema(for_cryptainer: bool, extended_json_format: bool):
     """Create validation schema for confs and cryptainers.
     :param for_cryptainer: true if instance is a cryptainer
@@ -2146,7 +5457,7 @@ def _create_cryptainer_and_cryptoconf_schema(for_cryptainer: bool, extended_json
     if for_cryptainer:
         extra_cryptainer = {
             "cryptainer_state": Or(CRYPTAINER_STATES.STARTED, CRYPTAINER_STATES.FINISHED),
-            "cryptainer_format": "cryptainer_1.0",
+            "cryptainer_format": Or(*SUPPORTED_CRYPTAINER_FORMATS),
             "cryptainer_uid": micro_schemas.schema_uid,
             "payload_ciphertext_struct": Or(
                 {
@@ -2227,22 +5538,170 @@ def _create_cryptainer_and_cryptoconf_schema(for_cryptainer: bool, extended_json
     return CRYPTAINER_SCHEMA
 
 
-CONF_SCHEMA_PYTHON = _create_cryptainer_and_cryptoconf_schema(for_cryptainer=False, extended_json_format=False)
-CONF_SCHEMA_JSON = _create_cryptainer_and_cryptoconf_schema(
-    for_cryptainer=False, extended_json_format=True
-).json_schema("conf_schema.json")
-CRYPTAINER_SCHEMA_PYTHON = _create_cryptainer_and_cryptoconf_schema(for_cryptainer=True, extended_json_format=False)
-CRYPTAINER_SCHEMA_JSON = _create_cryptainer_and_cryptoconf_schema(
-    for_cryptainer=True, extended_json_format=True
-).json_schema("cryptainer_schema.json")
+# These schemas are costly to build, so they are only created on first access, as (lazy) module attributes
+_LAZY_VALIDATION_SCHEMA_BUILDERS = {
+    "CONF_SCHEMA_PYTHON": lambda: _create_cryptainer_and_cryptoconf_schema(
+        for_cryptainer=False, extended_json_format=False
+    ),
+    "CONF_SCHEMA_JSON": lambda: _create_cryptainer_and_cryptoconf_schema(
+        for_cryptainer=False, extended_json_format=True
+    ).json_schema("conf_schema.json"),
+    "CRYPTAINER_SCHEMA_PYTHON": lambda: _create_cryptainer_and_cryptoconf_schema(
+        for_cryptainer=True, extended_json_format=False
+    ),
+    "CRYPTAINER_SCHEMA_JSON": lambda: _create_cryptainer_and_cryptoconf_schema(
+        for_cryptainer=True, extended_json_format=True
+    ).json_schema("cryptainer_schema.json"),
+}
+_LAZY_VALIDATION_SCHEMAS_LOCK = threading.Lock()
+
+
+def _get_validation_schema(schema_name: str) -> Union[dict, Schema]:
+    """Return the validation schema with this name, building it (once) if needed."""
+    validation_schema = globals().get(schema_name)
+    if validation_schema is None:
+        with _LAZY_VALIDATION_SCHEMAS_LOCK:
+            validation_schema = globals().get(schema_name)  # Might have been built by another thread
+            if validation_schema is None:
+                validation_schema = _LAZY_VALIDATION_SCHEMA_BUILDERS[schema_name]()
+                globals()[schema_name] = validation_schema  # Further accesses won't go through __getattr__()
+    return validation_schema
+
+
+def __getattr__(name):
+    """Module-level lookup of attributes not found in globals (see PEP 562), for lazy schemas."""
+    if name in _LAZY_VALIDATION_SCHEMA_BUILDERS:
+        return _get_validation_schema(name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+class _UncompilableSchema(Exception):
+    """THIS CLASS IS PRIVATE API"""
+
+
+def _compile_python_schema(schema_node, compiled_schemas: dict) -> Callable:
+    """Convert a python-schema tree to nested closures, which just return whether some data is valid.
+
+    Only the constructs of our own schemas are supported (else _UncompilableSchema is raised), with the same
+    semantic as python-schema; recursive (named) schemas are compiled once, thanks to `compiled_schemas` dict.
+    """
+    if type(schema_node) is Schema:
+        if schema_node.ignore_extra_keys:
+            raise _UncompilableSchema(schema_node)
+        schema_id = id(schema_node)
+        if schema_id in compiled_schemas:
+            if compiled_schemas[schema_id] is None:  # We're currently compiling it, so it's a recursive reference
+                return lambda data: compiled_schemas[schema_id](data)
+            return compiled_schemas[schema_id]
+        compiled_schemas[schema_id] = None
+        compiled_schemas[schema_id] = _compile_python_schema(schema_node.schema, compiled_schemas=compiled_schemas)
+        return compiled_schemas[schema_id]
+
+    if type(schema_node) in (And, Or):
+        if schema_node._ignore_extra_keys or getattr(schema_node, "only_one", False):
+            raise _UncompilableSchema(schema_node)
+        sub_validators = [_compile_python_schema(arg, compiled_schemas=compiled_schemas) for arg in schema_node.args]
+        if type(schema_node) is And:
+            return lambda data: all(sub_validator(data) for sub_validator in sub_validators)
+        return lambda data: any(sub_validator(data) for sub_validator in sub_validators)
+
+    if type(schema_node) is list:
+        item_validators = [_compile_python_schema(item, compiled_schemas=compiled_schemas) for item in schema_node]
+        return lambda data: isinstance(data, list) and all(
+            any(item_validator(item) for item_validator in item_validators) for item in data
+        )
+
+    if type(schema_node) is dict:
+        value_validators = {}
+        required_keys = set()
+        for key, value in schema_node.items():
+            if type(key) is OptionalKey and type(key.schema) is str and not hasattr(key, "default"):
+                key = key.schema
+            elif type(key) is str:
+                required_keys.add(key)
+            else:
+                raise _UncompilableSchema(key)
+            value_validators[key] = _compile_python_schema(value, compiled_schemas=compiled_schemas)
+
+        def _validate_dict(data):
+            if not isinstance(data, dict):
+                return False
+            for key, value in data.items():
+                value_validator = value_validators.get(key)
+                if value_validator is None or not value_validator(value):
+                    return False
+            return required_keys.issubset(data)
+
+        return _validate_dict
+
+    if type(schema_node) is type:
+        if schema_node is int:  # Like python-schema, reject booleans
+            return lambda data: isinstance(data, int) and not isinstance(data, bool)
+        return lambda data: isinstance(data, schema_node)
+
+    if type(schema_node) is pythonschema.Regex:
+
+        def _validate_regex(data):
+            try:
+                schema_node.validate(data)
+            except pythonschema.SchemaError:
+                return False
+            return True
+
+        return _validate_regex
+
+    if type(schema_node) in (str, int, float, bool, type(None)):
+        return lambda data: bool(schema_node == data)
+
+    if callable(schema_node) and not hasattr(schema_node, "validate") and not isinstance(schema_node, type):
+
+        def _validate_callable(data):
+            try:
+                return bool(schema_node(data))
+            except Exception:
+                return False
+
+        return _validate_callable
+
+    raise _UncompilableSchema(schema_node)  # E.g. tuples, Use, Literal, Hook...
+
+
+_COMPILED_SCHEMA_VALIDATORS = {}  # Maps id(schema) to (schema, validator), referencing schema prevents id reuse
+
+
+def _get_compiled_schema_validator(valid_schema: Union[dict, Schema]) -> Optional[Callable]:
+    """Return a (cached) function checking if data is valid against a schema, or None if schema is uncompilable."""
+    cache_entry = _COMPILED_SCHEMA_VALIDATORS.get(id(valid_schema))
+    if cache_entry is None:
+        if isinstance(valid_schema, Schema):
+            try:
+                validator = _compile_python_schema(valid_schema, compiled_schemas={})
+            except _UncompilableSchema as exc:
+                logger.debug("Couldn't compile python-schema, due to %r", exc)
+                validator = None
+        else:
+            import jsonschema  # Heavy, lazy import
+
+            jsonschema_validator_class = jsonschema.validators.validator_for(valid_schema)
+            jsonschema_validator_class.check_schema(valid_schema)  # Done once, instead of at each validation
+            validator = jsonschema_validator_class(valid_schema).is_valid
+        cache_entry = _COMPILED_SCHEMA_VALIDATORS[id(valid_schema)] = (valid_schema, validator)
+    return cache_entry[1]
 
 
 def _validate_data_tree(data_tree: dict, valid_schema: Union[dict, Schema]):
     """Allows the validation of a data_tree with a pythonschema or jsonschema
 
+    Valid data trees are checked by validators compiled once per schema, whereas invalid ones are
+    checked again by the original validator, to get a detailed error message.
+
     :param data_tree: cryptainer or cryptoconf to validate
     :param valid_schema: validation scheme
     """
+    validator = _get_compiled_schema_validator(valid_schema)
+    if validator is not None and validator(data_tree):
+        return
+
     if isinstance(valid_schema, Schema):
         # we use the python schema module
         try:
@@ -2252,13 +5711,21 @@ def _validate_data_tree(data_tree: dict, valid_schema: Union[dict, Schema]):
 
     else:
         # we use the json schema module
+        import jsonschema  # Heavy, lazy import
+
         assert isinstance(valid_schema, dict)
         try:
-            jsonschema_validate(instance=data_tree, schema=valid_schema)
+            jsonschema.validate(instance=data_tree, schema=valid_schema)
         except jsonschema.exceptions.ValidationError as exc:
             raise SchemaValidationError("Error validating data tree with json-schema: {}".format(exc)) from exc
 
 
+CRYPTOCONF_VALIDATION_CACHE_SIZE = 1024  # Count of valid cryptoconf digests remembered by check_cryptoconf_sanity()
+
+_VALID_CRYPTOCONF_DIGESTS = OrderedDict()  # Most recently used last
+_VALID_CRYPTOCONF_DIGESTS_LOCK = threading.Lock()
+
+
 def check_cryptainer_sanity(cryptainer: dict, jsonschema_mode=False):
     """Validate the format of a cryptainer.
 
@@ -2266,7 +5733,7 @@ def check_cryptainer_sanity(cryptainer: dict, jsonschema_mode=False):
            (with $binary, $numberInt and such) and will be checked using a jsonschema validator.
     """
 
-    schema = CRYPTAINER_SCHEMA_JSON if jsonschema_mode else CRYPTAINER_SCHEMA_PYTHON
+    schema = _get_validation_schema("CRYPTAINER_SCHEMA_JSON" if jsonschema_mode else "CRYPTAINER_SCHEMA_PYTHON")
 
     _validate_data_tree(data_tree=cryptainer, valid_schema=schema)
 
@@ -2274,10 +5741,25 @@ def check_cryptainer_sanity(cryptainer: dict, jsonschema_mode=False):
 def check_cryptoconf_sanity(cryptoconf: dict, jsonschema_mode=False):
     """Validate the format of a conf.
 
+    Digests of the latest valid cryptoconfs are cached, so that validating again the same
+    cryptoconf (e.g. for each cryptainer of a batch) is nearly free.
+
     :param jsonschema_mode: If True, the cryptainer must have been loaded as raw json
            (with $binary, $numberInt and such) and will be checked using a jsonschema validator.
     """
 
-    schema = CONF_SCHEMA_JSON if jsonschema_mode else CONF_SCHEMA_PYTHON
+    # The repr() of a valid cryptoconf only involves builtin types and UUIDs, so it's a faithful content digest
+    cryptoconf_digest = (jsonschema_mode, hashlib.sha256(repr(cryptoconf).encode("utf8")).digest())
+    with _VALID_CRYPTOCONF_DIGESTS_LOCK:
+        if cryptoconf_digest in _VALID_CRYPTOCONF_DIGESTS:
+            _VALID_CRYPTOCONF_DIGESTS.move_to_end(cryptoconf_digest)
+            return
+
+    schema = _get_validation_schema("CONF_SCHEMA_JSON" if jsonschema_mode else "CONF_SCHEMA_PYTHON")
 
     _validate_data_tree(data_tree=cryptoconf, valid_schema=schema)
+
+    with _VALID_CRYPTOCONF_DIGESTS_LOCK:
+        _VALID_CRYPTOCONF_DIGESTS[cryptoconf_digest] = True
+        if len(_VALID_CRYPTOCONF_DIGESTS) > CRYPTOCONF_VALIDATION_CACHE_SIZE:
+            _VALID_CRYPTOCONF_DIGESTS.popitem(last=False)  # Least recently used
@@ -1,4 +1,5 @@
 import builtins
+import functools
 import logging
 
 from jsonrpc_requests import Server as ServerBase, ProtocolError
@@ -10,12 +11,21 @@ from wacryptolib.utilities import dump_to_json_str, load_from_json_str
 logger = logging.getLogger(__name__)
 
 
-_exception_classes = StatusSlugsMapper.gather_exception_subclasses(builtins, parent_classes=[Exception])
-_exception_classes += StatusSlugsMapper.gather_exception_subclasses(
-    wacryptolib_exceptions, parent_classes=[wacryptolib_exceptions.FunctionalError]
-)
+@functools.lru_cache(maxsize=None)
+def _get_exception_mapper() -> StatusSlugsMapper:
+    """Build (once, on first RPC error) the mapper between status slugs and exception classes."""
+    exception_classes = StatusSlugsMapper.gather_exception_subclasses(builtins, parent_classes=[Exception])
+    exception_classes += StatusSlugsMapper.gather_exception_subclasses(
+        wacryptolib_exceptions, parent_classes=[wacryptolib_exceptions.FunctionalError]
+    )
+    return StatusSlugsMapper(exception_classes, fallback_exception_class=Exception)
 
-exception_mapper = StatusSlugsMapper(_exception_classes, fallback_exception_class=Exception)
+
+def __getattr__(name):
+    """Module-level lookup of attributes not found in globals (see PEP 562), for the lazy `exception_mapper`."""
+    if name == "exception_mapper":
+        return _get_exception_mapper()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 def status_slugs_response_error_handler(exc):
@@ -28,7 +38,7 @@ def status_slugs_response_error_handler(exc):
     if error_data:
         status_slugs = error_data["status_slugs"]
         status_message = error_data["message_untranslated"]
-        exception_class = exception_mapper.get_closest_exception_class_for_status_slugs(status_slugs)
+        exception_class = _get_exception_mapper().get_closest_exception_class_for_status_slugs(status_slugs)
         raise exception_class(status_message) from exc
     raise exc from None
 
@@ -388,6 +388,7 @@ class PeriodicEncryptionStreamMixin:
             cryptainer_filename_base,
             cryptainer_metadata=None,
             dump_initial_cryptainer=True,
+            keychain_group=self.sensor_name,
             **encryption_stream_extra_kwargs,
         )
         return cryptainer_encryption_stream
@@ -1,4 +1,5 @@
 import logging
+import threading
 import uuid
 from typing import Optional, Sequence
 
@@ -7,6 +8,7 @@ from wacryptolib.exceptions import KeyDoesNotExist, AuthorizationError, KeyLoadi
 from wacryptolib.keygen import load_asymmetric_key_from_pem_bytestring
 from wacryptolib.keystore import KeystoreBase, generate_keypair_for_storage
 from wacryptolib.signature import sign_message
+from wacryptolib.utilities import synchronized
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +24,17 @@ class TrusteeApi:
     outside the scope of a well defined legal procedure.
     """
 
-    def __init__(self, keystore: KeystoreBase):
+    _lock = threading.Lock()  # Shared by all instances, since they may target the same keystore concurrently
+
+    def __init__(self, keystore: KeystoreBase, private_key_cache: Optional[dict] = None):
+        """
+        If provided, `private_key_cache` is used to memorize loaded private keys (by keychain_uid and key_algo),
+        and must be cleared by the caller as soon as possible.
+        """
         self._keystore = keystore
+        self._private_key_cache = private_key_cache
 
+    @synchronized
     def _ensure_keypair_exists(self, keychain_uid: uuid.UUID, key_algo: str):
         """Create a keypair if it doesn't exist."""
 
@@ -99,6 +109,22 @@ class TrusteeApi:
             % (keychain_uid, key_algo, len(passphrases))
         )
 
+    def _load_private_key(self, *, keychain_uid: uuid.UUID, key_algo: str, passphrases: list):
+        """Return the private key object, possibly from the private key cache."""
+        cache_key = (keychain_uid, key_algo)
+        if self._private_key_cache is not None and cache_key in self._private_key_cache:
+            return self._private_key_cache[cache_key]
+
+        private_key_pem = self._keystore.get_private_key(keychain_uid=keychain_uid, key_algo=key_algo)
+
+        private_key = self._decrypt_private_key_pem_with_passphrases(
+            private_key_pem=private_key_pem, keychain_uid=keychain_uid, key_algo=key_algo, passphrases=passphrases
+        )
+
+        if self._private_key_cache is not None:
+            self._private_key_cache[cache_key] = private_key
+        return private_key
+
     def request_decryption_authorization(
         self,
         keypair_identifiers: Sequence,
@@ -212,11 +238,7 @@ class TrusteeApi:
         passphrases = passphrases or []
         assert isinstance(passphrases, (tuple, list)), repr(passphrases)
 
-        private_key_pem = self._keystore.get_private_key(keychain_uid=keychain_uid, key_algo=cipher_algo)
-
-        private_key = self._decrypt_private_key_pem_with_passphrases(
-            private_key_pem=private_key_pem, keychain_uid=keychain_uid, key_algo=cipher_algo, passphrases=passphrases
-        )
+        private_key = self._load_private_key(keychain_uid=keychain_uid, key_algo=cipher_algo, passphrases=passphrases)
 
         # We expect a well-formed JSON structure in key_struct_bytes, to possibly check its metadata
         key_struct_bytes = decrypt_bytestring(
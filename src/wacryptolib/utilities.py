@@ -1,16 +1,26 @@
 import abc
+import base64
+import binascii
+import calendar
+import json
 import logging
+import math
 import os
+import uuid
 from contextlib import contextmanager
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from json import JSONDecodeError
 from typing import List, Optional, Sequence, Union, BinaryIO
 
 import multitimer
 import schema
 import uuid0
+import bson
 from bson.binary import UuidRepresentation
-from bson.json_util import dumps, loads, JSONOptions, JSONMode
+from bson.codec_options import CodecOptions
+from bson.errors import BSONError
+from bson.int64 import Int64
+from bson.json_util import dumps, loads, object_hook, JSONOptions, JSONMode
 from decorator import decorator
 from schema import SchemaError, Schema
 
@@ -27,6 +37,14 @@ WACRYPTOLIB_JSON_OPTIONS = JSONOptions(
     tz_aware=True,  # All our serialized dates are UTC, not NAIVE
 )
 
+WACRYPTOLIB_BSON_OPTIONS = CodecOptions(
+    uuid_representation=UuidRepresentation.STANDARD, tz_aware=True, tzinfo=timezone.utc  # Same as for JSON
+)
+
+# Prefix of compact binary envelopes, followed by a version byte; a json document can't start with a NUL byte
+BINARY_ENVELOPE_MAGIC = b"\x00WAE"
+BINARY_ENVELOPE_VERSION = 1
+
 
 ### Private utilities ###
 
@@ -157,14 +175,157 @@ def recombine_chunks(chunks: Sequence[bytes], *, chunk_size: int, must_unpad: bo
     return bytestring
 
 
+class _UnsupportedFastJsonType(Exception):
+    """THIS CLASS IS PRIVATE API"""
+
+
+_INT32_BOUND = 2 ** 31
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _fast_convert_dict_to_extended_json(obj):
+    return {key: _fast_convert_to_extended_json(value) for (key, value) in obj.items()}
+
+
+def _fast_convert_list_to_extended_json(obj):
+    return [_fast_convert_to_extended_json(value) for value in obj]
+
+
+def _fast_convert_noop(obj):
+    return obj
+
+
+def _fast_convert_bytes(obj):
+    return {"$binary": {"base64": base64.b64encode(obj).decode("ascii"), "subType": "00"}}
+
+
+def _fast_convert_uuid(obj):
+    return {"$binary": {"base64": base64.b64encode(obj.bytes).decode("ascii"), "subType": "04"}}
+
+
+def _fast_convert_int(obj):
+    if -_INT32_BOUND <= obj < _INT32_BOUND:
+        return {"$numberInt": str(obj)}
+    return {"$numberLong": str(obj)}
+
+
+def _fast_convert_int64(obj):
+    return {"$numberLong": str(obj)}
+
+
+def _fast_convert_float(obj):
+    if math.isnan(obj):
+        return {"$numberDouble": "NaN"}
+    elif math.isinf(obj):
+        return {"$numberDouble": "Infinity" if obj > 0 else "-Infinity"}
+    return {"$numberDouble": repr(obj)}
+
+
+def _fast_convert_datetime(obj):
+    utcoffset = obj.utcoffset()
+    if utcoffset is not None:
+        obj = obj - utcoffset
+    millis = calendar.timegm(obj.timetuple()) * 1000 + obj.microsecond // 1000
+    return {"$date": {"$numberLong": str(millis)}}
+
+
+# Converters for the (exact) types found in wacryptolib data trees, mimicking bson.json_util in CANONICAL mode
+_FAST_EXTENDED_JSON_CONVERTERS = {
+    dict: _fast_convert_dict_to_extended_json,
+    list: _fast_convert_list_to_extended_json,
+    tuple: _fast_convert_list_to_extended_json,
+    str: _fast_convert_noop,
+    bool: _fast_convert_noop,
+    type(None): _fast_convert_noop,
+    bytes: _fast_convert_bytes,
+    uuid.UUID: _fast_convert_uuid,
+    uuid0.UUID: _fast_convert_uuid,
+    int: _fast_convert_int,
+    Int64: _fast_convert_int64,
+    float: _fast_convert_float,
+    datetime: _fast_convert_datetime,
+}
+
+
+def _fast_convert_to_extended_json(obj):
+    """Convert a data tree to a json-compatible tree, or raise _UnsupportedFastJsonType if some type is unknown."""
+    try:
+        converter = _FAST_EXTENDED_JSON_CONVERTERS[type(obj)]  # Other subclasses (OrderedDict...) are not handled
+    except KeyError:
+        raise _UnsupportedFastJsonType(type(obj)) from None
+    return converter(obj)
+
+
+def _fast_parse_binary(value):
+    if isinstance(value, dict) and len(value) == 2:
+        b64 = value.get("base64")
+        subtype = value.get("subType")
+        if isinstance(b64, str):
+            if subtype == "00":
+                return binascii.a2b_base64(b64)  # Same as lenient base64.b64decode()
+            elif subtype == "04":
+                return uuid.UUID(bytes=binascii.a2b_base64(b64))
+    raise _UnsupportedFastJsonType(value)
+
+
+def _fast_parse_date(value):
+    if type(value) is not Int64:  # Inner {"$numberLong": ...} was already parsed
+        raise _UnsupportedFastJsonType(value)
+    try:
+        return (_UTC_EPOCH + timedelta(milliseconds=int(value))).astimezone(WACRYPTOLIB_JSON_OPTIONS.tzinfo)
+    except OverflowError:
+        raise _UnsupportedFastJsonType(value) from None
+
+
+def _fast_parse_int32(value):
+    if not isinstance(value, str):
+        raise _UnsupportedFastJsonType(value)
+    return int(value)
+
+
+def _fast_parse_double(value):
+    if not isinstance(value, str):
+        raise _UnsupportedFastJsonType(value)
+    return float(value)
+
+
+# Parsers for the single-key extended json wrappers that wacryptolib produces
+_FAST_EXTENDED_JSON_PARSERS = {
+    "$binary": _fast_parse_binary,
+    "$date": _fast_parse_date,
+    "$numberInt": _fast_parse_int32,
+    "$numberLong": Int64,
+    "$numberDouble": _fast_parse_double,
+}
+
+
+def _fast_extended_json_object_hook(dct):
+    """Json object hook equivalent to that of bson.json_util, with shortcuts for the wrappers we use."""
+    if len(dct) == 1:
+        ((key, value),) = dct.items()
+        parser = _FAST_EXTENDED_JSON_PARSERS.get(key)
+        if parser is not None:
+            try:
+                return parser(value)
+            except (_UnsupportedFastJsonType, ValueError, TypeError):
+                pass  # Let bson.json_util handle (or reject) unusual values
+    return object_hook(dct, WACRYPTOLIB_JSON_OPTIONS)
+
+
 def dump_to_json_str(data, **extra_options):
     """
     Dump a data tree to a json representation as string.
     Supports advanced types like bytes, uuids, dates...
+
+    Usual data trees are converted by a fast codec specialized for wacryptolib types, with the
+    same output as the generic (and slower) converter of `bson.json_util`, used as fallback for other types.
     """
     sort_keys = extra_options.pop("sort_keys", True)
-    json_str = dumps(data, sort_keys=sort_keys, json_options=WACRYPTOLIB_JSON_OPTIONS, **extra_options)
-    return json_str
+    try:
+        json_tree = _fast_convert_to_extended_json(data)
+    except _UnsupportedFastJsonType:
+        return dumps(data, sort_keys=sort_keys, json_options=WACRYPTOLIB_JSON_OPTIONS, **extra_options)
+    return json.dumps(json_tree, sort_keys=sort_keys, **extra_options)
 
 
 def load_from_json_str(data, **extra_options):
@@ -176,7 +337,9 @@ def load_from_json_str(data, **extra_options):
     """
     assert isinstance(data, str), data
     try:
-        return loads(data, json_options=WACRYPTOLIB_JSON_OPTIONS, **extra_options)
+        if "object_hook" in extra_options or "object_pairs_hook" in extra_options:
+            return loads(data, json_options=WACRYPTOLIB_JSON_OPTIONS, **extra_options)
+        return json.loads(data, object_hook=_fast_extended_json_object_hook, **extra_options)
     except JSONDecodeError as exc:
         raise SchemaValidationError("Invalid JSON string: %r" % exc) from exc
 
@@ -198,6 +361,43 @@ def load_from_json_bytes(data, **extra_options):
     return load_from_json_str(data=json_str, **extra_options)
 
 
+def dump_to_binary_envelope(data) -> bytes:
+    """
+    Dump a data tree to a compact, versioned binary representation (BSON-based).
+    Supports the same advanced types as `dump_to_json_bytes`, but stores bytes as-is instead of base64.
+
+    Data trees which can't be represented in BSON (e.g. too big integers) are dumped to legacy json bytes instead,
+    which `load_from_binary_envelope()` reads transparently.
+    """
+    try:
+        bson_bytes = bson.encode({"_": data}, codec_options=WACRYPTOLIB_BSON_OPTIONS)  # Root must be a document
+    except (BSONError, OverflowError) as exc:
+        logger.debug("Falling back to json serialization for binary envelope: %r", exc)
+        return dump_to_json_bytes(data)
+    return BINARY_ENVELOPE_MAGIC + bytes([BINARY_ENVELOPE_VERSION]) + bson_bytes
+
+
+def load_from_binary_envelope(data: bytes):
+    """
+    Load a data tree from a binary envelope, or from legacy json bytes (as produced by `dump_to_json_bytes`).
+
+    Raises exceptions.ValidationError on loading error.
+    """
+    if not data.startswith(BINARY_ENVELOPE_MAGIC):
+        return load_from_json_bytes(data)
+
+    header_length = len(BINARY_ENVELOPE_MAGIC) + 1
+    if len(data) < header_length:
+        raise SchemaValidationError("Truncated binary envelope")
+    version = data[header_length - 1]
+    if version != BINARY_ENVELOPE_VERSION:
+        raise SchemaValidationError("Unsupported binary envelope version %s" % version)
+    try:
+        return bson.decode(data[header_length:], codec_options=WACRYPTOLIB_BSON_OPTIONS)["_"]
+    except (BSONError, KeyError) as exc:
+        raise SchemaValidationError("Invalid binary envelope: %r" % exc) from exc
+
+
 def dump_to_json_file(filepath, data, **extra_options):
     """
     Same as `dump_to_json_bytes`, but writes data to filesystem (and returns bytes too).
@@ -35,8 +35,8 @@ class FakeTestCryptainerStorage(CryptainerStorage):
             ),
         )
 
-    def _decrypt_payload_from_cryptainer(self, cryptainer, **kwargs):
-        return cryptainer["payload_ciphertext_struct"]["ciphertext_value"], []
+    def _decrypt_payload_from_cryptainer(self, cryptainer, payload_ciphertext_struct_loader, **kwargs):
+        return payload_ciphertext_struct_loader()["ciphertext_value"], []
 
 
 class WildcardUuid:
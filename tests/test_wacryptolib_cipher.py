@@ -7,7 +7,7 @@ import pytest
 
 import wacryptolib
 from wacryptolib._crypto_backend import get_random_bytes, generate_rsa_keypair
-from wacryptolib.cipher import AUTHENTICATED_CIPHER_ALGOS, PayloadEncryptionPipeline
+from wacryptolib.cipher import AUTHENTICATED_CIPHER_ALGOS, PayloadEncryptionPipeline, PayloadDecryptionPipeline
 from wacryptolib.cipher import STREAMABLE_CIPHER_ALGOS
 from wacryptolib.exceptions import DecryptionError, EncryptionError, DecryptionIntegrityError, OperationNotSupported
 from wacryptolib.keygen import SUPPORTED_SYMMETRIC_KEY_ALGOS, generate_symkey
@@ -93,6 +93,12 @@ def test_symmetric_encryption_and_decryption_for_algo(cipher_algo, use_empty_dat
 
     assert decrypted_content == binary_content
 
+    cipherdict_with_memoryview = dict(cipherdict, ciphertext=memoryview(cipherdict["ciphertext"]))  # E.g. mmap
+    decrypted_content = wacryptolib.cipher.decrypt_bytestring(
+        key_dict=key_dict, cipherdict=cipherdict_with_memoryview, cipher_algo=cipher_algo
+    )
+    assert decrypted_content == binary_content
+
     if not use_empty_data:
         decryption_func = functools.partial(
             wacryptolib.cipher.decrypt_bytestring, key_dict=key_dict, cipher_algo=cipher_algo
@@ -224,6 +230,54 @@ def test_invalid_payload_encryption_pipeline():
         )
 
 
+@pytest.mark.parametrize("cipher_algo_list", _stream_algo_nodes)
+def test_payload_decryption_pipeline(cipher_algo_list):
+
+    output_stream = io.BytesIO()
+
+    payload_cipher_layer_extracts = [
+        {
+            "cipher_algo": cipher_algo,
+            "symkey": generate_symkey(cipher_algo),
+            "payload_digest_algos": random.sample(SUPPORTED_HASH_ALGOS, k=random.randint(0, 2)),
+        }
+        for cipher_algo in cipher_algo_list
+    ]
+
+    encryption_pipeline = PayloadEncryptionPipeline(
+        payload_cipher_layer_extracts=payload_cipher_layer_extracts, output_stream=output_stream
+    )
+    plaintext_full = get_random_bytes(random.randint(0, 10000))
+    encryption_pipeline.encrypt_chunk(plaintext_full)
+    encryption_pipeline.finalize()
+    ciphertext_full = output_stream.getvalue()
+    payload_integrity_tags = encryption_pipeline.get_payload_integrity_tags()
+
+    for payload_cipher_layer_extract, authentication_data in zip(payload_cipher_layer_extracts, payload_integrity_tags):
+        payload_cipher_layer_extract["payload_macs"] = authentication_data["payload_macs"]
+
+    def _decrypt_by_random_chunks(ciphertext, verify_integrity_tags=True):
+        decryption_pipeline = PayloadDecryptionPipeline(
+            payload_cipher_layer_extracts, verify_integrity_tags=verify_integrity_tags
+        )
+        plaintext_chunks = []
+        while ciphertext:
+            chunk_length = random.randint(1, 300)
+            plaintext_chunks.append(decryption_pipeline.decrypt_chunk(ciphertext[:chunk_length]))
+            ciphertext = ciphertext[chunk_length:]
+        plaintext_chunks.append(decryption_pipeline.finalize())
+        return b"".join(plaintext_chunks), decryption_pipeline.get_payload_digests()
+
+    plaintext, payload_digests = _decrypt_by_random_chunks(ciphertext_full)
+    assert plaintext == plaintext_full
+    assert payload_digests == [authentication_data["payload_digests"] for authentication_data in payload_integrity_tags]
+
+    if any(cipher_algo in AUTHENTICATED_CIPHER_ALGOS for cipher_algo in cipher_algo_list) and ciphertext_full:
+        corrupted_ciphertext = bytes([ciphertext_full[0] ^ 1]) + ciphertext_full[1:]
+        with pytest.raises(DecryptionError):  # Integrity error or padding error
+            _decrypt_by_random_chunks(corrupted_ciphertext)
+
+
 @pytest.mark.parametrize("cipher_algo", SUPPORTED_SYMMETRIC_KEY_ALGOS)
 def test_symmetric_decryption_verify(cipher_algo):
 
@@ -1,3 +1,4 @@
+import json
 import os
 import pathlib
 import subprocess
@@ -7,8 +8,15 @@ from click.testing import CliRunner
 
 import wacryptolib
 from wacryptolib.__main__ import wacryptolib_cli as cli
-from wacryptolib.cryptainer import LOCAL_KEYFACTORY_TRUSTEE_MARKER
-from wacryptolib.utilities import dump_to_json_file
+from wacryptolib.cryptainer import (
+    LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+    CRYPTAINER_BINARY_MAGIC,
+    load_cryptainer_from_filesystem,
+    decrypt_payload_from_cryptainer,
+    DecryptionErrorCriticity,
+)
+from wacryptolib.keystore import FilesystemKeystorePool
+from wacryptolib.utilities import dump_to_json_file, load_from_json_file
 
 
 def test_cli_help_texts():
@@ -156,6 +164,211 @@ def test_cli_encryption_decryption_and_summary(tmp_path):
                 assert data == data_sample
 
 
+def test_cli_cryptainer_format_conversion(tmp_path):
+    runner = CliRunner()
+    base_args = ["-k", tmp_path]
+
+    data_sample = "Héllô\nguÿs".encode("utf8") + b"\x00\xff"
+
+    with runner.isolated_filesystem():
+
+        with open("test_file.txt", "wb") as output_file:
+            output_file.write(data_sample)
+
+        result = runner.invoke(
+            cli,
+            base_args + ["encrypt", "-i", "test_file.txt", "-o", "binary.crypt", "--binary"],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+        result = runner.invoke(
+            cli, base_args + ["encrypt", "-i", "test_file.txt", "-o", "json.crypt"], catch_exceptions=False
+        )
+        assert result.exit_code == 0
+
+        binary_cryptainer_bytes = pathlib.Path("binary.crypt").read_bytes()
+        json_cryptainer_bytes = pathlib.Path("json.crypt").read_bytes()
+        assert binary_cryptainer_bytes.startswith(CRYPTAINER_BINARY_MAGIC)
+        assert json_cryptainer_bytes.startswith(b"{")
+        assert len(binary_cryptainer_bytes) < len(json_cryptainer_bytes)
+
+        result = runner.invoke(cli, base_args + ["summarize", "-i", "binary.crypt"], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert b"AES_CBC" in result.stdout_bytes
+
+        result = runner.invoke(
+            cli, base_args + ["decrypt", "-i", "binary.crypt", "-o", "binary.medium"], catch_exceptions=False
+        )
+        assert result.exit_code == 0
+        assert pathlib.Path("binary.medium").read_bytes() == data_sample
+
+        result = runner.invoke(
+            cli, base_args + ["convert", "-i", "binary.crypt", "-i", "json.crypt", "--json"], catch_exceptions=False
+        )
+        assert result.exit_code == 0
+        assert "Conversion finished for 1 cryptainer(s), 1 already in json format" in result.output
+        assert pathlib.Path("binary.crypt").read_bytes().startswith(b"{")
+        assert not pathlib.Path("binary.crypt~").exists()
+
+        result = runner.invoke(
+            cli, base_args + ["convert", "-i", "binary.crypt", "-i", "json.crypt"], catch_exceptions=False
+        )
+        assert result.exit_code == 0
+        assert "Conversion finished for 2 cryptainer(s), 0 already in binary format" in result.output
+
+        for cryptainer_name in ("binary.crypt", "json.crypt"):
+            assert pathlib.Path(cryptainer_name).read_bytes().startswith(CRYPTAINER_BINARY_MAGIC)
+            result = runner.invoke(
+                cli, base_args + ["decrypt", "-i", cryptainer_name, "-o", "output.medium"], catch_exceptions=False
+            )
+            assert result.exit_code == 0
+            assert pathlib.Path("output.medium").read_bytes() == data_sample
+
+
+def test_cli_cryptainer_migration(tmp_path):
+    runner = CliRunner()
+
+    keystore_pool_dir = tmp_path.joinpath("keystore_pool")
+    keystore_pool_dir.mkdir()
+    cryptainer_dir = tmp_path.joinpath("cryptainers")
+    cryptainer_dir.mkdir()
+    base_args = ["-k", keystore_pool_dir]
+
+    data_file = tmp_path.joinpath("test_file.txt")
+    data_file.write_bytes(b"Some data to migrate")
+
+    for idx in range(2):
+        result = runner.invoke(
+            cli,
+            base_args + ["encrypt", "-i", data_file, "-o", cryptainer_dir.joinpath("data%s.crypt" % idx)],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+
+    cryptoconf_file = tmp_path.joinpath("newcryptoconf.json")
+    dump_to_json_file(
+        cryptoconf_file,
+        dict(
+            payload_cipher_layers=[
+                dict(
+                    payload_cipher_algo="CHACHA20_POLY1305",
+                    key_cipher_layers=[
+                        dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                    ],
+                    payload_signatures=[],
+                )
+            ]
+        ),
+    )
+
+    result = runner.invoke(cli, ["migrate", "-h"], catch_exceptions=False)
+    assert result.exit_code == 0
+    assert "new cryptoconf" in result.output
+
+    result = runner.invoke(
+        cli,
+        base_args + ["migrate", "-d", cryptainer_dir, "-c", cryptoconf_file, "-w", "2"],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert "Migration finished for 2 cryptainer(s)" in result.output
+    assert sorted(path.name for path in cryptainer_dir.iterdir()) == ["data0.crypt", "data1.crypt"]  # Still inline
+
+    keystore_pool = FilesystemKeystorePool(keystore_pool_dir)
+    for idx in range(2):
+        cryptainer = load_cryptainer_from_filesystem(cryptainer_dir.joinpath("data%s.crypt" % idx))
+        assert cryptainer["payload_cipher_layers"][0]["payload_cipher_algo"] == "CHACHA20_POLY1305"
+        payload, error_report = decrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+        assert payload == b"Some data to migrate"
+        assert not error_report
+
+    empty_keystore_pool_dir = tmp_path.joinpath("empty_keystore_pool")
+    empty_keystore_pool_dir.mkdir()
+    result = runner.invoke(
+        cli,
+        ["-k", empty_keystore_pool_dir, "migrate", "-d", cryptainer_dir, "-c", data_file],  # Wrong cryptoconf
+        catch_exceptions=True,
+    )
+    assert result.exit_code == 1
+
+
+def test_cli_cryptainer_integrity_verification(tmp_path, monkeypatch):
+    runner = CliRunner()
+
+    keystore_pool_dir = tmp_path.joinpath("keystore_pool")
+    keystore_pool_dir.mkdir()
+    cryptainer_dir = tmp_path.joinpath("cryptainers")
+    cryptainer_dir.mkdir()
+    base_args = ["-k", keystore_pool_dir]
+    report_file = tmp_path.joinpath("report.json")
+
+    data_file = tmp_path.joinpath("test_file.txt")
+    data_file.write_bytes(b"Some data to audit")
+
+    for idx in range(3):
+        result = runner.invoke(
+            cli,
+            base_args + ["encrypt", "-i", data_file, "-o", cryptainer_dir.joinpath("data%s.crypt" % idx)],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+
+    result = runner.invoke(cli, ["verify", "-h"], catch_exceptions=False)
+    assert result.exit_code == 0
+    assert "integrity" in result.output
+
+    for verify_tags_option in ("--no-verify-tags", "--verify-tags"):
+        result = runner.invoke(
+            cli,
+            base_args + ["verify", "-d", cryptainer_dir, "-o", report_file, "-w", "2", verify_tags_option],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+        audit_report = load_from_json_file(report_file)
+        assert audit_report["cryptainer_count"] == 3
+        assert audit_report["failed_cryptainer_count"] == 0
+        assert audit_report["verify_integrity_tags"] == (verify_tags_option == "--verify-tags")
+        assert [entry["cryptainer_name"] for entry in audit_report["cryptainers"]] == [
+            "data0.crypt",
+            "data1.crypt",
+            "data2.crypt",
+        ]
+        assert all(entry["is_intact"] for entry in audit_report["cryptainers"])
+        assert all(  # Only shards abandoned once the shared-secret threshold was reached
+            error["error_criticity"] == DecryptionErrorCriticity.WARNING
+            and "skipped or cancelled" in error["error_message"]
+            for entry in audit_report["cryptainers"]
+            for error in entry["errors"]
+        )
+
+    # Report on stdout remains valid json, even when falling back to the default keystore pool
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner(mix_stderr=False).invoke(cli, ["verify", "-d", cryptainer_dir], catch_exceptions=True)
+    assert "No keystore-pool directory provided" in result.stderr
+    audit_report = json.loads(result.stdout)
+    assert audit_report["cryptainer_count"] == 3
+
+    corrupted_cryptainer_filepath = cryptainer_dir.joinpath("data1.crypt")
+    cryptainer = load_from_json_file(corrupted_cryptainer_filepath)
+    ciphertext_value = cryptainer["payload_ciphertext_struct"]["ciphertext_value"]
+    cryptainer["payload_ciphertext_struct"]["ciphertext_value"] = (
+        bytes([ciphertext_value[0] ^ 1]) + ciphertext_value[1:]
+    )
+    dump_to_json_file(corrupted_cryptainer_filepath, cryptainer)
+    cryptainer_dir.joinpath("data2.crypt").write_bytes(b"badcontent")
+
+    result = runner.invoke(cli, base_args + ["verify", "-d", cryptainer_dir, "-o", report_file], catch_exceptions=True)
+    assert result.exit_code == 1
+    audit_report = load_from_json_file(report_file)
+    assert audit_report["failed_cryptainer_count"] == 2
+    intact_entry, corrupted_entry, broken_entry = audit_report["cryptainers"]
+    assert intact_entry["is_intact"]
+    assert not corrupted_entry["is_intact"]
+    assert "Mismatch between actual and expected payload digests" in corrupted_entry["errors"][0]["error_message"]
+    assert not broken_entry["is_intact"]
+    assert "Invalid JSON" in broken_entry["exception"]
+
+
 def test_cli_subprocess_invocation():
     src_dir = str(pathlib.Path(wacryptolib.__file__).resolve().parents[1])
 
@@ -1,10 +1,15 @@
+import asyncio
 import copy
+import io
 import os
 import random
+import subprocess
+import sys
 import textwrap
+import threading
 import time
 import uuid
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from itertools import product
 from pathlib import Path
 from pprint import pprint
@@ -13,21 +18,43 @@ from unittest.mock import patch
 from uuid import UUID
 
 import pytest
+from freezegun import freeze_time
 from jsonrpc_requests import TransportError
+from schema import Schema, Use
 
 from _test_mockups import FakeTestCryptainerStorage, random_bool
 from wacryptolib._crypto_backend import get_random_bytes
 from wacryptolib.cipher import SUPPORTED_CIPHER_ALGOS, AUTHENTICATED_CIPHER_ALGOS, encrypt_bytestring
 from wacryptolib.cryptainer import (
     LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+    CRYPTAINER_FORMAT,
+    CRYPTAINER_BINARY_ENVELOPES_FORMAT,
     encrypt_payload_into_cryptainer,
     decrypt_payload_from_cryptainer,
+    can_decrypt_cryptainer,
+    verify_cryptainers_signatures,
+    rewrap_cryptainer_keys,
+    migrate_cryptainers,
+    verify_cryptainer_integrity,
     CryptainerStorage,
     extract_metadata_from_cryptainer,
     CryptainerBase,
     get_cryptoconf_summary,
     dump_cryptainer_to_filesystem,
     load_cryptainer_from_filesystem,
+    PAYLOAD_CIPHERTEXT_LOCATIONS,
+    load_cryptainer_header_from_filesystem,
+    CRYPTAINER_HEADER_FIELDS,
+    dump_cryptainer_to_bytes,
+    load_cryptainer_from_bytes,
+    convert_cryptainer_format_on_filesystem,
+    mmap_cryptainer_payload_ciphertext,
+    _open_cryptainer_ciphertext_stream,
+    _locate_json_inline_ciphertext,
+    CRYPTAINER_BINARY_MAGIC,
+    CRYPTAINER_SINGLE_FILE_MAGIC,
+    CRYPTAINER_SINGLE_FILE_OFFSETS,
+    CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH,
     SHARED_SECRET_ALGO_MARKER,
     get_trustee_id,
     gather_trustee_dependencies,
@@ -42,12 +69,21 @@ from wacryptolib.cryptainer import (
     check_cryptoconf_sanity,
     check_cryptainer_sanity,
     CRYPTAINER_TEMP_SUFFIX,
+    CRYPTAINER_MIGRATION_SUFFIX,
+    OFFLOADED_PAYLOAD_FILENAME_SUFFIX,
     OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER,
     ReadonlyCryptainerStorage,
     CryptainerEncryptionPipeline,
     gather_decryptable_symkeys,
     DecryptionErrorType,
     DecryptionErrorCriticity,
+    compile_cryptoconf,
+    CryptoconfPlan,
+    aencrypt_payload_into_cryptainer,
+    adecrypt_payload_from_cryptainer,
+    get_async_trustee_proxy,
+    AsyncTrusteeProxy,
+    LOCAL_CHECKPOINT_CRYPTOCONF,
 )
 from wacryptolib.exceptions import (
     DecryptionError,
@@ -72,11 +108,16 @@ from wacryptolib.trustee import TrusteeApi
 from wacryptolib.utilities import (
     load_from_json_bytes,
     dump_to_json_bytes,
+    load_from_binary_envelope,
+    dump_to_binary_envelope,
+    BINARY_ENVELOPE_MAGIC,
     generate_uuid0,
     get_utc_now_date,
     convert_native_tree_to_extended_json_tree,
+    consume_bytes_as_chunks,
+    hash_message,
 )
-from wacryptolib.utilities import load_from_json_file
+from wacryptolib.utilities import load_from_json_file, dump_to_json_file
 
 ENFORCED_UID1 = UUID("0e8e861e-f0f7-e54b-18ea-34798d5daaaa")
 ENFORCED_UID2 = UUID("65dbbe4f-0bd5-4083-a274-3c76efeebbbb")
@@ -513,18 +554,57 @@ def test_encrypt_payload_into_cryptainer_from_file_object(tmp_path):
     assert source.exists()
 
     open_fileobj = open(source, "rb")
+    keystore_pool = InMemoryKeystorePool()
 
     cryptainer = encrypt_payload_into_cryptainer(
         payload=open_fileobj,
         cryptoconf=SIMPLE_CRYPTOCONF,
         cryptainer_metadata=None,
-        keystore_pool=InMemoryKeystorePool(),
+        keystore_pool=keystore_pool,
     )
     assert cryptainer
 
     assert open_fileobj.closed
     assert not source.exists()  # Source is autodeleted!
 
+    check_cryptainer_sanity(cryptainer)
+    result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+    assert result_payload == b"12345"
+    assert error_report == []
+
+
+@pytest.mark.parametrize("use_file_payload", [True, False])
+def test_encrypt_payload_into_cryptainer_with_ciphertext_sink(tmp_path, use_file_payload):
+    keystore_pool = InMemoryKeystorePool()
+    payload = get_random_bytes(random.randint(1, 3 * 1024 ** 2))  # Several chunks
+
+    if use_file_payload:
+        source = tmp_path / "source.media"
+        source.write_bytes(payload)
+        payload_or_file = source.open("rb")
+    else:
+        payload_or_file = payload
+
+    payload_ciphertext_sink = io.BytesIO()
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload_or_file,
+        cryptoconf=COMPLEX_CRYPTOCONF,
+        cryptainer_metadata=None,
+        keystore_pool=keystore_pool,
+        payload_ciphertext_sink=payload_ciphertext_sink,
+    )
+    assert cryptainer["payload_ciphertext_struct"] == OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+    check_cryptainer_sanity(cryptainer)
+
+    cryptainer_filepath = tmp_path / "mycryptainer.crypt"
+    dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=cryptainer, offload_payload_ciphertext=False)
+    Path(str(cryptainer_filepath) + ".payload").write_bytes(payload_ciphertext_sink.getvalue())
+
+    cryptainer_reloaded = load_cryptainer_from_filesystem(cryptainer_filepath, include_payload_ciphertext=True)
+    result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer_reloaded, keystore_pool=keystore_pool)
+    assert result_payload == payload
+    assert error_report == []
+
 
 def test_cryptainer_encryption_pipeline_autocleanup(tmp_path):
     pipeline = CryptainerEncryptionPipeline(
@@ -549,6 +629,133 @@ def test_cryptainer_encryption_pipeline_autocleanup(tmp_path):
     assert output_data_stream2.closed  # Autoclosed in __del__()
 
 
+@pytest.mark.parametrize("cryptoconf", [SIMPLE_CRYPTOCONF, COMPLEX_CRYPTOCONF, COMPLEX_SHAMIR_CRYPTOCONF])
+def test_cryptainer_encryption_pipeline_checkpoint_and_resume(tmp_path, cryptoconf):
+    keystore_pool = InMemoryKeystorePool()
+    storage = CryptainerStorage(
+        default_cryptoconf=cryptoconf,
+        cryptainer_dir=tmp_path,
+        keystore_pool=keystore_pool,
+        stream_checkpoint_interval=500,
+    )
+    payload = get_random_bytes(random.randint(2000, 4000))
+    cut_point = random.randint(1000, len(payload) - 1)
+
+    with pytest.raises(FileNotFoundError):
+        storage.resume_cryptainer_encryption_stream("mystream")  # No checkpoint yet
+
+    pipeline = storage.create_cryptainer_encryption_stream("mystream", cryptainer_metadata=None)
+    for chunk in consume_bytes_as_chunks(payload[:cut_point], chunk_size=random.randint(1, 300)):
+        pipeline.encrypt_chunk(chunk)
+    checkpoint_filepath = tmp_path / "mystream.crypt.checkpoint"
+    assert checkpoint_filepath.exists()
+    assert 500 <= pipeline.payload_length == cut_point
+    del pipeline  # Simulated crash, with some payload encrypted after last checkpoint
+
+    checkpoint_cryptainer = load_cryptainer_from_filesystem(checkpoint_filepath)  # Secrets are not in clear
+    assert checkpoint_cryptainer["cryptainer_state"] == "FINISHED"
+
+    pipeline = storage.resume_cryptainer_encryption_stream("mystream")
+    resumed_payload_length = pipeline.payload_length
+    assert 500 <= resumed_payload_length <= cut_point
+    for chunk in consume_bytes_as_chunks(payload[resumed_payload_length:], chunk_size=random.randint(1, 300)):
+        pipeline.encrypt_chunk(chunk)
+    pipeline.finalize()
+    assert not checkpoint_filepath.exists()
+
+    assert storage.list_cryptainer_names(as_sorted_list=True) == [Path("mystream.crypt")]
+    result_payload, error_report = storage.decrypt_cryptainer_from_storage("mystream.crypt")
+    assert result_payload == payload
+    _check_abandoned_shard_entries(
+        error_report, abandoned_shard_count=2 if cryptoconf is COMPLEX_SHAMIR_CRYPTOCONF else 0
+    )
+
+
+def test_cryptainer_encryption_pipeline_checkpoint_protection_and_purge(tmp_path):
+    keystore_uid = generate_uuid0()
+    keychain_uid = generate_uuid0()
+    keystore_pool, _, key_cipher_trustee = _create_keystore_and_keypair_protected_by_passphrase_in_foreign_keystore(
+        keystore_uid=keystore_uid, keychain_uid=keychain_uid, passphrase="tata"
+    )
+    key_cipher_layers = [dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=key_cipher_trustee)]
+    cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(payload_cipher_algo="AES_CBC", key_cipher_layers=key_cipher_layers, payload_signatures=[])
+        ]
+    )
+    payload = get_random_bytes(2000)
+
+    def _make_storage(dirname, **extra_kwargs):
+        cryptainer_dir = tmp_path / dirname
+        cryptainer_dir.mkdir()
+        return CryptainerStorage(
+            cryptainer_dir,
+            keystore_pool=keystore_pool,
+            default_cryptoconf=cryptoconf,
+            stream_checkpoint_interval=500,
+            **extra_kwargs
+        )
+
+    def _interrupt_stream(storage, filename_base="mystream"):
+        pipeline = storage.create_cryptainer_encryption_stream(
+            filename_base, cryptainer_metadata=None, keychain_uid=keychain_uid
+        )
+        for chunk in consume_bytes_as_chunks(payload[:1500], chunk_size=100):
+            pipeline.encrypt_chunk(chunk)
+        del pipeline  # Simulated crash
+        return load_cryptainer_from_filesystem(storage._cryptainer_dir / (filename_base + ".crypt.checkpoint"))
+
+    def _resume_and_finalize(storage, **extra_kwargs):
+        pipeline = storage.resume_cryptainer_encryption_stream("mystream", **extra_kwargs)
+        for chunk in consume_bytes_as_chunks(payload[pipeline.payload_length :], chunk_size=100):
+            pipeline.encrypt_chunk(chunk)  # New checkpoints are protected the same way
+        pipeline.finalize()
+        result_payload, error_report = storage.decrypt_cryptainer_from_storage(
+            "mystream.crypt", passphrase_mapper={None: ["tata"]}
+        )
+        assert result_payload == payload
+        assert error_report == []
+
+    # By default, checkpoints require the same trustees as the cryptainer itself
+    storage = _make_storage("escrowed")
+    checkpoint_cryptainer = _interrupt_stream(storage)
+    assert checkpoint_cryptainer["payload_cipher_layers"][0]["key_cipher_layers"] == key_cipher_layers
+    with pytest.raises(DecryptionError, match="Couldn't decrypt checkpoint"):
+        storage.resume_cryptainer_encryption_stream("mystream")  # Passphrase is missing
+    _resume_and_finalize(storage, passphrase_mapper={None: ["tata"]})
+
+    # Checkpoints protected by the local keyfactory are opt-in
+    storage = _make_storage("local", stream_checkpoint_cryptoconf=LOCAL_CHECKPOINT_CRYPTOCONF)
+    checkpoint_cryptainer = _interrupt_stream(storage)
+    assert checkpoint_cryptainer["payload_cipher_layers"][0]["key_cipher_layers"][0]["key_cipher_trustee"] == (
+        LOCAL_KEYFACTORY_TRUSTEE_MARKER
+    )
+    _resume_and_finalize(storage)
+
+    # Stale checkpoints are purged
+    storage = _make_storage("purged", max_cryptainer_age=timedelta(days=1))
+    cryptainer_dir = storage._cryptainer_dir
+    _interrupt_stream(storage, filename_base="abandoned")
+    _interrupt_stream(storage, filename_base="finalized")
+    storage.create_cryptainer_encryption_stream(
+        "finalized", cryptainer_metadata=None, keychain_uid=keychain_uid
+    ).finalize()
+    (cryptainer_dir / "finalized.crypt.checkpoint").write_bytes(b"leftover of crash during finalization")
+
+    storage.wait_for_idle_state()
+    assert sorted(path.name for path in cryptainer_dir.iterdir()) == [
+        "abandoned.crypt.checkpoint",
+        "abandoned.crypt.payload",
+        "abandoned.crypt~",
+        "finalized.crypt",
+        "finalized.crypt.payload",
+    ]
+
+    with freeze_time(datetime.now(tz=timezone.utc) + timedelta(days=2)):
+        storage.wait_for_idle_state()
+    assert not list(cryptainer_dir.iterdir())  # Old cryptainers and abandoned streams are all gone
+
+
 def test_is_cryptainer_cryptoconf_streamable():
     assert is_cryptainer_cryptoconf_streamable(SIMPLE_CRYPTOCONF)
     assert is_cryptainer_cryptoconf_streamable(COMPLEX_SHAMIR_CRYPTOCONF)
@@ -684,7 +891,7 @@ def _build_fake_gateway_revelation_request_list(revelation_requests_info):
     revelation_requests_successful = []
 
     for revelation_request_info in revelation_requests_info:
-        cipherdict = load_from_json_bytes(revelation_request_info["symkey_ciphertext"])
+        cipherdict = load_from_binary_envelope(revelation_request_info["symkey_ciphertext"])
         foreign_keystore = revelation_request_info["foreign_keystore"]
 
         # Authenticator has a single key pair that was used for data encryption
@@ -835,6 +1042,19 @@ def _check_error_entry(
     assert real_occurrence_count == occurrence_count
 
 
+def _check_abandoned_shard_entries(error_report, abandoned_shard_count):
+    """Shards left over once the shared-secret threshold is reached only leave warnings in error reports."""
+    if abandoned_shard_count:
+        _check_error_entry(
+            error_list=error_report,
+            error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+            error_criticity=DecryptionErrorCriticity.WARNING,
+            error_msg_match="was skipped or cancelled",
+            occurrence_count=abandoned_shard_count,
+        )
+    assert len(error_report) == abandoned_shard_count
+
+
 def test_cryptainer_decryption_rare_cipher_errors(tmp_path):
     keychain_uid = generate_uuid0()
 
@@ -876,7 +1096,7 @@ def test_cryptainer_decryption_rare_cipher_errors(tmp_path):
 
     # Corrupt the integrity tag of the ciphertext
     key_ciphertext = cryptainer["payload_cipher_layers"][0]["key_ciphertext"]
-    key_cipherdict = load_from_json_bytes(key_ciphertext)
+    key_cipherdict = load_from_binary_envelope(key_ciphertext)
     key_cipherdict["tag"] += b"xxx"
     cryptainer["payload_cipher_layers"][0]["key_ciphertext"] = dump_to_json_bytes(key_cipherdict)
 
@@ -896,9 +1116,9 @@ def test_cryptainer_decryption_rare_cipher_errors(tmp_path):
 
     cryptainer = copy.deepcopy(cryptainer_original)
     key_ciphertext = cryptainer["payload_cipher_layers"][0]["key_cipher_layers"][0]["key_ciphertext"]
-    key_cipherdict = load_from_json_bytes(key_ciphertext)
+    key_cipherdict = load_from_binary_envelope(key_ciphertext)
     key_cipherdict["ciphertext_chunks"][0] += b"xxx"
-    cryptainer["payload_cipher_layers"][0]["key_cipher_layers"][0]["key_ciphertext"] = dump_to_json_bytes(
+    cryptainer["payload_cipher_layers"][0]["key_cipher_layers"][0]["key_ciphertext"] = dump_to_binary_envelope(
         key_cipherdict
     )
 
@@ -1155,6 +1375,91 @@ def test_cryptainer_decryption_with_passphrases_and_mock_authenticator_from_simp
 
 
 # Cryptoconf with 1 shared secret with threshold of 1 and only one trustee
+def test_cryptainer_decryption_with_gateway_revelation_requests_in_session(tmp_path):
+    keychain_uid_trustee = generate_uuid0()
+    keystore_pool, _, key_cipher_trustee = _create_keystore_and_keypair_protected_by_passphrase_in_foreign_keystore(
+        keystore_uid=generate_uuid0(), keychain_uid=keychain_uid_trustee, passphrase="tata"
+    )
+    list_shard_trustee_id = [(get_trustee_id(key_cipher_trustee), "tata")]
+    cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_CBC",
+                key_cipher_layers=[
+                    dict(
+                        key_cipher_algo="RSA_OAEP",
+                        keychain_uid=keychain_uid_trustee,
+                        key_cipher_trustee=key_cipher_trustee,
+                    )
+                ],
+                payload_signatures=[],
+            )
+        ]
+    )
+    revelation_requestor_uid = generate_uuid0()
+    gateway_urls = ["http://127.0.0.1:9898/jsonrpc", "http://127.0.0.1:9899/jsonrpc"]
+
+    storage = CryptainerStorage(default_cryptoconf=cryptoconf, cryptainer_dir=tmp_path, keystore_pool=keystore_pool)
+    gateway_revelation_request_list = []
+    for idx in range(3):
+        filename = "file%d.dat" % idx
+        storage.enqueue_file_for_encryption(filename, b"abc%d" % idx, cryptainer_metadata=None)
+        storage.wait_for_idle_state()
+        cryptainer = storage.load_cryptainer_from_storage(filename + ".crypt")
+        revelation_requests_info = _create_response_keyair_in_local_keyfactory_and_build_fake_revelation_request_info(
+            revelation_requestor_uid, [(filename + ".crypt", cryptainer)], keystore_pool, list_shard_trustee_id
+        )
+        gateway_revelation_request_list.extend(_build_fake_gateway_revelation_request_list(revelation_requests_info))
+    cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
+
+    def _decrypt_all(**extra_kwargs):
+        for idx, cryptainer_name in enumerate(cryptainer_names):
+            result_payload, error_report = storage.decrypt_cryptainer_from_storage(
+                cryptainer_name,
+                gateway_urls=gateway_urls,
+                revelation_requestor_uid=revelation_requestor_uid,
+                **extra_kwargs
+            )  # No passphrases are provided, so symkeys can only come from gateways
+            assert result_payload == b"abc%d" % idx
+            assert error_report == []
+
+    with _patched_gateway_revelation_request_list(return_value=gateway_revelation_request_list) as gateway_mock:
+
+        _decrypt_all()
+        assert gateway_mock.call_count == len(cryptainer_names) * len(gateway_urls)
+        gateway_mock.reset_mock()
+
+        with storage.create_decryption_session() as decryption_session:
+            _decrypt_all(decryption_session=decryption_session)
+            assert gateway_mock.call_count == len(gateway_urls)  # Each gateway is queried once
+        gateway_mock.reset_mock()
+
+        # Gateway failures are not cached, so gateways are queried again for next cryptainers
+        gateway_mock.side_effect = [OSError("Gateway is down")] * len(gateway_urls) + [
+            gateway_revelation_request_list
+        ] * len(gateway_urls)
+        with storage.create_decryption_session() as decryption_session:
+            result_payload, error_report = storage.decrypt_cryptainer_from_storage(
+                cryptainer_names[0],
+                gateway_urls=gateway_urls,
+                revelation_requestor_uid=revelation_requestor_uid,
+                decryption_session=decryption_session,
+            )
+            assert result_payload is None
+            _check_error_entry(
+                error_list=error_report,
+                error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+                error_criticity=DecryptionErrorCriticity.WARNING,
+                error_msg_match="Unable to reach remote server",
+                exception_class=OSError,
+                occurrence_count=len(gateway_urls),
+            )
+            assert gateway_mock.call_count == len(gateway_urls)
+
+            _decrypt_all(decryption_session=decryption_session)
+            assert gateway_mock.call_count == 2 * len(gateway_urls)  # Successful results are then cached
+
+
 def test_cryptainer_decryption_with_one_authenticator_in_shared_secret(tmp_path):
     keychain_uid_trustee = generate_uuid0()
     keystore_uid = generate_uuid0()
@@ -1503,7 +1808,7 @@ def test_cryptainer_decryption_from_complex_cryptoconf(tmp_path):
             revelation_requestor_uid=revelation_requestor_uid,
         )
         assert result_payload == payload
-        assert error_report == []  # All passphrases are provided
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=1)  # All passphrases are provided
 
     # Remote decryption request for this container and requestor is rejected
     gateway_revelation_request_list = _build_fake_gateway_revelation_request_list(revelation_requests_info)
@@ -1519,7 +1824,7 @@ def test_cryptainer_decryption_from_complex_cryptoconf(tmp_path):
             revelation_requestor_uid=revelation_requestor_uid,
         )
         assert result_payload == payload
-        assert error_report == []  # All passphrases are provided
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=1)  # All passphrases are provided
 
     # No remote decryption request exists for this container and requestor
     gateway_revelation_request_list = _build_fake_gateway_revelation_request_list(revelation_requests_info)
@@ -1535,7 +1840,7 @@ def test_cryptainer_decryption_from_complex_cryptoconf(tmp_path):
             revelation_requestor_uid=revelation_requestor_uid,
         )
         assert result_payload == payload
-        assert error_report == []  # All passphrases are provided
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=1)  # All passphrases are provided
 
     # Remote revelation request with two trustee (1,3) and local trustee
     with _patched_gateway_revelation_request_list(
@@ -1550,7 +1855,8 @@ def test_cryptainer_decryption_from_complex_cryptoconf(tmp_path):
             revelation_requestor_uid=revelation_requestor_uid,
         )
         assert result_payload == payload
-        assert error_report == []  # Trustee 1, 3 decrypted from server, trustee2 and localkey have passphrases
+        # Trustee 1, 3 decrypted from server, trustee2 and localkey have passphrases
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=1)
 
     # Remote revelation request with two trustee (1,3) and without any passphrase(decrypted_shards below threshold)
     with _patched_gateway_revelation_request_list(
@@ -1732,7 +2038,7 @@ def test_shamir_cryptainer_encryption_and_decryption(shamir_cryptoconf, trustee_
     result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer=cryptainer)
 
     assert result_payload == payload
-    assert error_report == []
+    _check_abandoned_shard_entries(error_report, abandoned_shard_count=2)
 
     payload_encryption_shamir = {}
     # Delete 1, 2 and too many share(s) from cipherdict key
@@ -1741,7 +2047,7 @@ def test_shamir_cryptainer_encryption_and_decryption(shamir_cryptoconf, trustee_
             if key_encryption["key_cipher_algo"] == SHARED_SECRET_ALGO_MARKER:
                 payload_encryption_shamir = payload_encryption
 
-    key_ciphertext_shards = load_from_json_bytes(payload_encryption_shamir["key_ciphertext"])
+    key_ciphertext_shards = load_from_binary_envelope(payload_encryption_shamir["key_ciphertext"])
 
     # 1 share is deleted
 
@@ -1754,7 +2060,7 @@ def test_shamir_cryptainer_encryption_and_decryption(shamir_cryptoconf, trustee_
         cryptainer=cryptainer, verify_integrity_tags=verify_integrity_tags
     )
     assert result_payload == payload
-    assert error_report == []
+    _check_abandoned_shard_entries(error_report, abandoned_shard_count=1)
 
     # Another share is deleted
 
@@ -1789,154 +2095,595 @@ def test_shamir_cryptainer_encryption_and_decryption(shamir_cryptoconf, trustee_
         decrypt_payload_from_cryptainer(cryptainer=cryptainer)
 
 
-def test_decrypt_payload_from_cryptainer_with_authenticated_algo_and_verify_failures():
-    payload_cipher_algo = random.choice(AUTHENTICATED_CIPHER_ALGOS)
-    cryptoconf = copy.deepcopy(SIMPLE_CRYPTOCONF)
-    cryptoconf["payload_cipher_layers"][0]["payload_cipher_algo"] = payload_cipher_algo
+def test_gather_cryptainer_dependencies_in_bulk(tmp_path):
+    keystore_pool = InMemoryKeystorePool()
+    storage = CryptainerStorage(
+        default_cryptoconf=COMPLEX_SHAMIR_CRYPTOCONF,
+        cryptainer_dir=tmp_path,
+        keystore_pool=keystore_pool,
+        offload_payload_ciphertext=random_bool(),
+    )
+    shared_keychain_uid = generate_uuid0()
+    for idx in range(7):
+        storage.enqueue_file_for_encryption(
+            "file%d.dat" % idx,
+            b"abc%d" % idx,
+            cryptainer_metadata=dict(idx=idx),
+            keychain_uid=(shared_keychain_uid if idx % 2 else None),
+        )
+    storage.wait_for_idle_state()
+    cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
 
-    cryptainer = encrypt_payload_into_cryptainer(payload=b"1234", cryptoconf=cryptoconf, cryptainer_metadata=None)
+    def _iter_cryptainers_with_names():  # Generators are accepted as inputs
+        for cryptainer_name in cryptainer_names:
+            yield cryptainer_name, storage.load_cryptainer_from_storage(cryptainer_name)
 
-    result, error_report = decrypt_payload_from_cryptainer(cryptainer, verify_integrity_tags=True)
-    assert result == b"1234"
+    trustee_dependencies = gather_trustee_dependencies(cryptainer for (_, cryptainer) in _iter_cryptainers_with_names())
+    decryptable_symkeys_per_trustee = gather_decryptable_symkeys(_iter_cryptainers_with_names())
 
-    cryptainer["payload_cipher_layers"][0]["payload_macs"]["tag"] += b"hi"  # CORRUPTION
+    # Keypairs are deduplicated, even if cryptainers share their keychain_uid
+    for dependencies in trustee_dependencies.values():
+        for trustee_conf, keypair_identifiers in dependencies.values():
+            assert len(keypair_identifiers) == len(
+                set((identifiers["keychain_uid"], identifiers["key_algo"]) for identifiers in keypair_identifiers)
+            )
+    assert trustee_dependencies == gather_trustee_dependencies(
+        [storage.load_cryptainer_from_storage(cryptainer_names[0])]
+        + list(cryptainer for (_, cryptainer) in _iter_cryptainers_with_names())
+    )  # Already known keypairs are not added twice
+
+    for max_workers in (1, 3):
+        with patch("wacryptolib.cryptainer.STORAGE_SCAN_BATCH_SIZE", 2):
+            scanned_dependencies = storage.gather_cryptainer_dependencies(max_workers=max_workers)
+        assert scanned_dependencies == (trustee_dependencies, decryptable_symkeys_per_trustee)
+
+    trustee_dependencies, decryptable_symkeys_per_trustee = storage.gather_cryptainer_dependencies(
+        cryptainer_names=cryptainer_names[2:4]
+    )
+    cryptainer_names_found = set(
+        symkey_decryption_request["cryptainer_name"]
+        for (_, symkey_decryption_requests) in decryptable_symkeys_per_trustee.values()
+        for symkey_decryption_request in symkey_decryption_requests
+    )
+    assert cryptainer_names_found == set(str(cryptainer_name) for cryptainer_name in cryptainer_names[2:4])
 
-    result, error_report = decrypt_payload_from_cryptainer(cryptainer, verify_integrity_tags=False)
-    assert result == b"1234"
 
-    # DecryptionIntegrityError
-    result, error_report = decrypt_payload_from_cryptainer(cryptainer, verify_integrity_tags=True)
-    assert result is None
-    _check_error_entry(
-        error_list=error_report,
-        error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
-        error_criticity=DecryptionErrorCriticity.ERROR,
-        error_msg_match="Failed decryption authentication",
-        exception_class=DecryptionIntegrityError,
-    )
-    assert len(error_report) == 1
+@pytest.mark.parametrize("cryptoconf", [COMPLEX_CRYPTOCONF, COMPLEX_SHAMIR_CRYPTOCONF])
+def test_cryptainer_binary_key_envelopes_opt_in(tmp_path, cryptoconf):
+    payload = b"sometext"
+    abandoned_shard_count = 2 if cryptoconf is COMPLEX_SHAMIR_CRYPTOCONF else 0
 
+    def _get_header_size(cryptainer):
+        cryptainer_header = dict(cryptainer, payload_ciphertext_struct=None)
+        return len(dump_to_json_bytes(cryptainer_header))
 
-def test_decrypt_payload_from_cryptainer_with_signature_troubles():
-    verify_integrity_tags = random_bool()
+    def _check_cryptainer_format(cryptainer, binary_key_envelopes, abandoned_shard_count=abandoned_shard_count):
+        check_cryptainer_sanity(cryptainer, jsonschema_mode=False)
+        check_cryptainer_sanity(convert_native_tree_to_extended_json_tree(cryptainer), jsonschema_mode=True)
+        assert cryptainer["cryptainer_format"] == (
+            CRYPTAINER_BINARY_ENVELOPES_FORMAT if binary_key_envelopes else CRYPTAINER_FORMAT
+        )
+        for payload_cipher_layer in cryptainer["payload_cipher_layers"]:
+            assert payload_cipher_layer["key_ciphertext"].startswith(
+                BINARY_ENVELOPE_MAGIC if binary_key_envelopes else b"{"
+            )
+        result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer=cryptainer)
+        assert result_payload == payload
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=abandoned_shard_count)
 
-    cryptainer_original = encrypt_payload_into_cryptainer(
-        payload=b"1234abc", cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_metadata=None
-    )
+    # By default, keys/shards/cipherdicts remain json-serialized, as expected by readers of CRYPTAINER_FORMAT
+    json_cryptainer = encrypt_payload_into_cryptainer(payload=payload, cryptoconf=cryptoconf, cryptainer_metadata=None)
+    _check_cryptainer_format(json_cryptainer, binary_key_envelopes=False)
 
-    result, error_report = decrypt_payload_from_cryptainer(
-        cryptainer_original, verify_integrity_tags=verify_integrity_tags
+    envelopes_cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload, cryptoconf=cryptoconf, cryptainer_metadata=None, binary_key_envelopes=True
     )
-    assert result == b"1234abc"
+    _check_cryptainer_format(envelopes_cryptainer, binary_key_envelopes=True)
+    assert _get_header_size(envelopes_cryptainer) < 0.8 * _get_header_size(json_cryptainer)
+
+    # Rewrapping keeps the format of cryptainers
+    new_key_cipher_layers = [dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)]
+    for binary_key_envelopes, cryptainer in [(False, json_cryptainer), (True, envelopes_cryptainer)]:
+        rewrapped_cryptainer, error_report = rewrap_cryptainer_keys(cryptainer, new_key_cipher_layers)
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=abandoned_shard_count)
+        _check_cryptainer_format(
+            rewrapped_cryptainer, binary_key_envelopes=binary_key_envelopes, abandoned_shard_count=0
+        )  # No more shared secret
+
+    # Storages forward their setting to in-memory encryptions as well as to encryption streams
+    storage = CryptainerStorage(default_cryptoconf=cryptoconf, cryptainer_dir=tmp_path, binary_key_envelopes=True)
+    storage.enqueue_file_for_encryption("file.dat", payload, cryptainer_metadata=None)
+    storage.wait_for_idle_state()
+    _check_cryptainer_format(storage.load_cryptainer_from_storage("file.dat.crypt"), binary_key_envelopes=True)
 
-    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
-    # pprint(cryptainer_corrupted)
-    del cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_digest_value"]
 
-    result, error_report = decrypt_payload_from_cryptainer(
-        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
+def test_verify_cryptainers_signatures():
+    keystore_pool = InMemoryKeystorePool()
+    keychain_uid = generate_uuid0()
+    cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_CBC",
+                key_cipher_layers=[
+                    dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                ],
+                payload_signatures=[
+                    dict(
+                        payload_digest_algo="SHA256",
+                        payload_signature_algo="DSA_DSS",
+                        payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                    ),
+                    dict(
+                        payload_digest_algo="SHA256",
+                        payload_signature_algo="ECC_DSS",
+                        payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                    ),
+                ],
+            )
+        ]
     )
-    assert result == b"1234abc"  # Missing the payload_digest_value is OK
 
-    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
-    cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_digest_value"] = b"000"
+    cryptainers = [
+        encrypt_payload_into_cryptainer(
+            payload=b"abc%d" % idx,
+            cryptoconf=cryptoconf,
+            cryptainer_metadata=None,
+            keychain_uid=(keychain_uid if idx < 4 else None),
+            keystore_pool=keystore_pool,
+        )
+        for idx in range(5)
+    ]
 
-    # RuntimeError, match="Mismatch"
-    result, error_report = decrypt_payload_from_cryptainer(
-        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
-    )
-    assert result == b"1234abc"
-    _check_error_entry(
-        error_list=error_report,
-        error_type=DecryptionErrorType.SIGNATURE_ERROR,
-        error_criticity=DecryptionErrorCriticity.WARNING,
-        error_msg_match="Mismatch between actual and expected payload digests during signature verification",
-    )
-    assert len(error_report) == 1
+    assert verify_cryptainers_signatures([]) == []
 
-    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
-    del cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_signature_struct"]
+    error_reports = verify_cryptainers_signatures(cryptainers, keystore_pool=keystore_pool)
+    assert error_reports == [[]] * 5
 
-    # RuntimeError, match="Missing signature structure"
-    result, error_report = decrypt_payload_from_cryptainer(
-        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
-    )
+    cryptainers[1]["payload_ciphertext_struct"]["ciphertext_value"] += b"x"
+    del cryptainers[2]["payload_cipher_layers"][0]["payload_signatures"][1]["payload_signature_struct"]
 
-    assert result == b"1234abc"
-    _check_error_entry(
-        error_list=error_report,
-        error_type=DecryptionErrorType.SIGNATURE_ERROR,
-        error_criticity=DecryptionErrorCriticity.WARNING,
-        error_msg_match="Missing signature structure",
-    )
-    assert len(error_report) == 1
+    with patch(
+        "wacryptolib.cryptainer.load_asymmetric_key_from_pem_bytestring", wraps=load_asymmetric_key_from_pem_bytestring
+    ) as load_key_mock, patch("wacryptolib.cryptainer.hash_message", wraps=hash_message) as hash_message_mock:
+        error_reports = verify_cryptainers_signatures(cryptainers, keystore_pool=keystore_pool)
+        assert load_key_mock.call_count == 2 * 2  # Once per (trustee, keychain_uid, signature algo)
+        assert hash_message_mock.call_count == 5  # Once per cryptainer, since digest algos are the same
 
-    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
-    cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_signature_struct"] = {
-        "signature_timestamp_utc": 1645905017,
-        "signature_value": b"abcd",
-    }
-    payload_signature_algo = cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0][
-        "payload_signature_algo"
-    ]
+    assert error_reports[0] == error_reports[3] == error_reports[4] == []
+    assert len(error_reports[1]) == 4  # Digest mismatch and failed verification, for both signatures
+    assert all(entry["error_type"] == DecryptionErrorType.SIGNATURE_ERROR for entry in error_reports[1])
+    assert error_reports[1][0]["error_message"].startswith("Mismatch between actual and expected payload digests")
+    assert error_reports[1][1]["error_message"].startswith("Failed signature verification DSA_DSS")
+    assert len(error_reports[2]) == 1
+    assert error_reports[2][0]["error_message"] == "Missing signature structure"
 
-    # SignatureVerificationError, match="signature verification"
-    result, error_report = decrypt_payload_from_cryptainer(
-        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
-    )
+    # Same checks as when decrypting
+    result, error_report = decrypt_payload_from_cryptainer(cryptainers[2], keystore_pool=keystore_pool)
+    assert result == b"abc2"
+    assert error_report == error_reports[2]
 
-    assert result == b"1234abc"
-    _check_error_entry(
-        error_list=error_report,
-        error_type=DecryptionErrorType.SIGNATURE_ERROR,
-        error_criticity=DecryptionErrorCriticity.WARNING,
-        error_msg_match="Failed signature verification",
-        exception_class=SignatureVerificationError,
-    )
-    assert len(error_report) == 1
+    error_reports = verify_cryptainers_signatures(cryptainers, keystore_pool=InMemoryKeystorePool())  # No keys
+    assert all(len(error_report) == 2 for error_report in error_reports)
+    assert "not found" in error_reports[0][0]["error_message"]
 
 
-def test_passphrase_mapping_during_decryption(tmp_path):
+def test_concurrent_trustee_calls_during_encryption():
+    keystore_pool = InMemoryKeystorePool()
+    payload = b"abcdef"
     keychain_uid = generate_uuid0()
 
-    keychain_uid_trustee = generate_uuid0()
+    shard_count = 5
+    shard_barrier = threading.Barrier(shard_count, timeout=30)  # Broken if shards are not wrapped concurrently
+    worker_thread_names = set()
+    original_fetcher = CryptainerEncryptor._fetch_asymmetric_key_pem_from_trustee
 
-    local_passphrase = "b^yep&ts"
+    def _synchronized_fetcher(self, trustee, key_algo, keychain_uid):  # Simulates a remote trustee
+        thread_name = threading.current_thread().name
+        worker_thread_names.add(thread_name)
+        if thread_name.startswith("trustee_call_worker"):
+            shard_barrier.wait()
+        return original_fetcher(self, trustee=trustee, key_algo=key_algo, keychain_uid=keychain_uid)
 
-    keystore_uid1 = keychain_uid_trustee  # FIXME why mix key and storage uids ?
-    passphrase1 = "tata"
+    with patch.object(CryptainerEncryptor, "_fetch_asymmetric_key_pem_from_trustee", _synchronized_fetcher):
+        cryptainer = encrypt_payload_into_cryptainer(
+            payload=payload,
+            cryptoconf=SIMPLE_SHAMIR_CRYPTOCONF,
+            cryptainer_metadata=None,
+            keychain_uid=keychain_uid,
+            keystore_pool=keystore_pool,
+        )
 
-    keystore_uid2 = generate_uuid0()
-    passphrase2 = "2çès"
+    # One RSA layer in caller thread, then all shards wrapped concurrently
+    assert not shard_barrier.broken
+    assert len([name for name in worker_thread_names if name.startswith("trustee_call_worker")]) == shard_count
 
-    keystore_uid3 = generate_uuid0()
-    passphrase3 = "zaizoadsxsnd123"
+    result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+    assert result_payload == payload  # Shards were kept in the right order
+    _check_abandoned_shard_entries(error_report, abandoned_shard_count=2)
 
-    all_passphrases = [local_passphrase, passphrase1, passphrase2, passphrase3]
 
+def test_cryptainer_worker_thread_pool_lifecycle():
     keystore_pool = InMemoryKeystorePool()
-    keystore_pool._register_fake_imported_storage_uids(storage_uids=[keystore_uid1, keystore_uid2, keystore_uid3])
 
-    local_keystore = keystore_pool.get_local_keyfactory()
-    generate_keypair_for_storage(
-        key_algo="RSA_OAEP", keystore=local_keystore, keychain_uid=keychain_uid, passphrase=local_passphrase
-    )
-    keystore1 = keystore_pool.get_foreign_keystore(keystore_uid1)
-    generate_keypair_for_storage(
-        key_algo="RSA_OAEP", keystore=keystore1, keychain_uid=keychain_uid_trustee, passphrase=passphrase1
-    )
-    keystore2 = keystore_pool.get_foreign_keystore(keystore_uid2)
-    generate_keypair_for_storage(
-        key_algo="RSA_OAEP", keystore=keystore2, keychain_uid=keychain_uid, passphrase=passphrase2
-    )
-    keystore3 = keystore_pool.get_foreign_keystore(keystore_uid3)
-    generate_keypair_for_storage(
-        key_algo="RSA_OAEP", keystore=keystore3, keychain_uid=keychain_uid, passphrase=passphrase3
-    )
+    with CryptainerEncryptor(keystore_pool=keystore_pool) as cryptainer_encryptor:
+        assert cryptainer_encryptor._thread_pool_executor is None  # Created on demand only
+        cryptainer = cryptainer_encryptor.encrypt_data(
+            b"abc", cryptoconf=SIMPLE_CRYPTOCONF, keychain_uid=None, cryptainer_metadata=None
+        )
+        assert cryptainer_encryptor._thread_pool_executor is None  # No concurrent trustee calls were needed
 
-    local_keyfactory_trustee_id = get_trustee_id(LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+        cryptainer = cryptainer_encryptor.encrypt_data(
+            b"abc", cryptoconf=SIMPLE_SHAMIR_CRYPTOCONF, keychain_uid=None, cryptainer_metadata=None
+        )
+        thread_pool_executor = cryptainer_encryptor._thread_pool_executor
+        assert thread_pool_executor is not None
 
-    shard_trustee1 = dict(trustee_type="authenticator", keystore_uid=keystore_uid1)
+    assert cryptainer_encryptor._thread_pool_executor is None
+    assert thread_pool_executor._shutdown
+
+    # Instance remains usable after closing
+    cryptainer_encryptor.encrypt_data(
+        b"abc", cryptoconf=SIMPLE_SHAMIR_CRYPTOCONF, keychain_uid=None, cryptainer_metadata=None
+    )
+    assert cryptainer_encryptor._thread_pool_executor is not None
+    cryptainer_encryptor.close()
+    cryptainer_encryptor.close()  # Idempotent
+
+    result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+    assert result_payload == b"abc"
+
+
+def test_concurrent_shard_decryption_with_early_termination():
+    keystore_pool = InMemoryKeystorePool()
+    payload = b"abcdef"
+    slow_keychain_uid = generate_uuid0()
+    broken_keychain_uid = generate_uuid0()
+
+    def _build_shard_conf(keychain_uid=None):
+        key_cipher_layer = dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+        if keychain_uid:
+            key_cipher_layer["keychain_uid"] = keychain_uid
+        return dict(key_cipher_layers=[key_cipher_layer])
+
+    cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_CBC",
+                key_cipher_layers=[
+                    dict(
+                        key_cipher_algo=SHARED_SECRET_ALGO_MARKER,
+                        key_shared_secret_threshold=2,
+                        key_shared_secret_shards=[
+                            _build_shard_conf(slow_keychain_uid),
+                            _build_shard_conf(broken_keychain_uid),
+                            _build_shard_conf(),
+                            _build_shard_conf(),
+                        ],
+                    )
+                ],
+                payload_signatures=[],
+            )
+        ]
+    )
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload, cryptoconf=cryptoconf, cryptainer_metadata=None, keystore_pool=keystore_pool
+    )
+
+    slow_trustee_released = threading.Event()
+    broken_trustee_called = threading.Event()
+    original_decrypt_with_private_key = TrusteeApi.decrypt_with_private_key
+
+    def _unreliable_decrypt_with_private_key(self, *, keychain_uid, **kwargs):  # Simulates remote trustees
+        if keychain_uid == slow_keychain_uid:
+            slow_trustee_released.wait(timeout=30)
+        elif keychain_uid == broken_keychain_uid:
+            broken_trustee_called.set()
+            raise KeyDoesNotExist("Trustee has lost this key")
+        else:
+            broken_trustee_called.wait(timeout=30)  # Let the failure occur before threshold is reached
+        return original_decrypt_with_private_key(self, keychain_uid=keychain_uid, **kwargs)
+
+    try:
+        with patch.object(TrusteeApi, "decrypt_with_private_key", _unreliable_decrypt_with_private_key):
+            result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+        assert not slow_trustee_released.is_set()  # Slow trustee was not waited for
+    finally:
+        slow_trustee_released.set()
+
+    assert result_payload == payload
+
+    # Failures which occurred before threshold was reached are still reported
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.WARNING,
+        error_msg_match="Private key not found",
+        exception_class=KeyDoesNotExist,
+    )
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.WARNING,
+        error_msg_match="error prevented decrypting shard",
+    )
+    # Abandoned slow shard is reported too
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.WARNING,
+        error_msg_match="was skipped or cancelled",
+    )
+    assert str(slow_keychain_uid) in error_report[-1]["error_message"]
+    assert len(error_report) == 3
+
+
+def test_compiled_cryptoconf_plan_reuse(tmp_path):
+    keystore_pool = InMemoryKeystorePool()
+    cryptoconf = copy.deepcopy(COMPLEX_SHAMIR_CRYPTOCONF)
+
+    cryptoconf_plan = compile_cryptoconf(cryptoconf, keystore_pool=keystore_pool)
+    assert isinstance(cryptoconf_plan, CryptoconfPlan)
+    assert cryptoconf_plan.trustee_proxies  # Resolved once and for all
+    assert is_cryptainer_cryptoconf_streamable(cryptoconf_plan) == is_cryptainer_cryptoconf_streamable(cryptoconf)
+
+    cryptoconf["payload_cipher_layers"] = []  # Plan must not be impacted by later changes of original cryptoconf
+
+    cryptainers = []
+    for idx in range(3):
+        payload = b"payload%d" % idx
+        cryptainer = encrypt_payload_into_cryptainer(
+            payload=payload, cryptoconf=cryptoconf_plan, cryptainer_metadata=None, keystore_pool=keystore_pool
+        )
+        check_cryptainer_sanity(cryptainer)
+        result_payload, error_report = decrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+        assert result_payload == payload
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=2)
+        cryptainers.append(cryptainer)
+
+    # Template is copied for each cryptainer
+    assert cryptainers[0]["payload_cipher_layers"] is not cryptainers[1]["payload_cipher_layers"]
+    assert cryptainers[0]["cryptainer_uid"] != cryptainers[1]["cryptainer_uid"]
+
+    storage = CryptainerStorage(
+        default_cryptoconf=compile_cryptoconf(SIMPLE_CRYPTOCONF), cryptainer_dir=tmp_path, keystore_pool=keystore_pool
+    )
+    storage.enqueue_file_for_encryption("animals.dat", b"dogs\ncats\n", cryptainer_metadata=None)
+    storage.create_cryptainer_encryption_stream(
+        "stream.dat", cryptainer_metadata=None, cryptoconf=cryptoconf_plan
+    ).finalize()
+    storage.wait_for_idle_state()
+    assert len(storage.list_cryptainer_names()) == 2
+    assert storage.decrypt_cryptainer_from_storage("animals.dat.crypt")[0] == b"dogs\ncats\n"
+
+    with pytest.raises(SchemaValidationError):
+        compile_cryptoconf({"payload_cipher_layers": []})
+
+
+def test_async_encryption_and_decryption():
+    keystore_pool = InMemoryKeystorePool()
+    cryptoconf = COMPLEX_SHAMIR_CRYPTOCONF
+    payloads = [b"payload%d" % idx for idx in range(4)]
+
+    async def _process_payloads():
+        cryptainers = await asyncio.gather(
+            *(
+                aencrypt_payload_into_cryptainer(
+                    payload, cryptoconf=cryptoconf, cryptainer_metadata={"idx": idx}, keystore_pool=keystore_pool
+                )
+                for idx, payload in enumerate(payloads)
+            )
+        )
+        results = await asyncio.gather(
+            *(adecrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool) for cryptainer in cryptainers)
+        )
+        return cryptainers, results
+
+    cryptainers, results = asyncio.run(_process_payloads())
+
+    for idx, (cryptainer, (result_payload, error_report)) in enumerate(zip(cryptainers, results)):
+        check_cryptainer_sanity(cryptainer)
+        assert cryptainer["cryptainer_state"] == "FINISHED"
+        assert extract_metadata_from_cryptainer(cryptainer) == {"idx": idx}
+        assert result_payload == payloads[idx]
+        _check_abandoned_shard_entries(error_report, abandoned_shard_count=2)
+
+    # Async cryptainers are interoperable with the synchronous API
+    result_payload, error_report = decrypt_payload_from_cryptainer(cryptainers[0], keystore_pool=keystore_pool)
+    assert result_payload == payloads[0]
+
+    async def _fetch_public_key():
+        async_trustee_proxy = get_async_trustee_proxy(LOCAL_KEYFACTORY_TRUSTEE_MARKER, keystore_pool=keystore_pool)
+        return await async_trustee_proxy.fetch_public_key(keychain_uid=cryptainers[0]["keychain_uid"], key_algo="RSA_OAEP")
+
+    public_key_pem = asyncio.run(_fetch_public_key())
+    assert public_key_pem.startswith(b"-----BEGIN PUBLIC KEY-----")
+
+
+def test_async_decryption_through_async_trustee_proxies():
+    keystore_pool = InMemoryKeystorePool()
+    payload = b"abcdef"
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload, cryptoconf=SIMPLE_SHAMIR_CRYPTOCONF, cryptainer_metadata=None, keystore_pool=keystore_pool
+    )
+
+    unreachable_trustee_count = 2  # Shard threshold is 3 out of 5
+    original_decrypt_with_private_key = AsyncTrusteeProxy.decrypt_with_private_key
+    calling_threads = []
+    cancelled_calls = []
+
+    async def _unreliable_decrypt_with_private_key(self, **kwargs):  # Simulates natively async remote trustees
+        calling_threads.append(threading.current_thread())
+        if len(calling_threads) <= unreachable_trustee_count:
+            try:
+                await asyncio.Event().wait()  # Never answers, but doesn't block any thread
+            except asyncio.CancelledError:
+                cancelled_calls.append(kwargs["keychain_uid"])
+                raise
+        return await original_decrypt_with_private_key(self, **kwargs)
+
+    async def _decrypt():
+        result = await adecrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+        await asyncio.sleep(0)  # Let cancellations be processed
+        return result
+
+    with patch.object(AsyncTrusteeProxy, "decrypt_with_private_key", _unreliable_decrypt_with_private_key):
+        result_payload, error_report = asyncio.run(_decrypt())
+
+    assert result_payload == payload
+    _check_abandoned_shard_entries(error_report, abandoned_shard_count=2)
+    assert len(calling_threads) == 6  # 5 shards, then main RSA layer
+    assert set(calling_threads) == {threading.main_thread()}  # All trustee calls were awaited on event loop
+    assert len(cancelled_calls) == unreachable_trustee_count
+
+
+def test_decrypt_payload_from_cryptainer_with_authenticated_algo_and_verify_failures():
+    payload_cipher_algo = random.choice(AUTHENTICATED_CIPHER_ALGOS)
+    cryptoconf = copy.deepcopy(SIMPLE_CRYPTOCONF)
+    cryptoconf["payload_cipher_layers"][0]["payload_cipher_algo"] = payload_cipher_algo
+
+    cryptainer = encrypt_payload_into_cryptainer(payload=b"1234", cryptoconf=cryptoconf, cryptainer_metadata=None)
+
+    result, error_report = decrypt_payload_from_cryptainer(cryptainer, verify_integrity_tags=True)
+    assert result == b"1234"
+
+    cryptainer["payload_cipher_layers"][0]["payload_macs"]["tag"] += b"hi"  # CORRUPTION
+
+    result, error_report = decrypt_payload_from_cryptainer(cryptainer, verify_integrity_tags=False)
+    assert result == b"1234"
+
+    # DecryptionIntegrityError
+    result, error_report = decrypt_payload_from_cryptainer(cryptainer, verify_integrity_tags=True)
+    assert result is None
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.ERROR,
+        error_msg_match="Failed decryption authentication",
+        exception_class=DecryptionIntegrityError,
+    )
+    assert len(error_report) == 1
+
+
+def test_decrypt_payload_from_cryptainer_with_signature_troubles():
+    verify_integrity_tags = random_bool()
+
+    cryptainer_original = encrypt_payload_into_cryptainer(
+        payload=b"1234abc", cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_metadata=None
+    )
+
+    result, error_report = decrypt_payload_from_cryptainer(
+        cryptainer_original, verify_integrity_tags=verify_integrity_tags
+    )
+    assert result == b"1234abc"
+
+    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
+    # pprint(cryptainer_corrupted)
+    del cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_digest_value"]
+
+    result, error_report = decrypt_payload_from_cryptainer(
+        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
+    )
+    assert result == b"1234abc"  # Missing the payload_digest_value is OK
+
+    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
+    cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_digest_value"] = b"000"
+
+    # RuntimeError, match="Mismatch"
+    result, error_report = decrypt_payload_from_cryptainer(
+        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
+    )
+    assert result == b"1234abc"
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.SIGNATURE_ERROR,
+        error_criticity=DecryptionErrorCriticity.WARNING,
+        error_msg_match="Mismatch between actual and expected payload digests during signature verification",
+    )
+    assert len(error_report) == 1
+
+    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
+    del cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_signature_struct"]
+
+    # RuntimeError, match="Missing signature structure"
+    result, error_report = decrypt_payload_from_cryptainer(
+        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
+    )
+
+    assert result == b"1234abc"
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.SIGNATURE_ERROR,
+        error_criticity=DecryptionErrorCriticity.WARNING,
+        error_msg_match="Missing signature structure",
+    )
+    assert len(error_report) == 1
+
+    cryptainer_corrupted = copy.deepcopy(cryptainer_original)
+    cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0]["payload_signature_struct"] = {
+        "signature_timestamp_utc": 1645905017,
+        "signature_value": b"abcd",
+    }
+    payload_signature_algo = cryptainer_corrupted["payload_cipher_layers"][0]["payload_signatures"][0][
+        "payload_signature_algo"
+    ]
+
+    # SignatureVerificationError, match="signature verification"
+    result, error_report = decrypt_payload_from_cryptainer(
+        cryptainer_corrupted, verify_integrity_tags=verify_integrity_tags
+    )
+
+    assert result == b"1234abc"
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.SIGNATURE_ERROR,
+        error_criticity=DecryptionErrorCriticity.WARNING,
+        error_msg_match="Failed signature verification",
+        exception_class=SignatureVerificationError,
+    )
+    assert len(error_report) == 1
+
+
+def test_passphrase_mapping_during_decryption(tmp_path):
+    keychain_uid = generate_uuid0()
+
+    keychain_uid_trustee = generate_uuid0()
+
+    local_passphrase = "b^yep&ts"
+
+    keystore_uid1 = keychain_uid_trustee  # FIXME why mix key and storage uids ?
+    passphrase1 = "tata"
+
+    keystore_uid2 = generate_uuid0()
+    passphrase2 = "2çès"
+
+    keystore_uid3 = generate_uuid0()
+    passphrase3 = "zaizoadsxsnd123"
+
+    all_passphrases = [local_passphrase, passphrase1, passphrase2, passphrase3]
+
+    keystore_pool = InMemoryKeystorePool()
+    keystore_pool._register_fake_imported_storage_uids(storage_uids=[keystore_uid1, keystore_uid2, keystore_uid3])
+
+    local_keystore = keystore_pool.get_local_keyfactory()
+    generate_keypair_for_storage(
+        key_algo="RSA_OAEP", keystore=local_keystore, keychain_uid=keychain_uid, passphrase=local_passphrase
+    )
+    keystore1 = keystore_pool.get_foreign_keystore(keystore_uid1)
+    generate_keypair_for_storage(
+        key_algo="RSA_OAEP", keystore=keystore1, keychain_uid=keychain_uid_trustee, passphrase=passphrase1
+    )
+    keystore2 = keystore_pool.get_foreign_keystore(keystore_uid2)
+    generate_keypair_for_storage(
+        key_algo="RSA_OAEP", keystore=keystore2, keychain_uid=keychain_uid, passphrase=passphrase2
+    )
+    keystore3 = keystore_pool.get_foreign_keystore(keystore_uid3)
+    generate_keypair_for_storage(
+        key_algo="RSA_OAEP", keystore=keystore3, keychain_uid=keychain_uid, passphrase=passphrase3
+    )
+
+    local_keyfactory_trustee_id = get_trustee_id(LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+
+    shard_trustee1 = dict(trustee_type="authenticator", keystore_uid=keystore_uid1)
     shard_trustee1_id = get_trustee_id(shard_trustee1)
 
     shard_trustee2 = dict(trustee_type="authenticator", keystore_uid=keystore_uid2)
@@ -2176,7 +2923,7 @@ def test_passphrase_mapping_during_decryption(tmp_path):
         },
     )
     assert decrypted == payload
-    assert error_report == []
+    _check_abandoned_shard_entries(error_report, abandoned_shard_count=1)
 
     # Proper forwarding of parameters in cryptainer storage class
 
@@ -2208,7 +2955,7 @@ def test_passphrase_mapping_during_decryption(tmp_path):
         "beauty.txt.crypt", passphrase_mapper={None: all_passphrases}, verify_integrity_tags=verify_integrity_tags
     )
     assert decrypted == payload
-    assert error_report == []
+    _check_abandoned_shard_entries(error_report, abandoned_shard_count=1)
 
     # Decryption Error with wrong payload
     cryptainer_paylod_path = tmp_path / "beauty.txt.crypt.payload"
@@ -2226,7 +2973,7 @@ def test_passphrase_mapping_during_decryption(tmp_path):
         error_msg_match="Failed symmetric decryption",
         exception_class=DecryptionError,
     )
-    assert len(error_report) == 3  # with SignatureError
+    assert len(error_report) == 4  # with SignatureError and abandoned shard
 
 
 def test_get_proxy_for_trustee(tmp_path):
@@ -2326,73 +3073,766 @@ def test_cryptainer_storage_and_executor(tmp_path, caplog):
     assert len(list(storage._cryptainer_dir.iterdir())) == 4  # 2 files per cryptainer
 
     storage = CryptainerStorage(
-        default_cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_dir=cryptainer_dir, offload_payload_ciphertext=False
+        default_cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_dir=cryptainer_dir, offload_payload_ciphertext=False
+    )
+    storage.enqueue_file_for_encryption("newfile.bmp", b"stuffs", cryptainer_metadata=None)
+    storage.wait_for_idle_state()
+    assert storage.get_cryptainer_count() == 3
+    expected_cryptainer_names = [Path("animals.dat.crypt"), Path("empty.txt.crypt"), Path("newfile.bmp.crypt")]
+    assert storage.list_cryptainer_names(as_sorted_list=True) == expected_cryptainer_names
+    assert sorted(storage.list_cryptainer_names(as_sorted_list=False)) == expected_cryptainer_names
+
+    assert not list(storage._cryptainer_dir.glob("newfile*data"))  # Offloading is well disabled now
+    assert len(list(storage._cryptainer_dir.iterdir())) == 5
+
+    _cryptainer_for_txt = storage.load_cryptainer_from_storage("empty.txt.crypt")
+    assert storage.load_cryptainer_from_storage(1) == _cryptainer_for_txt
+    assert _cryptainer_for_txt["payload_ciphertext_struct"]  # Padding occurs for AES_CBC
+
+    _cryptainer_for_txt2 = storage.load_cryptainer_from_storage("empty.txt.crypt", include_payload_ciphertext=False)
+    assert storage.load_cryptainer_from_storage(1, include_payload_ciphertext=False) == _cryptainer_for_txt2
+    assert not hasattr(_cryptainer_for_txt2, "payload_ciphertext_struct")
+
+    # We continue test with a randomly configured storage
+    offload_payload_ciphertext = random_bool()
+    storage = CryptainerStorage(
+        default_cryptoconf=SIMPLE_CRYPTOCONF,
+        cryptainer_dir=cryptainer_dir,
+        offload_payload_ciphertext=offload_payload_ciphertext,
+    )
+
+    # Test proper logging of errors occurring in thread pool executor
+    assert storage._make_absolute  # Instance method
+    storage._make_absolute = None  # Corruption!
+    assert "Abnormal exception" not in caplog.text, caplog.text
+    storage.enqueue_file_for_encryption("something.mpg", b"#########", cryptainer_metadata=None)
+    storage.wait_for_idle_state()
+    assert storage.get_cryptainer_count() == 3  # Unchanged
+    assert "Abnormal exception" in caplog.text, caplog.text
+    del storage._make_absolute
+    assert storage._make_absolute  # Back to the method
+
+    abs_entries = storage.list_cryptainer_names(as_absolute_paths=True)
+    assert len(abs_entries) == 3  # Unchanged
+    assert all(entry.is_absolute() for entry in abs_entries)
+
+    animals_content, error_report = storage.decrypt_cryptainer_from_storage("animals.dat.crypt")
+    assert animals_content == b"dogs\ncats\n"
+
+    empty_content, error_report = storage.decrypt_cryptainer_from_storage("empty.txt.crypt")
+    assert empty_content == b""
+
+    assert storage.get_cryptainer_count() == 3
+    os.remove(os.path.join(cryptainer_dir, "animals.dat.crypt"))
+    os.remove(os.path.join(cryptainer_dir, "newfile.bmp.crypt"))
+    assert storage.list_cryptainer_names(as_sorted_list=True) == [Path("empty.txt.crypt")]
+    assert storage.get_cryptainer_count() == 1  # Remaining offloaded data file is ignored
+
+    offload_payload_ciphertext1 = random_bool()
+    storage = FakeTestCryptainerStorage(
+        default_cryptoconf={"smth": True},
+        cryptainer_dir=cryptainer_dir,
+        offload_payload_ciphertext=offload_payload_ciphertext1,
+    )
+    assert storage._max_cryptainer_count is None
+    for i in range(10):
+        storage.enqueue_file_for_encryption("file.dat", b"dogs\ncats\n", cryptainer_metadata=None)
+    assert storage.get_cryptainer_count() < 11  # In progress
+    storage.wait_for_idle_state()
+    assert storage.get_cryptainer_count() == 11  # Still the older file remains
+
+
+def test_cryptainer_storage_header_pool(tmp_path):
+    keystore_pool = InMemoryKeystorePool()
+    storage = CryptainerStorage(
+        default_cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_dir=tmp_path, keystore_pool=keystore_pool, header_pool_size=2
+    )
+    header_factory = storage._cryptainer_header_factory
+    header_factory.wait_for_idle_state()
+
+    (header_pool,) = header_factory._header_pools.values()  # Prefilled for default cryptoconf
+    assert len(header_pool) == 2
+    pregenerated_cryptainer_uids = [cryptainer["cryptainer_uid"] for (cryptainer, _extracts) in header_pool]
+
+    for idx in range(3):
+        stream = storage.create_cryptainer_encryption_stream(
+            "stream%d.dat" % idx, cryptainer_metadata=None, dump_initial_cryptainer=False
+        )
+        stream.encrypt_chunk(b"some data %d" % idx)
+        stream.finalize()
+        storage.wait_for_idle_state()  # Pool gets refilled
+
+    assert len(header_pool) == 2
+
+    cryptainers = [storage.load_cryptainer_from_storage("stream%d.dat.crypt" % idx) for idx in range(3)]
+    assert [cryptainer["cryptainer_uid"] for cryptainer in cryptainers[:2]] == pregenerated_cryptainer_uids
+    for idx in range(3):
+        result_payload, error_report = storage.decrypt_cryptainer_from_storage("stream%d.dat.crypt" % idx)
+        assert result_payload == b"some data %d" % idx
+        assert error_report == []
+
+    # Specific metadata get their own pool
+    storage.create_cryptainer_encryption_stream("other.dat", cryptainer_metadata={"a": 1}).finalize()
+    storage.wait_for_idle_state()
+    assert len(header_factory._header_pools) == 2
+    assert storage.load_cryptainer_from_storage("other.dat.crypt")["cryptainer_metadata"] == {"a": 1}
+
+
+@pytest.mark.parametrize("offload_payload_ciphertext", [True, False])
+def test_cryptainer_storage_header_pool_for_enqueued_files(tmp_path, offload_payload_ciphertext):
+    keystore_pool = InMemoryKeystorePool()
+    storage = CryptainerStorage(
+        default_cryptoconf=SIMPLE_CRYPTOCONF,
+        cryptainer_dir=tmp_path,
+        keystore_pool=keystore_pool,
+        header_pool_size=2,
+        offload_payload_ciphertext=offload_payload_ciphertext,
+        keychain_rotation_cryptainer_count=3,
+    )
+    header_factory = storage._cryptainer_header_factory
+    header_factory.wait_for_idle_state()
+
+    def _get_pregenerated_cryptainer_uids(keychain_uid):
+        (header_pool,) = [pool for (key, pool) in header_factory._header_pools.items() if key[1] == keychain_uid]
+        return [cryptainer["cryptainer_uid"] for (cryptainer, _extracts) in header_pool]
+
+    # Prefilled for the upcoming keychain of the default keychain group
+    first_keychain_uid = storage._upcoming_keychain_uids[None]
+    expected_cryptainer_uids = _get_pregenerated_cryptainer_uids(first_keychain_uid)
+    assert len(expected_cryptainer_uids) == 2
+
+    for idx in range(3):
+        storage.enqueue_file_for_encryption("file%d.dat" % idx, b"abc%d" % idx, cryptainer_metadata=None)
+        storage.wait_for_idle_state()
+        if idx == 1:  # Pool was refilled after first use
+            expected_cryptainer_uids += _get_pregenerated_cryptainer_uids(first_keychain_uid)[:1]
+
+    # Headers of the next keychain were pregenerated at rotation time
+    second_keychain_uid = storage._upcoming_keychain_uids[None]
+    assert second_keychain_uid != first_keychain_uid
+    expected_cryptainer_uids += _get_pregenerated_cryptainer_uids(second_keychain_uid)[:1]
+    storage.enqueue_file_for_encryption("file3.dat", b"abc3", cryptainer_metadata=None)
+    storage.wait_for_idle_state()
+
+    cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
+    cryptainers = [storage.load_cryptainer_from_storage(name) for name in cryptainer_names]
+    assert [cryptainer["cryptainer_uid"] for cryptainer in cryptainers] == expected_cryptainer_uids
+    keychain_uids = [cryptainer["keychain_uid"] for cryptainer in cryptainers]
+    assert keychain_uids == [first_keychain_uid] * 3 + [second_keychain_uid]
+    for idx, cryptainer_name in enumerate(cryptainer_names):
+        result_payload, error_report = storage.decrypt_cryptainer_from_storage(cryptainer_name)
+        assert result_payload == b"abc%d" % idx
+        assert error_report == []
+
+    # Record-specific metadata (e.g. those of tarfile aggregators) don't trigger useless pregenerations
+    def _get_header_counts():
+        return [len(header_pool) for header_pool in header_factory._header_pools.values()]
+
+    header_counts = _get_header_counts()
+    storage.enqueue_file_for_encryption("file4.dat", b"abc4", cryptainer_metadata={"members": {"a": 1}})
+    storage.wait_for_idle_state()
+    assert _get_header_counts() == header_counts + [0]
+
+
+def test_cryptainer_storage_keychain_rotation(tmp_path):
+    keystore_pool = InMemoryKeystorePool()
+
+    def _make_storage(dirname, **extra_kwargs):
+        cryptainer_dir = tmp_path / dirname
+        cryptainer_dir.mkdir()
+        return CryptainerStorage(
+            default_cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_dir=cryptainer_dir, keystore_pool=keystore_pool, **extra_kwargs
+        )
+
+    def _get_keychain_uids(storage):
+        storage.wait_for_idle_state()
+        cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
+        return [storage.load_cryptainer_from_storage(name)["keychain_uid"] for name in cryptainer_names]
+
+    # No rotation policy, one keychain per cryptainer
+    storage = _make_storage("a")
+    for idx in range(3):
+        storage.enqueue_file_for_encryption("file%d.dat" % idx, b"abc", cryptainer_metadata=None)
+    assert len(set(_get_keychain_uids(storage))) == 3
+
+    # Rotation by cryptainer count
+    storage = _make_storage("b", keychain_rotation_cryptainer_count=2)
+    explicit_keychain_uid = generate_uuid0()
+    for idx in range(5):
+        storage.enqueue_file_for_encryption("file%d.dat" % idx, b"abc", cryptainer_metadata=None)
+    storage.enqueue_file_for_encryption(
+        "file5.dat", b"abc", cryptainer_metadata=None, keychain_uid=explicit_keychain_uid
+    )  # Doesn't impact rotation
+    storage.enqueue_file_for_encryption("file6.dat", b"abc", cryptainer_metadata=None)
+    keychain_uids = _get_keychain_uids(storage)
+    assert keychain_uids[0] == keychain_uids[1] != keychain_uids[2] == keychain_uids[3] != keychain_uids[4]
+    assert keychain_uids[5] == explicit_keychain_uid
+    assert keychain_uids[6] == keychain_uids[4]
+    assert storage.decrypt_cryptainer_from_storage("file6.dat.crypt")[0] == b"abc"
+
+    # Rotation by period, and per keychain group
+    with freeze_time() as frozen_datetime:
+        storage = _make_storage("c", keychain_rotation_period=timedelta(hours=1))
+        storage.enqueue_file_for_encryption("file0.dat", b"abc", cryptainer_metadata=None)
+        storage.enqueue_file_for_encryption("file1.dat", b"abc", cryptainer_metadata=None, keychain_group="mic")
+        frozen_datetime.tick(delta=timedelta(minutes=50))
+        storage.create_cryptainer_encryption_stream("file2.dat", cryptainer_metadata=None).finalize()
+        storage.enqueue_file_for_encryption("file3.dat", b"abc", cryptainer_metadata=None, keychain_group="mic")
+        frozen_datetime.tick(delta=timedelta(minutes=20))
+        storage.enqueue_file_for_encryption("file4.dat", b"abc", cryptainer_metadata=None)
+        keychain_uids = _get_keychain_uids(storage)
+
+    assert keychain_uids[0] == keychain_uids[2] != keychain_uids[4]
+    assert keychain_uids[1] == keychain_uids[3]
+    assert keychain_uids[1] not in (keychain_uids[0], keychain_uids[4])
+
+
+def test_cryptainer_storage_decryption_session(tmp_path):
+    keystore_uid = generate_uuid0()
+    keychain_uid = generate_uuid0()
+    keystore_pool, _, key_cipher_trustee = _create_keystore_and_keypair_protected_by_passphrase_in_foreign_keystore(
+        keystore_uid=keystore_uid, keychain_uid=keychain_uid, passphrase="tata"
+    )
+    storage = CryptainerStorage(
+        default_cryptoconf=SIMPLE_CRYPTOCONF_NO_SIGNING,
+        cryptainer_dir=tmp_path,
+        keystore_pool=keystore_pool,
+        keychain_rotation_cryptainer_count=10,
+    )
+    for idx in range(4):
+        storage.enqueue_file_for_encryption("file%d.dat" % idx, b"abc%d" % idx, cryptainer_metadata=None)
+    authenticator_cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_EAX",
+                key_cipher_layers=[dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=key_cipher_trustee)],
+                payload_signatures=[],
+            )
+        ]
+    )
+    storage.enqueue_file_for_encryption(
+        "zzz.dat", b"xyz", cryptainer_metadata=None, keychain_uid=keychain_uid, cryptoconf=authenticator_cryptoconf
+    )
+    storage.wait_for_idle_state()
+    cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
+    local_cryptainer_names = cryptainer_names[:4]
+
+    def _decrypt_all(**extra_kwargs):
+        for idx, cryptainer_name in enumerate(local_cryptainer_names):
+            assert storage.decrypt_cryptainer_from_storage(cryptainer_name, **extra_kwargs)[0] == b"abc%d" % idx
+
+    with patch(
+        "wacryptolib.trustee.load_asymmetric_key_from_pem_bytestring", wraps=load_asymmetric_key_from_pem_bytestring
+    ) as load_key_mock:
+
+        _decrypt_all()
+        assert load_key_mock.call_count == 4  # Once per cryptainer
+        load_key_mock.reset_mock()
+
+        with storage.create_decryption_session() as decryption_session:
+            _decrypt_all(decryption_session=decryption_session)
+            assert load_key_mock.call_count == 1  # All cryptainers share the same keychain
+            unwrapped_keys = list(decryption_session._unwrapped_keys.values())
+            assert len(unwrapped_keys) == 4
+
+            with patch("wacryptolib.trustee.decrypt_bytestring") as trustee_decrypt_mock:
+                _decrypt_all(decryption_session=decryption_session)
+                trustee_decrypt_mock.assert_not_called()  # Unwrapped keys are reused
+
+            load_key_mock.reset_mock()
+            for passphrase_mapper in (None, {None: ["wrongpassphrase"]}):
+                for _ in range(2):
+                    result, error_report = storage.decrypt_cryptainer_from_storage(
+                        "zzz.dat.crypt", passphrase_mapper=passphrase_mapper, decryption_session=decryption_session
+                    )
+                    assert result is None
+                    assert "Could not load private key" in error_report[0]["error_message"]
+            assert load_key_mock.call_count == 1 + 2  # Failures are cached per set of passphrases
+
+            result, error_report = storage.decrypt_cryptainer_from_storage(
+                "zzz.dat.crypt", passphrase_mapper={None: ["tata"]}, decryption_session=decryption_session
+            )
+            assert result == b"xyz"
+
+        assert decryption_session.is_closed
+        assert all(not any(unwrapped_key) for unwrapped_key in unwrapped_keys)  # Zeroized
+        assert not decryption_session._unwrapped_keys
+        with pytest.raises(RuntimeError, match="closed"):
+            _decrypt_all(decryption_session=decryption_session)
+
+
+def test_cryptainer_storage_key_first_decryption(tmp_path):
+    keystore_uid = generate_uuid0()
+    keychain_uid = generate_uuid0()
+    keystore_pool, _, key_cipher_trustee = _create_keystore_and_keypair_protected_by_passphrase_in_foreign_keystore(
+        keystore_uid=keystore_uid, keychain_uid=keychain_uid, passphrase="tata"
+    )
+    cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_CBC",
+                key_cipher_layers=[
+                    dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                ],
+                payload_signatures=[],
+            ),
+            dict(
+                payload_cipher_algo="AES_EAX",
+                key_cipher_layers=[dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=key_cipher_trustee)],
+                payload_signatures=[],
+            ),
+        ]
+    )
+    offload_payload_ciphertext = random_bool()
+    storage = CryptainerStorage(
+        default_cryptoconf=cryptoconf,
+        cryptainer_dir=tmp_path,
+        keystore_pool=keystore_pool,
+        offload_payload_ciphertext=offload_payload_ciphertext,
+    )
+    storage.enqueue_file_for_encryption("file.dat", b"abcdef", cryptainer_metadata=None, keychain_uid=keychain_uid)
+    storage.wait_for_idle_state()
+    cryptainer_name = storage.list_cryptainer_names(as_sorted_list=True)[0]
+
+    cryptainer_header = storage.load_cryptainer_from_storage(cryptainer_name, include_payload_ciphertext=False)
+    assert not can_decrypt_cryptainer(cryptainer_header, keystore_pool=keystore_pool)
+    assert can_decrypt_cryptainer(cryptainer_header, keystore_pool=keystore_pool, passphrase_mapper={None: ["tata"]})
+
+    assert not storage.can_decrypt_cryptainer(0)
+    assert not storage.can_decrypt_cryptainer(cryptainer_name, passphrase_mapper={None: ["badpassphrase"]})
+    assert storage.can_decrypt_cryptainer(cryptainer_name, passphrase_mapper={None: ["tata"]})
+
+    import wacryptolib.cryptainer as cryptainer_module
+
+    cryptainer_filepath = tmp_path / cryptainer_name
+    with patch(
+        "wacryptolib.cryptainer._load_cryptainer_file", wraps=cryptainer_module._load_cryptainer_file
+    ) as load_cryptainer_file_mock, patch(
+        "wacryptolib.cryptainer._load_cryptainer_payload_ciphertext_struct",
+        wraps=cryptainer_module._load_cryptainer_payload_ciphertext_struct,
+    ) as load_payload_ciphertext_struct_mock:
+
+        result, header_only_error_report = storage.decrypt_cryptainer_from_storage(cryptainer_name)
+        assert result is None
+        assert len(header_only_error_report) == 3  # Key error, then aborted symmetric decryption of both layers
+        assert "Could not load private key" in header_only_error_report[0]["error_message"]
+        load_cryptainer_file_mock.assert_called_once_with(cryptainer_filepath, include_inline_ciphertext=False)
+        load_payload_ciphertext_struct_mock.assert_not_called()
+        load_cryptainer_file_mock.reset_mock()
+
+        result, error_report = storage.decrypt_cryptainer_from_storage(0, passphrase_mapper={None: ["tata"]})
+        assert result == b"abcdef"
+        assert not error_report
+        load_cryptainer_file_mock.assert_called_once()  # Header is not parsed again to load the payload ciphertext
+        load_payload_ciphertext_struct_mock.assert_called_once()
+
+    # In-memory cryptainers keep working as before, payload being simply ignored if keys are missing
+    cryptainer = storage.load_cryptainer_from_storage(cryptainer_name, include_payload_ciphertext=True)
+    result, error_report = decrypt_payload_from_cryptainer(cryptainer, keystore_pool=keystore_pool)
+    assert result is None
+    assert [entry["error_message"] for entry in error_report] == [
+        entry["error_message"] for entry in header_only_error_report
+    ]
+
+
+def test_rewrap_cryptainer_keys(tmp_path):
+    import wacryptolib.cryptainer as cryptainer_module
+
+    keystore_uid = generate_uuid0()
+    keychain_uid = generate_uuid0()
+    keystore_pool, _, key_cipher_trustee = _create_keystore_and_keypair_protected_by_passphrase_in_foreign_keystore(
+        keystore_uid=keystore_uid, keychain_uid=keychain_uid, passphrase="tata"
+    )
+    authenticator_key_cipher_layers = [dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=key_cipher_trustee)]
+    cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_CBC",
+                key_cipher_layers=authenticator_key_cipher_layers,
+                payload_signatures=[],
+            ),
+            dict(
+                payload_cipher_algo="AES_EAX",
+                key_cipher_layers=authenticator_key_cipher_layers,
+                payload_signatures=[],
+            ),
+        ]
+    )
+    new_key_cipher_layers = [
+        dict(
+            key_cipher_algo="CHACHA20_POLY1305",
+            key_cipher_layers=[dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)],
+        )
+    ]
+
+    # In-memory cryptainer
+
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=b"abc",
+        cryptoconf=cryptoconf,
+        cryptainer_metadata=None,
+        keychain_uid=keychain_uid,
+        keystore_pool=keystore_pool,
+    )
+    cryptainer_original = copy.deepcopy(cryptainer)
+
+    with pytest.raises(SchemaValidationError):
+        rewrap_cryptainer_keys(cryptainer, [dict(key_cipher_algo="RSA_OAEP")], keystore_pool=keystore_pool)
+
+    rewrapped_cryptainer, error_report = rewrap_cryptainer_keys(
+        cryptainer, new_key_cipher_layers, keystore_pool=keystore_pool
+    )
+    assert rewrapped_cryptainer is None
+    assert len(error_report) == 2
+    assert "Could not load private key" in error_report[0]["error_message"]
+
+    rewrapped_cryptainer, error_report = rewrap_cryptainer_keys(
+        cryptainer, new_key_cipher_layers, keystore_pool=keystore_pool, passphrase_mapper={None: ["tata"]}
+    )
+    assert not error_report
+    assert cryptainer == cryptainer_original  # Not modified
+    assert rewrapped_cryptainer["payload_ciphertext_struct"] == cryptainer["payload_ciphertext_struct"]
+    for payload_cipher_layer in rewrapped_cryptainer["payload_cipher_layers"]:
+        assert payload_cipher_layer["key_cipher_layers"][0]["key_cipher_algo"] == "CHACHA20_POLY1305"
+        assert payload_cipher_layer["key_cipher_layers"][0]["key_ciphertext"]
+    check_cryptainer_sanity(rewrapped_cryptainer)
+
+    result, error_report = decrypt_payload_from_cryptainer(rewrapped_cryptainer, keystore_pool=keystore_pool)
+    assert result == b"abc"  # No passphrase needed anymore
+    assert not error_report
+
+    # Cryptainers in storage
+
+    storage = CryptainerStorage(
+        default_cryptoconf=cryptoconf,
+        cryptainer_dir=tmp_path,
+        keystore_pool=keystore_pool,
+        offload_payload_ciphertext=True,
+        max_workers=2,
+    )
+    for idx in range(3):
+        storage.enqueue_file_for_encryption(
+            "file%d.dat" % idx, b"xyz%d" % idx, cryptainer_metadata=None, keychain_uid=keychain_uid
+        )
+    storage.wait_for_idle_state()
+    cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
+    payload_filepaths = sorted(tmp_path.glob("*" + OFFLOADED_PAYLOAD_FILENAME_SUFFIX))
+    assert len(payload_filepaths) == 3
+    payload_file_stats = [(filepath.stat().st_ino, filepath.stat().st_mtime_ns) for filepath in payload_filepaths]
+    cryptainer_headers_original = [(tmp_path / cryptainer_name).read_bytes() for cryptainer_name in cryptainer_names]
+
+    error_reports = storage.rewrap_cryptainers_keys(new_key_cipher_layers)
+    assert list(error_reports) == cryptainer_names
+    assert all(len(error_report) == 2 for error_report in error_reports.values())
+    assert [(tmp_path / cryptainer_name).read_bytes() for cryptainer_name in cryptainer_names] == (
+        cryptainer_headers_original
+    )
+
+    error_reports = storage.rewrap_cryptainers_keys(
+        new_key_cipher_layers, cryptainer_names=cryptainer_names[:2], passphrase_mapper={None: ["tata"]}
+    )
+    assert error_reports == {cryptainer_names[0]: [], cryptainer_names[1]: []}
+
+    assert [(filepath.stat().st_ino, filepath.stat().st_mtime_ns) for filepath in payload_filepaths] == (
+        payload_file_stats
+    )  # Payload files untouched
+    assert not list(tmp_path.glob("*" + CRYPTAINER_TEMP_SUFFIX))
+
+    for idx, cryptainer_name in enumerate(cryptainer_names):
+        result, error_report = storage.decrypt_cryptainer_from_storage(cryptainer_name)
+        if idx < 2:
+            assert result == b"xyz%d" % idx
+            assert not error_report
+        else:
+            assert result is None  # Still protected by passphrase
+
+    # Unexpected errors are reported per cryptainer, without preventing the processing of others
+    cryptainer_headers_before = [(tmp_path / cryptainer_name).read_bytes() for cryptainer_name in cryptainer_names]
+    original_replace_cryptainer_header = cryptainer_module._replace_cryptainer_header_on_filesystem
+
+    def _broken_replace_cryptainer_header(cryptainer_filepath, **kwargs):
+        if cryptainer_filepath.name == str(cryptainer_names[0]):
+            raise OSError("Disk is full")
+        return original_replace_cryptainer_header(cryptainer_filepath, **kwargs)
+
+    with patch(
+        "wacryptolib.cryptainer._replace_cryptainer_header_on_filesystem", side_effect=_broken_replace_cryptainer_header
+    ):
+        error_reports = storage.rewrap_cryptainers_keys(
+            new_key_cipher_layers, passphrase_mapper={None: ["tata"]}, workers=3
+        )
+    assert list(error_reports) == cryptainer_names
+    _check_error_entry(
+        error_list=error_reports[cryptainer_names[0]],
+        error_type=DecryptionErrorType.ASYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.ERROR,
+        error_msg_match="Disk is full",
+        exception_class=OSError,
+    )
+    assert error_reports[cryptainer_names[1]] == error_reports[cryptainer_names[2]] == []
+    assert (tmp_path / cryptainer_names[0]).read_bytes() == cryptainer_headers_before[0]
+    result, error_report = storage.decrypt_cryptainer_from_storage(cryptainer_names[2])
+    assert result == b"xyz2"  # Rewrapped despite the failure of another cryptainer
+
+
+def test_migrate_cryptainers(tmp_path):
+    keystore_pool = InMemoryKeystorePool()
+    old_cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_CBC",
+                key_cipher_layers=[
+                    dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                ],
+                payload_signatures=[
+                    dict(
+                        payload_digest_algo="SHA256",
+                        payload_signature_algo="DSA_DSS",
+                        payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                    )
+                ],
+            )
+        ]
+    )
+    new_cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_EAX",
+                key_cipher_layers=[
+                    dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                ],
+                payload_signatures=[],
+            ),
+            dict(
+                payload_cipher_algo="CHACHA20_POLY1305",
+                key_cipher_layers=[
+                    dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                ],
+                payload_signatures=[
+                    dict(
+                        payload_digest_algo="SHA512",
+                        payload_signature_algo="RSA_PSS",
+                        payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                    )
+                ],
+            ),
+        ]
+    )
+
+    storage = CryptainerStorage(
+        default_cryptoconf=old_cryptoconf, cryptainer_dir=tmp_path, keystore_pool=keystore_pool, max_workers=2
     )
-    storage.enqueue_file_for_encryption("newfile.bmp", b"stuffs", cryptainer_metadata=None)
+    payloads = [get_random_bytes(random.randint(0, 3 * 1024 ** 2)) for _ in range(4)]
+    for idx, payload in enumerate(payloads):
+        storage.enqueue_file_for_encryption("file%d.dat" % idx, payload, cryptainer_metadata=dict(idx=idx))
     storage.wait_for_idle_state()
-    assert storage.get_cryptainer_count() == 3
-    expected_cryptainer_names = [Path("animals.dat.crypt"), Path("empty.txt.crypt"), Path("newfile.bmp.crypt")]
-    assert storage.list_cryptainer_names(as_sorted_list=True) == expected_cryptainer_names
-    assert sorted(storage.list_cryptainer_names(as_sorted_list=False)) == expected_cryptainer_names
+    cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
+    assert len(cryptainer_names) == 4
+    cryptainer_uids = [
+        storage.load_cryptainer_from_storage(cryptainer_name, include_payload_ciphertext=False)["cryptainer_uid"]
+        for cryptainer_name in cryptainer_names
+    ]
 
-    assert not list(storage._cryptainer_dir.glob("newfile*data"))  # Offloading is well disabled now
-    assert len(list(storage._cryptainer_dir.iterdir())) == 5
+    non_streamable_cryptoconf = copy.deepcopy(new_cryptoconf)
+    non_streamable_cryptoconf["payload_cipher_layers"][0]["payload_cipher_algo"] = "RSA_OAEP"
+    with pytest.raises(ValueError, match="streamable"):
+        migrate_cryptainers(storage, non_streamable_cryptoconf)
+
+    # A cryptainer whose keys are lost can't be migrated, and is left untouched
+    broken_cryptainer = storage.load_cryptainer_from_storage(cryptainer_names[3], include_payload_ciphertext=False)
+    broken_cryptainer["payload_cipher_layers"][0]["key_cipher_layers"][0]["keychain_uid"] = generate_uuid0()
+    broken_cryptainer["payload_ciphertext_struct"] = OFFLOADED_PAYLOAD_CIPHERTEXT_MARKER
+    dump_to_json_file(tmp_path / cryptainer_names[3], broken_cryptainer)
+    broken_cryptainer_bytes = (tmp_path / cryptainer_names[3]).read_bytes()
+
+    error_reports = migrate_cryptainers(storage, new_cryptoconf, workers=2)
+    assert list(error_reports) == cryptainer_names
+    assert error_reports[cryptainer_names[0]] == error_reports[cryptainer_names[1]] == []
+    assert error_reports[cryptainer_names[2]] == []
+    assert error_reports[cryptainer_names[3]][-1]["error_criticity"] == DecryptionErrorCriticity.ERROR
+    assert (tmp_path / cryptainer_names[3]).read_bytes() == broken_cryptainer_bytes
+
+    assert not list(tmp_path.glob("*" + CRYPTAINER_TEMP_SUFFIX))
+    assert not list(tmp_path.glob("*" + CRYPTAINER_MIGRATION_SUFFIX + "*"))
+
+    for idx, cryptainer_name in enumerate(cryptainer_names[:3]):
+        cryptainer = storage.load_cryptainer_from_storage(cryptainer_name, include_payload_ciphertext=False)
+        assert cryptainer["cryptainer_uid"] == cryptainer_uids[idx]  # Identity preserved by migration
+        payload_cipher_algos = [
+            payload_cipher_layer["payload_cipher_algo"] for payload_cipher_layer in cryptainer["payload_cipher_layers"]
+        ]
+        assert payload_cipher_algos == ["AES_EAX", "CHACHA20_POLY1305"]
+        assert cryptainer["cryptainer_metadata"] == dict(idx=idx)
+        result, error_report = storage.decrypt_cryptainer_from_storage(cryptainer_name)
+        assert result == payloads[idx]
+        assert not error_report
+
+    # Already migrated cryptainers are skipped
+    cryptainer_headers = [(tmp_path / cryptainer_name).read_bytes() for cryptainer_name in cryptainer_names]
+    error_reports = migrate_cryptainers(
+        storage, compile_cryptoconf(new_cryptoconf), cryptainer_names=cryptainer_names[:3]
+    )
+    assert error_reports == {cryptainer_name: [] for cryptainer_name in cryptainer_names[:3]}
+    assert [(tmp_path / cryptainer_name).read_bytes() for cryptainer_name in cryptainer_names] == cryptainer_headers
+
+    # Interrupted migrations are completed or restarted
+    cryptainer_filepath = tmp_path / cryptainer_names[0]
+    staging_filepath = tmp_path / (cryptainer_names[0].name + CRYPTAINER_MIGRATION_SUFFIX)
+    cryptainer_filepath.rename(staging_filepath)
+    (tmp_path / (cryptainer_names[0].name + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)).rename(
+        tmp_path / (staging_filepath.name + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)
+    )
+    cryptainer_filepath.write_bytes(b"old cryptainer")  # Commit was interrupted after the point of no return
+    (tmp_path / (cryptainer_names[1].name + CRYPTAINER_MIGRATION_SUFFIX + CRYPTAINER_TEMP_SUFFIX)).write_bytes(b"junk")
+
+    error_reports = migrate_cryptainers(storage, new_cryptoconf, cryptainer_names=cryptainer_names[:2])
+    assert error_reports == {cryptainer_names[0]: [], cryptainer_names[1]: []}
+    assert not list(tmp_path.glob("*" + CRYPTAINER_MIGRATION_SUFFIX + "*"))
+    for idx in range(2):
+        result, error_report = storage.decrypt_cryptainer_from_storage(cryptainer_names[idx])
+        assert result == payloads[idx]
+        assert not error_report
+
+    # Inline cryptainers stay inline, and unexpected errors are reported without preventing other migrations
+    inline_cryptainer_name, corrupted_cryptainer_name, incomplete_cryptainer_name = [
+        Path("inline.crypt"),
+        Path("corrupted.crypt"),
+        Path("incomplete.crypt"),
+    ]
+    cryptainer = encrypt_payload_into_cryptainer(
+        payloads[0], cryptoconf=old_cryptoconf, cryptainer_metadata=None, keystore_pool=keystore_pool
+    )
+    dump_cryptainer_to_filesystem(tmp_path / inline_cryptainer_name, cryptainer, offload_payload_ciphertext=False)
+    (tmp_path / corrupted_cryptainer_name).write_bytes(b"badcontent")
+    dump_cryptainer_to_filesystem(tmp_path / incomplete_cryptainer_name, cryptainer)
+    (tmp_path / (incomplete_cryptainer_name.name + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)).unlink()
+
+    error_reports = migrate_cryptainers(
+        storage,
+        new_cryptoconf,
+        cryptainer_names=[corrupted_cryptainer_name, inline_cryptainer_name, incomplete_cryptainer_name],
+        workers=2,
+    )
+    assert list(error_reports) == [corrupted_cryptainer_name, inline_cryptainer_name, incomplete_cryptainer_name]
+    assert error_reports[inline_cryptainer_name] == []
+    _check_error_entry(
+        error_list=error_reports[corrupted_cryptainer_name],
+        error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.ERROR,
+        error_msg_match="Could not migrate cryptainer",
+        exception_class=SchemaValidationError,
+    )
+    _check_error_entry(
+        error_list=error_reports[incomplete_cryptainer_name],
+        error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.ERROR,
+        error_msg_match="Could not migrate cryptainer",
+        exception_class=FileNotFoundError,
+    )
+    assert (tmp_path / corrupted_cryptainer_name).read_bytes() == b"badcontent"
+    assert not list(tmp_path.glob("*" + CRYPTAINER_MIGRATION_SUFFIX + "*"))
 
-    _cryptainer_for_txt = storage.load_cryptainer_from_storage("empty.txt.crypt")
-    assert storage.load_cryptainer_from_storage(1) == _cryptainer_for_txt
-    assert _cryptainer_for_txt["payload_ciphertext_struct"]  # Padding occurs for AES_CBC
+    assert not (tmp_path / (inline_cryptainer_name.name + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)).exists()
+    cryptainer = load_cryptainer_from_filesystem(tmp_path / inline_cryptainer_name)
+    assert cryptainer["payload_ciphertext_struct"]["ciphertext_location"] == PAYLOAD_CIPHERTEXT_LOCATIONS.INLINE
+    assert len(cryptainer["payload_cipher_layers"]) == 2
+    result, error_report = storage.decrypt_cryptainer_from_storage(inline_cryptainer_name)
+    assert result == payloads[0]
+    assert not error_report
 
-    _cryptainer_for_txt2 = storage.load_cryptainer_from_storage("empty.txt.crypt", include_payload_ciphertext=False)
-    assert storage.load_cryptainer_from_storage(1, include_payload_ciphertext=False) == _cryptainer_for_txt2
-    assert not hasattr(_cryptainer_for_txt2, "payload_ciphertext_struct")
 
-    # We continue test with a randomly configured storage
+def test_verify_cryptainer_integrity(tmp_path):
+    keystore_pool = InMemoryKeystorePool()
+    cryptoconf = dict(
+        payload_cipher_layers=[
+            dict(
+                payload_cipher_algo="AES_EAX",
+                key_cipher_layers=[
+                    dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                ],
+                payload_signatures=[],
+            ),
+            dict(
+                payload_cipher_algo="CHACHA20_POLY1305",
+                key_cipher_layers=[
+                    dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)
+                ],
+                payload_signatures=[
+                    dict(
+                        payload_digest_algo="SHA256",
+                        payload_signature_algo="DSA_DSS",
+                        payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                    ),
+                    dict(
+                        payload_digest_algo="SHA3_512",
+                        payload_signature_algo="RSA_PSS",
+                        payload_signature_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER,
+                    ),
+                ],
+            ),
+        ]
+    )
     offload_payload_ciphertext = random_bool()
     storage = CryptainerStorage(
-        default_cryptoconf=SIMPLE_CRYPTOCONF,
-        cryptainer_dir=cryptainer_dir,
+        default_cryptoconf=cryptoconf,
+        cryptainer_dir=tmp_path,
+        keystore_pool=keystore_pool,
         offload_payload_ciphertext=offload_payload_ciphertext,
     )
-
-    # Test proper logging of errors occurring in thread pool executor
-    assert storage._make_absolute  # Instance method
-    storage._make_absolute = None  # Corruption!
-    assert "Abnormal exception" not in caplog.text, caplog.text
-    storage.enqueue_file_for_encryption("something.mpg", b"#########", cryptainer_metadata=None)
+    storage.enqueue_file_for_encryption("file.dat", get_random_bytes(3 * 1024 ** 2), cryptainer_metadata=None)
     storage.wait_for_idle_state()
-    assert storage.get_cryptainer_count() == 3  # Unchanged
-    assert "Abnormal exception" in caplog.text, caplog.text
-    del storage._make_absolute
-    assert storage._make_absolute  # Back to the method
+    (cryptainer_filepath,) = storage.list_cryptainer_names(as_absolute_paths=True)
 
-    abs_entries = storage.list_cryptainer_names(as_absolute_paths=True)
-    assert len(abs_entries) == 3  # Unchanged
-    assert all(entry.is_absolute() for entry in abs_entries)
+    for verify_integrity_tags in (False, True):
+        error_report = verify_cryptainer_integrity(
+            cryptainer_filepath, keystore_pool=keystore_pool, verify_integrity_tags=verify_integrity_tags
+        )
+        assert error_report == []
 
-    animals_content, error_report = storage.decrypt_cryptainer_from_storage("animals.dat.crypt")
-    assert animals_content == b"dogs\ncats\n"
+    # Integrity tags of inner layers can only be checked by decryption
 
-    empty_content, error_report = storage.decrypt_cryptainer_from_storage("empty.txt.crypt")
-    assert empty_content == b""
+    cryptainer = load_from_json_file(cryptainer_filepath)
+    cryptainer_original = copy.deepcopy(cryptainer)
+    cryptainer["payload_cipher_layers"][0]["payload_macs"]["tag"] = b"0" * 16
+    dump_to_json_file(cryptainer_filepath, cryptainer)
 
-    assert storage.get_cryptainer_count() == 3
-    os.remove(os.path.join(cryptainer_dir, "animals.dat.crypt"))
-    os.remove(os.path.join(cryptainer_dir, "newfile.bmp.crypt"))
-    assert storage.list_cryptainer_names(as_sorted_list=True) == [Path("empty.txt.crypt")]
-    assert storage.get_cryptainer_count() == 1  # Remaining offloaded data file is ignored
+    error_report = verify_cryptainer_integrity(cryptainer_filepath, keystore_pool=keystore_pool)
+    assert error_report == []
+    error_report = verify_cryptainer_integrity(
+        cryptainer_filepath, keystore_pool=keystore_pool, verify_integrity_tags=True
+    )
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.SYMMETRIC_DECRYPTION_ERROR,
+        error_criticity=DecryptionErrorCriticity.ERROR,
+        error_msg_match="MAC check failed",
+        exception_class=DecryptionIntegrityError,
+    )
 
-    offload_payload_ciphertext1 = random_bool()
-    storage = FakeTestCryptainerStorage(
-        default_cryptoconf={"smth": True},
-        cryptainer_dir=cryptainer_dir,
-        offload_payload_ciphertext=offload_payload_ciphertext1,
+    # Ciphertext corruption is detected through outermost signatures, without decryption
+
+    dump_to_json_file(cryptainer_filepath, cryptainer_original)
+    if offload_payload_ciphertext:
+        offloaded_file_path = tmp_path / (cryptainer_filepath.name + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)
+        ciphertext = offloaded_file_path.read_bytes()
+        offloaded_file_path.write_bytes(ciphertext[:-1] + bytes([ciphertext[-1] ^ 1]))
+    else:
+        ciphertext = cryptainer_original["payload_ciphertext_struct"]["ciphertext_value"]
+        cryptainer_original["payload_ciphertext_struct"]["ciphertext_value"] = ciphertext[:-1] + bytes(
+            [ciphertext[-1] ^ 1]
+        )
+        dump_to_json_file(cryptainer_filepath, cryptainer_original)
+
+    error_report = verify_cryptainer_integrity(cryptainer_filepath, keystore_pool=keystore_pool)
+    assert len(error_report) == 4  # Both digests mismatch, and both signatures fail
+    assert all(error_entry["error_type"] == DecryptionErrorType.SIGNATURE_ERROR for error_entry in error_report)
+    _check_error_entry(
+        error_list=error_report,
+        error_type=DecryptionErrorType.SIGNATURE_ERROR,
+        error_criticity=DecryptionErrorCriticity.WARNING,
+        error_msg_match="Mismatch between actual and expected payload digests",
+        occurrence_count=2,
     )
-    assert storage._max_cryptainer_count is None
-    for i in range(10):
-        storage.enqueue_file_for_encryption("file.dat", b"dogs\ncats\n", cryptainer_metadata=None)
-    assert storage.get_cryptainer_count() < 11  # In progress
-    storage.wait_for_idle_state()
-    assert storage.get_cryptainer_count() == 11  # Still the older file remains
 
 
 def test_cryptainer_storage_purge_by_max_count(tmp_path):
@@ -2904,6 +4344,426 @@ def test_filesystem_cryptainer_loading_and_dumping(tmp_path, cryptoconf):
     assert not cryptainer_offloaded_filepath.exists()
 
 
+@pytest.mark.parametrize("cryptoconf", [SIMPLE_CRYPTOCONF, COMPLEX_CRYPTOCONF])
+def test_filesystem_binary_cryptainer_format(tmp_path, cryptoconf):
+    payload = b"jhf" * 200
+    metadata = random.choice([None, dict(a=[123], b=b"\x00\xff", c=uuid.uuid4())])
+
+    cryptainer = encrypt_payload_into_cryptainer(payload=payload, cryptoconf=cryptoconf, cryptainer_metadata=metadata)
+
+    json_bytes = dump_cryptainer_to_bytes(cryptainer)
+    binary_bytes = dump_cryptainer_to_bytes(cryptainer, binary_format=True)
+    assert json_bytes.startswith(b"{")
+    assert binary_bytes.startswith(CRYPTAINER_BINARY_MAGIC)
+    assert len(binary_bytes) < len(json_bytes) * 0.8  # No base64 nor type wrappers
+    assert load_cryptainer_from_bytes(json_bytes) == load_cryptainer_from_bytes(binary_bytes) == cryptainer
+
+    with pytest.raises(SchemaValidationError, match="Invalid binary cryptainer"):
+        load_cryptainer_from_bytes(binary_bytes[:-10])
+
+    cryptainer_with_big_integer = dict(cryptainer, cryptainer_metadata=dict(big=2 ** 70))  # Not storable in BSON
+    fallback_bytes = dump_cryptainer_to_bytes(cryptainer_with_big_integer, binary_format=True)
+    assert fallback_bytes.startswith(b"{")
+    assert load_cryptainer_from_bytes(fallback_bytes) == cryptainer_with_big_integer
+
+    for offload_payload_ciphertext in (True, False):
+        cryptainer_filepath = tmp_path / ("mycryptainer_%s.crypt" % offload_payload_ciphertext)
+        dump_cryptainer_to_filesystem(
+            cryptainer_filepath,
+            cryptainer=cryptainer,
+            offload_payload_ciphertext=offload_payload_ciphertext,
+            binary_format=True,
+        )
+        assert cryptainer_filepath.read_bytes().startswith(CRYPTAINER_BINARY_MAGIC)
+        assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+        binary_size = get_cryptainer_size_on_filesystem(cryptainer_filepath)
+
+        assert convert_cryptainer_format_on_filesystem(cryptainer_filepath, binary_format=False)
+        assert not convert_cryptainer_format_on_filesystem(cryptainer_filepath, binary_format=False)
+        assert cryptainer_filepath.read_bytes().startswith(b"{")
+        assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+        assert get_cryptainer_size_on_filesystem(cryptainer_filepath) > binary_size
+
+        assert convert_cryptainer_format_on_filesystem(cryptainer_filepath, binary_format=True)
+        assert cryptainer_filepath.read_bytes().startswith(CRYPTAINER_BINARY_MAGIC)
+        assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+        assert not cryptainer_filepath.with_name(cryptainer_filepath.name + CRYPTAINER_TEMP_SUFFIX).exists()
+
+    # Storages keep the binary format, for streamed, resumed and rewrapped cryptainers too
+
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    storage = CryptainerStorage(
+        storage_dir,
+        keystore_pool=InMemoryKeystorePool(),
+        default_cryptoconf=cryptoconf,
+        offload_payload_ciphertext=random_bool(),
+        stream_checkpoint_interval=500,
+        binary_format=True,
+    )
+    storage.enqueue_file_for_encryption("enqueued.mp4", payload, cryptainer_metadata=None)
+    storage.wait_for_idle_state()
+
+    pipeline = storage.create_cryptainer_encryption_stream("mystream", cryptainer_metadata=None)
+    for chunk in consume_bytes_as_chunks(payload, chunk_size=100):
+        pipeline.encrypt_chunk(chunk)
+    assert (storage_dir / "mystream.crypt~").read_bytes().startswith(CRYPTAINER_BINARY_MAGIC)
+    assert (storage_dir / "mystream.crypt.checkpoint").read_bytes().startswith(CRYPTAINER_BINARY_MAGIC)
+    del pipeline  # Simulated crash
+
+    pipeline = storage.resume_cryptainer_encryption_stream("mystream")
+    for chunk in consume_bytes_as_chunks(payload[pipeline.payload_length :], chunk_size=100):
+        pipeline.encrypt_chunk(chunk)
+    pipeline.finalize()
+
+    new_key_cipher_layers = [dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)]
+    error_reports = storage.rewrap_cryptainers_keys(new_key_cipher_layers, cryptainer_names=["mystream.crypt"])
+    assert error_reports == {"mystream.crypt": []}
+
+    cryptainer_names = storage.list_cryptainer_names(as_sorted_list=True)
+    assert cryptainer_names == [Path("enqueued.mp4.crypt"), Path("mystream.crypt")]
+    for cryptainer_name in cryptainer_names:
+        assert (storage_dir / cryptainer_name).read_bytes().startswith(CRYPTAINER_BINARY_MAGIC)
+        result_payload, error_report = storage.decrypt_cryptainer_from_storage(cryptainer_name)
+        assert result_payload == payload
+        assert error_report == []
+
+
+def _get_single_file_offsets(cryptainer_filepath):
+    prefix = cryptainer_filepath.read_bytes()[:CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH]
+    assert prefix.startswith(CRYPTAINER_SINGLE_FILE_MAGIC)
+    return CRYPTAINER_SINGLE_FILE_OFFSETS.unpack_from(prefix, len(CRYPTAINER_SINGLE_FILE_MAGIC))
+
+
+def test_single_file_cryptainer_layout(tmp_path):
+    payload = get_random_bytes(random.randint(1, 3000))
+    binary_format = random_bool()
+
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload, cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_metadata=None
+    )
+    payload_ciphertext = cryptainer["payload_ciphertext_struct"]["ciphertext_value"]
+
+    cryptainer_filepath = tmp_path / "mycryptainer.crypt"
+    offloaded_filepath = tmp_path / ("mycryptainer.crypt" + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)
+
+    dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=cryptainer)  # Two-files layout
+    assert offloaded_filepath.exists()
+    with mmap_cryptainer_payload_ciphertext(cryptainer_filepath) as ciphertext_view:
+        assert ciphertext_view == payload_ciphertext
+
+    dump_cryptainer_to_filesystem(
+        cryptainer_filepath, cryptainer=cryptainer, single_file=True, binary_format=binary_format
+    )
+    assert not offloaded_filepath.exists()  # Obsolete payload file was removed
+    header_offset, header_length, payload_offset, payload_length = _get_single_file_offsets(cryptainer_filepath)
+    assert header_offset == CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH
+    assert payload_offset == header_offset + header_length
+    assert payload_length == len(payload_ciphertext)
+    assert get_cryptainer_size_on_filesystem(cryptainer_filepath) == payload_offset + payload_length
+    offloaded_filepath.write_bytes(b"stray")  # Offloaded sibling isn't even looked up for single-file cryptainers
+    assert get_cryptainer_size_on_filesystem(cryptainer_filepath) == payload_offset + payload_length
+    offloaded_filepath.unlink()
+
+    assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+    cryptainer_truncated = load_cryptainer_from_filesystem(cryptainer_filepath, include_payload_ciphertext=False)
+    assert "payload_ciphertext_struct" not in cryptainer_truncated
+
+    with mmap_cryptainer_payload_ciphertext(cryptainer_filepath) as ciphertext_view:
+        assert isinstance(ciphertext_view, memoryview)
+        assert ciphertext_view == payload_ciphertext
+    with pytest.raises(ValueError):
+        ciphertext_view[0]  # Released along with the mapping
+
+    dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=cryptainer, offload_payload_ciphertext=False)
+    with mmap_cryptainer_payload_ciphertext(cryptainer_filepath) as ciphertext_view:
+        assert ciphertext_view == payload_ciphertext  # Inline ciphertext
+
+    # Offloaded ciphertexts can be loaded as memory-mapped memoryviews, and decrypted as such
+
+    for single_file in (True, False):
+        dump_cryptainer_to_filesystem(
+            cryptainer_filepath, cryptainer=cryptainer, binary_format=binary_format, single_file=single_file
+        )
+        cryptainer_mapped = load_cryptainer_from_filesystem(cryptainer_filepath, mmap_payload_ciphertext=True)
+        ciphertext_view = cryptainer_mapped["payload_ciphertext_struct"]["ciphertext_value"]
+        assert isinstance(ciphertext_view, memoryview)
+        assert ciphertext_view.readonly
+        assert ciphertext_view == payload_ciphertext
+        assert decrypt_payload_from_cryptainer(cryptainer_mapped)[0] == payload
+
+        dump_cryptainer_to_filesystem(
+            tmp_path / "copied.crypt", cryptainer=cryptainer_mapped, offload_payload_ciphertext=False
+        )
+        assert load_cryptainer_from_filesystem(tmp_path / "copied.crypt") == cryptainer
+        del cryptainer_mapped, ciphertext_view  # Releases the mapping
+        delete_cryptainer_from_filesystem(cryptainer_filepath)
+        delete_cryptainer_from_filesystem(tmp_path / "copied.crypt")
+
+    empty_cryptainer = copy.deepcopy(cryptainer)
+    empty_cryptainer["payload_ciphertext_struct"]["ciphertext_value"] = b""
+    dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=empty_cryptainer)
+    cryptainer_mapped = load_cryptainer_from_filesystem(cryptainer_filepath, mmap_payload_ciphertext=True)
+    assert cryptainer_mapped == empty_cryptainer  # Empty files can't be mapped
+    delete_cryptainer_from_filesystem(cryptainer_filepath)
+
+    # Streamed (and resumed) single-file cryptainers, with in-place finalization of their header
+
+    keystore_pool = InMemoryKeystorePool()
+    storage = CryptainerStorage(
+        tmp_path,
+        keystore_pool=keystore_pool,
+        default_cryptoconf=COMPLEX_CRYPTOCONF,
+        stream_checkpoint_interval=500,
+        binary_format=binary_format,
+        single_file=True,
+    )
+    storage.enqueue_file_for_encryption("enqueued.mp4", payload, cryptainer_metadata=None)
+    storage.wait_for_idle_state()
+
+    pipeline = storage.create_cryptainer_encryption_stream("mystream", cryptainer_metadata=dict(a=1))
+    for chunk in consume_bytes_as_chunks(payload, chunk_size=100):
+        pipeline.encrypt_chunk(chunk)
+    del pipeline  # Simulated crash
+
+    assert not (tmp_path / "mystream.crypt").exists()
+    assert not (tmp_path / ("mystream.crypt" + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)).exists()
+    temp_filepath = tmp_path / "mystream.crypt~"
+    initial_header_offset, initial_header_length, initial_payload_offset, _ = _get_single_file_offsets(temp_filepath)
+    assert initial_payload_offset > initial_header_offset + initial_header_length  # Room for final header
+
+    if len(payload) > 500:
+        pipeline = storage.resume_cryptainer_encryption_stream("mystream")
+    else:  # No checkpoint was reached
+        pipeline = storage.create_cryptainer_encryption_stream("mystream", cryptainer_metadata=dict(a=1))
+    for chunk in consume_bytes_as_chunks(payload[pipeline.payload_length :], chunk_size=100):
+        pipeline.encrypt_chunk(chunk)
+    pipeline.finalize()
+    assert not temp_filepath.exists()
+
+    streamed_filepath = tmp_path / "mystream.crypt"
+    header_offset, header_length, payload_offset, payload_length = _get_single_file_offsets(streamed_filepath)
+    assert header_offset == CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH  # Rewritten in place
+    assert header_length > initial_header_length  # Signatures were added
+    assert payload_offset == initial_payload_offset
+    assert streamed_filepath.stat().st_size == payload_offset + payload_length
+
+    assert storage.list_cryptainer_names(as_sorted_list=True) == [Path("enqueued.mp4.crypt"), Path("mystream.crypt")]
+    assert verify_cryptainer_integrity(streamed_filepath, keystore_pool=keystore_pool, verify_integrity_tags=True) == []
+
+    # Header updates alternate between the end of file and the room before payload
+
+    new_key_cipher_layers = [dict(key_cipher_algo="RSA_OAEP", key_cipher_trustee=LOCAL_KEYFACTORY_TRUSTEE_MARKER)]
+    for expected_header_offset in (payload_offset + payload_length, CRYPTAINER_SINGLE_FILE_PREFIX_LENGTH):
+        error_reports = storage.rewrap_cryptainers_keys(new_key_cipher_layers, cryptainer_names=["mystream.crypt"])
+        assert error_reports == {"mystream.crypt": []}
+        header_offset, header_length, _, _ = _get_single_file_offsets(streamed_filepath)
+        assert header_offset == expected_header_offset
+        assert streamed_filepath.stat().st_size == max(header_offset + header_length, payload_offset + payload_length)
+        result_payload, error_report = storage.decrypt_cryptainer_from_storage("mystream.crypt")
+        assert result_payload == payload
+        assert error_report == []
+
+    assert convert_cryptainer_format_on_filesystem(streamed_filepath, binary_format=not binary_format)
+    assert _get_single_file_offsets(streamed_filepath)[2:] == (payload_offset, payload_length)
+    result_payload, error_report = storage.decrypt_cryptainer_from_storage("mystream.crypt")
+    assert result_payload == payload
+    assert error_report == []
+
+    # Migrated cryptainers keep their layout
+
+    new_cryptoconf = copy.deepcopy(SIMPLE_CRYPTOCONF)
+    new_cryptoconf["payload_cipher_layers"][0]["payload_cipher_algo"] = "CHACHA20_POLY1305"
+    assert migrate_cryptainers(storage, new_cryptoconf, cryptainer_names=["enqueued.mp4.crypt"]) == {
+        "enqueued.mp4.crypt": []
+    }
+
+    for cryptainer_name in storage.list_cryptainer_names(as_sorted_list=True):
+        cryptainer_filepath = tmp_path / cryptainer_name
+        assert cryptainer_filepath.read_bytes().startswith(CRYPTAINER_SINGLE_FILE_MAGIC)
+        assert not (tmp_path / (cryptainer_name.name + OFFLOADED_PAYLOAD_FILENAME_SUFFIX)).exists()
+        result_payload, error_report = storage.decrypt_cryptainer_from_storage(cryptainer_name)
+        assert result_payload == payload
+        assert error_report == []
+        delete_cryptainer_from_filesystem(cryptainer_filepath)
+    assert not list(tmp_path.iterdir())
+
+    # Final header is appended after payload if it doesn't fit in its room
+
+    with patch("wacryptolib.cryptainer.CRYPTAINER_SINGLE_FILE_HEADER_ROOM", 0):
+        encrypt_payload_and_stream_cryptainer_to_filesystem(
+            payload,
+            cryptainer_filepath=streamed_filepath,
+            cryptoconf=COMPLEX_CRYPTOCONF,
+            cryptainer_metadata=None,
+            keystore_pool=keystore_pool,
+            single_file=True,
+        )
+    header_offset, header_length, payload_offset, payload_length = _get_single_file_offsets(streamed_filepath)
+    assert header_offset == payload_offset + payload_length
+    assert verify_cryptainer_integrity(streamed_filepath, keystore_pool=keystore_pool, verify_integrity_tags=True) == []
+    result_payload, error_report = storage.decrypt_cryptainer_from_storage("mystream.crypt")
+    assert result_payload == payload
+    assert error_report == []
+
+
+def test_load_cryptainer_header_from_filesystem(tmp_path):
+    payload = get_random_bytes(random.randint(1, 3000))
+    metadata = random.choice([None, dict(a=[123], b=b"\x00\xff", c=uuid.uuid4(), d="hêllo" * 2000)])
+
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload, cryptoconf=COMPLEX_CRYPTOCONF, cryptainer_metadata=metadata
+    )
+    expected_header = {key: cryptainer[key] for key in CRYPTAINER_HEADER_FIELDS}
+    assert expected_header["cryptainer_metadata"] == metadata
+
+    cryptainer_filepath = tmp_path / "mycryptainer.crypt"
+
+    for offload_payload_ciphertext in (True, False):
+        for binary_format in (True, False):
+            for single_file in (True, False):
+                dump_cryptainer_to_filesystem(
+                    cryptainer_filepath,
+                    cryptainer=cryptainer,
+                    offload_payload_ciphertext=offload_payload_ciphertext,
+                    binary_format=binary_format,
+                    single_file=single_file,
+                )
+                cryptainer_header = load_cryptainer_header_from_filesystem(cryptainer_filepath)
+                assert cryptainer_header == expected_header
+                assert extract_metadata_from_cryptainer(cryptainer_header) == metadata
+
+    # Only the start of json cryptainers is parsed, thanks to their sorted keys
+
+    cryptainer_bytes = dump_to_json_bytes(cryptainer)
+    truncation_offset = cryptainer_bytes.index(b'"payload_cipher_layers"') + 40
+    cryptainer_filepath.write_bytes(cryptainer_bytes[:truncation_offset])  # Broken json document
+    assert load_cryptainer_header_from_filesystem(cryptainer_filepath) == expected_header
+
+    # Other layouts are loaded via the slow path
+
+    cryptainer_filepath.write_bytes(dump_to_json_bytes(cryptainer, sort_keys=False, indent=4))
+    assert load_cryptainer_header_from_filesystem(cryptainer_filepath) == expected_header
+
+    truncated_cryptainer = cryptainer.copy()
+    del truncated_cryptainer["cryptainer_state"]
+    cryptainer_filepath.write_bytes(dump_to_json_bytes(truncated_cryptainer))
+    truncated_header = expected_header.copy()
+    del truncated_header["cryptainer_state"]
+    assert load_cryptainer_header_from_filesystem(cryptainer_filepath) == truncated_header
+
+    cryptainer_filepath.write_bytes(b'{"cryptainer_format": "cryptainer_1.0", "cryptain')
+    with pytest.raises(SchemaValidationError):
+        load_cryptainer_header_from_filesystem(cryptainer_filepath)
+    cryptainer_filepath.unlink()
+
+    # Storages iterate on headers of their cryptainers
+
+    storage = CryptainerStorage(
+        tmp_path,
+        keystore_pool=InMemoryKeystorePool(),
+        default_cryptoconf=SIMPLE_CRYPTOCONF,
+        binary_format=random_bool(),
+        single_file=random_bool(),
+    )
+    for idx in range(3):
+        storage.enqueue_file_for_encryption("file%d.mp4" % idx, payload, cryptainer_metadata=dict(idx=idx))
+    storage.wait_for_idle_state()
+
+    cryptainer_headers_with_names = list(storage.iter_cryptainer_headers())
+    assert [cryptainer_name for (cryptainer_name, _header) in cryptainer_headers_with_names] == [
+        Path("file0.mp4.crypt"),
+        Path("file1.mp4.crypt"),
+        Path("file2.mp4.crypt"),
+    ]
+    for idx, (cryptainer_name, cryptainer_header) in enumerate(cryptainer_headers_with_names):
+        assert set(cryptainer_header) == set(CRYPTAINER_HEADER_FIELDS)
+        assert cryptainer_header["cryptainer_metadata"] == dict(idx=idx)
+        assert cryptainer_header["cryptainer_state"] == "FINISHED"
+        cryptainer = storage.load_cryptainer_from_storage(cryptainer_name, include_payload_ciphertext=False)
+        assert cryptainer_header["cryptainer_uid"] == cryptainer["cryptainer_uid"]
+
+    assert list(storage.iter_cryptainer_headers(cryptainer_names=["file1.mp4.crypt"])) == [
+        cryptainer_headers_with_names[1]
+    ]
+
+
+def test_json_inline_ciphertext_streaming(tmp_path):
+    payload = get_random_bytes(random.randint(1, 3000))
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload, cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_metadata=dict(a='"payload_ciphertext_struct": {')
+    )
+    ciphertext_value = cryptainer["payload_ciphertext_struct"]["ciphertext_value"]
+    cryptainer_filepath = tmp_path / "mycryptainer.crypt"
+
+    for chunk_size in (3, 3 * 7, 3 * 1024 ** 2):
+        with patch("wacryptolib.cryptainer.INLINE_CIPHERTEXT_BASE64_CHUNK_SIZE", chunk_size):
+            dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=cryptainer, offload_payload_ciphertext=False)
+            assert cryptainer_filepath.read_bytes() == dump_cryptainer_to_bytes(cryptainer)  # Same as non-streamed
+            assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+
+            cryptainer_header = load_cryptainer_from_filesystem(cryptainer_filepath, include_payload_ciphertext=False)
+            assert "payload_ciphertext_struct" not in cryptainer_header
+            with _open_cryptainer_ciphertext_stream(cryptainer_filepath, cryptainer_header) as ciphertext_stream:
+                assert ciphertext_stream.read(7) == ciphertext_value[:7]
+                assert ciphertext_stream.read() == ciphertext_value[7:]
+
+            assert verify_cryptainer_integrity(cryptainer_filepath, verify_integrity_tags=True) == []
+
+    empty_cryptainer = copy.deepcopy(cryptainer)
+    empty_cryptainer["payload_ciphertext_struct"]["ciphertext_value"] = b""
+    dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=empty_cryptainer, offload_payload_ciphertext=False)
+    assert load_cryptainer_from_filesystem(cryptainer_filepath) == empty_cryptainer
+
+    # Other json layouts are loaded via the slow path
+
+    cryptainer_bytes = dump_cryptainer_to_bytes(cryptainer)
+    for unusual_cryptainer_bytes in [
+        dump_to_json_bytes(cryptainer, indent=4),
+        dump_to_json_bytes(cryptainer, sort_keys=False),
+        cryptainer_bytes.replace(b"/", b"\\/") + b"\n",  # Escaped slashes are valid json
+    ]:
+        cryptainer_filepath.write_bytes(unusual_cryptainer_bytes)
+        assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+        assert load_cryptainer_header_from_filesystem(cryptainer_filepath) == {
+            key: cryptainer[key] for key in CRYPTAINER_HEADER_FIELDS
+        }
+
+    cryptainer_filepath.write_bytes(cryptainer_bytes.replace(b'", "subType": "00"}', b'", "subType": "00"', 1))
+    with pytest.raises(SchemaValidationError):
+        load_cryptainer_from_filesystem(cryptainer_filepath)
+
+
+def test_json_inline_ciphertext_location_is_bounded(tmp_path):
+    payload = get_random_bytes(5 * 1024 ** 2)
+    cryptainer = encrypt_payload_into_cryptainer(
+        payload=payload, cryptoconf=SIMPLE_CRYPTOCONF, cryptainer_metadata=dict(a="b")
+    )
+    cryptainer_filepath = tmp_path / "mycryptainer.crypt"
+
+    # Search stops at the ciphertext struct of a large indented cryptainer, instead of scanning its whole base64
+    cryptainer_filepath.write_bytes(dump_to_json_bytes(cryptainer, indent=4))
+    with open(cryptainer_filepath, "rb") as f:
+        header_buffer = bytearray()
+        assert _locate_json_inline_ciphertext(f, header_buffer=header_buffer) is None
+        assert len(header_buffer) < 64 * 1024
+    assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+
+    dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=cryptainer, offload_payload_ciphertext=False)
+    with open(cryptainer_filepath, "rb") as f:
+        header_buffer = bytearray()
+        assert _locate_json_inline_ciphertext(f, header_buffer=header_buffer)
+        assert len(header_buffer) < 64 * 1024
+
+    # Json cryptainers with offloaded ciphertext are entirely read by the search, and loaded from its buffer
+    dump_cryptainer_to_filesystem(cryptainer_filepath, cryptainer=cryptainer, offload_payload_ciphertext=True)
+    with open(cryptainer_filepath, "rb") as f:
+        header_buffer = bytearray()
+        assert _locate_json_inline_ciphertext(f, header_buffer=header_buffer) is None
+        assert len(header_buffer) == cryptainer_filepath.stat().st_size
+    assert load_cryptainer_from_filesystem(cryptainer_filepath) == cryptainer
+
+
 def test_generate_cryptainer_base_and_symmetric_keys():
     cryptainer_decryptor = CryptainerEncryptor()
     cryptainer, extracts = cryptainer_decryptor._generate_cryptainer_base_and_secrets(COMPLEX_CRYPTOCONF)
@@ -3047,3 +4907,107 @@ def test_cryptainer_validation_error():
         with pytest.raises(ValidationError):
             corrupted_cryptainer_json = convert_native_tree_to_extended_json_tree(corrupted_cryptainer)
             check_cryptainer_sanity(cryptainer=corrupted_cryptainer_json, jsonschema_mode=False)
+
+
+def test_compiled_schema_validation():
+    from wacryptolib.cryptainer import (
+        CONF_SCHEMA_PYTHON,
+        CONF_SCHEMA_JSON,
+        CRYPTAINER_SCHEMA_PYTHON,
+        CRYPTAINER_SCHEMA_JSON,
+        _get_compiled_schema_validator,
+        _validate_data_tree,
+    )
+
+    cryptoconfs = [SIMPLE_CRYPTOCONF, COMPLEX_CRYPTOCONF, SIMPLE_SHAMIR_CRYPTOCONF, COMPLEX_SHAMIR_CRYPTOCONF]
+
+    checked_trees = []  # Tuples (data_tree, python_schema, json_schema)
+    for cryptoconf in cryptoconfs:
+        checked_trees.append((cryptoconf, CONF_SCHEMA_PYTHON, CONF_SCHEMA_JSON))
+        for corrupted_conf in _generate_corrupted_confs(cryptoconf):
+            checked_trees.append((corrupted_conf, CONF_SCHEMA_PYTHON, CONF_SCHEMA_JSON))
+        cryptainer = encrypt_payload_into_cryptainer(
+            payload=b"stuffs", cryptoconf=cryptoconf, keychain_uid=None, cryptainer_metadata=dict(a=True)
+        )
+        checked_trees.append((cryptainer, CRYPTAINER_SCHEMA_PYTHON, CRYPTAINER_SCHEMA_JSON))
+        for corrupted_cryptainer in _generate_corrupted_cryptainers(cryptoconf):
+            checked_trees.append((corrupted_cryptainer, CRYPTAINER_SCHEMA_PYTHON, CRYPTAINER_SCHEMA_JSON))
+    checked_trees.append(({"payload_cipher_layers": "abc"}, CONF_SCHEMA_PYTHON, CONF_SCHEMA_JSON))
+
+    valid_tree_count = 0
+    for data_tree, python_schema, json_schema in checked_trees:
+        is_valid = python_schema.is_valid(data_tree)
+        valid_tree_count += is_valid
+        assert _get_compiled_schema_validator(python_schema)(data_tree) == is_valid  # Same results as python-schema
+
+        json_data_tree = convert_native_tree_to_extended_json_tree(data_tree)
+        assert _get_compiled_schema_validator(json_schema)(json_data_tree) == is_valid
+
+        if not is_valid:
+            with pytest.raises(SchemaValidationError, match="python-schema"):  # Detailed errors
+                _validate_data_tree(data_tree, valid_schema=python_schema)
+            with pytest.raises(SchemaValidationError, match="json-schema"):
+                _validate_data_tree(json_data_tree, valid_schema=json_schema)
+    assert valid_tree_count == 2 * len(cryptoconfs)
+    assert _get_compiled_schema_validator(CONF_SCHEMA_PYTHON) is _get_compiled_schema_validator(CONF_SCHEMA_PYTHON)
+
+    # Like in python-schema, booleans are not integers
+
+    bool_schema = Schema({"value": int})
+    assert _get_compiled_schema_validator(bool_schema)({"value": 3})
+    assert not _get_compiled_schema_validator(bool_schema)({"value": True})
+
+    # Unusual schema constructs are left to python-schema
+
+    schema_with_conversion = Schema({"value": Use(int)})
+    assert _get_compiled_schema_validator(schema_with_conversion) is None
+    _validate_data_tree({"value": "33"}, valid_schema=schema_with_conversion)
+    with pytest.raises(SchemaValidationError):
+        _validate_data_tree({"value": "abc"}, valid_schema=schema_with_conversion)
+
+    # Valid cryptoconfs are remembered by their digest
+
+    cryptoconf = copy.deepcopy(COMPLEX_SHAMIR_CRYPTOCONF)
+    cryptoconf["keychain_uid"] = uuid.uuid4()  # Not yet in cache
+    with patch("wacryptolib.cryptainer._validate_data_tree", wraps=_validate_data_tree) as validate_data_tree:
+        for _ in range(3):
+            check_cryptoconf_sanity(cryptoconf=cryptoconf)
+        assert validate_data_tree.call_count == 1
+
+        cryptoconf_with_tuple = copy.deepcopy(cryptoconf)
+        cryptoconf_with_tuple["payload_cipher_layers"] = tuple(cryptoconf_with_tuple["payload_cipher_layers"])
+        with pytest.raises(SchemaValidationError):  # Same json serialization, but different content
+            check_cryptoconf_sanity(cryptoconf=cryptoconf_with_tuple)
+        assert validate_data_tree.call_count == 2
+
+        cryptoconf["payload_cipher_layers"][0]["payload_cipher_algo"] = "AES_AES"
+        for _ in range(2):
+            with pytest.raises(SchemaValidationError):  # Errors are not cached
+                check_cryptoconf_sanity(cryptoconf=cryptoconf)
+        assert validate_data_tree.call_count == 4
+
+
+def test_lazy_imports_and_schemas():
+    import wacryptolib.cryptainer as cryptainer_module
+
+    checker_code = textwrap.dedent(
+        """
+        import sys
+        import wacryptolib.cryptainer as cryptainer_module
+        heavy_modules = ["asyncio", "jsonschema", "jsonrpc_requests", "requests"]
+        print(sorted(module for module in heavy_modules if module in sys.modules))
+        print("CONF_SCHEMA_PYTHON" in vars(cryptainer_module))
+        """
+    )
+    env = os.environ.copy()
+    env["PYTHONPATH"] = env.get("PYTHONPATH", "") + os.pathsep + str(Path(cryptainer_module.__file__).parents[1])
+    proc = subprocess.run([sys.executable, "-c", checker_code], env=env, stdout=subprocess.PIPE, check=True, timeout=30)
+    assert proc.stdout.split() == [b"[]", b"False"]  # Nothing heavy loaded at import time
+
+    conf_schema_python = cryptainer_module.CONF_SCHEMA_PYTHON  # Built on first access
+    assert isinstance(conf_schema_python, Schema)
+    assert cryptainer_module.CONF_SCHEMA_PYTHON is conf_schema_python
+    assert isinstance(cryptainer_module.CRYPTAINER_SCHEMA_JSON, dict)
+
+    with pytest.raises(AttributeError, match="has no attribute"):
+        cryptainer_module.UNEXISTING_SCHEMA
@@ -1,3 +1,4 @@
+import math
 import os
 import uuid
 from datetime import datetime, timezone, timedelta
@@ -8,6 +9,7 @@ import pytest
 import pytz
 
 from wacryptolib._crypto_backend import get_random_bytes
+from wacryptolib.exceptions import SchemaValidationError
 from wacryptolib.utilities import (
     split_as_chunks,
     recombine_chunks,
@@ -18,6 +20,9 @@ from wacryptolib.utilities import (
     check_datetime_is_tz_aware,
     dump_to_json_file,
     load_from_json_file,
+    dump_to_binary_envelope,
+    load_from_binary_envelope,
+    BINARY_ENVELOPE_MAGIC,
     generate_uuid0,
     SUPPORTED_HASH_ALGOS,
     hash_message,
@@ -148,6 +153,101 @@ def test_serialization_utilities(tmp_path):
     assert utcoffset == timedelta(0)  # Date is returned as UTC in any case!
 
 
+def test_fast_json_codec_matches_bson_json_util():
+    from collections import OrderedDict
+
+    from bson.binary import Binary
+    from bson.int64 import Int64
+    from bson.json_util import dumps, loads
+
+    from wacryptolib.utilities import WACRYPTOLIB_JSON_OPTIONS
+
+    utc_date = pytz.utc.localize(datetime(2022, 10, 10, 11, 12, 13, 456789))
+    values = [
+        b"",
+        get_random_bytes(100),
+        uuid.UUID("7c0b18f5-f410-4e83-9263-b38c2328e516"),
+        generate_uuid0(),
+        0,
+        -(2 ** 31),
+        2 ** 31 - 1,
+        2 ** 31,
+        -(2 ** 70),
+        Int64(3),
+        1.5,
+        float("inf"),
+        -float("inf"),
+        None,
+        True,
+        False,
+        "hêllo",
+        utc_date,
+        utc_date.astimezone(pytz.timezone("America/Los_Angeles")),
+        datetime(2022, 10, 10),  # Naive dates are considered as UTC
+        datetime(1, 1, 1, tzinfo=timezone.utc),
+        (1, [2, b"x"]),
+        {"b": {"a": [b"y", {}]}},
+        # Types unknown to the fast codec
+        OrderedDict(z=1, a=b"abc"),
+        {1, 2},
+        Binary(b"abc", subtype=5),
+    ]
+
+    for value in values:
+        payload = {"key": value, "list": [value, {"nested": value}]}
+        for extra_options in [{}, dict(indent=4), dict(ensure_ascii=False), dict(sort_keys=False)]:
+            expected_json_str = dumps(
+                payload, json_options=WACRYPTOLIB_JSON_OPTIONS, **{"sort_keys": True, **extra_options}
+            )
+            json_str = dump_to_json_str(payload, **extra_options)
+            assert json_str == expected_json_str  # Byte-identical
+
+            expected_deserialized = loads(json_str, json_options=WACRYPTOLIB_JSON_OPTIONS)
+            deserialized = load_from_json_str(json_str)
+            assert deserialized == expected_deserialized
+            assert repr(deserialized) == repr(expected_deserialized)  # Same types (Int64, UUID, tzinfo...)
+
+    deserialized = load_from_json_str(dump_to_json_str({"nan": float("nan")}))
+    assert math.isnan(deserialized["nan"])
+
+    # Unusual extended json wrappers are still handled by bson.json_util
+    assert load_from_json_str(r'{"$oid": "5a1b2c3d4e5f6a7b8c9d0e1f"}') == loads(r'{"$oid": "5a1b2c3d4e5f6a7b8c9d0e1f"}')
+    assert load_from_json_str(r'{"$binary": {"base64": "eHl6", "subType": "05"}}') == Binary(b"xyz", subtype=5)
+    assert load_from_json_str(r'{"$binary": "eHl6", "$type": "00"}') == b"xyz"  # Legacy format
+
+    # Invalid wrappers are rejected the same way
+    with pytest.raises(TypeError):
+        load_from_json_str(r'{"$numberInt": 33}')
+    with pytest.raises(TypeError):
+        load_from_json_str(r'{"$binary": {"base64": "eHl6", "subType": "00", "other": 1}}')
+
+
+def test_binary_envelope_utilities():
+
+    uid = uuid.UUID("7c0b18f5-f410-4e83-9263-b38c2328e516")
+    utc_date = pytz.utc.localize(datetime(2022, 10, 10))
+    payload = dict(b=b"xyz" * 100, a="hêllo", c=uid, d=utc_date, e=[1, None, {"f": b""}])
+
+    envelope = dump_to_binary_envelope(payload)
+    assert envelope.startswith(BINARY_ENVELOPE_MAGIC + b"\x01")
+    assert len(envelope) < 0.8 * len(dump_to_json_bytes(payload))  # No base64 overhead
+    deserialized = load_from_binary_envelope(envelope)
+    assert deserialized == payload
+    assert deserialized["d"].utcoffset() == timedelta(0)
+
+    assert load_from_binary_envelope(dump_to_binary_envelope((3, b"abc"))) == [3, b"abc"]  # Like json
+
+    # Legacy json data is loaded transparently, and used as fallback for data unsupported by BSON
+    assert load_from_binary_envelope(dump_to_json_bytes(payload)) == payload
+    huge_payload = dict(a=2**80)
+    assert dump_to_binary_envelope(huge_payload) == dump_to_json_bytes(huge_payload)
+    assert load_from_binary_envelope(dump_to_binary_envelope(huge_payload)) == huge_payload
+
+    for corrupted_envelope in [envelope[:-3], BINARY_ENVELOPE_MAGIC, BINARY_ENVELOPE_MAGIC + b"\x09" + envelope[5:]]:
+        with pytest.raises(SchemaValidationError):
+            load_from_binary_envelope(corrupted_envelope)
+
+
 def test_generate_uuid0():
 
     utc = pytz.UTC